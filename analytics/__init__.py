@@ -7,6 +7,7 @@ Usage:
 
 from datetime import datetime
 
+from tracing import traced
 from analytics.data_prep import load_comparison_data
 from analytics.kpi_engine import (
     compute_price_index,
@@ -20,6 +21,7 @@ from analytics.kpi_engine import (
 from analytics.report import print_report
 
 
+@traced("analytics")
 def run_analytics(db_path: str = "data/concurrentiecheck.db",
                   scrape_date: str = None,
                   segment: str = None,
@@ -3,6 +3,8 @@
 from collections import defaultdict
 from datetime import datetime
 
+from tracing import traced
+
 OWN_PARK = "Westerbergen"
 CANONICAL_DURATIONS = [2, 3, 4, 7]
 
@@ -35,6 +37,7 @@ def classify_stay(check_in_date: str, nights: int) -> str:
         return f"{nights}_nachten"
 
 
+@traced("analytics")
 def load_comparison_data(db, scrape_date: str = None,
                          segment: str = None) -> list[dict]:
     """Load and normalize all price data into comparison rows.
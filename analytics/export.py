@@ -0,0 +1,227 @@
+"""Streaming export of comparison rows, price index, recommendations and raw prices.
+
+Rows are produced as generators and written incrementally, so a full price
+history can be exported to CSV, NDJSON or Parquet in bounded memory:
+
+- prices: streamed from a DB cursor (Database.iter_prices)
+- comparison / price_index / recommendations: computed one
+  (scrape_date, segment) at a time with the regular analytics functions
+
+Usage:
+    from analytics.export import export
+    n = export("data/concurrentiecheck.db", "prices", "csv", "prices.csv",
+               date_from="2026-01-01", competitors=["De Boshoek"])
+"""
+
+import csv
+import json
+import sys
+
+from analytics.data_prep import load_comparison_data
+from analytics.kpi_engine import (
+    compute_price_index,
+    compute_competitive_position,
+    compute_availability_gaps,
+    compute_seasonal_patterns,
+    compute_recommendations,
+)
+
+# Column name -> type per dataset (order = default column order)
+DATASETS = {
+    "comparison": {
+        "scrape_date": "str", "segment": "str",
+        "check_in_date": "str", "check_out_date": "str", "nights": "int",
+        "stay_type": "str", "month": "str", "day_of_week": "str", "days_ahead": "int",
+        "wb_price": "float", "wb_available": "bool",
+        "competitor": "str", "comp_price": "float", "comp_available": "bool",
+    },
+    "price_index": {
+        "scrape_date": "str", "segment": "str",
+        "check_in_date": "str", "nights": "int", "stay_type": "str",
+        "competitor": "str", "wb_price": "float", "comp_price": "float",
+        "price_index": "float", "verschil_eur": "float", "verschil_pct": "float",
+    },
+    "recommendations": {
+        "scrape_date": "str", "segment": "str",
+        "check_in_date": "str", "nights": "int", "stay_type": "str",
+        "type": "str", "urgentie": "str", "huidig_prijs": "float",
+        "voorgesteld_prijs": "float", "extra_omzet": "float",
+        "reden": "str", "concurrenten": "str",
+    },
+    "prices": {
+        "scrape_date": "str", "segment": "str", "competitor_name": "str",
+        "accommodation_type": "str", "check_in_date": "str", "check_out_date": "str",
+        "price": "float", "available": "bool", "min_nights": "int",
+        "special_offers": "str", "surcharges": "str", "persons": "int",
+        "scrape_timestamp": "str",
+    },
+}
+
+FORMATS = ("csv", "ndjson", "parquet")
+
+
+def resolve_columns(dataset: str, columns: list[str] = None) -> list[str]:
+    """Validate a column selection; default is all columns of the dataset."""
+    if dataset not in DATASETS:
+        raise ValueError(f"Onbekende dataset '{dataset}' (kies uit: {', '.join(DATASETS)})")
+    available = DATASETS[dataset]
+    if not columns:
+        return list(available)
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(
+            f"Onbekende kolom(men) voor {dataset}: {', '.join(unknown)} "
+            f"(beschikbaar: {', '.join(available)})"
+        )
+    return list(columns)
+
+
+def _scrape_dates(db, date_from: str = None, date_to: str = None) -> list[str]:
+    dates = sorted(db.get_all_scrape_dates())
+    return [d for d in dates
+            if (not date_from or d >= date_from) and (not date_to or d <= date_to)]
+
+
+def _analytics_slices(db, date_from, date_to, segments):
+    """Yield (scrape_date, segment, comparison_data) one slice at a time."""
+    for scrape_date in _scrape_dates(db, date_from, date_to):
+        for segment in segments or db.get_available_segments(scrape_date):
+            comparison = load_comparison_data(db, scrape_date, segment=segment)
+            if comparison:
+                yield scrape_date, segment, comparison
+
+
+def iter_rows(db, dataset: str, date_from: str = None, date_to: str = None,
+              competitors: list[str] = None, segments: list[str] = None,
+              columns: list[str] = None, batch_size: int = 5000):
+    """Yield flat row dicts for one dataset.
+
+    ``competitors`` filters on the competitor column; recommendations are
+    per stay (not per competitor) and are therefore not filtered by it.
+    ``columns`` is pushed down into the SELECT for raw prices.
+    """
+    comp_filter = set(competitors) if competitors else None
+
+    if dataset == "prices":
+        yield from db.iter_prices(
+            scrape_date_from=date_from, scrape_date_to=date_to,
+            competitors=competitors, segments=segments,
+            columns=columns or list(DATASETS["prices"]), batch_size=batch_size,
+        )
+        return
+
+    for scrape_date, segment, comparison in _analytics_slices(db, date_from, date_to, segments):
+        if dataset == "comparison":
+            for row in comparison:
+                for comp, info in row["competitors"].items():
+                    if comp_filter and comp not in comp_filter:
+                        continue
+                    yield {
+                        "scrape_date": scrape_date, "segment": segment,
+                        "check_in_date": row["check_in_date"],
+                        "check_out_date": row["check_out_date"],
+                        "nights": row["nights"], "stay_type": row["stay_type"],
+                        "month": row["month"], "day_of_week": row["day_of_week"],
+                        "days_ahead": row["days_ahead"],
+                        "wb_price": row["wb_price"], "wb_available": row["wb_available"],
+                        "competitor": comp, "comp_price": info["price"],
+                        "comp_available": info["available"],
+                    }
+
+        elif dataset == "price_index":
+            for pi in compute_price_index(comparison):
+                if comp_filter and pi["competitor"] not in comp_filter:
+                    continue
+                yield {"scrape_date": scrape_date, "segment": segment, **pi}
+
+        elif dataset == "recommendations":
+            price_index = compute_price_index(comparison)
+            recs = compute_recommendations(
+                price_index,
+                compute_competitive_position(comparison),
+                compute_availability_gaps(comparison),
+                compute_seasonal_patterns(comparison),
+            )
+            for rec in recs:
+                yield {
+                    "scrape_date": scrape_date, "segment": segment, **rec,
+                    "concurrenten": json.dumps(rec.get("concurrenten", {}), ensure_ascii=False),
+                }
+
+
+# ── Writers ────────────────────────────────────────────────────────────
+
+def write_csv(rows, fh, columns: list[str]) -> int:
+    writer = csv.writer(fh)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([row.get(c) for c in columns])
+        count += 1
+    return count
+
+
+def write_ndjson(rows, fh, columns: list[str]) -> int:
+    count = 0
+    for row in rows:
+        fh.write(json.dumps({c: row.get(c) for c in columns}, ensure_ascii=False))
+        fh.write("\n")
+        count += 1
+    return count
+
+
+def write_parquet(rows, path: str, columns: list[str], types: dict,
+                  batch_size: int = 5000) -> int:
+    """Write rows as Parquet row groups of ``batch_size`` (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export vereist pyarrow: pip install pyarrow")
+
+    pa_types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+    schema = pa.schema([(c, pa_types[types[c]]) for c in columns])
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = {c: [] for c in columns}
+        for row in rows:
+            for c in columns:
+                value = row.get(c)
+                if types[c] == "bool" and value is not None:
+                    value = bool(value)
+                batch[c].append(value)
+            count += 1
+            if count % batch_size == 0:
+                writer.write_table(pa.table(batch, schema=schema))
+                batch = {c: [] for c in columns}
+        if batch[columns[0]]:
+            writer.write_table(pa.table(batch, schema=schema))
+    return count
+
+
+def export(db_path: str, dataset: str, fmt: str, output: str = None,
+           date_from: str = None, date_to: str = None,
+           competitors: list[str] = None, segments: list[str] = None,
+           columns: list[str] = None, batch_size: int = 5000) -> int:
+    """Stream one dataset to a file (or stdout for csv/ndjson). Returns row count."""
+    from database import Database
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Onbekend formaat '{fmt}' (kies uit: {', '.join(FORMATS)})")
+    columns = resolve_columns(dataset, columns)
+
+    db = Database(db_path)
+    rows = iter_rows(db, dataset, date_from, date_to, competitors, segments,
+                     columns=columns, batch_size=batch_size)
+
+    if fmt == "parquet":
+        if not output or output == "-":
+            raise ValueError("Parquet export vereist een output-bestand")
+        return write_parquet(rows, output, columns, DATASETS[dataset], batch_size)
+
+    writer = write_csv if fmt == "csv" else write_ndjson
+    if not output or output == "-":
+        return writer(rows, sys.stdout, columns)
+    with open(output, "w", encoding="utf-8", newline="") as fh:
+        return writer(rows, fh, columns)
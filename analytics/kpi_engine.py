@@ -2,7 +2,10 @@
 
 from collections import defaultdict
 
+from tracing import traced
 
+
+@traced("kpi")
 def compute_price_index(comparison_data: list[dict]) -> list[dict]:
     """Compute Westerbergen price / competitor price * 100.
 
@@ -32,6 +35,7 @@ def compute_price_index(comparison_data: list[dict]) -> list[dict]:
     return results
 
 
+@traced("kpi")
 def compute_price_per_night(comparison_data: list[dict]) -> list[dict]:
     """Compute price/night for WB and each competitor with ranking."""
     results = []
@@ -62,6 +66,7 @@ def compute_price_per_night(comparison_data: list[dict]) -> list[dict]:
     return results
 
 
+@traced("kpi")
 def compute_competitive_position(comparison_data: list[dict]) -> list[dict]:
     """Rank WB among all competitors by total price per (date, nights)."""
     results = []
@@ -87,6 +92,7 @@ def compute_competitive_position(comparison_data: list[dict]) -> list[dict]:
     return results
 
 
+@traced("kpi")
 def compute_availability_gaps(comparison_data: list[dict]) -> dict:
     """Identify dates where availability differs between WB and competitors."""
     wb_open_comp_closed = []  # Opportunity to raise prices
@@ -132,6 +138,7 @@ def compute_availability_gaps(comparison_data: list[dict]) -> dict:
     }
 
 
+@traced("kpi")
 def compute_seasonal_patterns(comparison_data: list[dict]) -> dict:
     """Average prices per month, per stay_type, per competitor."""
     # Accumulators: {group_key: {competitor: [prices]}}
@@ -174,6 +181,7 @@ def compute_seasonal_patterns(comparison_data: list[dict]) -> dict:
     }
 
 
+@traced("kpi")
 def compute_price_changes(db) -> dict:
     """Track price changes across scrape days.
 
@@ -240,6 +248,7 @@ def compute_price_changes(db) -> dict:
     }
 
 
+@traced("kpi")
 def compute_recommendations(
     price_index_data: list[dict],
     position_data: list[dict],
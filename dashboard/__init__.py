@@ -3,23 +3,34 @@
 Usage:
     from dashboard import generate_dashboard
     path = generate_dashboard(analytics_result, config)
+
+    # Multiple segments in parallel worker processes
+    from dashboard import generate_dashboards
+    outcomes = generate_dashboards({"accommodatie": result, ...}, config)
 """
 
 import glob
+import logging
 import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+import tracing
 from dashboard.excel_generator import ExcelDashboard
+from dashboard.payload import pack, unpack
+
+logger = logging.getLogger(__name__)
 
 
 def generate_dashboard(analytics_result: dict, config: dict = None,
-                       output_path: str = None) -> str:
+                       output_path: str = None, cleanup: bool = True) -> str:
     """Generate Excel dashboard from analytics results.
 
     Args:
         analytics_result: dict returned by run_analytics()
         config: dashboard section of settings.yaml (optional)
         output_path: custom output path (optional, overrides config)
+        cleanup: remove old dashboard files afterwards (keep_last)
 
     Returns:
         Path to generated Excel file.
@@ -40,13 +51,125 @@ def generate_dashboard(analytics_result: dict, config: dict = None,
     dashboard.generate(output_path)
 
     # Cleanup old files
-    keep_last = config.get("keep_last", 30)
-    output_dir = config.get("output_dir", "data")
-    _cleanup_old_dashboards(output_dir, keep_last)
+    if cleanup:
+        keep_last = config.get("keep_last", 30)
+        output_dir = config.get("output_dir", "data")
+        _cleanup_old_dashboards(output_dir, keep_last)
 
     return output_path
 
 
+def generate_dashboards(results_by_segment: dict, config: dict = None,
+                        max_workers: int = None) -> dict:
+    """Generate one workbook per segment, in parallel worker processes.
+
+    xlsxwriter is pure-Python and single-threaded, so each segment is
+    rendered in its own process. Workers receive a compact columnar
+    payload (see dashboard.payload) instead of the full analytics dict.
+
+    Args:
+        results_by_segment: {segment: dict returned by run_analytics()}
+        config: dashboard section of settings.yaml (optional)
+        max_workers: worker processes (default: config "workers", else one
+            per segment capped at the CPU count); 1 renders in-process
+
+    Returns:
+        {segment: {"path": str or None, "error": str or None}} in input order.
+    """
+    config = config or {}
+    outcomes = {segment: {"path": None, "error": None} for segment in results_by_segment}
+    if not results_by_segment:
+        return outcomes
+
+    jobs = {}
+    for segment, result in results_by_segment.items():
+        try:
+            meta = result.get("metadata", {})
+            output_path = _build_output_path(config, meta.get("scrape_date"), segment=segment)
+            jobs[segment] = (pack(result), output_path)
+        except Exception as e:
+            outcomes[segment]["error"] = f"{type(e).__name__}: {e}"
+
+    if max_workers is None:
+        max_workers = config.get("workers") or min(len(jobs), os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        for segment, (payload, output_path) in jobs.items():
+            try:
+                outcomes[segment]["path"] = _render_payload(payload, config, output_path)
+            except Exception as e:
+                logger.error(f"Dashboard {segment} mislukt: {e}", exc_info=True)
+                outcomes[segment]["error"] = f"{type(e).__name__}: {e}"
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            futures = {
+                _submit(pool, payload, config, output_path): segment
+                for segment, (payload, output_path) in jobs.items()
+            }
+            for future in as_completed(futures):
+                segment = futures[future]
+                try:
+                    outcomes[segment]["path"] = future.result()
+                except Exception as e:
+                    logger.error(f"Dashboard {segment} mislukt: {e}")
+                    outcomes[segment]["error"] = f"{type(e).__name__}: {e}"
+
+    # Cleanup once, after all workers are done
+    cleanup_dashboards(config)
+    return outcomes
+
+
+def submit_dashboard(pool, analytics_result: dict, config: dict = None):
+    """Submit one segment workbook to a process pool; returns a Future (path).
+
+    For callers that own their pool and interleave workbooks with other
+    work (run_daily's task graph). Old files are not cleaned up here; call
+    cleanup_dashboards() once all futures are done.
+    """
+    config = config or {}
+    meta = analytics_result.get("metadata", {})
+    output_path = _build_output_path(config, meta.get("scrape_date"), segment=meta.get("segment"))
+    return _submit(pool, pack(analytics_result), config, output_path)
+
+
+def _submit(pool, payload: dict, config: dict, output_path: str):
+    """Submit one render; with tracing on, the worker's spans are merged on completion."""
+    if not tracing.active():
+        return pool.submit(_render_payload, payload, config, output_path)
+
+    future = Future()
+
+    def _done(worker_future):
+        try:
+            path, events = worker_future.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        tracing.merge(events)
+        future.set_result(path)
+
+    pool.submit(_render_traced, payload, config, output_path).add_done_callback(_done)
+    return future
+
+
+def cleanup_dashboards(config: dict = None):
+    """Remove old dashboard files according to the keep_last setting."""
+    config = config or {}
+    _cleanup_old_dashboards(config.get("output_dir", "data"), config.get("keep_last", 30))
+
+
+def _render_payload(payload: dict, config: dict, output_path: str) -> str:
+    """Worker entry point: rebuild the analytics dict and write one workbook."""
+    return generate_dashboard(unpack(payload), config, output_path, cleanup=False)
+
+
+def _render_traced(payload: dict, config: dict, output_path: str) -> tuple[str, list]:
+    """Worker entry point with tracing: returns (path, trace events of the worker)."""
+    with tracing.capture() as events:
+        path = _render_payload(payload, config, output_path)
+    return path, events
+
+
 def _build_output_path(config: dict, scrape_date: str = None,
                        segment: str = None) -> str:
     """Build the output file path from config template."""
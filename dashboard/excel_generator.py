@@ -4,6 +4,8 @@ import xlsxwriter
 from collections import defaultdict
 from datetime import datetime
 
+import tracing
+
 # Color palette
 WB_DARK_GREEN = '#2E5A1C'
 WB_GREEN = '#4A8C2A'
@@ -28,6 +30,10 @@ STAY_LABELS = {
 }
 
 
+# Above this many table rows (Prijsvergelijking + Historisch) the workbook
+# is written in batch mode: write_row + constant_memory.
+BATCH_WRITE_THRESHOLD = 20000
+
 SEGMENT_LABELS = {
     "accommodatie": "Accommodaties",
     "kampeerplaats": "Kampeerplaatsen",
@@ -46,19 +52,44 @@ class ExcelDashboard:
         self.competitors = sorted(self.data.get("metadata", {}).get("competitors", []))
         self.segment = self.data.get("metadata", {}).get("segment")
         self.segment_label = SEGMENT_LABELS.get(self.segment, self.segment or "Alle segmenten")
+        self.batch_write = self._use_batch_write()
+
+    def _use_batch_write(self) -> bool:
+        """Decide on batch-write mode from config ("auto", true, false).
+
+        Batch mode writes the large tables with ``write_row`` against
+        column-level formats and runs xlsxwriter with ``constant_memory``,
+        so rows are flushed to disk as they are written. Alternating rows,
+        borders and "-" placeholders are styled through conditional formats
+        instead of per-cell format lookups.
+        """
+        setting = self.config.get("batch_write", "auto")
+        if setting != "auto":
+            return bool(setting)
+        threshold = self.config.get("batch_write_threshold", BATCH_WRITE_THRESHOLD)
+        n_rows = (len(self.data.get("comparison_data", []))
+                  + len(self.data.get("price_changes", {}).get("changes", [])))
+        return n_rows >= threshold
 
     def generate(self, output_path: str) -> str:
         """Create the workbook, write all sheets, close, return path."""
-        self.workbook = xlsxwriter.Workbook(output_path)
-        try:
-            self._init_formats()
-
-            self._write_overzicht()
-            self._write_prijsvergelijking()
-            self._write_concurrenten()
-            self._write_historisch()
-        finally:
-            self.workbook.close()
+        # constant_memory requires every sheet to be written in row order.
+        options = {"constant_memory": True} if self.batch_write else {}
+        with tracing.span("dashboard", cat="dashboard", segment=self.segment,
+                          batch_write=self.batch_write):
+            self.workbook = xlsxwriter.Workbook(output_path, options)
+            try:
+                self._init_formats()
+
+                for sheet, write in (("Overzicht", self._write_overzicht),
+                                     ("Prijsvergelijking", self._write_prijsvergelijking),
+                                     ("Concurrenten", self._write_concurrenten),
+                                     ("Historisch", self._write_historisch)):
+                    with tracing.span(sheet, cat="sheet"):
+                        write()
+            finally:
+                with tracing.span("workbook.close", cat="sheet"):
+                    self.workbook.close()
         return output_path
 
     # ── Format initialization ──────────────────────────────────────────
@@ -118,6 +149,21 @@ class ExcelDashboard:
             "border_color": "#DDDDDD", "align": "center", "bg_color": WB_LIGHT_GREEN,
         })
 
+        # Column-level formats for batch mode: no border/fill, those come
+        # from the conditional formats over the data range.
+        col_props = {"font_size": 10, "font_color": WB_DARK_GRAY}
+        f["col_text"] = wb.add_format(col_props)
+        f["col_euro"] = wb.add_format({**col_props, "num_format": '#,##0', "align": "right"})
+        f["col_euro_eur"] = wb.add_format({**col_props, "num_format": u'\u20ac #,##0', "align": "right"})
+        f["col_index"] = wb.add_format({**col_props, "num_format": "0.0", "align": "center"})
+        f["col_pct"] = wb.add_format({**col_props, "num_format": "0.0%", "align": "center"})
+        f["col_int"] = wb.add_format({**col_props, "num_format": "0", "align": "center"})
+
+        # Conditional (dxf) formats for batch mode
+        f["cf_border"] = wb.add_format({"border": 1, "border_color": "#DDDDDD"})
+        f["cf_alt"] = wb.add_format({"bg_color": WB_LIGHT_GREEN})
+        f["cf_na"] = wb.add_format({"font_color": "#AAAAAA", "italic": True})
+
         # Unavailable / no data
         f["na"] = wb.add_format({
             "font_size": 10, "font_color": "#AAAAAA", "italic": True,
@@ -203,6 +249,47 @@ class ExcelDashboard:
         for i, w in enumerate(widths):
             ws.set_column(i, i, w)
 
+    def _write_table_rows(self, ws, row: int, rows, kinds: list, widths: list) -> int:
+        """Write data rows of a table; returns the row after the last one.
+
+        ``kinds`` holds the base format name per column ("text", "euro", ...);
+        a "-" value is rendered with the "na" format. In batch mode the
+        kinds become column formats and each row is a single ``write_row``.
+        """
+        if not self.batch_write:
+            for i, values in enumerate(rows):
+                alt = i % 2 == 1
+                for c, value in enumerate(values):
+                    kind = "na" if value == "-" else kinds[c]
+                    ws.write(row, c, value, self._fmt(kind, alt))
+                row += 1
+            return row
+
+        for c, (kind, width) in enumerate(zip(kinds, widths)):
+            ws.set_column(c, c, width, self._formats[f"col_{kind}"])
+
+        first_row = row
+        write_row = ws.write_row
+        for values in rows:
+            write_row(row, 0, values)
+            row += 1
+
+        if row > first_row:
+            last_row, last_col = row - 1, len(kinds) - 1
+            ws.conditional_format(first_row, 0, last_row, last_col, {
+                "type": "formula", "criteria": "=TRUE",
+                "format": self._formats["cf_border"],
+            })
+            ws.conditional_format(first_row, 0, last_row, last_col, {
+                "type": "formula", "criteria": f"=MOD(ROW()-{first_row + 1},2)=1",
+                "format": self._formats["cf_alt"],
+            })
+            ws.conditional_format(first_row, 0, last_row, last_col, {
+                "type": "cell", "criteria": "==", "value": '"-"',
+                "format": self._formats["cf_na"],
+            })
+        return row
+
     # ── Sheet 1: Overzicht ─────────────────────────────────────────────
 
     def _write_overzicht(self):
@@ -248,11 +335,15 @@ class ExcelDashboard:
             ("Acties nodig", str(acties_hoog), "hoge urgentie"),
         ]
 
-        for i, (label, value, desc) in enumerate(kpis):
-            col = (i % 3) * 3
-            r = row + (i // 3) * 3
-            ws.merge_range(r, col, r, col + 1, value, f["kpi_value"])
-            ws.merge_range(r + 1, col, r + 1, col + 1, f"{label}\n{desc}", f["kpi_label"])
+        # Written row by row (values, then labels) so constant_memory mode
+        # never has to go back to an already flushed row.
+        for card_row in range(0, len(kpis), 3):
+            r = row + (card_row // 3) * 3
+            cards = kpis[card_row:card_row + 3]
+            for j, (label, value, desc) in enumerate(cards):
+                ws.merge_range(r, j * 3, r, j * 3 + 1, value, f["kpi_value"])
+            for j, (label, value, desc) in enumerate(cards):
+                ws.merge_range(r + 1, j * 3, r + 1, j * 3 + 1, f"{label}\n{desc}", f["kpi_label"])
 
         row += 7
 
@@ -380,7 +471,12 @@ class ExcelDashboard:
         headers.extend(["Gem. Index", "WB Rang"])
         col_widths.extend([11, 9])
 
-        self._set_col_widths(ws, col_widths)
+        kinds = ["text", "text", "int", "text", "euro"]
+        kinds += ["euro", "index"] * len(self.competitors)
+        kinds += ["index", "int"]
+
+        if not self.batch_write:
+            self._set_col_widths(ws, col_widths)
 
         for c, h in enumerate(headers):
             ws.write(row, c, h, f["header"])
@@ -388,78 +484,17 @@ class ExcelDashboard:
         header_row = row
         row += 1
 
-        # Build lookup for price_index data
-        pi_lookup = {}
-        for pi in self.data.get("price_index", []):
-            key = (pi["check_in_date"], pi["nights"], pi["competitor"])
-            pi_lookup[key] = pi
-
-        # Build lookup for position data
-        pos_lookup = {}
-        for pos in self.data.get("competitive_position", []):
-            key = (pos["check_in_date"], pos["nights"])
-            pos_lookup[key] = pos
-
         # Index columns for conditional formatting
         index_cols = []
         for i, comp in enumerate(self.competitors):
             index_cols.append(5 + i * 2 + 1)  # The "Index" column for each competitor
         avg_index_col = 5 + len(self.competitors) * 2
-        rank_col = avg_index_col + 1
 
         data_start_row = row
-        comparison_data = self.data.get("comparison_data", [])
-
-        for i, cd in enumerate(comparison_data):
-            alt = i % 2 == 1
-            col = 0
-
-            ws.write(row, col, cd["check_in_date"], self._fmt("text", alt)); col += 1
-            ws.write(row, col, cd["day_of_week"], self._fmt("text", alt)); col += 1
-            ws.write(row, col, cd["nights"], self._fmt("int", alt)); col += 1
-            ws.write(row, col, STAY_LABELS.get(cd["stay_type"], cd["stay_type"]), self._fmt("text", alt)); col += 1
-            ws.write(row, col, cd["wb_price"], self._fmt("euro", alt)); col += 1
-
-            indices_this_row = []
-            for comp in self.competitors:
-                comp_data = cd["competitors"].get(comp)
-                if comp_data and comp_data["price"] and comp_data["available"]:
-                    ws.write(row, col, comp_data["price"], self._fmt("euro", alt))
-                    pi_key = (cd["check_in_date"], cd["nights"], comp)
-                    pi = pi_lookup.get(pi_key)
-                    if pi:
-                        ws.write(row, col + 1, pi["price_index"], self._fmt("index", alt))
-                        indices_this_row.append(pi["price_index"])
-                    else:
-                        ws.write(row, col + 1, "-", self._fmt("na", alt))
-                else:
-                    ws.write(row, col, "-", self._fmt("na", alt))
-                    ws.write(row, col + 1, "-", self._fmt("na", alt))
-                col += 2
-
-            # Average index
-            if indices_this_row:
-                ws.write(row, col, sum(indices_this_row) / len(indices_this_row), self._fmt("index", alt))
-            else:
-                ws.write(row, col, "-", self._fmt("na", alt))
-            col += 1
-
-            # WB rank
-            pos = pos_lookup.get((cd["check_in_date"], cd["nights"]))
-            if pos:
-                ws.write(row, col, pos["wb_rank"], self._fmt("int", alt))
-            else:
-                ws.write(row, col, "-", self._fmt("na", alt))
-
-            row += 1
+        data_end_row = row + len(self.data.get("comparison_data", [])) - 1
 
-        data_end_row = row - 1
-
-        # Autofilter
-        if data_end_row >= data_start_row:
-            ws.autofilter(header_row, 0, data_end_row, len(headers) - 1)
-
-        # Conditional formatting on index columns
+        # Conditional formatting on index columns (added before the rows so
+        # the color scales take priority over the batch-mode row styling)
         for ic in index_cols + [avg_index_col]:
             if data_end_row >= data_start_row:
                 ws.conditional_format(data_start_row, ic, data_end_row, ic, {
@@ -469,6 +504,12 @@ class ExcelDashboard:
                     "max_color": CF_RED, "max_type": "num", "max_value": 130,
                 })
 
+        row = self._write_table_rows(ws, row, self._prijsvergelijking_rows(), kinds, col_widths)
+
+        # Autofilter
+        if data_end_row >= data_start_row:
+            ws.autofilter(header_row, 0, data_end_row, len(headers) - 1)
+
         # Freeze panes
         ws.freeze_panes(header_row + 1, 5)
 
@@ -478,6 +519,53 @@ class ExcelDashboard:
         ws.fit_to_pages(1, 0)
         ws.repeat_rows(header_row)
 
+    def _prijsvergelijking_rows(self):
+        """Yield one value tuple per comparison row (Prijsvergelijking)."""
+        # Build lookup for price_index data
+        pi_lookup = {}
+        for pi in self.data.get("price_index", []):
+            key = (pi["check_in_date"], pi["nights"], pi["competitor"])
+            pi_lookup[key] = pi["price_index"]
+
+        # Build lookup for position data
+        pos_lookup = {}
+        for pos in self.data.get("competitive_position", []):
+            key = (pos["check_in_date"], pos["nights"])
+            pos_lookup[key] = pos["wb_rank"]
+
+        for cd in self.data.get("comparison_data", []):
+            check_in, nights = cd["check_in_date"], cd["nights"]
+            values = [
+                check_in,
+                cd["day_of_week"],
+                nights,
+                STAY_LABELS.get(cd["stay_type"], cd["stay_type"]),
+                cd["wb_price"],
+            ]
+
+            indices_this_row = []
+            for comp in self.competitors:
+                comp_data = cd["competitors"].get(comp)
+                if comp_data and comp_data["price"] and comp_data["available"]:
+                    index = pi_lookup.get((check_in, nights, comp))
+                    if index is not None:
+                        indices_this_row.append(index)
+                    values.append(comp_data["price"])
+                    values.append(index if index is not None else "-")
+                else:
+                    values.append("-")
+                    values.append("-")
+
+            # Average index
+            if indices_this_row:
+                values.append(sum(indices_this_row) / len(indices_this_row))
+            else:
+                values.append("-")
+
+            # WB rank
+            values.append(pos_lookup.get((check_in, nights), "-"))
+            yield values
+
     # ── Sheet 3: Concurrenten ──────────────────────────────────────────
 
     def _write_concurrenten(self):
@@ -649,24 +737,29 @@ class ExcelDashboard:
         headers = ["Concurrent", "Check-in", "Vorige datum", "Vorige prijs",
                    "Huidige datum", "Huidige prijs", "Verschil EUR", "Verschil %"]
         widths = [20, 12, 12, 13, 13, 13, 13, 11]
-        self._set_col_widths(ws, widths)
+        kinds = ["text", "text", "text", "euro_eur", "text", "euro_eur", "euro_eur", "pct"]
+        if not self.batch_write:
+            self._set_col_widths(ws, widths)
 
         for c, h in enumerate(headers):
             ws.write(row, c, h, f["header"])
         header_row = row
         row += 1
 
-        for i, ch in enumerate(changes):
-            alt = i % 2 == 1
-            ws.write(row, 0, ch.get("competitor_name", ""), self._fmt("text", alt))
-            ws.write(row, 1, ch.get("check_in_date", ""), self._fmt("text", alt))
-            ws.write(row, 2, ch.get("prev_date", ""), self._fmt("text", alt))
-            ws.write(row, 3, ch.get("prev_price", 0), self._fmt("euro_eur", alt))
-            ws.write(row, 4, ch.get("curr_date", ""), self._fmt("text", alt))
-            ws.write(row, 5, ch.get("curr_price", 0), self._fmt("euro_eur", alt))
-            ws.write(row, 6, ch.get("price_change", 0), self._fmt("euro_eur", alt))
-            ws.write(row, 7, (ch.get("change_pct", 0) or 0) / 100, self._fmt("pct", alt))
-            row += 1
+        change_rows = (
+            (
+                ch.get("competitor_name", ""),
+                ch.get("check_in_date", ""),
+                ch.get("prev_date", ""),
+                ch.get("prev_price", 0),
+                ch.get("curr_date", ""),
+                ch.get("curr_price", 0),
+                ch.get("price_change", 0),
+                (ch.get("change_pct", 0) or 0) / 100,
+            )
+            for ch in changes
+        )
+        row = self._write_table_rows(ws, row, change_rows, kinds, widths)
 
         if changes:
             ws.autofilter(header_row, 0, row - 1, len(headers) - 1)
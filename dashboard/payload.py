@@ -0,0 +1,86 @@
+"""Compact columnar payload for shipping analytics to dashboard workers.
+
+run_analytics() returns a nested dict of row dicts. Pickling that for every
+worker process repeats the same keys per row and carries tables the
+workbook never reads (full availability gaps, per-night details, ...).
+pack() keeps only the fields ExcelDashboard uses and stores each table as
+columns; unpack() rebuilds the row dicts on the worker side.
+"""
+
+# Fields per table that ExcelDashboard reads
+TABLE_FIELDS = {
+    "price_index": ["check_in_date", "nights", "competitor", "price_index", "comp_price"],
+    "competitive_position": ["check_in_date", "nights", "wb_rank"],
+    "price_per_night": ["wb_ppn"],
+    "recommendations": ["check_in_date", "nights", "type", "urgentie", "huidig_prijs",
+                        "voorgesteld_prijs", "reden", "extra_omzet"],
+}
+COMPARISON_FIELDS = ["check_in_date", "day_of_week", "nights", "stay_type", "wb_price"]
+CHANGE_FIELDS = ["competitor_name", "check_in_date", "prev_date", "prev_price",
+                 "curr_date", "curr_price", "price_change", "change_pct"]
+
+
+def _to_columns(rows: list[dict], fields: list[str]) -> dict:
+    return {field: [row.get(field) for row in rows] for field in fields}
+
+
+def _from_columns(columns: dict) -> list[dict]:
+    fields = list(columns)
+    if not fields:
+        return []
+    return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+
+def pack(result: dict) -> dict:
+    """Reduce an analytics result to a columnar payload for one workbook."""
+    payload = {
+        "metadata": result.get("metadata", {}),
+        "tables": {
+            name: _to_columns(result.get(name, []), fields)
+            for name, fields in TABLE_FIELDS.items()
+        },
+        "gaps_summary": result.get("availability_gaps", {}).get("summary", {}),
+        "seasonal_patterns": {
+            key: result.get("seasonal_patterns", {}).get(key, {})
+            for key in ("by_month", "by_stay_type")
+        },
+    }
+
+    comparison = result.get("comparison_data", [])
+    payload["comparison"] = _to_columns(comparison, COMPARISON_FIELDS)
+    payload["comparison"]["competitors"] = [
+        tuple((comp, info.get("price"), info.get("available"))
+              for comp, info in row.get("competitors", {}).items())
+        for row in comparison
+    ]
+
+    changes = result.get("price_changes", {})
+    payload["price_changes"] = {
+        key: changes[key] for key in ("status", "message", "scrape_dates") if key in changes
+    }
+    payload["price_changes"]["changes"] = _to_columns(changes.get("changes", []), CHANGE_FIELDS)
+    return payload
+
+
+def unpack(payload: dict) -> dict:
+    """Rebuild the analytics dict shape ExcelDashboard expects."""
+    result = {"metadata": payload["metadata"]}
+    for name, columns in payload["tables"].items():
+        result[name] = _from_columns(columns)
+    result["availability_gaps"] = {"summary": payload["gaps_summary"]}
+    result["seasonal_patterns"] = payload["seasonal_patterns"]
+
+    comparison = dict(payload["comparison"])
+    competitors = comparison.pop("competitors")
+    rows = _from_columns(comparison)
+    for row, comps in zip(rows, competitors):
+        row["competitors"] = {
+            comp: {"price": price, "available": available}
+            for comp, price, available in comps
+        }
+    result["comparison_data"] = rows
+
+    changes = dict(payload["price_changes"])
+    changes["changes"] = _from_columns(changes["changes"])
+    result["price_changes"] = changes
+    return result
@@ -1,11 +1,99 @@
 """Database module for storing competitor price data."""
 
+import json
 import sqlite3
 import os
+import statistics
+import sys
 from datetime import datetime
 from pathlib import Path
 
 
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class PriceRecord:
+    """One scraped price: slotted, with interned name/type/segment strings.
+
+    Scrapers emit these instead of 10-key dicts; Database.save_record and
+    save_prices_batch consume them directly. Read access is dict-compatible
+    (``record["price"]``, ``record.get(...)``, ``**record``) for callers
+    that still treat records as mappings.
+    """
+
+    __slots__ = (
+        "competitor_name", "accommodation_type", "check_in_date", "check_out_date",
+        "price", "available", "min_nights", "special_offers", "persons",
+        "segment", "surcharges",
+    )
+
+    def __init__(self, competitor_name: str, accommodation_type: str,
+                 check_in_date: str, check_out_date: str, price: float | None,
+                 available: bool = True, min_nights: int = None,
+                 special_offers: str = None, persons: int = 4,
+                 segment: str = "accommodatie", surcharges: str = None):
+        self.competitor_name = _intern(competitor_name)
+        self.accommodation_type = _intern(accommodation_type)
+        self.check_in_date = check_in_date
+        self.check_out_date = check_out_date
+        self.price = price
+        self.available = available
+        self.min_nights = min_nights
+        self.special_offers = special_offers
+        self.persons = persons
+        self.segment = _intern(segment)
+        self.surcharges = surcharges
+
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def as_dict(self) -> dict:
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PriceRecord):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"PriceRecord({self.competitor_name!r}, {self.check_in_date}->{self.check_out_date}, "
+            f"{self.price}, available={self.available}, segment={self.segment!r})"
+        )
+
+    def as_row(self, now: datetime) -> tuple:
+        """Parameters for the prices upsert."""
+        return (
+            self.competitor_name, self.accommodation_type, self.check_in_date,
+            self.check_out_date, self.price, int(self.available), self.min_nights,
+            self.special_offers, self.persons, now.isoformat(), now.strftime("%Y-%m-%d"),
+            self.segment, self.surcharges
+        )
+
+
 class Database:
     """SQLite database for competitor price storage and retrieval."""
 
@@ -81,6 +169,12 @@ class Database:
         if "segment" not in log_columns:
             conn.execute("ALTER TABLE scrape_log ADD COLUMN segment TEXT DEFAULT 'accommodatie'")
             conn.commit()
+        if "scraper_key" not in log_columns:
+            conn.execute("ALTER TABLE scrape_log ADD COLUMN scraper_key TEXT")
+            conn.commit()
+        if "resumed" not in log_columns:
+            conn.execute("ALTER TABLE scrape_log ADD COLUMN resumed INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
 
     def _get_conn(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, timeout=30)
@@ -127,8 +221,42 @@ class Database:
                     records_scraped INTEGER DEFAULT 0,
                     error_message TEXT,
                     duration_seconds REAL,
-                    segment TEXT DEFAULT 'accommodatie'
+                    segment TEXT DEFAULT 'accommodatie',
+                    scraper_key TEXT,
+                    resumed INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+                    scraper TEXT NOT NULL,
+                    scrape_date TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    payload TEXT,
+                    completed_at TEXT NOT NULL,
+                    PRIMARY KEY (scraper, scrape_date, unit)
+                );
+
+                CREATE TABLE IF NOT EXISTS scrape_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scraper_key TEXT,
+                    competitor_name TEXT NOT NULL,
+                    segment TEXT,
+                    timestamp TEXT NOT NULL,
+                    status TEXT,
+                    duration_seconds REAL,
+                    records INTEGER,
+                    requests INTEGER,
+                    http_errors INTEGER,
+                    bytes INTEGER,
+                    latency_p50 REAL,
+                    latency_p95 REAL,
+                    latency_max REAL,
+                    sleep_seconds REAL,
+                    parse_seconds REAL,
+                    db_seconds REAL
                 );
+
+                CREATE INDEX IF NOT EXISTS idx_scrape_metrics_timestamp
+                    ON scrape_metrics(timestamp);
             """)
             conn.commit()
             # Migrate existing databases: add segment column if missing
@@ -148,10 +276,31 @@ class Database:
                    special_offers: str = None, persons: int = 4,
                    segment: str = "accommodatie", surcharges: str = None):
         """Save a single price record. Updates if same competitor+dates+scrape_date+segment exists."""
+        self.save_record(PriceRecord(
+            competitor_name, accommodation_type, check_in_date, check_out_date, price,
+            available=available, min_nights=min_nights, special_offers=special_offers,
+            persons=persons, segment=segment, surcharges=surcharges,
+        ))
+
+    def save_record(self, record: PriceRecord):
+        """Save one PriceRecord (same upsert as save_price)."""
+        self.save_prices_batch([record])
+
+    def save_prices_batch(self, records: list):
+        """Save multiple price records at once (one transaction, same upsert as save_price).
+
+        Accepts PriceRecords and, for older callers, save_price-style dicts.
+        """
+        if not records:
+            return
         now = datetime.now()
+        rows = [
+            (r if isinstance(r, PriceRecord) else PriceRecord(**r)).as_row(now)
+            for r in records
+        ]
         conn = self._get_conn()
         try:
-            conn.execute("""
+            conn.executemany("""
                 INSERT INTO prices (
                     competitor_name, accommodation_type, check_in_date,
                     check_out_date, price, available, min_nights,
@@ -168,40 +317,140 @@ class Database:
                     persons = excluded.persons,
                     scrape_timestamp = excluded.scrape_timestamp,
                     surcharges = excluded.surcharges
-            """, (
-                competitor_name, accommodation_type, check_in_date,
-                check_out_date, price, int(available), min_nights,
-                special_offers, persons, now.isoformat(), now.strftime("%Y-%m-%d"),
-                segment, surcharges
-            ))
+            """, rows)
             conn.commit()
         finally:
             conn.close()
 
-    def save_prices_batch(self, records: list[dict]):
-        """Save multiple price records at once."""
-        for record in records:
-            self.save_price(**record)
-
     def log_scrape(self, competitor_name: str, status: str,
                    records_scraped: int = 0, error_message: str = None,
-                   duration_seconds: float = None, segment: str = "accommodatie"):
-        """Log a scrape attempt."""
+                   duration_seconds: float = None, segment: str = "accommodatie",
+                   scraper_key: str = None, resumed: bool = False):
+        """Log a scrape attempt.
+
+        ``resumed``: the run continued from today's checkpoints, so its
+        records and duration cover only the units that were left.
+        """
         conn = self._get_conn()
         try:
             conn.execute("""
                 INSERT INTO scrape_log (
                     competitor_name, timestamp, status,
-                    records_scraped, error_message, duration_seconds, segment
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    records_scraped, error_message, duration_seconds, segment,
+                    scraper_key, resumed
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 competitor_name, datetime.now().isoformat(), status,
-                records_scraped, error_message, duration_seconds, segment
+                records_scraped, error_message, duration_seconds, segment,
+                scraper_key, int(resumed)
             ))
             conn.commit()
         finally:
             conn.close()
 
+    def save_scrape_metrics(self, competitor_name: str, scraper_key: str = None,
+                            segment: str = None, status: str = None,
+                            duration_seconds: float = None, records: int = None,
+                            requests: int = 0, http_errors: int = 0, bytes: int = 0,
+                            latency_p50: float = None, latency_p95: float = None,
+                            latency_max: float = None, sleep_seconds: float = 0.0,
+                            parse_seconds: float = 0.0, db_seconds: float = 0.0):
+        """Store the performance telemetry of one scraper run (scrapers/telemetry.py)."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO scrape_metrics (
+                    scraper_key, competitor_name, segment, timestamp, status,
+                    duration_seconds, records, requests, http_errors, bytes,
+                    latency_p50, latency_p95, latency_max,
+                    sleep_seconds, parse_seconds, db_seconds
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                scraper_key, competitor_name, segment, datetime.now().isoformat(), status,
+                duration_seconds, records, requests, http_errors, bytes,
+                latency_p50, latency_p95, latency_max,
+                sleep_seconds, parse_seconds, db_seconds,
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def save_checkpoint(self, scraper: str, unit: str, payload=None,
+                        scrape_date: str = None):
+        """Mark one unit of work (arrival date, grid cursor, ...) as completed.
+
+        ``payload`` is stored as JSON so a resumed scrape can reuse what the
+        unit produced without re-requesting it.
+        """
+        now = datetime.now()
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO scrape_checkpoints (
+                    scraper, scrape_date, unit, payload, completed_at
+                ) VALUES (?, ?, ?, ?, ?)
+            """, (
+                scraper, scrape_date or now.strftime("%Y-%m-%d"), unit,
+                json.dumps(payload) if payload is not None else None,
+                now.isoformat(),
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def save_checkpoints(self, scraper: str, units: list[str], scrape_date: str = None):
+        """Mark several units completed in one transaction (no payload)."""
+        if not units:
+            return
+        now = datetime.now()
+        date = scrape_date or now.strftime("%Y-%m-%d")
+        conn = self._get_conn()
+        try:
+            conn.executemany("""
+                INSERT OR REPLACE INTO scrape_checkpoints (
+                    scraper, scrape_date, unit, payload, completed_at
+                ) VALUES (?, ?, ?, NULL, ?)
+            """, [(scraper, date, unit, now.isoformat()) for unit in units])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_checkpoints(self, scraper: str, scrape_date: str = None) -> dict:
+        """Completed units for a scraper on a scrape date (default: today).
+
+        Returns {unit: payload} with the JSON payload decoded (None if absent).
+        """
+        conn = self._get_conn()
+        try:
+            rows = conn.execute("""
+                SELECT unit, payload FROM scrape_checkpoints
+                WHERE scraper = ? AND scrape_date = ?
+            """, (scraper, scrape_date or datetime.now().strftime("%Y-%m-%d"))).fetchall()
+            return {
+                row["unit"]: json.loads(row["payload"]) if row["payload"] is not None else None
+                for row in rows
+            }
+        finally:
+            conn.close()
+
+    def clear_checkpoints(self, scraper: str = None, before_date: str = None) -> int:
+        """Delete checkpoints (all, per scraper and/or older than a scrape date)."""
+        query = "DELETE FROM scrape_checkpoints WHERE 1=1"
+        params = []
+        if scraper:
+            query += " AND scraper = ?"
+            params.append(scraper)
+        if before_date:
+            query += " AND scrape_date < ?"
+            params.append(before_date)
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
     def get_prices(self, competitor_name: str = None,
                    check_in_from: str = None, check_in_to: str = None,
                    scrape_date: str = None) -> list[dict]:
@@ -231,6 +480,53 @@ class Database:
         finally:
             conn.close()
 
+    PRICE_COLUMNS = (
+        "id", "competitor_name", "accommodation_type", "check_in_date",
+        "check_out_date", "price", "available", "min_nights", "special_offers",
+        "persons", "scrape_timestamp", "scrape_date", "segment", "surcharges",
+    )
+
+    def iter_prices(self, scrape_date_from: str = None, scrape_date_to: str = None,
+                    competitors: list[str] = None, segments: list[str] = None,
+                    columns: list[str] = None, batch_size: int = 5000):
+        """Stream raw price rows as dicts straight from the cursor.
+
+        Rows are fetched in batches of ``batch_size`` so a full history can be
+        exported in bounded memory. Ordered by scrape_date, competitor, check-in.
+        """
+        columns = list(columns or self.PRICE_COLUMNS)
+        unknown = [c for c in columns if c not in self.PRICE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown price column(s): {', '.join(unknown)}")
+
+        query = f"SELECT {', '.join(columns)} FROM prices WHERE 1=1"
+        params = []
+        if scrape_date_from:
+            query += " AND scrape_date >= ?"
+            params.append(scrape_date_from)
+        if scrape_date_to:
+            query += " AND scrape_date <= ?"
+            params.append(scrape_date_to)
+        if competitors:
+            query += f" AND competitor_name IN ({','.join('?' * len(competitors))})"
+            params.extend(competitors)
+        if segments:
+            query += f" AND segment IN ({','.join('?' * len(segments))})"
+            params.extend(segments)
+        query += " ORDER BY scrape_date, competitor_name, check_in_date, check_out_date"
+
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            conn.close()
+
     def get_latest_prices(self, competitor_name: str = None) -> list[dict]:
         """Get the most recent prices for each competitor and date combination."""
         query = """
@@ -363,6 +659,51 @@ class Database:
         finally:
             conn.close()
 
+    def get_scraper_durations(self, days: int = 30) -> dict:
+        """Median duration (seconds) per scraper key over the last N days.
+
+        Only successful/partial runs with a scraper_key count; resumed runs
+        (partial work after a checkpointed abort) would pull the median
+        down and are skipped. Used by the scrape planner to order and split
+        domain groups.
+        """
+        conn = self._get_conn()
+        try:
+            rows = conn.execute("""
+                SELECT scraper_key, duration_seconds
+                FROM scrape_log
+                WHERE scraper_key IS NOT NULL
+                  AND duration_seconds IS NOT NULL
+                  AND status IN ('success', 'partial')
+                  AND NOT resumed
+                  AND timestamp >= datetime('now', ? || ' days')
+            """, (f"-{days}",)).fetchall()
+        finally:
+            conn.close()
+
+        per_key = {}
+        for row in rows:
+            per_key.setdefault(row["scraper_key"], []).append(row["duration_seconds"])
+        return {key: statistics.median(values) for key, values in per_key.items()}
+
+    def get_scrape_metrics(self, days: int = 30, scraper_key: str = None) -> list[dict]:
+        """Telemetry rows of the last N days, oldest first."""
+        query = """
+            SELECT * FROM scrape_metrics
+            WHERE timestamp >= datetime('now', ? || ' days')
+        """
+        params = [f"-{days}"]
+        if scraper_key:
+            query += " AND scraper_key = ?"
+            params.append(scraper_key)
+        query += " ORDER BY timestamp"
+
+        conn = self._get_conn()
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
     def get_scrape_summary(self, date: str = None) -> dict:
         """Get scrape summary for a given date (default: today).
 
@@ -13,6 +13,7 @@ Usage:
     python run_daily.py                  # Volledige run
     python run_daily.py --dry-run        # Test zonder scraping
     python run_daily.py --skip-scrape    # Alleen analytics + dashboard
+    python run_daily.py --trace          # Plus Chrome-trace in logs/traces/
     python run_daily.py --config alt.yaml
 """
 
@@ -21,34 +22,31 @@ import logging
 import os
 import subprocess
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
 
 import yaml
 
+import tracing
 from database import Database
 from run_scraper import get_scraper_map, setup_logging, load_config
-
-
-# Domain groups: scrapers hitting the same domain run sequentially,
-# different groups run in parallel to avoid rate-limiting conflicts.
-DOMAIN_GROUPS = {
-    "api_centerparcs": ["centerparcs_sandur"],
-    "api_molecaten": ["molecaten_bosven", "molecaten_camping"],
-    "api_ommerland": ["camping_ommerland", "ommerland_camping", "ommerland_psanitair"],
-    "api_maurik": ["eiland_van_maurik", "maurik_camping"],
-    "be_beerzebulten": ["beerze_bulten", "bb_camping", "bb_psanitair"],
-    "be_boshoek": ["de_boshoek"],
-    "be_witteberg": ["de_witte_berg"],
-    "be_zandstuve": ["zandstuve_boslodge", "zandstuve_camping", "zandstuve_psanitair"],
-    "tomm_witterzomer": ["witter_zomer"],
-    "capfun": ["stoetenslagh_camping", "stoetenslagh_acc", "sprookjes_camping",
-               "fruithof_camping", "fruithof_acc"],
-    "api_landal": ["landal_aelderholt", "landal_aelderholt_premium", "landal_bartje"],
-    "api_kleinewolf": ["kleinewolf_camping", "kleinewolf_acc"],
-    "rcn": ["rcn_mercurius", "rcn_luna", "rcn_camping"],
-    "westerbergen": ["westerbergen", "westerbergen_camping", "westerbergen_psanitair"],
+from scheduler.task_graph import SKIPPED, TaskGraph
+from scrapers import credential_cache, pipeline, progress_log, rate_control
+from scrapers.orchestrator import (
+    GroupSlots, Progress, format_summary, run_group, run_scraper_job, scrape_params,
+)
+from scrapers.planner import browser_slots, plan_groups, uses_browser
+from scrapers.registry import domain_groups
+
+
+SEGMENT_LABELS = {
+    "accommodatie": "Accommodaties",
+    "kampeerplaats": "Kampeerplaatsen",
+    "prive_sanitair": "Privé sanitair",
 }
 
 
@@ -58,11 +56,34 @@ EXIT_FATAL = 2
 
 
 def run_pipeline(config: dict, dry_run: bool = False,
-                 skip_scrape: bool = False) -> int:
+                 skip_scrape: bool = False, trace: bool = None) -> int:
     """Run the full daily pipeline.
 
+    With ``trace`` (default: ``general.trace`` in config) every phase,
+    domain group, scraper, request, KPI function and sheet is recorded as a
+    span and written as a Chrome trace to ``general.trace_dir``.
+
     Returns exit code (0=success, 1=partial, 2=fatal).
     """
+    general = config.get("general", {})
+    if trace is None:
+        trace = general.get("trace", False)
+    if not trace:
+        return _run_pipeline(config, dry_run, skip_scrape)
+
+    tracing.start()
+    try:
+        mode = "dry-run" if dry_run else "skip-scrape" if skip_scrape else "volledig"
+        with tracing.span("run_daily", cat="pipeline", mode=mode) as span_args:
+            exit_code = _run_pipeline(config, dry_run, skip_scrape)
+            span_args["exit_code"] = exit_code
+        return exit_code
+    finally:
+        path = tracing.stop(general.get("trace_dir", "logs/traces"))
+        logging.getLogger("daily").info(f"Trace: {path} (open in https://ui.perfetto.dev)")
+
+
+def _run_pipeline(config: dict, dry_run: bool, skip_scrape: bool) -> int:
     logger = logging.getLogger("daily")
     start_time = time.time()
     today = datetime.now().strftime("%Y-%m-%d")
@@ -71,135 +92,91 @@ def run_pipeline(config: dict, dry_run: bool = False,
     db_path = config.get("general", {}).get("database_path", "data/concurrentiecheck.db")
     db = Database(db_path)
 
-    # --- Phase 1: Scraping ---
+    # --- Taakgraaf: scraping → retries → analytics → dashboard per segment ---
+    # Elk segment start zodra de scrapers die dát segment voeden klaar zijn
+    # (inclusief hun retries); andere domeingroepen kunnen dan nog lopen.
     scrape_results = {}
-    failed_scrapers = []
+    analytics_results = {}
+    segment_paths = {}
+
+    automation = config.get("automation", {})
+    generate_analytics = automation.get("generate_analytics", True)
+    should_generate_dashboard = automation.get("generate_dashboard", True)
+    competitors_cfg = config.get("competitors", {})
+
+    graph = TaskGraph()
+    segment_deps = defaultdict(list)  # segment (None = alle) -> laatste node per groep
+    n_scrape_nodes = 0  # one graph thread per group; GroupSlots limits the scraping
 
     if skip_scrape:
         logger.info("Scraping overgeslagen (--skip-scrape)")
+        segments = db.get_available_segments(None)
     elif dry_run:
         logger.info("Dry-run modus: scraping wordt gesimuleerd")
+        # Alleen de keys: de (lazy) scraper map bouwt geen scrapers in dry-run
         scrapers = get_scraper_map(db, headless=True)
-        enabled = config.get("competitors", {})
-        for key, scraper in scrapers.items():
-            if key == "westerbergen" or enabled.get(key, {}).get("enabled", True):
+        for key in scrapers:
+            if key == "westerbergen" or competitors_cfg.get(key, {}).get("enabled", True):
                 scrape_results[key] = {
                     "status": "dry-run",
                     "records": 0,
                     "duration": 0,
                 }
-                logger.info(f"  [DRY-RUN] {scraper.competitor_name}: overgeslagen")
+                name = competitors_cfg.get(key, {}).get("name", key)
+                logger.info(f"  [DRY-RUN] {name}: overgeslagen")
+        segments = db.get_available_segments(today)
     else:
         headless = config.get("scraping", {}).get("headless", True)
         persons = config.get("scraping", {}).get("default_persons", 4)
         scrapers = get_scraper_map(db, headless=headless)
-        enabled = config.get("competitors", {})
-        automation = config.get("automation", {})
         retry_failed = automation.get("retry_failed", True)
         max_retries = automation.get("max_retry_attempts", 1)
 
-        # Determine which scrapers to run (enabled + westerbergen)
-        to_run = {}
-        for key, scraper in scrapers.items():
-            if key == "westerbergen":
-                to_run[key] = scraper
-            elif enabled.get(key, {}).get("enabled", True):
-                to_run[key] = scraper
+        # Determine which scrapers to run (enabled + westerbergen); scrapers
+        # are only built when their group starts
+        to_run = [
+            key for key in scrapers
+            if key == "westerbergen" or competitors_cfg.get(key, {}).get("enabled", True)
+        ]
+
+        logger.info(f"Scrapers te draaien: {', '.join(to_run)}")
 
-        logger.info(f"Scrapers te draaien: {', '.join(to_run.keys())}")
+        # Checkpoints van eerdere dagen zijn niet meer bruikbaar
+        removed = db.clear_checkpoints(before_date=today)
+        if removed:
+            logger.info(f"  {removed} oude checkpoints opgeruimd")
+
+        # Adaptive rate control: fresh per-host controllers for this run
+        rate_control.configure(**(config.get("scraping", {}).get("rate_control") or {}))
+        credential_cache.configure(**(config.get("scraping", {}).get("credential_cache") or {}))
+        pipeline.configure(**(config.get("scraping", {}).get("pipeline") or {}))
+        progress_log.configure(**(config.get("scraping", {}).get("progress") or {}))
+        rate_control.reset()
 
         # Scrape 12 months ahead
-        days_ahead = 365
-        months_ahead = 12
-        target_end_date = (datetime.now() + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
-        max_pages = days_ahead // 3 + 10  # ~130 pages for BookingExperts
-
-        def _run_scraper(key, scraper):
-            """Run a single scraper and return result dict."""
-            scraper_logger = logging.getLogger("daily")
-            scraper_logger.info(f"\n--- Scraping: {scraper.competitor_name} ({key}) ---")
-            t0 = time.time()
-            try:
-                results = scraper.run_efficient(
-                    max_pages=max_pages,
-                    months_ahead=months_ahead,
-                    target_end_date=target_end_date,
-                    persons=persons,
-                )
-                available = [r for r in results if r.get("available") and r.get("price")]
-                dur = time.time() - t0
-                result = {
-                    "status": "success",
-                    "records": len(results),
-                    "available": len(available),
-                    "duration": dur,
-                }
-                scraper_logger.info(
-                    f"  OK: {key} - {len(results)} records "
-                    f"({len(available)} beschikbaar), {dur:.1f}s"
-                )
-                return key, result
-            except Exception as e:
-                dur = time.time() - t0
-                result = {
-                    "status": "failed",
-                    "records": 0,
-                    "available": 0,
-                    "duration": dur,
-                    "error": str(e),
-                }
-                scraper_logger.error(f"  MISLUKT: {key} - {e}", exc_info=True)
-                return key, result
+        params = scrape_params(days_ahead=365, persons=persons)
+        names = {key: competitors_cfg.get(key, {}).get("name", key) for key in to_run}
+        progress = Progress(len(to_run))
+        runner = None
+        if config.get("scraping", {}).get("isolation", False):
+            from scrapers.isolation import IsolatedRunner
+            runner = IsolatedRunner(
+                db, headless=headless,
+                deadline=config.get("scraping", {}).get("scraper_deadline_seconds"),
+            )
+            logger.info(f"Proces-isolatie aan (deadline {runner.deadline}s per scraper)")
 
-        def _run_domain_group(group_name, scraper_keys):
+        def _run_domain_group(group_name, scraper_keys, browser):
             """Run scrapers in a domain group sequentially, return results."""
-            results = []
-            for key in scraper_keys:
-                if key in to_run:
-                    results.append(_run_scraper(key, to_run[key]))
-            return results
-
-        # Build domain groups from enabled scrapers
-        active_groups = {}
-        assigned_keys = set()
-        for group_name, keys in DOMAIN_GROUPS.items():
-            active_keys = [k for k in keys if k in to_run]
-            if active_keys:
-                active_groups[group_name] = active_keys
-                assigned_keys.update(active_keys)
-
-        # Any scrapers not in a domain group run as their own group
-        for key in to_run:
-            if key not in assigned_keys:
-                active_groups[f"_ungrouped_{key}"] = [key]
-
-        logger.info(
-            f"Parallel uitvoering: {len(active_groups)} domeingroepen, "
-            f"{len(to_run)} scrapers totaal"
-        )
-        for gname, gkeys in active_groups.items():
-            logger.info(f"  {gname}: {', '.join(gkeys)}")
-
-        # Run domain groups in parallel (max 6 concurrent to limit resources)
-        max_workers = min(10, len(active_groups))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(_run_domain_group, gname, gkeys): gname
-                for gname, gkeys in active_groups.items()
-            }
-            for future in as_completed(futures):
-                group_name = futures[future]
+            with scrape_slots.acquire(browser=browser):
                 try:
-                    group_results = future.result()
-                    for key, result in group_results:
-                        scrape_results[key] = result
-                        if result["status"] == "failed":
-                            failed_scrapers.append(key)
+                    return run_group(group_name, scraper_keys, scrapers, params,
+                                     scrape_results, names, progress, runner)
                 except Exception as e:
                     logger.error(f"  Groep {group_name} crash: {e}", exc_info=True)
-                    # Mark all scrapers in this group as failed
-                    for key in active_groups[group_name]:
-                        if key in to_run:
+                    # Mark the remaining scrapers in this group as failed
+                    for key in scraper_keys:
+                        if key not in scrape_results:
                             scrape_results[key] = {
                                 "status": "failed",
                                 "records": 0,
@@ -207,79 +184,145 @@ def run_pipeline(config: dict, dry_run: bool = False,
                                 "duration": 0,
                                 "error": str(e),
                             }
-                            failed_scrapers.append(key)
-
-        # Retry failed scrapers (sequentially)
-        if failed_scrapers and retry_failed:
-            for attempt in range(1, max_retries + 1):
-                retry_list = list(failed_scrapers)
-                failed_scrapers.clear()
-                logger.info(f"\n--- Retry poging {attempt} voor {len(retry_list)} scrapers ---")
-
-                for key in retry_list:
-                    scraper = to_run[key]
-                    logger.info(f"  Retry: {scraper.competitor_name}")
-                    rkey, result = _run_scraper(key, scraper)
-                    scrape_results[rkey] = result
-                    if result["status"] == "failed":
-                        failed_scrapers.append(key)
-
-    # --- Phase 2 & 3: Analytics + Excel Dashboard per segment ---
-    analytics_result = None  # Will hold the 'accommodatie' result for backwards compat
-    analytics_results = {}   # All segments
-    excel_paths = []
-
-    generate_analytics = config.get("automation", {}).get("generate_analytics", True)
-    should_generate_dashboard = config.get("automation", {}).get("generate_dashboard", True)
-
-    SEGMENT_LABELS = {
-        "accommodatie": "Accommodaties",
-        "kampeerplaats": "Kampeerplaatsen",
-        "prive_sanitair": "Privé sanitair",
-    }
+                    raise
+
+        def _retry_scraper(key, attempt):
+            """Retry-node: draai de scraper opnieuw als hij (nog) mislukt is."""
+            if scrape_results.get(key, {}).get("status") != "failed":
+                return SKIPPED
+            with scrape_slots.acquire(browser=uses_browser([key])):
+                logger.info(f"\n--- Retry poging {attempt}: {names[key]} ---")
+                if runner:
+                    result = runner.run_group(f"retry:{key}", [key], params,
+                                              scrape_results, names)[key]
+                else:
+                    result = run_scraper_job(key, scrapers, params, name=names[key])
+                    scrape_results[key] = result
+            return result
+
+        # Domain groups from the scraper registry; scrapers hitting the same
+        # domain run sequentially, different groups run in parallel. Groups
+        # are planned longest-first from recent scrape_log durations.
+        scraping_cfg = config.get("scraping", {})
+        plan = plan_groups(domain_groups(to_run), db.get_scraper_durations())
+
+        # Max `scraping.jobs` (default 10) domain groups scraping at once to
+        # limit resources, browser groups additionally capped by CPU/RAM;
+        # retries are chained after their own group so one domain is never
+        # hit twice concurrently.
+        n_scrape_slots = max(1, min(scraping_cfg.get("jobs") or 10, len(plan)))
+        n_browser_slots = browser_slots(scraping_cfg.get("browser_jobs"))
+        scrape_slots = GroupSlots(n_scrape_slots, n_browser_slots)
+        n_scrape_nodes = len(plan)
+
+        logger.info(
+            f"Parallel uitvoering: {len(plan)} domeingroepen, "
+            f"{len(to_run)} scrapers totaal, {n_scrape_slots} tegelijk "
+            f"(max {n_browser_slots} met browser)"
+        )
+        for gname, group in plan.items():
+            logger.info(f"  {gname:20s} ~{group['cost']:6.0f}s  {', '.join(group['keys'])}")
+
+        for gname, group in plan.items():
+            gkeys = group["keys"]
+            last = graph.add(f"scrape:{gname}",
+                             partial(_run_domain_group, gname, gkeys, group["browser"]))
+            if retry_failed:
+                for attempt in range(1, max_retries + 1):
+                    for key in gkeys:
+                        last = graph.add(f"retry:{key}:{attempt}",
+                                         partial(_retry_scraper, key, attempt), deps=[last])
+            for key in gkeys:
+                segment_deps[competitors_cfg.get(key, {}).get("segment")].append(last)
+
+        segments = sorted(
+            {seg for seg in segment_deps if seg},
+            key=lambda s: (list(SEGMENT_LABELS).index(s) if s in SEGMENT_LABELS else 99, s),
+        )
+
+    tracing.add_span("voorbereiding", start_time, time.time() - start_time, cat="phase")
+
+    if not segments:
+        segments = ["accommodatie"]
 
     if generate_analytics or should_generate_dashboard:
         from analytics import run_analytics
-        from dashboard import generate_dashboard
+        from dashboard import submit_dashboard, cleanup_dashboards
 
-        # Determine which segments have data
-        segments = db.get_available_segments(today if not skip_scrape else None)
-        if not segments:
-            segments = ["accommodatie"]
+        dashboard_config = config.get("dashboard", {})
+        # Analytics print een rapport naar de console; één segment tegelijk
+        # zodat de rapporten niet door elkaar lopen (de berekening is toch
+        # CPU-gebonden onder de GIL).
+        analytics_lock = threading.Lock()
 
-        for segment in segments:
+        def _run_segment_analytics(segment):
             label = SEGMENT_LABELS.get(segment, segment)
-            logger.info(f"\n--- Analytics: {label} ---")
-            try:
+            with analytics_lock:
+                logger.info(f"\n--- Analytics: {label} ---")
                 seg_result = run_analytics(
                     db_path=db_path,
                     scrape_date=today if not skip_scrape else None,
                     segment=segment,
                     print_to_console=True,
                 )
-                analytics_results[segment] = seg_result
-                comparison_count = seg_result.get("metadata", {}).get("comparison_count", 0)
-                rec_count = len(seg_result.get("recommendations", []))
-                logger.info(f"  {comparison_count} vergelijkingen, {rec_count} prijsadviezen")
-
-                # Generate Excel dashboard for this segment
-                if should_generate_dashboard and comparison_count > 0:
-                    try:
-                        dashboard_config = config.get("dashboard", {})
-                        excel_path = generate_dashboard(
-                            analytics_result=seg_result,
-                            config=dashboard_config,
-                        )
-                        excel_paths.append(excel_path)
-                        logger.info(f"  Dashboard: {excel_path}")
-                    except Exception as e:
-                        logger.error(f"  Dashboard generatie mislukt: {e}", exc_info=True)
+            analytics_results[segment] = seg_result
+            comparison_count = seg_result.get("metadata", {}).get("comparison_count", 0)
+            rec_count = len(seg_result.get("recommendations", []))
+            logger.info(f"  [{label}] {comparison_count} vergelijkingen, {rec_count} prijsadviezen")
+            return comparison_count
+
+        # Excel via worker-processen (xlsxwriter is CPU-gebonden). De pool
+        # start pas bij het eerste dashboard: zonder dashboards geen workers.
+        dashboard_pool = None
+        pool_lock = threading.Lock()
+
+        def _dashboard_pool():
+            nonlocal dashboard_pool
+            with pool_lock:
+                if dashboard_pool is None:
+                    workers = dashboard_config.get("workers") or min(len(segments), os.cpu_count() or 1)
+                    dashboard_pool = ProcessPoolExecutor(max_workers=workers)
+                return dashboard_pool
+
+        def _render_segment(segment):
+            seg_result = analytics_results.get(segment, {})
+            if seg_result.get("metadata", {}).get("comparison_count", 0) == 0:
+                return SKIPPED
+            path = submit_dashboard(_dashboard_pool(), seg_result, dashboard_config).result()
+            segment_paths[segment] = path
+            logger.info(f"  [{SEGMENT_LABELS.get(segment, segment)}] Dashboard: {path}")
+            return path
 
-            except Exception as e:
-                logger.error(f"  Analytics mislukt voor {label}: {e}", exc_info=True)
-
-        # Keep accommodatie result as primary for backwards compat (email etc)
-        analytics_result = analytics_results.get("accommodatie")
+        for segment in segments:
+            deps = list(dict.fromkeys(segment_deps.get(segment, []) + segment_deps.get(None, [])))
+            node = graph.add(f"analytics:{segment}", partial(_run_segment_analytics, segment), deps=deps)
+            if should_generate_dashboard:
+                graph.add(f"dashboard:{segment}", partial(_render_segment, segment),
+                          deps=[node], require_success=True)
+
+        graph.max_workers = max(1, n_scrape_nodes + 2 * len(segments))
+        with tracing.span("taakgraaf", cat="phase", nodes=len(graph.nodes)):
+            try:
+                graph.run()
+            finally:
+                if dashboard_pool is not None:
+                    dashboard_pool.shutdown()
+        if segment_paths:
+            cleanup_dashboards(dashboard_config)
+    else:
+        graph.max_workers = max(1, n_scrape_nodes)
+        with tracing.span("taakgraaf", cat="phase", nodes=len(graph.nodes)):
+            graph.run()
+
+    for name, node in graph.nodes.items():
+        if name.startswith("dashboard:") and node["status"] == "failed":
+            logger.error(f"  Dashboard generatie mislukt ({name}): {node['error']}")
+        elif name.startswith("analytics:") and node["status"] == "failed":
+            logger.error(f"  Analytics mislukt ({name}): {node['error']}")
+
+    excel_paths = [segment_paths[s] for s in segments if s in segment_paths]
+    # Keep accommodatie result as primary for backwards compat (email etc)
+    analytics_result = analytics_results.get("accommodatie")
     excel_path = excel_paths[0] if excel_paths else None
 
     # --- Phase 4: Git auto-push (voor Streamlit Cloud) ---
@@ -287,33 +330,34 @@ def run_pipeline(config: dict, dry_run: bool = False,
     git_auto_push = config.get("automation", {}).get("git_auto_push", False)
     if git_auto_push and not dry_run and total_records > 0:
         logger.info("\n--- Database pushen naar GitHub ---")
-        try:
-            project_dir = os.path.dirname(os.path.abspath(__file__))
-            git_run = lambda cmd: subprocess.run(
-                cmd, cwd=project_dir, capture_output=True, text=True, timeout=60,
-            )
-            # Stage only the database file
-            result = git_run(["git", "add", db_path])
-            if result.returncode != 0:
-                raise RuntimeError(f"git add failed: {result.stderr}")
-
-            # Check if there are staged changes
-            result = git_run(["git", "diff", "--cached", "--quiet"])
-            if result.returncode == 0:
-                logger.info("  Geen wijzigingen in database, push overgeslagen")
-            else:
-                msg = f"Auto-update prijsdata {today}"
-                result = git_run(["git", "commit", "-m", msg])
-                if result.returncode != 0:
-                    raise RuntimeError(f"git commit failed: {result.stderr}")
-
-                result = git_run(["git", "push"])
+        with tracing.span("git push", cat="phase"):
+            try:
+                project_dir = os.path.dirname(os.path.abspath(__file__))
+                git_run = lambda cmd: subprocess.run(
+                    cmd, cwd=project_dir, capture_output=True, text=True, timeout=60,
+                )
+                # Stage only the database file
+                result = git_run(["git", "add", db_path])
                 if result.returncode != 0:
-                    raise RuntimeError(f"git push failed: {result.stderr}")
-
-                logger.info("  Database gepusht naar GitHub")
-        except Exception as e:
-            logger.error(f"  Git push mislukt: {e}")
+                    raise RuntimeError(f"git add failed: {result.stderr}")
+
+                # Check if there are staged changes
+                result = git_run(["git", "diff", "--cached", "--quiet"])
+                if result.returncode == 0:
+                    logger.info("  Geen wijzigingen in database, push overgeslagen")
+                else:
+                    msg = f"Auto-update prijsdata {today}"
+                    result = git_run(["git", "commit", "-m", msg])
+                    if result.returncode != 0:
+                        raise RuntimeError(f"git commit failed: {result.stderr}")
+
+                    result = git_run(["git", "push"])
+                    if result.returncode != 0:
+                        raise RuntimeError(f"git push failed: {result.stderr}")
+
+                    logger.info("  Database gepusht naar GitHub")
+            except Exception as e:
+                logger.error(f"  Git push mislukt: {e}")
 
     # --- Samenvatting ---
     total_duration = time.time() - start_time
@@ -345,30 +389,35 @@ def run_pipeline(config: dict, dry_run: bool = False,
 
     if scrape_results:
         logger.info("\n  Per scraper:")
-        for key, result in sorted(scrape_results.items()):
-            status = result.get("status", "?")
-            records = result.get("records", 0)
-            dur = result.get("duration", 0)
-            error = result.get("error", "")
-            line = f"    {key:25s} {status:18s} {records:4d} records  {dur:6.1f}s"
-            if error:
-                line += f"  ({error[:60]})"
+        for line in format_summary(scrape_results):
             logger.info(line)
+        rate_lines = rate_control.format_telemetry()
+        if rate_lines:
+            logger.info("\n  Request-rate per host:")
+            for line in rate_lines:
+                logger.info(line)
+
+    timings = graph.format_timings()
+    if timings:
+        logger.info("\n  Taakgraaf (start, duur, status):")
+        for line in timings:
+            logger.info(f"    {line}")
 
     logger.info("=" * 60)
 
     # --- Phase 5: E-mail rapport versturen ---
     if not dry_run and scrape_results:
         logger.info("\n--- E-mail rapport versturen ---")
-        try:
-            from email_report import send_report
-            send_report(
-                scrape_results=scrape_results,
-                excel_path=excel_path,
-                total_duration=total_duration,
-            )
-        except Exception as e:
-            logger.error(f"  E-mail versturen mislukt: {e}", exc_info=True)
+        with tracing.span("e-mail", cat="phase"):
+            try:
+                from email_report import send_report
+                send_report(
+                    scrape_results=scrape_results,
+                    excel_path=excel_path,
+                    total_duration=total_duration,
+                )
+            except Exception as e:
+                logger.error(f"  E-mail versturen mislukt: {e}", exc_info=True)
 
     # Determine exit code
     if dry_run or skip_scrape:
@@ -393,6 +442,10 @@ def main():
         "--skip-scrape", action="store_true",
         help="Sla scraping over, draai alleen analytics + dashboard",
     )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="Schrijf een Chrome-trace van de run (Perfetto) naar general.trace_dir",
+    )
     parser.add_argument(
         "--config", default="config/settings.yaml",
         help="Pad naar configuratiebestand",
@@ -413,6 +466,7 @@ def main():
     log_file = setup_logging(
         log_dir=config.get("general", {}).get("log_dir", "logs"),
         level=config.get("general", {}).get("log_level", "INFO"),
+        log_format=config.get("general", {}).get("log_format", "jsonl"),
     )
 
     logger = logging.getLogger("daily")
@@ -427,6 +481,7 @@ def main():
         config=config,
         dry_run=args.dry_run,
         skip_scrape=args.skip_scrape,
+        trace=True if args.trace else None,
     )
 
     status_msg = {
@@ -0,0 +1,80 @@
+"""Export price data for BI tools (CSV, NDJSON or Parquet).
+
+Usage:
+    python run_export.py prices -o prijzen.csv                     # All raw prices
+    python run_export.py comparison --from 2026-01-01 -o cmp.ndjson
+    python run_export.py price_index --competitor "De Boshoek" --segment accommodatie
+    python run_export.py recommendations --format parquet -o advies.parquet
+    python run_export.py prices --columns scrape_date,competitor_name,price
+"""
+
+import argparse
+import os
+import sys
+
+import yaml
+
+from analytics.export import DATASETS, FORMATS, export
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Concurrentiecheck Westerbergen - Data export"
+    )
+    parser.add_argument("dataset", choices=list(DATASETS), help="Welke data exporteren")
+    parser.add_argument("--format", "-f", choices=FORMATS,
+                        help="Uitvoerformaat (standaard: afgeleid van --output, anders csv)")
+    parser.add_argument("--output", "-o", help="Uitvoerbestand (standaard: stdout)")
+    parser.add_argument("--from", dest="date_from", help="Vanaf scrape-datum (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="Tot en met scrape-datum (YYYY-MM-DD)")
+    parser.add_argument("--competitor", action="append",
+                        help="Filter op concurrent (herhaalbaar)")
+    parser.add_argument("--segment", action="append",
+                        help="Filter op segment (herhaalbaar)")
+    parser.add_argument("--columns", help="Kommagescheiden kolomselectie")
+    parser.add_argument("--config", default="config/settings.yaml")
+    args = parser.parse_args()
+
+    # Ensure UTF-8 output on Windows
+    if sys.platform == "win32":
+        try:
+            sys.stdout.reconfigure(encoding="utf-8")
+        except Exception:
+            pass
+
+    # Load config for db_path
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    db_path = config.get("general", {}).get("database_path", "data/concurrentiecheck.db")
+
+    fmt = args.format
+    if fmt is None:
+        ext = os.path.splitext(args.output or "")[1].lstrip(".").lower()
+        fmt = {"jsonl": "ndjson", "json": "ndjson", "pq": "parquet"}.get(ext, ext)
+        if fmt not in FORMATS:
+            fmt = "csv"
+
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+
+    try:
+        count = export(
+            db_path=db_path,
+            dataset=args.dataset,
+            fmt=fmt,
+            output=args.output,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            competitors=args.competitor,
+            segments=args.segment,
+            columns=columns,
+        )
+    except (ValueError, RuntimeError) as e:
+        print(f"Export mislukt: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output and args.output != "-":
+        print(f"{count} rijen geëxporteerd naar {args.output} ({fmt})")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,57 +5,86 @@ Usage:
     python run_scraper.py --competitor beerze # Run specific competitor
     python run_scraper.py --days 60          # Override days ahead
     python run_scraper.py --visible          # Show browser window
+    python run_scraper.py -c rcn_luna,landal_bartje --jobs 4  # Parallel per domain
+    python run_scraper.py --jobs 4 --isolate --deadline 900   # Worker process per group
 """
 
 import argparse
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import yaml
 
 from database import Database
-from scrapers.beerze_bulten import (
-    BeerzeBultenScraper, BeerzeBultenCampingScraper, BeerzeBultenPsanitairScraper
-)
-from scrapers.holidayagent_scraper import (
-    CampingOmmerlandScraper, EilandVanMaurikScraper,
-    CampingOmmerlandCampingScraper, CampingOmmerlandPsanitairScraper,
-    EilandVanMaurikCampingScraper,
-)
-from scrapers.witter_zomer import WitterZomerScraper
-from scrapers.de_witte_berg import DeWitteBergScraper
-from scrapers.de_boshoek import DeBoshoekScraper
-from scrapers.westerbergen import (
-    WesterbergenScraper, WesterbergenCampingScraper, WesterbergenPsanitairScraper
-)
-from scrapers.centerparcs_scraper import CenterParcsScraper
-from scrapers.molecaten_scraper import MolecatenKuierpadBosvenScraper, MolecatenKuierpadCampingScraper
-from scrapers.zandstuve_scraper import (
-    ZandstuveBoslodgeScraper, ZandstuveCampingScraper, ZandstuvePsanitairScraper
-)
-from scrapers.capfun_scraper import (
-    CapfunStoetenslaghCampingScraper, CapfunStoetenslaghAccScraper,
-    CapfunSprookjesCampingScraper, CapfunFruithofCampingScraper,
-    CapfunFruithofAccScraper,
-)
-from scrapers.landal_scraper import (
-    LandalAelderholtScraper, LandalAelderholtPremiumScraper, LandalBartjeScraper,
-)
-from scrapers.kleinewolf_scraper import KleineWolfCampingScraper, KleineWolfAccScraper
-from scrapers.rcn_scraper import (
-    RcnNoordsterMercuriusScraper, RcnNoordsterLunaScraper, RcnNoordsterCampingScraper,
-)
-
-
-def setup_logging(log_dir: str = "logs", level: str = "INFO"):
-    """Configure logging to both console and file."""
+from scrapers import credential_cache, pipeline, progress_log, rate_control
+from scrapers.orchestrator import format_summary, run_groups, scrape_params
+from scrapers.planner import browser_slots, plan_groups
+from scrapers.registry import LazyScraperMap, domain_groups
+
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, thread, msg + ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process queue that keeps ``exc_info`` on the record.
+
+    The stock ``prepare()`` formats the record and folds the traceback into
+    ``msg`` so it survives pickling. The listener here runs in the same
+    process, so the record can stay intact: ``msg`` is only the message and
+    each handler formats the traceback itself (``exc`` in JSON lines).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener = None
+
+
+def setup_logging(log_dir: str = "logs", level: str = "INFO", log_format: str = "jsonl"):
+    """Configure logging to both console and file.
+
+    Threads only put records on a queue (QueueHandler); one listener
+    thread writes them to the console (INFO) and the log file (DEBUG).
+    The file is JSON lines (``log_format="jsonl"``) or plain text.
+    """
+    global _listener
     os.makedirs(log_dir, exist_ok=True)
 
+    json_lines = log_format == "jsonl"
     log_file = os.path.join(
         log_dir,
-        f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{'jsonl' if json_lines else 'log'}"
     )
 
     # Root logger
@@ -69,20 +98,42 @@ def setup_logging(log_dir: str = "logs", level: str = "INFO"):
         "%(asctime)s [%(name)s] %(levelname)s: %(message)s",
         datefmt="%H:%M:%S",
     ))
-    root.addHandler(console)
 
     # File handler (more verbose)
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(logging.Formatter(
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(
         "%(asctime)s [%(name)s] %(levelname)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     ))
-    root.addHandler(file_handler)
+
+    # Replace an earlier setup (e.g. run_daily calling twice)
+    if _listener is not None:
+        stop_logging()
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_LocalQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console, file_handler, respect_handler_level=True,
+    )
+    _listener.start()
+    atexit.register(stop_logging)
 
     return log_file
 
 
+def stop_logging():
+    """Flush the log queue and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def load_config(config_path: str = "config/settings.yaml") -> dict:
     """Load configuration from YAML file."""
     with open(config_path, "r", encoding="utf-8") as f:
@@ -90,59 +141,13 @@ def load_config(config_path: str = "config/settings.yaml") -> dict:
 
 
 def get_scraper_map(db: Database, headless: bool):
-    """Return mapping of competitor key -> scraper instance."""
-    # Volgorde: API-scrapers eerst (snel, geen browser), dan BookingExperts
-    # scrapers gespreid om rate-limiting te voorkomen.
-    return {
-        # --- API-only scrapers (snel, geen browser) ---
-        "centerparcs_sandur": CenterParcsScraper(db=db, headless=headless),
-        "molecaten_bosven": MolecatenKuierpadBosvenScraper(db=db, headless=headless),
-        "molecaten_camping": MolecatenKuierpadCampingScraper(db=db, headless=headless),
-        "camping_ommerland": CampingOmmerlandScraper(db=db, headless=headless),
-        "ommerland_camping": CampingOmmerlandCampingScraper(db=db, headless=headless),
-        "ommerland_psanitair": CampingOmmerlandPsanitairScraper(db=db, headless=headless),
-        "eiland_van_maurik": EilandVanMaurikScraper(db=db, headless=headless),
-        "maurik_camping": EilandVanMaurikCampingScraper(db=db, headless=headless),
-
-        # --- BookingExperts scrapers (browser, gespreid) ---
-        "de_boshoek": DeBoshoekScraper(db=db, headless=headless),
-        "zandstuve_boslodge": ZandstuveBoslodgeScraper(db=db, headless=headless),
-        "beerze_bulten": BeerzeBultenScraper(db=db, headless=headless),
-        "bb_camping": BeerzeBultenCampingScraper(db=db, headless=headless),
-        "zandstuve_camping": ZandstuveCampingScraper(db=db, headless=headless),
-        "de_witte_berg": DeWitteBergScraper(db=db, headless=headless),
-        "bb_psanitair": BeerzeBultenPsanitairScraper(db=db, headless=headless),
-        "zandstuve_psanitair": ZandstuvePsanitairScraper(db=db, headless=headless),
-
-        # --- Other browser scrapers ---
-        "witter_zomer": WitterZomerScraper(db=db, headless=headless),
-
-        # --- Capfun scrapers (HTTP API) ---
-        "stoetenslagh_camping": CapfunStoetenslaghCampingScraper(db=db, headless=headless),
-        "stoetenslagh_acc": CapfunStoetenslaghAccScraper(db=db, headless=headless),
-        "sprookjes_camping": CapfunSprookjesCampingScraper(db=db, headless=headless),
-        "fruithof_camping": CapfunFruithofCampingScraper(db=db, headless=headless),
-        "fruithof_acc": CapfunFruithofAccScraper(db=db, headless=headless),
-
-        # --- Landal scrapers (HTTP API) ---
-        "landal_aelderholt": LandalAelderholtScraper(db=db, headless=headless),
-        "landal_aelderholt_premium": LandalAelderholtPremiumScraper(db=db, headless=headless),
-        "landal_bartje": LandalBartjeScraper(db=db, headless=headless),
-
-        # --- De Kleine Wolf scrapers (HTTP API) ---
-        "kleinewolf_camping": KleineWolfCampingScraper(db=db, headless=headless),
-        "kleinewolf_acc": KleineWolfAccScraper(db=db, headless=headless),
-
-        # --- RCN De Noordster scrapers (Playwright) ---
-        "rcn_mercurius": RcnNoordsterMercuriusScraper(db=db, headless=headless),
-        "rcn_luna": RcnNoordsterLunaScraper(db=db, headless=headless),
-        "rcn_camping": RcnNoordsterCampingScraper(db=db, headless=headless),
-
-        # --- Westerbergen (eigen park, alle segmenten) ---
-        "westerbergen": WesterbergenScraper(db=db, headless=headless),
-        "westerbergen_camping": WesterbergenCampingScraper(db=db, headless=headless),
-        "westerbergen_psanitair": WesterbergenPsanitairScraper(db=db, headless=headless),
-    }
+    """Return mapping of competitor key -> scraper instance.
+
+    The mapping is lazy: scraper modules are imported and scrapers built
+    only when a key is accessed (see scrapers/registry.py for the order
+    and domain groups).
+    """
+    return LazyScraperMap(db=db, headless=headless)
 
 
 def main():
@@ -151,7 +156,12 @@ def main():
     )
     parser.add_argument(
         "--competitor", "-c",
-        help="Run only a specific competitor (key from config)",
+        action="append",
+        help="Run only specific competitors (key from config; repeatable or comma-separated)",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Domain groups to scrape in parallel (default: 1)",
     )
     parser.add_argument(
         "--days", "-d", type=int, default=365,
@@ -161,6 +171,15 @@ def main():
         "--visible", "-v", action="store_true",
         help="Show browser window (non-headless mode)",
     )
+    parser.add_argument(
+        "--isolate", action="store_true",
+        help="Run each domain group in a worker process with a per-scraper deadline",
+    )
+    parser.add_argument(
+        "--deadline", type=float,
+        help="Per-scraper deadline in seconds with --isolate "
+             "(default: scraping.scraper_deadline_seconds)",
+    )
     parser.add_argument(
         "--config", default="config/settings.yaml",
         help="Path to config file",
@@ -174,6 +193,7 @@ def main():
     log_file = setup_logging(
         log_dir=config.get("general", {}).get("log_dir", "logs"),
         level=config.get("general", {}).get("log_level", "INFO"),
+        log_format=config.get("general", {}).get("log_format", "jsonl"),
     )
 
     logger = logging.getLogger("main")
@@ -193,58 +213,46 @@ def main():
     scrapers = get_scraper_map(db, headless)
 
     # Determine which scrapers to run
+    competitors_cfg = config.get("competitors", {})
     if args.competitor:
-        if args.competitor not in scrapers:
+        to_run = [k.strip() for arg in args.competitor for k in arg.split(",") if k.strip()]
+        unknown = [k for k in to_run if k not in scrapers]
+        if unknown:
             logger.error(
-                f"Unknown competitor: {args.competitor}. "
+                f"Unknown competitor: {', '.join(unknown)}. "
                 f"Available: {list(scrapers.keys())}"
             )
             sys.exit(1)
-        to_run = {args.competitor: scrapers[args.competitor]}
     else:
         # Run all enabled scrapers
-        enabled = config.get("competitors", {})
-        to_run = {
-            key: scraper
-            for key, scraper in scrapers.items()
-            if enabled.get(key, {}).get("enabled", True)
-        }
-
-    # Run scrapers
-    total_records = 0
-    total_errors = 0
-
-    # Convert days to months for scrapers that use months_ahead
-    months_ahead = max(1, args.days // 30)
-    target_end_date = (datetime.now() + timedelta(days=args.days)).strftime("%Y-%m-%d")
-    # BookingExperts pages: ~3 days per page step
-    max_pages = max(30, args.days // 3 + 10)
-
-    for key, scraper in to_run.items():
-        logger.info(f"\n--- Running: {scraper.competitor_name} ---")
-        try:
-            results = scraper.run_efficient(
-                max_pages=max_pages,
-                months_ahead=months_ahead,
-                target_end_date=target_end_date,
-                persons=config.get("scraping", {}).get("default_persons", 4),
-            )
-            available = [r for r in results if r.get("available") and r.get("price")]
-            total_records += len(results)
-
-            logger.info(
-                f"  Results: {len(results)} total, "
-                f"{len(available)} available with price"
-            )
-            if available:
-                prices = [r["price"] for r in available]
-                logger.info(
-                    f"  Price range: EUR {min(prices):.0f} - EUR {max(prices):.0f}"
-                )
+        to_run = [key for key in scrapers if competitors_cfg.get(key, {}).get("enabled", True)]
 
-        except Exception as e:
-            total_errors += 1
-            logger.error(f"  FAILED: {e}", exc_info=True)
+    # Run scrapers: sequential within a domain group, --jobs groups in parallel
+    params = scrape_params(
+        days_ahead=args.days,
+        persons=config.get("scraping", {}).get("default_persons", 4),
+    )
+    names = {key: competitors_cfg.get(key, {}).get("name", key) for key in to_run}
+    rate_control.configure(**(config.get("scraping", {}).get("rate_control") or {}))
+    credential_cache.configure(**(config.get("scraping", {}).get("credential_cache") or {}))
+    pipeline.configure(**(config.get("scraping", {}).get("pipeline") or {}))
+    progress_log.configure(**(config.get("scraping", {}).get("progress") or {}))
+    runner = None
+    if args.isolate or config.get("scraping", {}).get("isolation", False):
+        from scrapers.isolation import IsolatedRunner
+        runner = IsolatedRunner(
+            db, headless=headless,
+            deadline=args.deadline or config.get("scraping", {}).get("scraper_deadline_seconds"),
+        )
+    # Longest-first from recent durations; long groups split where the host allows
+    plan = plan_groups(domain_groups(to_run), db.get_scraper_durations())
+    groups = {name: group["keys"] for name, group in plan.items()}
+    browser_jobs = browser_slots(config.get("scraping", {}).get("browser_jobs"))
+    results = run_groups(groups, scrapers, params, jobs=args.jobs, names=names,
+                         runner=runner, browser_jobs=browser_jobs)
+
+    total_records = sum(r.get("records", 0) for r in results.values())
+    total_errors = sum(1 for r in results.values() if r.get("status") == "failed")
 
     # Summary
     logger.info("\n" + "=" * 60)
@@ -252,6 +260,10 @@ def main():
     logger.info(f"  Competitors: {len(to_run)}")
     logger.info(f"  Total records: {total_records}")
     logger.info(f"  Failed competitors: {total_errors}")
+    for line in format_summary(results):
+        logger.info(line)
+    for line in rate_control.format_telemetry():
+        logger.info(line)
     logger.info(f"  Log file: {log_file}")
     logger.info("=" * 60)
 
@@ -2,4 +2,5 @@
 
 Bevat:
     - task_scheduler_setup: Windows Task Scheduler registratie
+    - task_graph: taakgraaf-executor voor de stappen van run_daily
 """
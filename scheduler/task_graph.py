@@ -0,0 +1,167 @@
+"""Kleine taakgraaf-executor voor de dagelijkse pipeline.
+
+Elke node is een functie zonder argumenten met een lijst afhankelijkheden.
+Een node start zodra al zijn afhankelijkheden klaar zijn, op een gedeelde
+thread pool. Zo kan de analytics van een segment beginnen zodra de
+scrapers van dát segment klaar zijn, terwijl andere groepen nog lopen.
+
+Usage:
+    graph = TaskGraph(max_workers=8)
+    graph.add("scrape:rcn", run_rcn)
+    graph.add("segment:accommodatie", run_analytics, deps=["scrape:rcn"])
+    nodes = graph.run()
+    for line in graph.format_timings():
+        print(line)
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Return value for a node that had nothing to do (e.g. a retry of a scraper
+# that already succeeded); shown as "skipped" in the timings.
+SKIPPED = object()
+
+
+class TaskGraph:
+    """Dependency graph of callables, executed on a thread pool."""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self.nodes = {}
+        self._t0 = None
+
+    def add(self, name: str, fn, deps: list[str] = None,
+            require_success: bool = False) -> str:
+        """Add a node. Returns its name so callers can chain dependencies.
+
+        Args:
+            name: unique node name (e.g. "scrape:rcn", "segment:accommodatie")
+            fn: callable without arguments; its return value is the node result
+            deps: names of nodes that must finish first
+            require_success: skip this node if a dependency failed
+                (default: run anyway, e.g. analytics on partial data)
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' bestaat al")
+        self.nodes[name] = {
+            "fn": fn,
+            "deps": list(deps or []),
+            "require_success": require_success,
+            "status": "pending",
+            "result": None,
+            "error": None,
+            "start": None,
+            "end": None,
+            "duration": 0.0,
+        }
+        return name
+
+    def result(self, name: str):
+        """Result of a finished node (None if it failed or did not run)."""
+        return self.nodes[name]["result"]
+
+    def _validate(self):
+        for name, node in self.nodes.items():
+            for dep in node["deps"]:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node '{name}' hangt af van onbekende node '{dep}'")
+
+        # Cycle check (Kahn)
+        indegree = {name: len(node["deps"]) for name, node in self.nodes.items()}
+        dependents = {name: [] for name in self.nodes}
+        for name, node in self.nodes.items():
+            for dep in node["deps"]:
+                dependents[dep].append(name)
+        ready = [n for n, d in indegree.items() if d == 0]
+        seen = 0
+        while ready:
+            n = ready.pop()
+            seen += 1
+            for child in dependents[n]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if seen != len(self.nodes):
+            raise ValueError("Taakgraaf bevat een cyclus")
+
+    def _run_node(self, name: str):
+        node = self.nodes[name]
+        node["start"] = time.time()
+        try:
+            # Span category from the node prefix ("scrape:rcn" -> "scrape")
+            with tracing.span(name, cat=name.split(":", 1)[0]):
+                return node["fn"]()
+        finally:
+            node["end"] = time.time()
+            node["duration"] = node["end"] - node["start"]
+
+    def run(self) -> dict:
+        """Execute all nodes respecting dependencies; returns the node table.
+
+        Every node ends as "ok", "failed" or "skipped". Exceptions are
+        caught per node and stored in ``error``.
+        """
+        self._validate()
+        self._t0 = time.time()
+        order = {name: i for i, name in enumerate(self.nodes)}
+        pending = set(self.nodes)
+        done = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Submit every node whose dependencies are all done
+                for name in sorted(pending, key=order.get):
+                    node = self.nodes[name]
+                    if not all(dep in done for dep in node["deps"]):
+                        continue
+                    pending.discard(name)
+                    if node["require_success"] and any(
+                        self.nodes[dep]["status"] != "ok" for dep in node["deps"]
+                    ):
+                        node["status"] = "skipped"
+                        done.add(name)
+                        continue
+                    node["status"] = "running"
+                    running[executor.submit(self._run_node, name)] = name
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    node = self.nodes[name]
+                    try:
+                        result = future.result()
+                        if result is SKIPPED:
+                            node["status"] = "skipped"
+                        else:
+                            node["status"] = "ok"
+                            node["result"] = result
+                    except Exception as e:
+                        node["status"] = "failed"
+                        node["error"] = f"{type(e).__name__}: {e}"
+                        logger.error(f"Node {name} mislukt: {e}", exc_info=True)
+                    done.add(name)
+
+        return self.nodes
+
+    def format_timings(self, include_skipped: bool = False) -> list[str]:
+        """Timing lines per node (start offset, duration, status), by start time."""
+        t0 = self._t0
+        lines = []
+        ran = [(n, node) for n, node in self.nodes.items() if node["start"] is not None]
+        for name, node in sorted(ran, key=lambda item: item[1]["start"]):
+            if node["status"] == "skipped" and not include_skipped:
+                continue
+            offset = node["start"] - t0 if t0 else 0.0
+            lines.append(
+                f"{name:40s} +{offset:7.1f}s  {node['duration']:7.1f}s  {node['status']}"
+            )
+        return lines
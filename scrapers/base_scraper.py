@@ -8,12 +8,23 @@ from pathlib import Path
 
 from playwright.sync_api import sync_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
 
-from database import Database
+import tracing
+from database import Database, PriceRecord
+from scrapers.ingest import IngestSink
+from scrapers.progress_log import ProgressLog
+from scrapers.telemetry import RunMetrics
 
 
 class BaseScraper(ABC):
     """Abstract base class for competitor price scrapers."""
 
+    # Registry key (e.g. "landal_bartje"); set by scrapers.registry.build_scraper
+    # and written to scrape_log so durations can be tracked per scraper.
+    scraper_key: str = None
+
+    # Which record wins when a stay is scraped more than once (scrapers.ingest)
+    INGEST_POLICY = "first"
+
     def __init__(self, competitor_name: str, accommodation_type: str,
                  url: str, db: Database, headless: bool = True,
                  rate_limit: float = 2.0, max_retries: int = 3,
@@ -27,18 +38,108 @@ class BaseScraper(ABC):
         self.max_retries = max_retries
         self.page_timeout = page_timeout
         self._last_request_time = 0
+        # Set by _use_adaptive_rate(): pacing then happens per host in the
+        # session adapter and _wait_rate_limit() no longer sleeps.
+        self._rate_controller = None
+        # Requests, latency, sleep/parse/db time of the current run (scrape_metrics)
+        self.metrics = RunMetrics()
 
         self.logger = logging.getLogger(f"scraper.{competitor_name}")
 
+    def _save_batch(self, records: list):
+        """Database.save_prices_batch, timed as db time in the run metrics."""
+        with self.metrics.timed("db"):
+            self.db.save_prices_batch(records)
+
+    def _ingest_sink(self, batch_size: int = None, name: str = None) -> IngestSink:
+        """IngestSink to the database with this scraper's conflict policy."""
+        return IngestSink(
+            self._save_batch, policy=self.INGEST_POLICY, batch_size=batch_size,
+            name=name or f"{self.competitor_name} ({self.accommodation_type})",
+        )
+
+    def _make_record(self, check_in_date: str, check_out_date: str, price: float | None,
+                     available: bool = True, min_nights: int = None,
+                     special_offers: str = None, persons: int = 4,
+                     segment: str = None, surcharges: str = None) -> PriceRecord:
+        """PriceRecord for this scraper's competitor and accommodation type.
+
+        ``segment`` defaults to the scraper's ``segment`` (or class ``SEGMENT``)
+        attribute, so subclasses never have to patch the database layer.
+        """
+        if segment is None:
+            segment = getattr(self, "segment", None) or getattr(self, "SEGMENT", "accommodatie")
+        return PriceRecord(
+            self.competitor_name, self.accommodation_type, check_in_date, check_out_date,
+            price, available=available, min_nights=min_nights,
+            special_offers=special_offers, persons=persons, segment=segment,
+            surcharges=surcharges,
+        )
+
     def _wait_rate_limit(self):
         """Enforce rate limiting between requests."""
+        if self._rate_controller is not None:
+            return
         elapsed = time.time() - self._last_request_time
         if elapsed < self.rate_limit:
             wait_time = self.rate_limit - elapsed
-            self.logger.debug(f"Rate limiting: waiting {wait_time:.1f}s")
+            self.logger.debug("Rate limiting: waiting %.1fs", wait_time)
+            tracing.add_span("rate limit", time.time(), wait_time, cat="wait")
             time.sleep(wait_time)
+            self.metrics.add_time("sleep", wait_time)
         self._last_request_time = time.time()
 
+    def _use_adaptive_rate(self, session, host_or_url: str, base_interval: float = None):
+        """Pace ``session`` per host with AIMD rate control (scrapers/rate_control.py).
+
+        ``base_interval`` (default ``self.rate_limit``) is the starting interval; the controller
+        speeds up on healthy responses and backs off on 429/5xx/latency
+        spikes, honouring Retry-After. No-op when disabled in config.
+        """
+        from scrapers.rate_control import mount_adaptive
+        self.metrics.instrument_session(session)
+        controller = mount_adaptive(
+            session, host_or_url,
+            base_interval=self.rate_limit if base_interval is None else base_interval,
+        )
+        if controller is not None:
+            self._rate_controller = controller
+        return session
+
+    # --- Checkpoints: hervatten na een mislukte of afgebroken run ---
+
+    @property
+    def checkpoint_id(self) -> str:
+        """Identifier for this scraper's checkpoints (registry key if known)."""
+        return self.scraper_key or f"{self.competitor_name}|{self.accommodation_type}"
+
+    def _load_checkpoints(self) -> dict:
+        """Units already completed today: {unit: payload}. Empty on any error."""
+        try:
+            done = self.db.get_checkpoints(self.checkpoint_id)
+        except Exception as e:
+            self.logger.warning(f"Checkpoints niet leesbaar, volledige run: {e}")
+            return {}
+        if done:
+            self.logger.info(f"  Hervatten: {len(done)} units vandaag al voltooid")
+        return done
+
+    def _checkpoint(self, unit: str, payload=None):
+        """Record a completed unit; a failing checkpoint never fails the scrape."""
+        try:
+            with self.metrics.timed("db"):
+                self.db.save_checkpoint(self.checkpoint_id, unit, payload)
+        except Exception as e:
+            self.logger.debug("Checkpoint %s niet opgeslagen: %s", unit, e)
+
+    def _checkpoint_units(self, units: list[str]):
+        """Record several completed units in one write (same guarantees as _checkpoint)."""
+        try:
+            with self.metrics.timed("db"):
+                self.db.save_checkpoints(self.checkpoint_id, units)
+        except Exception as e:
+            self.logger.debug("Checkpoints (%d) niet opgeslagen: %s", len(units), e)
+
     def _create_browser(self, playwright) -> Browser:
         """Create a browser instance with realistic settings."""
         return playwright.chromium.launch(
@@ -63,6 +164,7 @@ class BaseScraper(ABC):
         )
         page = context.new_page()
         page.set_default_timeout(self.page_timeout)
+        self.metrics.instrument_page(page)
         return page
 
     def generate_check_dates(self, days_ahead_list: list[int] = None,
@@ -143,6 +245,7 @@ class BaseScraper(ABC):
         start_time = time.time()
         results = []
         errors = 0
+        progress = ProgressLog(self.logger, total=len(dates), unit="dates")
 
         with sync_playwright() as playwright:
             browser = self._create_browser(playwright)
@@ -152,6 +255,7 @@ class BaseScraper(ABC):
                 for date_info in dates:
                     check_in = date_info["check_in"]
                     check_out = date_info["check_out"]
+                    progress.update(prices=len(results))
 
                     for attempt in range(1, self.max_retries + 1):
                         self._wait_rate_limit()
@@ -160,23 +264,21 @@ class BaseScraper(ABC):
                                 page, check_in, check_out, persons
                             )
                             if result is not None:
-                                record = {
-                                    "competitor_name": self.competitor_name,
-                                    "accommodation_type": self.accommodation_type,
-                                    "check_in_date": check_in.isoformat(),
-                                    "check_out_date": check_out.isoformat(),
-                                    "price": result.get("price"),
-                                    "available": result.get("available", True),
-                                    "min_nights": result.get("min_nights"),
-                                    "special_offers": result.get("special_offers"),
-                                    "persons": persons,
-                                }
-                                self.db.save_price(**record)
+                                record = self._make_record(
+                                    check_in.isoformat(), check_out.isoformat(),
+                                    result.get("price"),
+                                    available=result.get("available", True),
+                                    min_nights=result.get("min_nights"),
+                                    special_offers=result.get("special_offers"),
+                                    persons=persons,
+                                )
+                                with self.metrics.timed("db"):
+                                    self.db.save_record(record)
                                 results.append(record)
-                                self.logger.info(
-                                    f"  {check_in} -> {check_out}: "
-                                    f"€{result.get('price', 'N/A')} "
-                                    f"({'beschikbaar' if result.get('available') else 'niet beschikbaar'})"
+                                self.logger.debug(
+                                    "  %s -> %s: €%s (%s)", check_in, check_out,
+                                    result.get("price", "N/A"),
+                                    "beschikbaar" if result.get("available") else "niet beschikbaar",
                                 )
                                 break
                         except PlaywrightTimeout:
@@ -211,11 +313,13 @@ class BaseScraper(ABC):
             finally:
                 browser.close()
 
+        progress.done()
         duration = time.time() - start_time
         status = "success" if errors == 0 else "partial" if results else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(results),
             error_message=f"{errors} date(s) failed" if errors else None,
@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.progress_log import ProgressLog
 from database import Database
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,9 @@ class BeerzeBultenScraper(BaseScraper):
 
     # Default number of guests for pricing (affects tourist tax etc.)
     DEFAULT_PERSONS = 4
+    # "Later" pages overlap; a stay shown sold out on one page edge can be
+    # bookable on the next
+    INGEST_POLICY = "prefer_available"
 
     def __init__(self, db: Database, headless: bool = True, **kwargs):
         super().__init__(
@@ -51,7 +55,7 @@ class BeerzeBultenScraper(BaseScraper):
                     self.logger.debug("Cookie banner accepted")
                     return
         except Exception as e:
-            self.logger.debug(f"Cookie handling: {e}")
+            self.logger.debug("Cookie handling: %s", e)
 
     def _parse_price_grid(self, page: Page) -> list[dict]:
         """Parse the price grid table and extract all prices with dates.
@@ -171,7 +175,7 @@ class BeerzeBultenScraper(BaseScraper):
             f"{self.url}"
             f"?grid_center%5Bsearch_date%5D={check_in.strftime('%Y-%m-%d')}"
         )
-        self.logger.debug(f"Loading grid for {check_in}: {grid_url}")
+        self.logger.debug("Loading grid for %s: %s", check_in, grid_url)
 
         page.goto(grid_url, wait_until="networkidle")
         time.sleep(2)
@@ -229,7 +233,7 @@ class BeerzeBultenScraper(BaseScraper):
             f"{self.url}"
             f"?grid_center%5Bsearch_date%5D={center_date.strftime('%Y-%m-%d')}"
         )
-        self.logger.debug(f"Loading grid week around {center_date}")
+        self.logger.debug("Loading grid week around %s", center_date)
 
         page.goto(grid_url, wait_until="networkidle")
         time.sleep(2)
@@ -255,17 +259,13 @@ class BeerzeBultenScraper(BaseScraper):
             check_in_dt = datetime.strptime(check_in_str, "%Y-%m-%d")
             check_out_dt = check_in_dt + timedelta(days=entry["nights"])
 
-            records.append({
-                "competitor_name": self.competitor_name,
-                "accommodation_type": self.accommodation_type,
-                "check_in_date": check_in_str,
-                "check_out_date": check_out_dt.strftime("%Y-%m-%d"),
-                "price": entry["price"],
-                "available": entry["available"],
-                "min_nights": entry["nights"],
-                "special_offers": None,
-                "persons": persons,
-            })
+            records.append(self._make_record(
+                check_in_str, check_out_dt.strftime("%Y-%m-%d"),
+                entry["price"],
+                available=entry["available"],
+                min_nights=entry["nights"],
+                persons=persons,
+            ))
 
         return records
 
@@ -310,7 +310,9 @@ class BeerzeBultenScraper(BaseScraper):
         """Efficiently scrape by navigating through grid pages using 'Later' link.
 
         The grid shows 7 days at a time, and the 'Later' link shifts ~3 days forward.
-        We follow this link to cover all dates up to target_end_date.
+        We follow this link to cover all dates up to target_end_date. The
+        next-page URL is checkpointed after every parsed page, so a retry on
+        the same day resumes where the previous run stopped.
 
         Args:
             max_pages: Maximum number of grid pages to load (safety limit).
@@ -332,9 +334,17 @@ class BeerzeBultenScraper(BaseScraper):
             f"up to {target_end_date} (max {max_pages} pages, {persons} persons)"
         )
 
+        # Resume from the grid cursor of an earlier (failed) run today
+        done = self._load_checkpoints()
+        if "complete" in done:
+            self.logger.info("  Vandaag al volledig gescraped (checkpoint), overgeslagen")
+            return []
+        cursor = done.get("cursor") or {}
+        first_page = cursor.get("page", 1)
+
         start_time = time.time()
-        all_records = []
-        seen_keys = set()
+        ingest = self._ingest_sink()
+        progress = ProgressLog(self.logger, unit="pages")
         errors = 0
         consecutive_failures = 0
         max_consecutive_failures = 3
@@ -344,8 +354,10 @@ class BeerzeBultenScraper(BaseScraper):
             try:
                 page = self._create_page(browser)
 
-                # Start at the base URL with guest count
-                start_url = self._build_url_with_guests(persons=persons)
+                # Start at the base URL with guest count (or the saved cursor)
+                start_url = self._build_url_with_guests(cursor.get("url"), persons=persons)
+                if cursor:
+                    self.logger.info(f"  Hervatten vanaf grid-pagina {first_page}")
                 page.goto(start_url, wait_until="domcontentloaded", timeout=60000)
                 time.sleep(2)
                 self._accept_cookies(page)
@@ -354,7 +366,7 @@ class BeerzeBultenScraper(BaseScraper):
                 page.evaluate('document.getElementById("reservation_section")?.scrollIntoView()')
                 time.sleep(1)
 
-                for page_num in range(1, max_pages + 1):
+                for page_num in range(first_page, max_pages + 1):
                     try:
                         page.wait_for_selector(".price-grid-table", timeout=30000)
                         consecutive_failures = 0
@@ -391,9 +403,11 @@ class BeerzeBultenScraper(BaseScraper):
                     date_range = self._get_grid_date_range(page)
                     range_str = f"{date_range[0]} - {date_range[1]}" if date_range else "unknown"
 
+                    page_ok = False
                     try:
                         # Parse the current grid
-                        grid_data = self._parse_price_grid(page)
+                        with self.metrics.timed("parse"):
+                            grid_data = self._parse_price_grid(page)
 
                         # Determine reference date from first header
                         ref_date = datetime.now()
@@ -403,7 +417,7 @@ class BeerzeBultenScraper(BaseScraper):
                                 ref_date = datetime.strptime(resolved, "%Y-%m-%d")
 
                         # Convert to records
-                        new_count = 0
+                        page_records = []
                         for entry in grid_data:
                             if entry["nights"] not in (2, 3, 4, 7):
                                 continue
@@ -414,38 +428,28 @@ class BeerzeBultenScraper(BaseScraper):
 
                             check_in_dt = datetime.strptime(check_in_str, "%Y-%m-%d")
                             check_out_dt = check_in_dt + timedelta(days=entry["nights"])
-                            key = (check_in_str, check_out_dt.strftime("%Y-%m-%d"))
-
-                            if key in seen_keys:
-                                continue
-                            seen_keys.add(key)
-
-                            record = {
-                                "competitor_name": self.competitor_name,
-                                "accommodation_type": self.accommodation_type,
-                                "check_in_date": check_in_str,
-                                "check_out_date": check_out_dt.strftime("%Y-%m-%d"),
-                                "price": entry["price"],
-                                "available": entry["available"],
-                                "min_nights": entry["nights"],
-                                "special_offers": None,
-                                "persons": persons,
-                                "segment": getattr(self, 'segment', 'accommodatie'),
-                            }
-                            self.db.save_price(**record)
-                            all_records.append(record)
-                            new_count += 1
-
-                        self.logger.info(
-                            f"  Page {page_num} ({range_str}): "
-                            f"{new_count} new prices"
+                            page_records.append(self._make_record(
+                                check_in_str, check_out_dt.strftime("%Y-%m-%d"),
+                                entry["price"],
+                                available=entry["available"],
+                                min_nights=entry["nights"],
+                                persons=persons,
+                            ))
+                        new_count = ingest.add(page_records)
+                        ingest.flush()
+
+                        self.logger.debug(
+                            "  Page %d (%s): %d new prices", page_num, range_str, new_count,
                         )
+                        progress.update(prices=len(ingest))
+                        page_ok = True
 
                         # Check if we've passed the target end date
                         if date_range:
                             last_date = self._resolve_date(date_range[-1], ref_date)
                             if last_date and last_date > target_end_date:
                                 self.logger.info(f"  Reached target end date {target_end_date}")
+                                self._checkpoint("complete")
                                 break
 
                     except Exception as e:
@@ -456,10 +460,15 @@ class BeerzeBultenScraper(BaseScraper):
                     later_url = self._get_later_url(page)
                     if not later_url:
                         self.logger.info("  No 'Later' link found, stopping.")
+                        if page_ok:
+                            self._checkpoint("complete")
                         break
 
                     # Ensure guest count is preserved in the URL
                     later_url = self._build_url_with_guests(later_url, persons)
+                    if page_ok:
+                        # A retry today continues from the next grid page
+                        self._checkpoint("cursor", {"url": later_url, "page": page_num + 1})
 
                     self._wait_rate_limit()
                     page.goto(later_url, wait_until="domcontentloaded", timeout=60000)
@@ -469,16 +478,22 @@ class BeerzeBultenScraper(BaseScraper):
             finally:
                 browser.close()
 
+        all_records = ingest.close()
+        progress.done()
+        errors += ingest.errors
+        self.logger.info(ingest.format_stats())
         duration = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors} week(s) failed" if errors else None,
             duration_seconds=duration,
             segment=getattr(self, 'segment', 'accommodatie'),
+            resumed=bool(cursor),
         )
 
         self.logger.info(
@@ -4,7 +4,7 @@ The booking engine at reserveren.capfun.com exposes a Search/search endpoint
 that returns available products with prices for a given arrival date and duration.
 
 The API requires a PHPSESSID session cookie, obtained by visiting the booking
-page. All endpoints are POST with JSON body.
+page and cached per camping (scrapers/credential_cache.py). All endpoints are POST with JSON body.
 
 Used by: Het Stoetenslagh, De Sprookjescamping, De Fruithof
 """
@@ -16,6 +16,9 @@ from datetime import datetime, timedelta
 import requests
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.coverage import CoveragePlanner
+from scrapers.credential_cache import get_cache
+from scrapers.progress_log import ProgressLog
 from database import Database
 
 logger = logging.getLogger(__name__)
@@ -23,8 +26,8 @@ logger = logging.getLogger(__name__)
 # Canonical durations to scrape
 DURATIONS = [2, 3, 4, 7]
 
-# Step size between arrival dates (days)
-# The API returns nearby stays per call, so 7-day steps give sufficient coverage
+# Step size between arrival dates (days) of the old fixed grid: the prior
+# response window for the coverage planner and the basis of its budget
 DATE_STEP = 7
 
 
@@ -37,6 +40,10 @@ class CapfunScraper(BaseScraper):
     """
 
     BOOKING_BASE = "https://reserveren.capfun.com"
+    # PHPSESSID is cached per camping; a 403 forces a new one
+    CREDENTIALS_TTL = 6 * 3600
+    # Overlapping Search responses return the same stay: keep the cheapest
+    INGEST_POLICY = "cheapest"
 
     def __init__(self, competitor_name: str, accommodation_type: str,
                  camping_param: str, product_type: int | str,
@@ -81,8 +88,26 @@ class CapfunScraper(BaseScraper):
             "Origin": self.BOOKING_BASE,
             "Referer": url,
         })
+        self._use_adaptive_rate(self.http, self.BOOKING_BASE)
 
-    def _get_session(self):
+    def _get_session(self, force: bool = False):
+        """Obtain a PHPSESSID, from the credential cache or via the browser.
+
+        The session is shared by all scrapers of the same camping; ``force``
+        mints a new one (e.g. after a 403 on a cached session).
+        """
+        creds, fresh = get_cache().get_or_refresh(
+            f"capfun:{self.camping_param}",
+            lambda: {"session_id": self._mint_session()},
+            ttl=self.CREDENTIALS_TTL, force=force,
+        )
+        session_id = creds["session_id"]
+        self.session_id = session_id
+        # Also set cookie on HTTP session for API calls
+        self.http.cookies.set("PHPSESSID", session_id, domain="reserveren.capfun.com")
+        self.logger.info(f"  Session{'' if fresh else ' (cache)'}: {session_id[:8]}...")
+
+    def _mint_session(self) -> str:
         """Obtain a PHPSESSID by loading the booking page in Playwright.
 
         The Capfun site is an Angular SPA that sets PHPSESSID via JavaScript,
@@ -121,11 +146,7 @@ class CapfunScraper(BaseScraper):
             raise RuntimeError(
                 f"Could not obtain PHPSESSID for {self.camping_param} via browser."
             )
-
-        self.session_id = session_id
-        # Also set cookie on HTTP session for API calls
-        self.http.cookies.set("PHPSESSID", session_id, domain="reserveren.capfun.com")
-        self.logger.info(f"  Session: {session_id[:8]}...")
+        return session_id
 
     def _api_url(self, service: str) -> str:
         """Build the API URL for a given service endpoint."""
@@ -232,14 +253,14 @@ class CapfunScraper(BaseScraper):
                             })
                         except (ValueError, TypeError) as e:
                             self.logger.debug(
-                                f"  Skipping malformed stay in '{prod_name}': {e}"
+                                "  Skipping malformed stay in '%s': %s", prod_name, e,
                             )
                             continue
 
         return records
 
     def _select_best_product(self, records: list[dict]) -> list[dict]:
-        """Select the representative product from all returned records.
+        """Select the representative product from the records of one response.
 
         For accommodations (type=2): pick the cheapest 6+ person product per date/duration.
         For camping (type=1): pick the standard kampeerplaats per date/duration.
@@ -273,6 +294,23 @@ class CapfunScraper(BaseScraper):
 
         return best
 
+    @staticmethod
+    def _records_to_json(records: list[dict]) -> list[dict]:
+        """Checkpoint payload: records with dates as YYYY-MM-DD strings."""
+        return [
+            {**r, "check_in": r["check_in"].strftime("%Y-%m-%d"),
+             "check_out": r["check_out"].strftime("%Y-%m-%d")}
+            for r in records
+        ]
+
+    @staticmethod
+    def _records_from_json(records: list[dict]) -> list[dict]:
+        return [
+            {**r, "check_in": datetime.strptime(r["check_in"], "%Y-%m-%d"),
+             "check_out": datetime.strptime(r["check_out"], "%Y-%m-%d")}
+            for r in records
+        ]
+
     def scrape_price(self, page, check_in, check_out, persons=4):
         """Not used - we use run_efficient() with the API instead."""
         raise NotImplementedError("Use run_efficient() for Capfun sites")
@@ -280,9 +318,11 @@ class CapfunScraper(BaseScraper):
     def run_efficient(self, months_ahead: int = 12, **kwargs) -> list[dict]:
         """Scrape all prices via the Capfun Sequoiasoft REST API.
 
-        Iterates over arrival dates (every DATE_STEP days) for the next
-        months_ahead months, calling Search/search for each combination
-        of date and duration.
+        A CoveragePlanner picks the (arrival date, duration) Search calls:
+        each call returns nearby stays, so the next call is the one that
+        covers the most (arrival, nights) cells still open in the horizon.
+        Completed calls are checkpointed, so a retry on the same day only
+        requests what is still missing.
         """
         self.logger.info(
             f"Starting API scrape for {self.competitor_name} "
@@ -291,133 +331,153 @@ class CapfunScraper(BaseScraper):
         )
 
         start_time = time.time()
-        all_raw_records = []
-        all_saved_records = []
+        ingest = self._ingest_sink()
         errors = 0
         request_count = 0
+        done = {}
 
         try:
-            self._get_session()
-
-            # Generate arrival dates for the next N months
+            # Arrival horizon for the next N months; the old fixed grid
+            # (every DATE_STEP days x DURATIONS) is the request budget. The
+            # planner hands over to that grid before the budget could leave
+            # the end of the horizon unrequested.
             today = datetime.now().date()
+            first_arrival = today + timedelta(days=1)  # Start from tomorrow
             end_date = today + timedelta(days=months_ahead * 30)
-
-            arrival_dates = []
-            current = today + timedelta(days=1)  # Start from tomorrow
-            while current <= end_date:
-                arrival_dates.append(current)
-                current += timedelta(days=DATE_STEP)
-
-            total_requests = len(arrival_dates) * len(DURATIONS)
+            budget = ((end_date - first_arrival).days // DATE_STEP + 1) * len(DURATIONS)
+
+            # Each Search call returns nearby stays: pick the request that
+            # covers the most open (arrival, nights) cells next
+            planner = CoveragePlanner(
+                first_arrival, end_date, DURATIONS,
+                window=(0, DATE_STEP - 1), per_duration=True, max_requests=budget,
+                grid_step=DATE_STEP,
+            )
             self.logger.info(
-                f"  {len(arrival_dates)} arrival dates x {len(DURATIONS)} durations "
-                f"= {total_requests} API calls"
+                f"  Horizon {first_arrival} - {end_date}, max {budget} API calls"
             )
+            progress = ProgressLog(self.logger, total=budget, unit="requests")
+
+            def _cells(records):
+                return [(r["check_in"], r["duration"]) for r in records]
+
+            def _ingest(best):
+                ingest.add([
+                    self._make_record(
+                        r["check_in"].strftime("%Y-%m-%d"), r["check_out"].strftime("%Y-%m-%d"),
+                        r["price"],
+                        min_nights=r["duration"],
+                        persons=self.persons,
+                    )
+                    for r in best
+                ])
+
+            # Units (arrival/duration) completed earlier today carry their
+            # best records as checkpoint payload; they count as covered.
+            done = self._load_checkpoints()
+            for unit, payload in done.items():
+                restored = self._records_from_json(payload or [])
+                _ingest(restored)
+                try:
+                    date_str, _, nights = unit.partition("/")
+                    request = (datetime.strptime(date_str, "%Y-%m-%d").date(),
+                               int(nights.rstrip("n")))
+                except ValueError:
+                    continue
+                planner.record(request, _cells(restored))
+
+            def _unit_done(unit, data, duration):
+                # Product choice per response; the same stay from overlapping
+                # responses is resolved by the ingest sink (cheapest wins)
+                with self.metrics.timed("parse"):
+                    raw = self._extract_prices(data, duration)
+                    best = self._select_best_product(raw)
+                _ingest(best)
+                self._checkpoint(unit, self._records_to_json(best))
+                return raw
+
+            session_ready = False
+            while (request := planner.next_request()) is not None:
+                arrival, duration = request
+                if not session_ready:
+                    self._get_session()
+                    session_ready = True
+                date_str = arrival.strftime("%Y-%m-%d")
+                request_count += 1
+                unit = f"{date_str}/{duration}n"
+                raw = None
 
-            for i, arrival in enumerate(arrival_dates):
-                for duration in DURATIONS:
-                    request_count += 1
-                    date_str = arrival.strftime("%Y-%m-%d")
-
-                    try:
-                        self._wait_rate_limit()
-                        data = self._search(date_str, duration)
-                        raw = self._extract_prices(data, duration)
-                        all_raw_records.extend(raw)
-
-                        if request_count % 25 == 0:
-                            self.logger.info(
-                                f"  Progress: {request_count}/{total_requests} requests, "
-                                f"{len(all_raw_records)} raw records so far"
-                            )
+                try:
+                    self._wait_rate_limit()
+                    data = self._search(date_str, duration)
+                    raw = _unit_done(unit, data, duration)
 
-                    except requests.exceptions.HTTPError as e:
-                        if e.response is not None and e.response.status_code == 429:
-                            self.logger.warning(
-                                f"  Rate limited at request {request_count}, "
-                                f"waiting 10s..."
-                            )
+                except requests.exceptions.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 429:
+                        self.logger.warning(
+                            f"  Rate limited at request {request_count}, retrying once..."
+                        )
+                        if self._rate_controller is None:
                             time.sleep(10)
-                            # Retry once
-                            try:
-                                data = self._search(date_str, duration)
-                                raw = self._extract_prices(data, duration)
-                                all_raw_records.extend(raw)
-                            except Exception as retry_e:
-                                errors += 1
-                                self.logger.error(
-                                    f"  Retry failed for {date_str}/{duration}n: {retry_e}"
-                                )
-                        elif e.response is not None and e.response.status_code == 403:
-                            self.logger.warning(
-                                f"  Session expired at request {request_count}, "
-                                f"refreshing..."
+                        # Retry once
+                        try:
+                            data = self._search(date_str, duration)
+                            raw = _unit_done(unit, data, duration)
+                        except Exception as retry_e:
+                            errors += 1
+                            self.logger.error(
+                                f"  Retry failed for {date_str}/{duration}n: {retry_e}"
                             )
-                            try:
-                                self._get_session()
-                                data = self._search(date_str, duration)
-                                raw = self._extract_prices(data, duration)
-                                all_raw_records.extend(raw)
-                            except Exception as retry_e:
-                                errors += 1
-                                self.logger.error(
-                                    f"  Session refresh failed: {retry_e}"
-                                )
-                        else:
+                    elif e.response is not None and e.response.status_code == 403:
+                        self.logger.warning(
+                            f"  Session expired at request {request_count}, "
+                            f"refreshing..."
+                        )
+                        try:
+                            self._get_session(force=True)
+                            data = self._search(date_str, duration)
+                            raw = _unit_done(unit, data, duration)
+                        except Exception as retry_e:
                             errors += 1
-                            self.logger.warning(
-                                f"  HTTP error for {date_str}/{duration}n: {e}"
+                            self.logger.error(
+                                f"  Session refresh failed: {retry_e}"
                             )
-                    except Exception as e:
+                    else:
                         errors += 1
                         self.logger.warning(
-                            f"  Error for {date_str}/{duration}n: {e}"
+                            f"  HTTP error for {date_str}/{duration}n: {e}"
                         )
+                except Exception as e:
+                    errors += 1
+                    self.logger.warning(
+                        f"  Error for {date_str}/{duration}n: {e}"
+                    )
 
-            # Deduplicate and select best product per (check_in, check_out)
-            self.logger.info(
-                f"  Raw records: {len(all_raw_records)}, deduplicating..."
-            )
-            best_records = self._select_best_product(all_raw_records)
-            self.logger.info(
-                f"  After dedup/selection: {len(best_records)} records"
-            )
+                planner.record(request, _cells(raw or []), failed=raw is None)
+                progress.update(stays=len(ingest))
 
-            # Save to database
-            for rec in best_records:
-                try:
-                    saved = {
-                        "competitor_name": self.competitor_name,
-                        "accommodation_type": self.accommodation_type,
-                        "check_in_date": rec["check_in"].strftime("%Y-%m-%d"),
-                        "check_out_date": rec["check_out"].strftime("%Y-%m-%d"),
-                        "price": rec["price"],
-                        "available": True,
-                        "min_nights": rec["duration"],
-                        "special_offers": None,
-                        "persons": self.persons,
-                        "segment": self.segment,
-                    }
-                    self.db.save_price(**saved)
-                    all_saved_records.append(saved)
-                except Exception as e:
-                    self.logger.warning(f"  Failed to save record: {e}")
+            progress.done()
+            self.logger.info(planner.format_stats())
 
         except Exception as e:
             errors += 1
             self.logger.error(f"  Scraping failed: {e}", exc_info=True)
 
+        all_saved_records = ingest.close()
+        errors += ingest.errors
+        self.logger.info(ingest.format_stats())
         duration_s = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_saved_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_saved_records),
             error_message=f"{errors} errors" if errors else None,
             duration_seconds=duration_s,
             segment=self.segment,
+            resumed=bool(done),
         )
 
         self.logger.info(
@@ -1,20 +1,27 @@
 """Scraper for Center Parcs Parc Sandur — Comfort cottage SR390 6p.
 
-Uses the flexCalendar API at cpe-search-api.groupepvcp.com, routed through
-a Playwright browser session to bypass Akamai Bot Manager protection.
+Uses the flexCalendar API at cpe-search-api.groupepvcp.com, protected by
+Akamai Bot Manager.
 
-The browser loads the Center Parcs page first to establish Akamai cookies,
-then uses page.evaluate(fetch(...)) to call the API with those cookies.
+A Playwright browser loads the Center Parcs page once to mint the
+SEARCH_TOKEN and Akamai cookies; both are cached (scrapers/credential_cache.py).
+The flexCalendar calls for all durations then go concurrently over a pooled
+requests.Session. Only if the API keeps answering 403 (also with a fresh
+token) does the scraper fall back to page.evaluate(fetch(...)) in the browser.
 
 One API call per duration returns all available dates with prices at once.
 """
 
-import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from scrapers.base_scraper import BaseScraper
+from scrapers.credential_cache import apply_cookies, get_cache
 from database import Database
 
 logger = logging.getLogger(__name__)
@@ -34,6 +41,12 @@ class CenterParcsScraper(BaseScraper):
     TOKEN_PAGE = "https://www.centerparcs.nl/nl-nl/nederland/fp_SR_vakantiepark-parc-sandur.htm"
 
     STAY_DURATIONS = [2, 3, 4, 5, 7]
+    # SEARCH_TOKEN + Akamai cookies, shared by all Center Parcs scrapers
+    CREDENTIALS_KEY = "centerparcs:token"
+    CREDENTIALS_TTL = 6 * 3600
+    # flexCalendar over pooled HTTP (False = always fetch inside the browser)
+    HTTP_MODE = True
+    HTTP_WORKERS = 5
 
     def __init__(self, db: Database, headless: bool = True,
                  housing_code: str = "SR390",
@@ -94,19 +107,183 @@ class CenterParcsScraper(BaseScraper):
 
         return results
 
+    def _mint_token(self, page) -> str:
+        """Load the Center Parcs page for Akamai cookies and the SEARCH_TOKEN.
+
+        Token and browser cookies are stored in the credential cache.
+        """
+        self.logger.info("  Loading Center Parcs page for Akamai session...")
+        page.goto(self.TOKEN_PAGE, wait_until="networkidle", timeout=60000)
+        time.sleep(3)
+
+        # Extract search token from page
+        token = page.evaluate("""() => {
+            for (const s of document.querySelectorAll('script')) {
+                const m = s.textContent.match(/SEARCH_TOKEN['"\\s:]+['"](\\w{20,})['"]/);
+                if (m) return m[1];
+            }
+            return null;
+        }""")
+
+        if not token:
+            self.logger.error("  Could not find SEARCH_TOKEN in page")
+            raise RuntimeError("SEARCH_TOKEN not found")
+
+        self.logger.info(f"  Token: {token[:8]}...")
+        return token
+
+    def _mint_credentials(self) -> dict:
+        """Open a browser only to harvest the token and Akamai cookies."""
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as playwright:
+            browser = self._create_browser(playwright)
+            try:
+                page = self._create_page(browser)
+                token = self._mint_token(page)
+                return {"token": token, "cookies": page.context.cookies()}
+            finally:
+                browser.close()
+
+    def _http_session(self, creds: dict) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/131.0.0.0 Safari/537.36"
+            ),
+            "Accept": "application/json",
+            "Origin": "https://www.centerparcs.nl",
+            "Referer": self.TOKEN_PAGE,
+        })
+        apply_cookies(session, creds.get("cookies"))
+        session.mount("https://", HTTPAdapter(pool_maxsize=self.HTTP_WORKERS))
+        self._use_adaptive_rate(session, self.API_BASE, base_interval=0.1)
+        return session
+
+    def _fetch_http(self, creds: dict, persons: int,
+                    housing_codes: list[str] = None) -> dict:
+        """Fetch the flexCalendar for all (housing, duration) pairs concurrently.
+
+        Returns {(housing, duration): json} with {"error": status} on failure.
+        """
+        session = self._http_session(creds)
+        pairs = [
+            (housing, duration)
+            for housing in (housing_codes or [self.housing_code])
+            for duration in self.STAY_DURATIONS
+        ]
+
+        def _get(pair):
+            housing, duration = pair
+            params = {
+                "univers": "cpe", "language": "nl", "market": "nl",
+                "token": creds["token"], "currency": "EUR", "residence": "SR",
+                "housing": housing, "duration": duration, "adults": persons,
+                "children": 0, "babies": 0,
+            }
+            try:
+                resp = session.get(self.API_BASE, params=params, timeout=30)
+            except requests.RequestException as e:
+                return pair, {"error": str(e)}
+            if not resp.ok:
+                return pair, {"error": resp.status_code}
+            try:
+                return pair, resp.json()
+            except ValueError:
+                # Akamai challenge page instead of JSON
+                return pair, {"error": 403}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.HTTP_WORKERS) as executor:
+                return dict(executor.map(_get, pairs))
+        finally:
+            session.close()
+
+    def _run_http(self, persons: int) -> dict | None:
+        """flexCalendar over pooled HTTP; None if the API keeps answering 403."""
+        cache = get_cache()
+        for attempt in range(2):
+            creds, fresh = cache.get_or_refresh(
+                self.CREDENTIALS_KEY, self._mint_credentials,
+                ttl=self.CREDENTIALS_TTL, force=attempt > 0,
+            )
+            fetched = self._fetch_http(creds, persons)
+            results = {str(d): fetched[(self.housing_code, d)] for d in self.STAY_DURATIONS}
+            if not any(r.get("error") == 403 for r in results.values()):
+                return results
+            self.logger.warning(
+                f"  HTTP 403 with {'fresh' if fresh else 'cached'} token"
+            )
+            if fresh:
+                break
+        return None
+
+    def _fetch_browser(self, persons: int) -> dict:
+        """Browser fallback: flexCalendar via fetch() inside the page."""
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as playwright:
+            browser = self._create_browser(playwright)
+            try:
+                page = self._create_page(browser)
+                token = self._mint_token(page)
+                get_cache().put(
+                    self.CREDENTIALS_KEY,
+                    {"token": token, "cookies": page.context.cookies()},
+                    ttl=self.CREDENTIALS_TTL,
+                )
+                return self._fetch_durations(page, token, persons)
+            finally:
+                browser.close()
+
+    def _fetch_durations(self, page, token: str, persons: int) -> dict:
+        """Fetch the flexCalendar for every duration via fetch() in the page."""
+        return page.evaluate("""async (params) => {
+            const results = {};
+            for (const duration of params.durations) {
+                try {
+                    const url = params.apiBase
+                        + '?univers=cpe&language=nl&market=nl'
+                        + '&token=' + params.token
+                        + '&currency=EUR&residence=SR'
+                        + '&housing=' + params.housing
+                        + '&duration=' + duration
+                        + '&adults=' + params.adults
+                        + '&children=0&babies=0';
+                    const resp = await fetch(url);
+                    if (resp.ok) {
+                        results[duration] = await resp.json();
+                    } else {
+                        results[duration] = {error: resp.status};
+                    }
+                } catch(e) {
+                    results[duration] = {error: e.message};
+                }
+            }
+            return results;
+        }""", {
+            "apiBase": self.API_BASE,
+            "token": token,
+            "housing": self.housing_code,
+            "adults": persons,
+            "durations": self.STAY_DURATIONS,
+        })
+
     def scrape_price(self, page, check_in, check_out, persons=6):
         raise NotImplementedError("Use run_efficient()")
 
     def run_efficient(self, months_ahead: int = 12, persons: int = 6,
                       **kwargs) -> list[dict]:
-        """Scrape prices by loading CP page in browser, then fetching API via JS.
+        """Scrape prices from the flexCalendar API.
 
-        The browser session carries Akamai cookies that allow API access.
+        The browser is only used to mint the token and Akamai cookies
+        (cached); the API calls go over pooled HTTP. Only when the API keeps
+        answering 403 are the calls made from inside the browser page.
         """
-        from playwright.sync_api import sync_playwright
-
         self.logger.info(
-            f"Starting browser-based scrape for {self.competitor_name} "
+            f"Starting scrape for {self.competitor_name} "
             f"({self.housing_code}, segment={self.segment})"
         )
 
@@ -114,105 +291,48 @@ class CenterParcsScraper(BaseScraper):
         all_records = []
         errors = 0
 
-        with sync_playwright() as playwright:
-            browser = self._create_browser(playwright)
-            try:
-                page = self._create_page(browser)
-
-                # Load Center Parcs page to establish Akamai session
-                self.logger.info("  Loading Center Parcs page for Akamai session...")
-                page.goto(self.TOKEN_PAGE, wait_until="networkidle", timeout=60000)
-                time.sleep(3)
-
-                # Extract search token from page
-                token = page.evaluate("""() => {
-                    for (const s of document.querySelectorAll('script')) {
-                        const m = s.textContent.match(/SEARCH_TOKEN['"\\s:]+['"](\\w{20,})['"]/);
-                        if (m) return m[1];
-                    }
-                    return null;
-                }""")
-
-                if not token:
-                    self.logger.error("  Could not find SEARCH_TOKEN in page")
-                    raise RuntimeError("SEARCH_TOKEN not found")
-
-                self.logger.info(f"  Token: {token[:8]}...")
-
-                # Fetch prices for each duration via browser fetch
-                durations_json = json.dumps(self.STAY_DURATIONS)
-                results = page.evaluate("""async (params) => {
-                    const results = {};
-                    for (const duration of params.durations) {
-                        try {
-                            const url = params.apiBase
-                                + '?univers=cpe&language=nl&market=nl'
-                                + '&token=' + params.token
-                                + '&currency=EUR&residence=SR'
-                                + '&housing=' + params.housing
-                                + '&duration=' + duration
-                                + '&adults=' + params.adults
-                                + '&children=0&babies=0';
-                            const resp = await fetch(url);
-                            if (resp.ok) {
-                                results[duration] = await resp.json();
-                            } else {
-                                results[duration] = {error: resp.status};
-                            }
-                        } catch(e) {
-                            results[duration] = {error: e.message};
-                        }
-                    }
-                    return results;
-                }""", {
-                    "apiBase": self.API_BASE,
-                    "token": token,
-                    "housing": self.housing_code,
-                    "adults": persons,
-                    "durations": self.STAY_DURATIONS,
-                })
-
-                for duration in self.STAY_DURATIONS:
-                    data = results.get(str(duration), {})
-                    if "error" in data:
-                        errors += 1
-                        self.logger.error(
-                            f"  Duration {duration}n failed: {data['error']}"
-                        )
-                        continue
-
-                    prices = self._parse_api_response(data, duration)
-                    self.logger.info(
-                        f"  Duration {duration}n: {len(prices)} dates"
+        try:
+            results = self._run_http(persons) if self.HTTP_MODE else None
+            if results is None:
+                self.logger.info("  Browser fallback for flexCalendar calls...")
+                results = self._fetch_browser(persons)
+
+            for duration in self.STAY_DURATIONS:
+                data = results.get(str(duration), {})
+                if "error" in data:
+                    errors += 1
+                    self.logger.error(
+                        f"  Duration {duration}n failed: {data['error']}"
+                    )
+                    continue
+
+                prices = self._parse_api_response(data, duration)
+                self.logger.info(
+                    f"  Duration {duration}n: {len(prices)} dates"
+                )
+
+                for p in prices:
+                    record = self._make_record(
+                        p["check_in"].strftime("%Y-%m-%d"), p["check_out"].strftime("%Y-%m-%d"),
+                        p["price"],
+                        available=p["available"],
+                        min_nights=p["duration"],
+                        special_offers=p["special_offers"],
+                        persons=persons,
                     )
+                    self.db.save_record(record)
+                    all_records.append(record)
 
-                    for p in prices:
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": p["check_in"].strftime("%Y-%m-%d"),
-                            "check_out_date": p["check_out"].strftime("%Y-%m-%d"),
-                            "price": p["price"],
-                            "available": p["available"],
-                            "min_nights": p["duration"],
-                            "special_offers": p["special_offers"],
-                            "persons": persons,
-                            "segment": self.segment,
-                        }
-                        self.db.save_price(**record)
-                        all_records.append(record)
-
-            except Exception as e:
-                errors += 1
-                self.logger.error(f"  Scraping failed: {e}", exc_info=True)
-            finally:
-                browser.close()
+        except Exception as e:
+            errors += 1
+            self.logger.error(f"  Scraping failed: {e}", exc_info=True)
 
         duration_s = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors} errors" if errors else None,
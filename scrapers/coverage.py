@@ -0,0 +1,250 @@
+"""Coverage-gestuurde planning van API-requests.
+
+Capfun, De Kleine Wolf en Molecaten geven per request een venster aan
+verblijven terug (nabije aankomstdata, meerdere duren). Vaste stappen van
+7 dagen vragen daardoor deels dezelfde data opnieuw op, of laten gaten.
+
+``CoveragePlanner`` houdt per (aankomstdatum, nachten) bij wat al gedekt is
+en kiest steeds het request dat de meeste nog open cellen oplevert:
+
+- het vroegste open cel is het anker; kandidaten zijn de aankomstdata
+  waarvan het (geleerde) venster dat anker bevat
+- het venster wordt geleerd uit de offsets van teruggegeven aankomstdata
+  t.o.v. de opgevraagde datum (vooraf: ``window``)
+- cellen binnen het (verwachte) venster van een request die niet
+  terugkomen, zijn niet te boeken en worden niet opnieuw nagejaagd
+- klaar als elke cel in de horizon gedekt of afgevallen is, of het budget
+  (``max_requests``) op is
+- met ``grid_step`` mag het budget de dekking nooit onder die van het vaste
+  raster drukken: zodra het resterende budget net genoeg is voor het raster
+  (elke ``grid_step`` dagen vanaf het anker), gaat de planner over op dat
+  raster tot het einde van de horizon
+
+Usage:
+    planner = CoveragePlanner(start, end, [2, 3, 4, 7], window=(-3, 3))
+    while (request := planner.next_request()) is not None:
+        arrival, nights = request
+        cells = [(r["check_in"], r["nights"]) for r in fetch(arrival)]
+        planner.record(request, cells)
+    logger.info(planner.format_stats())
+"""
+
+from collections import deque
+from datetime import date, datetime, timedelta
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    return value
+
+
+class CoveragePlanner:
+    """Greedy request planner over (check_in, nights) cells.
+
+    Args:
+        start, end: horizon of arrival dates (inclusive)
+        durations: target stay lengths
+        window: assumed (min, max) day offset of returned arrivals relative
+            to the requested date, until real responses are seen
+        per_duration: True if a request is for one stay length (Capfun);
+            False if one request returns all durations (Kleine Wolf)
+        max_requests: request budget (None = unlimited)
+        grid_step: fixed grid (days) the budget falls back to; the grid is
+            always completed, so coverage never drops below the grid's
+    """
+
+    def __init__(self, start, end, durations: list[int], window: tuple[int, int] = (0, 0),
+                 per_duration: bool = False, max_requests: int = None,
+                 grid_step: int = None):
+        self.start = _as_date(start)
+        self.end = _as_date(end)
+        self.durations = list(durations)
+        self.per_duration = per_duration
+        self.max_requests = max_requests
+        self.grid_step = grid_step
+        self.grid_from = None    # anchor date where the grid took over
+        self._grid = None        # pending grid requests once switched
+        self._prior = window
+        self._ranges = []        # (lo, hi) offsets per non-empty response
+
+        days = (self.end - self.start).days + 1
+        self._cells = [
+            (self.start + timedelta(days=i), n)
+            for i in range(max(days, 0)) for n in self.durations
+        ]
+        self._target = set(self._cells)
+        self.covered = set()
+        self.empty = set()       # probed, never returned
+        self.attempted = set()
+        self.requests = 0
+        self._anchor = 0         # index into _cells; everything before is resolved
+
+    @property
+    def window(self) -> tuple[int, int]:
+        """Expected offsets of a response: median of the observed ranges."""
+        if not self._ranges:
+            return self._prior
+        los = sorted(lo for lo, _ in self._ranges)
+        his = sorted(hi for _, hi in self._ranges)
+        return los[len(los) // 2], his[len(his) // 2]
+
+    def _is_open(self, cell) -> bool:
+        return cell not in self.covered and cell not in self.empty
+
+    def _request_cells(self, request) -> set:
+        """Cells a request is expected to return (current window)."""
+        arrival, nights = request
+        lo, hi = self.window
+        lengths = [nights] if self.per_duration else self.durations
+        return {
+            (arrival + timedelta(days=o), n)
+            for o in range(lo, hi + 1) for n in lengths
+        } & self._target
+
+    def first_open(self):
+        """Earliest (check_in, nights) cell not yet covered or ruled out."""
+        while self._anchor < len(self._cells) and not self._is_open(self._cells[self._anchor]):
+            self._anchor += 1
+        return self._cells[self._anchor] if self._anchor < len(self._cells) else None
+
+    def _grid_requests(self) -> list:
+        """Fixed-grid requests for the rest of the horizon.
+
+        The grid keeps the phase of a fixed grid from ``start`` (what the
+        budget was sized on); per stay length (or once, without
+        per_duration) it starts at the grid date whose step holds the
+        earliest open arrival.
+        """
+        lengths = self.durations if self.per_duration else [None]
+        firsts = {}
+        for cell in self._cells[self._anchor:]:
+            if self._is_open(cell):
+                firsts.setdefault(cell[1] if self.per_duration else None, cell[0])
+                if len(firsts) == len(lengths):
+                    break
+        requests = []
+        last = (self.end - self.start).days // self.grid_step
+        for nights, first in firsts.items():
+            k_first = (first - self.start).days // self.grid_step
+            requests += [(self.start + timedelta(days=k * self.grid_step), nights)
+                         for k in range(k_first, last + 1)]
+        return sorted(
+            (r for r in requests if r not in self.attempted),
+            key=lambda r: (r[0], r[1] or 0),
+        )
+
+    def _next_grid(self):
+        while self._grid:
+            request = self._grid.popleft()
+            if request not in self.attempted:
+                return request
+        return None
+
+    def next_request(self):
+        """(arrival, nights) to request next; nights is None unless per_duration.
+
+        Returns None when the horizon is resolved or the budget is spent
+        (with ``grid_step``: when the fallback grid is done).
+        """
+        while True:
+            if self._grid is not None:
+                return self._next_grid()
+            budgeted = self.max_requests is not None
+            if budgeted and self.grid_step is None and self.requests >= self.max_requests:
+                return None
+            anchor = self.first_open()
+            if anchor is None:
+                return None
+            anchor_date, anchor_nights = anchor
+            if budgeted and self.grid_step is not None:
+                # Hand over to the grid once the budget left is no longer
+                # more than the grid over the rest of the horizon needs (the
+                # grid may then overrun the budget by one request)
+                grid = self._grid_requests()
+                if self.max_requests - self.requests < len(grid):
+                    self.grid_from = anchor_date
+                    self._grid = deque(grid)
+                    continue
+            nights = anchor_nights if self.per_duration else None
+            lo, hi = self.window
+
+            best, best_gain = None, 0
+            for offset in range(lo, hi + 1):
+                arrival = anchor_date - timedelta(days=offset)
+                if arrival < self.start:
+                    continue
+                request = (arrival, nights)
+                if request in self.attempted:
+                    continue
+                gain = sum(1 for cell in self._request_cells(request) if self._is_open(cell))
+                # Ties: the later arrival reaches further into the horizon
+                if gain > best_gain or (gain == best_gain and gain and arrival > best[0]):
+                    best, best_gain = request, gain
+            if best is not None:
+                return best
+            # Every request that could return the anchor was already made
+            self.empty.add(anchor)
+
+    def record(self, request, cells=(), failed: bool = False) -> int:
+        """Register a response; returns the number of newly covered cells.
+
+        ``cells`` are the (check_in, nights) pairs that came back. Cells
+        within the span of returned arrivals that did not come back are
+        ruled out; an empty or failed response rules out the requested
+        arrival itself, so the planner always moves on.
+        """
+        arrival, nights = request
+        expected = self._request_cells(request)   # window the request was chosen on
+        self.attempted.add(request)
+        self.requests += 1
+        returned = {(_as_date(d), n) for d, n in cells}
+
+        new = returned & self._target - self.covered
+        self.covered |= new
+        if failed:
+            lengths = [nights] if nights is not None else self.durations
+            self.empty |= {(arrival, n) for n in lengths} & self._target - self.covered
+            return len(new)
+        if returned:
+            offsets = [(d - arrival).days for d, _ in returned]
+            lo, hi = min(offsets), max(offsets)
+            self._ranges.append((lo, hi))
+            # Rule out what this response (or its expected window) spanned
+            # but did not contain
+            lengths = [nights] if nights is not None else self.durations
+            spanned = {
+                (arrival + timedelta(days=o), n)
+                for o in range(lo, hi + 1) for n in lengths
+            } & self._target
+            self.empty |= (spanned | expected) - self.covered
+        else:
+            lengths = [nights] if nights is not None else self.durations
+            self.empty |= {(arrival, n) for n in lengths} & self._target - self.covered
+        return len(new)
+
+    def stats(self) -> dict:
+        total = len(self._target)
+        open_cells = total - len(self.covered) - len(self.empty - self.covered)
+        return {
+            "cells": total,
+            "covered": len(self.covered),
+            "empty": len(self.empty - self.covered),
+            "open": open_cells,
+            "requests": self.requests,
+            "coverage_pct": 100.0 * len(self.covered) / total if total else 0.0,
+            "cells_per_request": len(self.covered) / self.requests if self.requests else 0.0,
+            "window": self.window,
+            "grid_from": self.grid_from,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"  Coverage: {s['covered']}/{s['cells']} cellen ({s['coverage_pct']:.0f}%), "
+            f"{s['empty']} niet boekbaar, {s['open']} open, {s['requests']} requests "
+            f"({s['cells_per_request']:.1f} cellen/request, venster {s['window']})"
+            + (f", vast raster vanaf {s['grid_from']}" if s["grid_from"] else "")
+        )
@@ -0,0 +1,206 @@
+"""Gedeelde cache voor sessies, cookies en tokens van de API-scrapers.
+
+De warm-up van een API-scraper (Landal-homepage voor cookies, Capfun
+PHPSESSID via de browser, RCN basispagina, Center Parcs SEARCH_TOKEN) is
+duur en werd per scraper per poging herhaald. Deze module bewaart het
+resultaat op schijf (``data/credentials.json``) met een TTL per entry,
+zodat alle scrapers van hetzelfde park of platform — ook in andere worker-
+processen en in retries — dezelfde credentials hergebruiken.
+
+Een entry is een dict met optioneel ``cookies`` (lijst van
+{name, value, domain, path}), ``token``, ``headers`` en vrije velden.
+Is een gecachete entry toch verlopen (401/403 bij eerste gebruik), dan
+roept de scraper ``invalidate()`` aan en haalt hij verse credentials op.
+
+Usage:
+    cache = get_cache()
+    creds = cache.get_or_refresh("landal:www.landal.nl", warm_up, ttl=12 * 3600)
+    apply_cookies(session, creds.get("cookies"))
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+logger = logging.getLogger("credential_cache")
+
+DEFAULT_PATH = "data/credentials.json"
+DEFAULT_TTL = 12 * 3600
+
+
+class CredentialCache:
+    """JSON-bestand met credentials per sleutel (thread- en process-safe).
+
+    Args:
+        path: pad naar het JSON-bestand
+        enabled: False = nooit lezen of schrijven (altijd verse warm-up)
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, default=str)
+        os.replace(tmp, self.path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock across processes (``<path>.lock``) for read-modify-write.
+
+        Isolation workers share the file; without it two writers can each
+        drop the other's entry. Best effort: no lock if the lock file can't
+        be opened.
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            f = open(f"{self.path}.lock", "a+")
+        except OSError as e:
+            logger.debug("Geen lock op %s: %s", self.path, e)
+            yield
+            return
+        with f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> dict | None:
+        """Cached credentials for ``key``, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._read().get(key)
+        if not entry or entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("credentials")
+
+    def put(self, key: str, credentials: dict, ttl: float = DEFAULT_TTL):
+        """Store credentials for ``key`` for ``ttl`` seconds."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock, self._file_lock():
+            data = self._read()
+            # Verlopen entries meteen opruimen
+            data = {k: v for k, v in data.items() if v.get("expires_at", 0) > now}
+            data[key] = {
+                "created_at": now,
+                "expires_at": now + ttl,
+                "credentials": credentials,
+            }
+            try:
+                self._write(data)
+            except OSError as e:
+                logger.warning(f"Credential cache niet geschreven ({self.path}): {e}")
+
+    def invalidate(self, key: str):
+        """Drop ``key`` (stale credentials detected on first use)."""
+        if not self.enabled:
+            return
+        with self._lock, self._file_lock():
+            data = self._read()
+            if data.pop(key, None) is not None:
+                try:
+                    self._write(data)
+                except OSError as e:
+                    logger.warning(f"Credential cache niet geschreven ({self.path}): {e}")
+
+    def get_or_refresh(self, key: str, refresh, ttl: float = DEFAULT_TTL,
+                       force: bool = False) -> tuple[dict, bool]:
+        """Return (credentials, fresh).
+
+        ``refresh()`` is called (once per key, even with concurrent callers)
+        when there is no valid entry or ``force`` is set; its result is stored.
+        """
+        with self._key_lock(key):
+            if not force:
+                cached = self.get(key)
+                if cached is not None:
+                    logger.debug("Credentials uit cache: %s", key)
+                    return cached, False
+            credentials = refresh()
+            self.put(key, credentials, ttl)
+            return credentials, True
+
+
+def session_cookies(session, domain: str = None) -> list[dict]:
+    """Cookies of a requests.Session as JSON-serialisable dicts."""
+    return [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in session.cookies
+        if domain is None or (c.domain or "").lstrip(".").endswith(domain)
+    ]
+
+
+def apply_cookies(session, cookies: list[dict] | None):
+    """Load cached cookies into a requests.Session."""
+    for c in cookies or []:
+        session.cookies.set(c["name"], c["value"], domain=c.get("domain") or "",
+                            path=c.get("path") or "/")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure(path: str = None, enabled: bool = None):
+    """Set path/enabled of the shared cache (config: scraping.credential_cache)."""
+    global _cache
+    with _cache_lock:
+        current = _cache or CredentialCache()
+        _cache = CredentialCache(
+            path=path or current.path,
+            enabled=current.enabled if enabled is None else enabled,
+        )
+
+
+def get_cache() -> CredentialCache:
+    """Shared cache for this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CredentialCache()
+        return _cache
@@ -54,6 +54,7 @@ class HolidayAgentScraper(BaseScraper):
             "Accept": "application/json",
             "Referer": url,
         })
+        self._use_adaptive_rate(self.session, self.api_base, base_interval=0.2)
         # For accommodations: additionalPrice = extra-guest surcharge (add to total)
         # For camping pitches: additionalPrice = tourist tax (already in totalPrice)
         self.add_additional_price = True
@@ -68,7 +69,7 @@ class HolidayAgentScraper(BaseScraper):
             f"&amount-of-months={months_ahead}"
             f"&includes%5B%5D=specialperiods"
         )
-        self.logger.debug(f"Fetching arrivals: {api_url}")
+        self.logger.debug("Fetching arrivals: %s", api_url)
 
         resp = self.session.get(api_url, timeout=30)
         resp.raise_for_status()
@@ -139,19 +140,15 @@ class HolidayAgentScraper(BaseScraper):
                         if discount_price and discount_price > 0:
                             special_offers = f"Korting: EUR {discount_price:.0f}"
 
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": check_in_dt.strftime("%Y-%m-%d"),
-                            "check_out_date": check_out_dt.strftime("%Y-%m-%d"),
-                            "price": total_price,
-                            "available": amount_available > 0 and total_price is not None,
-                            "min_nights": nights,
-                            "special_offers": special_offers,
-                            "persons": persons,
-                            "segment": getattr(self, 'segment', 'accommodatie'),
-                        }
-                        self.db.save_price(**record)
+                        record = self._make_record(
+                            check_in_dt.strftime("%Y-%m-%d"), check_out_dt.strftime("%Y-%m-%d"),
+                            total_price,
+                            available=amount_available > 0 and total_price is not None,
+                            min_nights=nights,
+                            special_offers=special_offers,
+                            persons=persons,
+                        )
+                        self.db.save_record(record)
                         all_records.append(record)
                     except (TypeError, ValueError, KeyError) as e:
                         self.logger.warning(f"  Skipping malformed departure: {e}")
@@ -166,6 +163,7 @@ class HolidayAgentScraper(BaseScraper):
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=str(errors) + " errors" if errors else None,
@@ -0,0 +1,199 @@
+"""Gedeelde ingest-sink: ontdubbelen, conflicten oplossen, batchgewijs wegschrijven.
+
+Scrapers kregen dezelfde verblijven vaak meerdere keren binnen (overlappende
+vensters, NUXT-data van andere pagina's, ongefilterde + gefilterde
+zoekopdrachten) en ontdubbelden dat elk op hun eigen manier met ``seen_keys``
+sets naast een lijst records. ``IngestSink`` doet dat op één plek:
+
+- sleutel per record: de tuple (competitor, check-in, check-out, segment),
+  dezelfde sleutel als de UNIQUE-constraint van ``prices`` (per scrape-datum)
+- records mogen in willekeurige volgorde binnenkomen; bij een conflict
+  beslist de policy van de scraper (``BaseScraper.INGEST_POLICY``):
+
+  - ``first``: het eerste record blijft (standaard)
+  - ``cheapest``: de laagste prijs wint (beschikbaar gaat voor)
+  - ``prefer_promo``: een record met aanbieding wint
+  - ``prefer_available``: een beschikbaar record wint van een volgeboekt
+
+- winnaars gaan in batches naar de sink (``Database.save_prices_batch``);
+  verliest een al weggeschreven record alsnog, dan wordt de winnaar opnieuw
+  geschreven (de upsert overschrijft)
+
+Elk record wordt één keer bewaard (in ``records``), niet in een set én een lijst.
+
+Usage:
+    ingest = IngestSink(db.save_prices_batch, policy="cheapest", name=name)
+    for response in responses:
+        new = ingest.add(parse(response))
+    records = ingest.close()
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger("ingest")
+
+DEFAULT_BATCH_SIZE = 200
+
+# (competitor_name, check_in_date, check_out_date, segment)
+StayKey = tuple[str, str, str, str]
+
+
+def stay_key(competitor_name: str, check_in_date: str, check_out_date: str,
+             segment: str) -> StayKey:
+    """Dedup key of one stay (the prices UNIQUE key within a scrape date).
+
+    The tuple itself, not its ``hash()``: two stays with colliding hashes
+    must stay two entries.
+    """
+    return (competitor_name, check_in_date, check_out_date, segment)
+
+
+def record_key(record) -> StayKey:
+    return stay_key(record["competitor_name"], record["check_in_date"],
+                    record["check_out_date"], record["segment"])
+
+
+def _rank_cheapest(record):
+    price = record["price"]
+    return (not record["available"], price is None, price or 0.0)
+
+
+def _rank_promo(record):
+    return (not record["special_offers"],)
+
+
+def _rank_available(record):
+    return (not record["available"] or record["price"] is None,)
+
+
+# Rank per policy: lower wins, ties keep the record already held
+POLICIES = {
+    "first": None,
+    "cheapest": _rank_cheapest,
+    "prefer_promo": _rank_promo,
+    "prefer_available": _rank_available,
+}
+
+
+class IngestSink:
+    """Dedup + conflict policy + batched writes for one scraper (thread-safe).
+
+    Args:
+        sink: ``sink(records)`` for one batch, e.g. ``db.save_prices_batch``
+        policy: name from POLICIES, or a ``rank(record)`` callable (lower wins)
+        batch_size: pending winners that trigger a write
+        name: label for logs
+    """
+
+    def __init__(self, sink, policy="first", batch_size: int = None, name: str = "ingest"):
+        if callable(policy):
+            self._rank = policy
+        elif policy in POLICIES:
+            self._rank = POLICIES[policy]
+        else:
+            raise ValueError(f"Onbekende ingest policy: {policy!r}")
+        self.policy = policy
+        self.sink_fn = sink
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.name = name
+        self.received = 0
+        self.duplicates = 0
+        self.replaced = 0
+        self.written = 0
+        self.errors = 0
+        self._best = {}        # key -> winning record
+        self._pending = {}     # key -> winner not yet written
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def __contains__(self, key: StayKey) -> bool:
+        return key in self._best
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    @property
+    def records(self) -> list:
+        """Current winner per stay."""
+        with self._lock:
+            return list(self._best.values())
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, records) -> int:
+        """Merge records; returns how many stays were new.
+
+        Writes a batch once ``batch_size`` winners are pending.
+        """
+        new = 0
+        with self._lock:
+            for record in records:
+                self.received += 1
+                key = record_key(record)
+                held = self._best.get(key)
+                if held is None:
+                    new += 1
+                elif self._rank is not None and self._rank(record) < self._rank(held):
+                    self.replaced += 1
+                else:
+                    self.duplicates += 1
+                    continue
+                self._best[key] = record
+                self._pending[key] = record
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+        return new
+
+    def flush(self) -> int:
+        """Write pending winners now; returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = self._pending
+                self._pending = {}
+            try:
+                self.sink_fn(list(batch.values()))
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"  {self.name}: wegschrijven mislukt ({len(batch)} records): {e}")
+                # Not written: forget them so a later duplicate is taken again
+                with self._lock:
+                    for key, record in batch.items():
+                        if self._best.get(key) is record:
+                            del self._best[key]
+                return 0
+            self.written += len(batch)
+            return len(batch)
+
+    def close(self) -> list:
+        """Write what is pending; returns the winners."""
+        self.flush()
+        return self.records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received, "stays": len(self._best),
+            "duplicates": self.duplicates, "replaced": self.replaced,
+            "written": self.written, "errors": self.errors,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"  Ingest {self.name} ({self.policy if isinstance(self.policy, str) else 'custom'}): "
+            f"{s['received']} records -> {s['stays']} verblijven, "
+            f"{s['duplicates']} dubbel, {s['replaced']} vervangen, {s['written']} geschreven"
+            + (f", {s['errors']} fouten" if s["errors"] else "")
+        )
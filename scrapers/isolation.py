@@ -0,0 +1,288 @@
+"""Domeingroepen in een eigen worker-proces met harde deadline per scraper.
+
+Playwright-scrapers draaien normaal in threads van één proces. Een hangende
+browser of een ``networkidle``-wait van 120s is vanuit een thread niet te
+annuleren, en een crash kan de hele run meenemen. Met isolatie draait elke
+domeingroep in een subproces (spawn):
+
+- de worker bouwt zijn scrapers zelf (via de registry) met een
+  ``QueueDatabase``; save_price/log_scrape gaan als berichten terug naar
+  de parent, die als enige naar SQLite schrijft
+- log records van de worker worden in de parent afgehandeld, net als de
+  rate-telemetrie per host (scrapers/rate_control.py) en, met tracing aan,
+  de spans van de worker (tracing.py)
+- overschrijdt een scraper zijn deadline, dan wordt de worker gekilld, de
+  scraper als mislukt gemarkeerd en een nieuwe worker gestart voor de rest
+  van de groep; een groep met gedeelde sessie (registry.is_shared_group)
+  is één job en faalt dan als geheel, zonder nieuwe worker
+
+Usage:
+    runner = IsolatedRunner(db, headless=True, deadline=1800)
+    run_groups(groups, scrapers, params, jobs=4, runner=runner)
+
+Let op: na een kill ruimt de Playwright-driver de browser op zodra zijn
+parent-proces weg is; er wordt niet apart op de browser gewacht.
+"""
+
+import importlib
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import time
+
+import tracing
+from scrapers import progress_log, rate_control
+from scrapers.credential_cache import get_cache
+from scrapers.registry import SCRAPERS, is_shared_group
+
+logger = logging.getLogger("orchestrator")
+
+
+class QueueDatabase:
+    """Database-proxy in de worker: stuurt schrijfacties naar de parent."""
+
+    def __init__(self, out_queue, db_path: str = None):
+        self._queue = out_queue
+        self.db_path = db_path
+
+    def save_price(self, **kwargs):
+        self._queue.put(("db", "save_price", kwargs))
+
+    def save_record(self, record):
+        self.save_prices_batch([record])
+
+    def save_prices_batch(self, records: list):
+        # PriceRecords pickle compactly (slots); one message per batch
+        self._queue.put(("db", "save_prices_batch", {"records": list(records)}))
+
+    def log_scrape(self, **kwargs):
+        self._queue.put(("db", "log_scrape", kwargs))
+
+    def save_scrape_metrics(self, **kwargs):
+        self._queue.put(("db", "save_scrape_metrics", kwargs))
+
+    def save_checkpoint(self, scraper: str, unit: str, payload=None, scrape_date: str = None):
+        self._queue.put(("db", "save_checkpoint", {
+            "scraper": scraper, "unit": unit, "payload": payload, "scrape_date": scrape_date,
+        }))
+
+    def save_checkpoints(self, scraper: str, units: list, scrape_date: str = None):
+        self._queue.put(("db", "save_checkpoints", {
+            "scraper": scraper, "units": list(units), "scrape_date": scrape_date,
+        }))
+
+    def get_checkpoints(self, scraper: str, scrape_date: str = None) -> dict:
+        # Lezen mag direct (SQLite WAL); schrijven blijft bij de parent
+        if not self.db_path:
+            return {}
+        from database import Database
+        return Database(self.db_path).get_checkpoints(scraper, scrape_date)
+
+
+class _WorkerScraperMap(dict):
+    """Bouwt scrapers in de worker op basis van registry-entries."""
+
+    def __init__(self, entries: dict, db, headless: bool):
+        super().__init__()
+        self.entries = entries
+        self.db = db
+        self.headless = headless
+
+    def __missing__(self, key):
+        entry = self.entries[key]
+        cls = getattr(importlib.import_module(entry["module"]), entry["class"])
+        scraper = cls(db=self.db, headless=self.headless)
+        scraper.scraper_key = key
+        self[key] = scraper
+        return scraper
+
+
+def _group_worker(keys: list[str], entries: dict, headless: bool, params: dict,
+                  names: dict, out_queue, log_level: int, db_path: str = None,
+                  rate_settings: dict = None, credential_settings: dict = None,
+                  progress_settings: dict = None, trace: bool = False):
+    """Worker entry point: run ``keys`` sequentially, report via ``out_queue``."""
+    from scrapers import credential_cache, progress_log, rate_control
+    from scrapers.orchestrator import run_scraper_job, run_shared_job
+
+    rate_control.configure(**(rate_settings or {}))
+    credential_cache.configure(**(credential_settings or {}))
+    progress_log.configure(**(progress_settings or {}))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(out_queue))
+    root.setLevel(log_level)
+
+    db = QueueDatabase(out_queue, db_path)
+    scrapers = _WorkerScraperMap(entries, db, headless)
+    with tracing.capture(trace) as trace_events:
+        if is_shared_group(keys):
+            # One shared session; the deadline applies to the whole group
+            out_queue.put(("start", keys[0]))
+            for key, result in run_shared_job(keys, scrapers, params, names).items():
+                out_queue.put(("done", key, result))
+            keys = []
+        for key in keys:
+            out_queue.put(("start", key))
+            result = run_scraper_job(key, scrapers, params, name=names.get(key))
+            out_queue.put(("done", key, result))
+    if trace:
+        out_queue.put(("trace", trace_events))
+    out_queue.put(("rates", rate_control.telemetry()))
+    out_queue.put(("exit",))
+
+
+class IsolatedRunner:
+    """Draait domeingroepen in subprocessen met een deadline per scraper.
+
+    Args:
+        db: Database van de parent (ontvangt alle schrijfacties)
+        headless: browser headless mode voor de workers
+        deadline: max. wall-clock seconden per scraper (None = geen limiet)
+        entries: registry-entries (standaard scrapers.registry.SCRAPERS)
+    """
+
+    def __init__(self, db, headless: bool = True, deadline: float = None,
+                 entries: dict = None):
+        self.db = db
+        self.headless = headless
+        self.deadline = deadline
+        self.entries = entries or SCRAPERS
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def _failed(self, error: str, duration: float = 0.0) -> dict:
+        return {"status": "failed", "records": 0, "available": 0,
+                "duration": duration, "error": error}
+
+    def _handle(self, msg):
+        """Verwerk een DB- of logbericht; geeft andere berichten terug."""
+        if isinstance(msg, logging.LogRecord):
+            logging.getLogger(msg.name).handle(msg)
+            return None
+        if msg[0] == "db":
+            _, method, kwargs = msg
+            getattr(self.db, method)(**kwargs)
+            return None
+        if msg[0] == "rates":
+            rate_control.merge_telemetry(msg[1])
+            return None
+        if msg[0] == "trace":
+            tracing.merge(msg[1])
+            return None
+        return msg
+
+    def _drain(self, out_queue, finish, current, started):
+        """Handle what a stopped worker left in the queue; returns (current, started)."""
+        while True:
+            try:
+                msg = self._handle(out_queue.get(timeout=0.2))
+            except queue.Empty:
+                return current, started
+            if msg and msg[0] == "done":
+                finish(msg[1], msg[2])
+                current = None
+            elif msg and msg[0] == "start":
+                current, started = msg[1], time.time()
+
+    def run_group(self, group_name: str, keys: list[str], params: dict,
+                  results: dict, names: dict = None, progress=None) -> dict:
+        """Run one domain group in worker processes; same contract as orchestrator.run_group."""
+        names = names or {}
+        group_results = {}
+        remaining = list(keys)
+
+        def _finish(key, result):
+            results[key] = result
+            group_results[key] = result
+            if key in remaining:
+                remaining.remove(key)
+            if progress:
+                progress.update(key, result)
+
+        cache = get_cache()
+        while remaining:
+            out_queue = self._ctx.Queue()
+            entries = {k: self.entries[k] for k in remaining if k in self.entries}
+            proc = self._ctx.Process(
+                target=_group_worker,
+                args=(list(remaining), entries, self.headless, params, names,
+                      out_queue, logging.getLogger().level,
+                      getattr(self.db, "db_path", None), dict(rate_control.SETTINGS),
+                      {"path": cache.path, "enabled": cache.enabled},
+                      dict(progress_log.SETTINGS), tracing.active()),
+                name=f"scrape-{group_name}",
+                daemon=True,
+            )
+            proc.start()
+            # A shared-session group is one job: if it is killed or crashes,
+            # a new worker would only rerun the whole session for the rest
+            shared = is_shared_group(remaining)
+            current, started = None, None
+            finished = False
+
+            while not finished:
+                try:
+                    msg = self._handle(out_queue.get(timeout=0.5))
+                except queue.Empty:
+                    msg = None
+                    if not proc.is_alive():
+                        # Worker is weg: lees wat er nog in de queue staat
+                        current, started = self._drain(out_queue, _finish, current, started)
+                        failed_key = current or (remaining[0] if remaining else None)
+                        if failed_key:
+                            logger.error(
+                                f"  Worker {group_name} gestopt (exit code {proc.exitcode}) "
+                                f"tijdens {f'groep {group_name}' if shared else failed_key}"
+                            )
+                            duration = time.time() - started if started else 0.0
+                            for key in list(remaining) if shared else [failed_key]:
+                                _finish(key, self._failed(
+                                    f"worker gestopt (exit code {proc.exitcode})", duration,
+                                ))
+                        break
+
+                if msg is not None:
+                    if msg[0] == "start":
+                        current, started = msg[1], time.time()
+                    elif msg[0] == "done":
+                        _finish(msg[1], msg[2])
+                        current = None
+                    elif msg[0] == "exit":
+                        finished = True
+
+                # Every iteration, not only when the queue is idle: a worker
+                # that keeps logging or writing batches must still be killed
+                if current and self.deadline and time.time() - started > self.deadline:
+                    label = f"groep {group_name}" if shared else current
+                    logger.error(
+                        f"  DEADLINE: {label} na {self.deadline:.0f}s - worker gekilld"
+                    )
+                    proc.kill()
+                    proc.join()
+                    # DB writes the scraper already sent (batches, checkpoints)
+                    # still count; only its own spans are lost with the worker
+                    overrun, overrun_started = current, started
+                    current, started = self._drain(out_queue, _finish, current, started)
+                    duration = time.time() - overrun_started
+                    tracing.add_span(group_name if shared else overrun, overrun_started,
+                                     duration, cat="scraper", status="deadline")
+                    overrun_keys = list(remaining) if shared else [overrun]
+                    for key in overrun_keys:
+                        if key in remaining:
+                            _finish(key, self._failed(
+                                f"deadline van {self.deadline:.0f}s overschreden"
+                                + (f" (groep {group_name})" if shared else ""),
+                                duration,
+                            ))
+                    break
+
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+            out_queue.close()
+
+        return group_results
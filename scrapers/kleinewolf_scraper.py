@@ -19,7 +19,10 @@ from datetime import datetime, timedelta
 import requests
 
 from scrapers.base_scraper import BaseScraper
-from database import Database
+from scrapers.coverage import CoveragePlanner
+from scrapers.pipeline import ScrapePipeline
+from scrapers.progress_log import ProgressLog
+from database import Database, PriceRecord
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +31,97 @@ AUTH_TOKEN = "e9l3Nt14fZ7vHb4QZBw1ZfLgnl6n7nQB"
 TARGET_DURATIONS = {2, 3, 4, 7}
 
 
+def parse_availability(data: dict, context: dict) -> list[dict]:
+    """Parse the API response into price records (parse stage, see scrapers/pipeline.py).
+
+    Response structure: levels[].arrivals[].departures[]
+    Each departure has: price, discount, additional, total, date, nights, etc.
+
+    Returns:
+        List of PriceRecords.
+    """
+    records = []
+    levels = data.get("response", data).get("levels", [])
+
+    for level in levels:
+        # Filter: only process our target level
+        level_ident = str(level.get("ident", ""))
+        if level_ident != str(context["level_id"]):
+            continue
+
+        arrivals = level.get("arrivals", [])
+        for arrival in arrivals:
+            arrival_date_str = arrival.get("date", "")
+            if not arrival_date_str:
+                continue
+
+            try:
+                check_in_dt = datetime.strptime(arrival_date_str, "%d-%m-%Y")
+            except ValueError:
+                logger.warning(f"  Could not parse arrival date: {arrival_date_str}")
+                continue
+
+            for departure in arrival.get("departures", []):
+                try:
+                    dep_date_str = departure.get("date", "")
+                    nights = int(departure.get("nights", 0))
+
+                    if nights not in TARGET_DURATIONS:
+                        continue
+
+                    base_price = departure.get("price")
+                    additional = departure.get("additional", 0) or 0
+                    discount = departure.get("discount", 0) or 0
+                    total_field = departure.get("total")
+
+                    # Determine the price to store
+                    if base_price is None and total_field is None:
+                        continue
+
+                    if context["add_additional_price"]:
+                        # Accommodation: add extra person surcharge
+                        price = (base_price or 0) + additional
+                    else:
+                        # Camping: price already includes tourist tax
+                        price = base_price
+
+                    if price is None or price <= 0:
+                        continue
+
+                    check_out_dt = datetime.strptime(dep_date_str, "%d-%m-%Y")
+
+                    # Special offers
+                    special_offers = None
+                    if discount and discount > 0:
+                        special_offers = f"Korting: EUR {discount:.0f}"
+
+                    records.append(PriceRecord(
+                        context["competitor_name"], context["accommodation_type"],
+                        check_in_dt.strftime("%Y-%m-%d"), check_out_dt.strftime("%Y-%m-%d"),
+                        round(price, 2),
+                        min_nights=nights,
+                        special_offers=special_offers,
+                        persons=context["persons"],
+                        segment=context["segment"],
+                    ))
+
+                except (TypeError, ValueError, KeyError) as e:
+                    logger.warning(f"  Skipping malformed departure: {e}")
+                    continue
+
+    return records
+
+
 class KleineWolfScraper(BaseScraper):
     """Base scraper for Camping De Kleine Wolf (HolidayAgent/TOMM bridge).
 
-    Uses a REST API with weekly iteration and alternatives parameter
-    to cover all arrival dates over 12 months.
+    Uses a REST API with coverage-planned arrival dates and the
+    alternatives parameter to cover all arrival dates over 12 months.
     """
 
+    # Days before/after the arrival date returned per request
+    ALTERNATIVE_DAYS = 3
+
     def __init__(self, competitor_name: str, accommodation_type: str,
                  url: str, level_id: str, segment: str, persons: int,
                  db: Database, headless: bool = True,
@@ -63,6 +150,7 @@ class KleineWolfScraper(BaseScraper):
             "Authorization": AUTH_TOKEN,
             "Referer": url,
         })
+        self._use_adaptive_rate(self.session, API_URL)
 
     def _build_params(self, arrival_date: str) -> dict:
         """Build query parameters for the availability API.
@@ -73,7 +161,7 @@ class KleineWolfScraper(BaseScraper):
         return {
             "arrivalDate": arrival_date,
             "nrOfNights": 7,
-            "alternativesDaysBeforeAndAfterArrival": 3,
+            "alternativesDaysBeforeAndAfterArrival": self.ALTERNATIVE_DAYS,
             "alternativeNrOfNights[]": [2, 3, 4, 7],
             "levels[]": self.level_id,
             "persons[adults]": self.persons,
@@ -96,89 +184,20 @@ class KleineWolfScraper(BaseScraper):
         resp.raise_for_status()
         return resp.json()
 
-    def _parse_response(self, data: dict) -> list[dict]:
-        """Parse the API response into price records.
-
-        Response structure: levels[].arrivals[].departures[]
-        Each departure has: price, discount, additional, total, date, nights, etc.
-
-        Returns:
-            List of record dicts ready for db.save_price().
-        """
-        records = []
-        levels = data.get("response", data).get("levels", [])
-
-        for level in levels:
-            # Filter: only process our target level
-            level_ident = str(level.get("ident", ""))
-            if level_ident != str(self.level_id):
-                continue
-
-            arrivals = level.get("arrivals", [])
-            for arrival in arrivals:
-                arrival_date_str = arrival.get("date", "")
-                if not arrival_date_str:
-                    continue
-
-                try:
-                    check_in_dt = datetime.strptime(arrival_date_str, "%d-%m-%Y")
-                except ValueError:
-                    self.logger.warning(f"  Could not parse arrival date: {arrival_date_str}")
-                    continue
-
-                for departure in arrival.get("departures", []):
-                    try:
-                        dep_date_str = departure.get("date", "")
-                        nights = int(departure.get("nights", 0))
-
-                        if nights not in TARGET_DURATIONS:
-                            continue
-
-                        base_price = departure.get("price")
-                        additional = departure.get("additional", 0) or 0
-                        discount = departure.get("discount", 0) or 0
-                        total_field = departure.get("total")
-
-                        # Determine the price to store
-                        if base_price is None and total_field is None:
-                            continue
-
-                        if self.add_additional_price:
-                            # Accommodation: add extra person surcharge
-                            price = (base_price or 0) + additional
-                        else:
-                            # Camping: price already includes tourist tax
-                            price = base_price
-
-                        if price is None or price <= 0:
-                            continue
-
-                        check_out_dt = datetime.strptime(dep_date_str, "%d-%m-%Y")
-
-                        # Special offers
-                        special_offers = None
-                        if discount and discount > 0:
-                            special_offers = f"Korting: EUR {discount:.0f}"
-
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": check_in_dt.strftime("%Y-%m-%d"),
-                            "check_out_date": check_out_dt.strftime("%Y-%m-%d"),
-                            "price": round(price, 2),
-                            "available": True,
-                            "min_nights": nights,
-                            "special_offers": special_offers,
-                            "persons": self.persons,
-                            "segment": self.segment,
-                        }
-                        records.append(record)
-
-                    except (TypeError, ValueError, KeyError) as e:
-                        self.logger.warning(f"  Skipping malformed departure: {e}")
-                        continue
+    def _parse_context(self) -> dict:
+        """Picklable parse settings for parse_availability."""
+        return {
+            "level_id": self.level_id,
+            "add_additional_price": self.add_additional_price,
+            "competitor_name": self.competitor_name,
+            "accommodation_type": self.accommodation_type,
+            "persons": self.persons,
+            "segment": self.segment,
+        }
 
-        return records
+    def _parse_response(self, data: dict) -> list[dict]:
+        """Parse the API response into price records (see parse_availability)."""
+        return parse_availability(data, self._parse_context())
 
     def scrape_price(self, page, check_in, check_out, persons=4):
         """Not used - we use run_efficient() with the API instead."""
@@ -187,9 +206,10 @@ class KleineWolfScraper(BaseScraper):
     def run_efficient(self, months_ahead: int = 12, **kwargs) -> list[dict]:
         """Scrape all prices via the HolidayAgent/TOMM availability API.
 
-        Iterates weekly over the date range. Each request covers ~7 days
-        (arrival date +/- 3 days via alternativesDaysBeforeAndAfterArrival).
-        With a 2 second delay, ~52 requests take about 2 minutes.
+        Each request covers ~7 days (arrival date +/- ALTERNATIVE_DAYS via
+        alternativesDaysBeforeAndAfterArrival). A CoveragePlanner picks the
+        next arrival date so that every request lands on (arrival, nights)
+        cells not yet covered, and stops once the horizon is full.
         """
         self.logger.info(
             f"Starting API scrape for {self.competitor_name} "
@@ -198,40 +218,40 @@ class KleineWolfScraper(BaseScraper):
         )
 
         start_time = time.time()
-        all_records = []
-        seen_keys = set()  # Deduplicate across overlapping requests
         errors = 0
         request_count = 0
 
         today = datetime.now().date()
         end_date = today + timedelta(days=months_ahead * 30)
-        current_date = today
+        planner = CoveragePlanner(
+            today, end_date, sorted(TARGET_DURATIONS),
+            window=(-self.ALTERNATIVE_DAYS, self.ALTERNATIVE_DAYS),
+        )
+
+        # The planner needs each response before the next request, so parsing
+        # runs synchronously in the parse pool; the sink drops the stays that
+        # overlapping requests return again
+        pipeline = ScrapePipeline(
+            parse_availability, self._save_batch,
+            context=self._parse_context(), policy=self.INGEST_POLICY,
+            name=f"{self.competitor_name} ({self.segment})",
+        )
 
-        while current_date <= end_date:
-            arrival_str = current_date.strftime("%d-%m-%Y")
+        progress = ProgressLog(self.logger, unit="requests")
+        while (request := planner.next_request()) is not None:
+            arrival_str = request[0].strftime("%d-%m-%Y")
             request_count += 1
+            records = None
 
             try:
                 self._wait_rate_limit()
                 data = self._fetch_availability(arrival_str)
-                records = self._parse_response(data)
-
-                new_count = 0
-                for record in records:
-                    key = (
-                        record["check_in_date"],
-                        record["check_out_date"],
-                        record["min_nights"],
-                    )
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        self.db.save_price(**record)
-                        all_records.append(record)
-                        new_count += 1
+                records = pipeline.parse(data)
+                pipeline.write(records)
 
                 self.logger.debug(
-                    f"  Request {request_count} ({arrival_str}): "
-                    f"{len(records)} prices found, {new_count} new"
+                    "  Request %d (%s): %d prices found",
+                    request_count, arrival_str, len(records),
                 )
 
             except requests.exceptions.RequestException as e:
@@ -245,14 +265,27 @@ class KleineWolfScraper(BaseScraper):
                     f"  Request {request_count} ({arrival_str}) unexpected error: {e}"
                 )
 
-            # Step forward 7 days (alternatives=3 gives +/-3 days coverage)
-            current_date += timedelta(days=7)
+            planner.record(
+                request,
+                [(r["check_in_date"], r["min_nights"]) for r in records or []],
+                failed=records is None,
+            )
+            progress.update(prices=len(pipeline.ingest))
+
+        all_records = pipeline.close()
+        progress.done()
+        self.metrics.add_time("parse", pipeline.stages["parse"].busy_s)
+        errors += pipeline.errors
+        self.logger.info(planner.format_stats())
+        for line in pipeline.format_metrics():
+            self.logger.info(line)
 
         duration = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors}/{request_count} requests failed" if errors else None,
@@ -4,12 +4,21 @@ Uses two endpoints:
 1. /arrivaldates/get — returns available arrival dates with durations per month
 2. /parksAvailabilities/search — returns accommodation prices for a given stay
 
-Session cookies are obtained by loading the park's pricing page first.
+Session cookies are obtained by loading the Landal homepage first and
+shared between runs and parks via scrapers/credential_cache.py.
 No browser needed — pure HTTP with requests.
 
+``LandalScraper.run_group`` scrapes all Landal accommodations together:
+arrival-date discovery per (park, stayType) feeds a bounded pool of search
+workers that share one session and the landal.nl rate budget, and each
+search response is parsed for every target code of that park (the
+orchestrator uses it for the ``api_landal`` group).
+
 Used by: Landal Aelderholt, Landal Het Land van Bartje
 """
 
+import queue
+import threading
 import time
 import logging
 from datetime import datetime, timedelta
@@ -17,6 +26,8 @@ from datetime import datetime, timedelta
 import requests
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.credential_cache import apply_cookies, get_cache, session_cookies
+from scrapers.progress_log import ProgressLog
 from database import Database
 
 logger = logging.getLogger(__name__)
@@ -42,6 +53,13 @@ class LandalScraper(BaseScraper):
     SESSION_URL_TEMPLATE = "https://www.landal.nl/parken/{park_slug}/prijzen-en-beschikbaarheid"
     ARRIVALS_URL = "https://www.landal.nl/nl/api/arrivaldates/get"
     SEARCH_URL = "https://www.landal.nl/nl/api/destinations/parksAvailabilities/search"
+    # Session cookies are shared by all Landal parks
+    CREDENTIALS_KEY = "landal:www.landal.nl"
+    CREDENTIALS_TTL = 12 * 3600
+    # Concurrent search requests in run_group (paced by the landal.nl controller)
+    SEARCH_WORKERS = 4
+    # Same stay from two stayTypes: keep the one carrying the promotion
+    INGEST_POLICY = "prefer_promo"
 
     def __init__(self, competitor_name: str, accommodation_type: str,
                  park_code: str, park_slug: str, target_acc_code: str,
@@ -60,6 +78,7 @@ class LandalScraper(BaseScraper):
         self.park_slug = park_slug
         self.target_acc_code = target_acc_code
         self.segment = segment
+        self._cached_session = False
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": (
@@ -72,17 +91,34 @@ class LandalScraper(BaseScraper):
             "Referer": f"https://www.landal.nl/parken/{park_slug}/prijzen-en-beschikbaarheid",
             "Origin": "https://www.landal.nl",
         })
+        self._use_adaptive_rate(self.session, "https://www.landal.nl")
 
-    def _init_session(self):
+    def _init_session(self, force: bool = False) -> bool:
         """Load the main Landal site to get session cookies.
 
         The park-specific pricing URL may 404 but the API works without it.
-        We just need the session cookies from any Landal page.
+        We just need the session cookies from any Landal page. The cookies
+        are shared by all Landal scrapers via the credential cache; returns
+        True if a fresh warm-up was done.
         """
-        self.logger.info("  Initializing session (loading Landal homepage for cookies)...")
-        resp = self.session.get("https://www.landal.nl/", timeout=30)
-        resp.raise_for_status()
-        self.logger.info(f"  Session initialized, got {len(self.session.cookies)} cookies")
+        def _warm_up():
+            self.logger.info("  Initializing session (loading Landal homepage for cookies)...")
+            self.session.cookies.clear()
+            resp = self.session.get("https://www.landal.nl/", timeout=30)
+            resp.raise_for_status()
+            return {"cookies": session_cookies(self.session)}
+
+        creds, fresh = get_cache().get_or_refresh(
+            self.CREDENTIALS_KEY, _warm_up, ttl=self.CREDENTIALS_TTL, force=force,
+        )
+        if not fresh:
+            apply_cookies(self.session, creds.get("cookies"))
+        self._cached_session = not fresh
+        self.logger.info(
+            f"  Session {'initialized' if fresh else 'from cache'}, "
+            f"{len(self.session.cookies)} cookies"
+        )
+        return fresh
 
     def _fetch_arrival_dates(self, stay_type: str) -> list[dict]:
         """Fetch available arrival dates and durations for a stayType.
@@ -95,8 +131,11 @@ class LandalScraper(BaseScraper):
             "stayType": stay_type,
             "accommodationType": self.target_acc_code,
         }
-        self.logger.debug(f"  Fetching arrival dates: stayType={stay_type}, accType={self.target_acc_code}")
-        resp = self.session.get(self.ARRIVALS_URL, params=params, timeout=30)
+        self.logger.debug("  Fetching arrival dates: stayType=%s, accType=%s",
+                          stay_type, self.target_acc_code)
+        # Session may be shared between parks (run_group): Referer per request
+        resp = self.session.get(self.ARRIVALS_URL, params=params,
+                                headers={"Referer": self.url}, timeout=30)
         resp.raise_for_status()
         data = resp.json()
 
@@ -161,11 +200,14 @@ class LandalScraper(BaseScraper):
         return arrival_dates
 
     def _search_prices(self, arrival_date: str, departure_date: str,
-                       stay_type: str, persons: int = 6) -> list[dict]:
+                       stay_type: str, persons: int = 6,
+                       acc_code: str | None = "") -> list[dict]:
         """Search for accommodation prices for a specific date range.
 
         Returns list of accommodation results. With accommodationType filter,
         typically returns only a few results so no pagination needed.
+        ``acc_code`` defaults to the target code; None searches the whole
+        park (first results page only).
         """
         form_data = {
             "selectedParkCode": self.park_code,
@@ -175,13 +217,15 @@ class LandalScraper(BaseScraper):
             "stayType": stay_type,
             "paginationOffset": "0",
             "numberOfGuests": str(persons),
-            "accommodationType": self.target_acc_code,
         }
+        if acc_code is not None:
+            form_data["accommodationType"] = acc_code or self.target_acc_code
 
         resp = self.session.post(
             self.SEARCH_URL,
             data=form_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            headers={"Content-Type": "application/x-www-form-urlencoded",
+                     "Referer": self.url},
             timeout=30,
         )
         resp.raise_for_status()
@@ -249,154 +293,258 @@ class LandalScraper(BaseScraper):
 
     def run_efficient(self, months_ahead: int = 12, persons: int = 6,
                       **kwargs) -> list[dict]:
-        """Scrape all prices via the Landal REST API.
+        """Scrape all prices via the Landal REST API (see ``run_group``)."""
+        return self.run_group([self], months_ahead=months_ahead, persons=persons)[0]
+
+    def _search_pairs(self, stay_type: str, arrival_dates: list[dict]) -> list[tuple]:
+        """Unique (check_in, check_out, nights) stays for the stayType's durations."""
+        target_durations = STAY_TYPE_DURATIONS.get(stay_type, [])
+        pairs = []
+        seen = set()
+        for arrival_info in arrival_dates:
+            date_str = arrival_info["date"]
+            try:
+                check_in_dt = datetime.strptime(date_str, "%d-%m-%Y")
+            except ValueError:
+                try:
+                    check_in_dt = datetime.strptime(date_str, "%Y-%m-%d")
+                except ValueError:
+                    continue
+
+            for dur in arrival_info["durations"]:
+                try:
+                    dur = int(dur)
+                except (TypeError, ValueError):
+                    continue
+                if dur not in target_durations:
+                    continue
+                stay = (check_in_dt, check_in_dt + timedelta(days=dur), dur)
+                if stay not in seen:
+                    seen.add(stay)
+                    pairs.append(stay)
+        return pairs
+
+    @classmethod
+    def run_group(cls, scrapers: list, months_ahead: int = 12, persons: int = 6,
+                  workers: int = None, **kwargs) -> list[list[dict]]:
+        """Scrape several Landal accommodations in one producer/consumer pipeline.
 
         Workflow:
-        1. Load park page for session cookies
-        2. Fetch arrival dates for each stayType
-        3. For each arrival date + duration, search for prices
-        4. Filter for target accommodation code
-        5. Save to database
+        1. One session (cookies from the credential cache) for all scrapers
+        2. Producers: arrival dates per (park, stayType), merged over the
+           park's target accommodation codes
+        3. Consumers: ``workers`` search threads on a bounded queue, paced
+           by the shared landal.nl rate controller
+        4. Each search response is parsed for every target code of the park;
+           a code missing from an unfiltered response gets a filtered search
+        5. Each scraper writes its records through its own IngestSink (in
+           batches) and its own scrape_log entry
+
+        Returns the records per scraper, in the order of ``scrapers``.
         """
-        self.logger.info(
-            f"Starting API scrape for {self.competitor_name} "
-            f"(park={self.park_code}, acc={self.target_acc_code})"
+        lead = scrapers[0]
+        workers = workers or cls.SEARCH_WORKERS
+        lead.logger.info(
+            f"Starting API scrape for {len(scrapers)} Landal accommodation(s): "
+            + ", ".join(f"{s.park_code}/{s.target_acc_code}" for s in scrapers)
         )
 
         start_time = time.time()
-        all_records = []
-        errors = 0
-        seen_stays = set()  # Avoid duplicate (check_in, check_out) combos
+        ingests = [scraper._ingest_sink() for scraper in scrapers]
+        errors = [0] * len(scrapers)
+        lock = threading.Lock()
+        refresh_lock = threading.Lock()
+        refreshed = []
+        pace_lock = threading.Lock()
+
+        def finish():
+            duration = time.time() - start_time
+            records = []
+            for i, scraper in enumerate(scrapers):
+                records.append(ingests[i].close())
+                scraper.logger.info(ingests[i].format_stats())
+                scraper._finish(records[i], errors[i] + ingests[i].errors, duration)
+            return records
 
         try:
-            # Step 1: Initialize session
-            self._init_session()
-            time.sleep(2)
-
-            # Step 2-3: For each stayType, fetch arrivals and search prices
-            for stay_type, target_durations in STAY_TYPE_DURATIONS.items():
-                self._wait_rate_limit()
-
+            # Step 1: Initialize session (cached cookies skip the warm-up)
+            if lead._init_session():
+                time.sleep(2)
+        except Exception as e:
+            lead.logger.error(f"  Scraping failed: {e}", exc_info=True)
+            for i in range(len(errors)):
+                errors[i] += 1
+            return finish()
+
+        for scraper in scrapers[1:]:
+            scraper.session = lead.session
+
+        def pace():
+            # Without adaptive rate control: one flat interval for all workers
+            with pace_lock:
+                lead._wait_rate_limit()
+
+        def fetch_arrivals(scraper, stay_type):
+            pace()
+            try:
+                return scraper._fetch_arrival_dates(stay_type)
+            except requests.exceptions.HTTPError as e:
+                # Stale cached cookies: refresh once (for all producers) and retry
+                status = e.response.status_code if e.response is not None else None
+                if status not in (401, 403):
+                    raise
+                with refresh_lock:
+                    if not refreshed:
+                        if not lead._cached_session:
+                            raise
+                        lead.logger.warning("  Cached session rejected, refreshing...")
+                        get_cache().invalidate(cls.CREDENTIALS_KEY)
+                        lead._init_session(force=True)
+                        refreshed.append(True)
+                pace()
+                return scraper._fetch_arrival_dates(stay_type)
+
+        parks = {}
+        for i, scraper in enumerate(scrapers):
+            parks.setdefault(scraper.park_code, []).append(i)
+
+        jobs = queue.Queue(maxsize=workers * 4)
+
+        def discover(indices, stay_type):
+            """Producer: search jobs for one park and stayType."""
+            wanted = {}
+            for i in indices:
+                scraper = scrapers[i]
                 try:
-                    arrival_dates = self._fetch_arrival_dates(stay_type)
+                    arrival_dates = fetch_arrivals(scraper, stay_type)
                 except Exception as e:
-                    self.logger.error(
-                        f"  Failed to fetch arrival dates for stayType {stay_type}: {e}"
+                    scraper.logger.error(
+                        f"  Failed to fetch arrival dates for stayType {stay_type} "
+                        f"({scraper.target_acc_code}): {e}"
                     )
-                    errors += 1
+                    with lock:
+                        errors[i] += 1
                     continue
-
-                # Build unique (date, duration) pairs to search
-                search_pairs = []
-                for arrival_info in arrival_dates:
-                    date_str = arrival_info["date"]
-                    durations = arrival_info["durations"]
-
-                    try:
-                        check_in_dt = datetime.strptime(date_str, "%d-%m-%Y")
-                    except ValueError:
-                        try:
-                            check_in_dt = datetime.strptime(date_str, "%Y-%m-%d")
-                        except ValueError:
-                            continue
-
-                    for dur in durations:
-                        try:
-                            dur = int(dur)
-                        except (TypeError, ValueError):
-                            continue
-                        if dur not in target_durations:
-                            continue
-                        check_out_dt = check_in_dt + timedelta(days=dur)
-                        stay_key = (check_in_dt.date(), check_out_dt.date())
-                        if stay_key not in seen_stays:
-                            search_pairs.append((check_in_dt, check_out_dt, dur, stay_key))
-
-                self.logger.info(
-                    f"  stayType {stay_type}: {len(search_pairs)} date/duration combos to search"
+                for stay in scraper._search_pairs(stay_type, arrival_dates):
+                    wanted.setdefault(stay, []).append(i)
+
+            scrapers[indices[0]].logger.info(
+                f"  {scrapers[indices[0]].park_code} stayType {stay_type}: "
+                f"{len(wanted)} date/duration combos to search"
+            )
+            for stay in sorted(wanted):
+                jobs.put((stay_type, stay, wanted[stay]))
+
+        def search_job(stay_type, stay, indices):
+            check_in_dt, check_out_dt, dur = stay
+            arr_str = check_in_dt.strftime("%d-%m-%Y")
+            dep_str = check_out_dt.strftime("%d-%m-%Y")
+            owner = scrapers[indices[0]]
+            codes = list(dict.fromkeys(scrapers[i].target_acc_code for i in indices))
+
+            try:
+                pace()
+                accommodations = owner._search_prices(
+                    arr_str, dep_str, stay_type, persons,
+                    acc_code=codes[0] if len(codes) == 1 else None,
                 )
-
-                for check_in_dt, check_out_dt, dur, stay_key in search_pairs:
-                    if stay_key in seen_stays:
-                        continue
-
-                    arr_str = check_in_dt.strftime("%d-%m-%Y")
-                    dep_str = check_out_dt.strftime("%d-%m-%Y")
-
-                    self._wait_rate_limit()
-
-                    try:
-                        accommodations = self._search_prices(
-                            arr_str, dep_str, stay_type, persons
-                        )
-                    except Exception as e:
-                        self.logger.warning(
-                            f"  Search failed for {arr_str}->{dep_str}: {e}"
-                        )
-                        errors += 1
-                        continue
-
-                    # Filter for our target accommodation
-                    found = False
-                    for acc in accommodations:
-                        parsed = self._parse_accommodation(acc)
-                        if parsed is None:
-                            continue
-
-                        found = True
-                        seen_stays.add(stay_key)
-
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": parsed["check_in"].strftime("%Y-%m-%d"),
-                            "check_out_date": parsed["check_out"].strftime("%Y-%m-%d"),
-                            "price": parsed["price"],
-                            "available": True,
-                            "min_nights": parsed["nights"],
-                            "special_offers": parsed["special_offers"],
-                            "persons": persons,
-                            "segment": self.segment,
-                        }
-                        self.db.save_price(**record)
-                        all_records.append(record)
-
-                        self.logger.debug(
-                            f"  {arr_str} -> {dep_str} ({dur}n): "
-                            f"EUR {parsed['price']:.0f}"
+                # Unfiltered results may be paginated: filtered search for the rest
+                returned = {a.get("AccommodationInfo", {}).get("Code") for a in accommodations}
+                for code in codes:
+                    if len(codes) > 1 and code not in returned:
+                        pace()
+                        accommodations += owner._search_prices(
+                            arr_str, dep_str, stay_type, persons, acc_code=code,
                         )
-                        break  # Only need first match per stay
-
-                    if not found:
-                        # Accommodation not available for this date
-                        self.logger.debug(
-                            f"  {arr_str} -> {dep_str} ({dur}n): "
-                            f"not available (sold out or not offered)"
-                        )
-
-        except Exception as e:
-            errors += 1
-            self.logger.error(f"  Scraping failed: {e}", exc_info=True)
+            except Exception as e:
+                owner.logger.warning(f"  Search failed for {arr_str}->{dep_str}: {e}")
+                with lock:
+                    for i in indices:
+                        errors[i] += 1
+                return
+
+            for i in indices:
+                scraper = scrapers[i]
+                with scraper.metrics.timed("parse"):
+                    # Only need first match per stay
+                    parsed = next(
+                        (p for p in map(scraper._parse_accommodation, accommodations)
+                         if p is not None),
+                        None,
+                    )
+                if parsed is None:
+                    # Accommodation not available for this date
+                    scraper.logger.debug(
+                        "  %s -> %s (%sn): not available (sold out or not offered)",
+                        arr_str, dep_str, dur,
+                    )
+                    continue
+                record = scraper._make_record(
+                    parsed["check_in"].strftime("%Y-%m-%d"),
+                    parsed["check_out"].strftime("%Y-%m-%d"),
+                    parsed["price"],
+                    min_nights=parsed["nights"],
+                    special_offers=parsed["special_offers"],
+                    persons=persons,
+                )
+                ingests[i].add([record])
+                scraper.logger.debug(
+                    "  %s -> %s (%sn): EUR %.0f", arr_str, dep_str, dur, parsed["price"],
+                )
 
-        duration_s = time.time() - start_time
-        status = "success" if errors == 0 else "partial" if all_records else "failed"
+        def consume():
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                try:
+                    search_job(*job)
+                except Exception as e:
+                    lead.logger.error(f"  Search worker failed: {e}", exc_info=True)
+                progress.update(stays=sum(len(ingest) for ingest in ingests))
+
+        progress = ProgressLog(lead.logger, unit="searches")
+        consumers = [
+            threading.Thread(target=consume, name=f"landal-search-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        producers = [
+            threading.Thread(target=discover, args=(indices, stay_type),
+                             name=f"landal-arrivals-{park}-{stay_type}", daemon=True)
+            for park, indices in parks.items()
+            for stay_type in STAY_TYPE_DURATIONS
+        ]
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        for _ in consumers:
+            jobs.put(None)
+        for thread in consumers:
+            thread.join()
+
+        progress.done()
+        return finish()
+
+    def _finish(self, records: list[dict], errors: int, duration: float):
+        """Write the scrape_log entry and the completion summary."""
+        status = "success" if errors == 0 else "partial" if records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
-            records_scraped=len(all_records),
+            records_scraped=len(records),
             error_message=f"{errors} errors" if errors else None,
-            duration_seconds=duration_s,
+            duration_seconds=duration,
             segment=self.segment,
         )
 
         self.logger.info(
-            f"Completed {self.competitor_name}: {len(all_records)} records, "
-            f"{errors} errors, {duration_s:.1f}s"
+            f"Completed {self.competitor_name}: {len(records)} records, "
+            f"{errors} errors, {duration:.1f}s"
         )
 
-        return all_records
-
 
 class LandalAelderholtScraper(LandalScraper):
     """Landal Aelderholt — 6-persoons bungalow (6CE)."""
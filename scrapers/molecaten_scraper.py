@@ -5,16 +5,21 @@ Uses Molecaten's custom ASP.NET ASMX web service endpoints:
 - /Services/Search.asmx/GetAvailabilityDates — all available arrival dates
 
 No anti-bot measures, no auth needed. Only requires X-Requested-With header.
-Pagination via navigatenextdate field in the response.
+Pagination via navigatenextdate field in the response; the next pages are
+prefetched speculatively (+7 days) and both Kuierpad products run through
+one session via ``MolecatenScraper.run_group`` (group ``api_molecaten``).
 """
 
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.coverage import CoveragePlanner
+from scrapers.progress_log import ProgressLog
 from database import Database
 
 logger = logging.getLogger(__name__)
@@ -32,6 +37,10 @@ class MolecatenScraper(BaseScraper):
     API_BASE = "https://www.molecaten.nl/Services/Search.asmx"
 
     STAY_DURATIONS = [2, 3, 4, 7]
+    # Arrival days per GetAvailability page (dtt)
+    PAGE_DAYS = 7
+    # Pages requested ahead of navigatenextdate
+    PREFETCH = 3
 
     def __init__(self, db: Database, headless: bool = True,
                  ac_code: str = "4063", os_code: str = "1300",
@@ -58,6 +67,7 @@ class MolecatenScraper(BaseScraper):
             "X-Requested-With": "XMLHttpRequest",
             "Accept": "application/json",
         })
+        self._use_adaptive_rate(self.session, self.API_BASE, base_interval=0.2)
 
     def _fetch_availability_page(self, arrival_date: str, persons: int = 6) -> dict:
         """Fetch one page of the availability/price matrix.
@@ -73,7 +83,7 @@ class MolecatenScraper(BaseScraper):
             "AC": self.ac_code,
             "OS": self.os_code,
             "ad": arrival_date,
-            "dtt": "7",
+            "dtt": str(self.PAGE_DAYS),
             "ap": str(persons),
         }
 
@@ -83,6 +93,7 @@ class MolecatenScraper(BaseScraper):
             timeout=30,
         )
         resp.raise_for_status()
+        parse_start = time.perf_counter()
         data = resp.json()
 
         # The response wraps in {"d": {...}} for ASMX
@@ -122,6 +133,7 @@ class MolecatenScraper(BaseScraper):
                     })
 
         next_date = inner.get("navigatenextdate")
+        self.metrics.add_time("parse", time.perf_counter() - parse_start)
         return {"prices": prices, "next_date": next_date}
 
     def scrape_price(self, page, check_in, check_out, persons=6):
@@ -130,78 +142,165 @@ class MolecatenScraper(BaseScraper):
     def run_efficient(self, max_pages: int = 60, months_ahead: int = 12,
                       persons: int = 6, **kwargs) -> list[dict]:
         """Scrape all prices by paginating through the GetAvailability API."""
+        return self.run_group([self], max_pages=max_pages, months_ahead=months_ahead,
+                              persons=persons)[0]
+
+    @classmethod
+    def run_group(cls, scrapers: list, max_pages: int = 60, months_ahead: int = 12,
+                  persons: int = 6, prefetch: int = None, **kwargs) -> list[list[dict]]:
+        """Scrape several Molecaten products through one session.
+
+        Each product follows its own ``navigatenextdate`` chain; the chains
+        run side by side and share one pool for the page requests (paced by
+        the Molecaten rate controller). Each scraper saves its own records
+        and scrape_log entry.
+
+        Returns the records per scraper, in the order of ``scrapers``.
+        """
+        lead = scrapers[0]
+        prefetch = cls.PREFETCH if prefetch is None else prefetch
+        for scraper in scrapers[1:]:
+            scraper.session = lead.session
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=(prefetch + 1) * len(scrapers)) as pages, \
+                ThreadPoolExecutor(max_workers=len(scrapers)) as chains:
+            outcomes = list(chains.map(
+                lambda s: s._paginate(pages, max_pages, months_ahead, persons, prefetch),
+                scrapers,
+            ))
+
+        duration_s = time.time() - start_time
+        for scraper, (records, errors) in zip(scrapers, outcomes):
+            scraper._finish(records, errors, duration_s)
+        return [records for records, _ in outcomes]
+
+    def _paginate(self, pages: ThreadPoolExecutor, max_pages: int, months_ahead: int,
+                  persons: int, prefetch: int) -> tuple[list[dict], int]:
+        """Follow the page chain of this product; returns (records, errors).
+
+        The next page almost always starts ``PAGE_DAYS`` later, so up to
+        ``prefetch`` pages ahead are requested speculatively while the
+        current one is in flight. The real next date (``navigatenextdate``,
+        or further when the planner skips covered arrivals) decides which
+        page is used; speculative pages before it are dropped.
+        """
         self.logger.info(
             f"Starting API scrape for {self.competitor_name} "
             f"(AC={self.ac_code}, OS={self.os_code}, segment={self.segment})"
         )
 
-        start_time = time.time()
-        all_records = []
-        seen_keys = set()
+        ingest = self._ingest_sink()
+        progress = ProgressLog(self.logger, unit="pages")
         errors = 0
 
-        # Start from today
-        current_date = datetime.now().strftime("%Y%m%d")
+        # Pages cover a week of arrivals; stop once the horizon is covered
+        today = datetime.now().date()
+        horizon_end = today + timedelta(days=months_ahead * 30)
+        planner = CoveragePlanner(
+            today, horizon_end, self.STAY_DURATIONS, window=(0, self.PAGE_DAYS - 1),
+        )
+        if self._rate_controller is None:
+            prefetch = 0  # Without adaptive pacing: strictly one page at a time
+
+        inflight = {}
+        prefetch_stats = {"hits": 0, "misses": 0, "wasted": 0}
+        current_date = today.strftime("%Y%m%d")
 
         try:
             for page_num in range(1, max_pages + 1):
+                future = inflight.pop(current_date, None)
+                if page_num > 1:
+                    prefetch_stats["hits" if future else "misses"] += 1
+                if future is None:
+                    future = pages.submit(self._fetch_availability_page, current_date, persons)
+
+                # Speculate on the following pages while this one is in flight
+                current_day = datetime.strptime(current_date, "%Y%m%d").date()
+                for ahead in range(1, prefetch + 1):
+                    guess = current_day + timedelta(days=ahead * self.PAGE_DAYS)
+                    if guess > horizon_end or page_num + ahead > max_pages:
+                        break
+                    key = guess.strftime("%Y%m%d")
+                    if key not in inflight:
+                        inflight[key] = pages.submit(
+                            self._fetch_availability_page, key, persons,
+                        )
+
+                request = (current_day, None)
                 try:
-                    result = self._fetch_availability_page(current_date, persons)
+                    result = future.result()
                     prices = result["prices"]
                     next_date = result["next_date"]
-
-                    new_count = 0
-                    for p in prices:
-                        key = (
-                            p["check_in"].strftime("%Y-%m-%d"),
-                            p["check_out"].strftime("%Y-%m-%d"),
+                    planner.record(request, [(p["check_in"], p["nights"]) for p in prices])
+
+                    new_count = ingest.add([
+                        self._make_record(
+                            p["check_in"].strftime("%Y-%m-%d"), p["check_out"].strftime("%Y-%m-%d"),
+                            p["price"],
+                            available=p["available"],
+                            min_nights=p["nights"],
+                            persons=persons,
                         )
-                        if key in seen_keys:
-                            continue
-                        seen_keys.add(key)
-
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": p["check_in"].strftime("%Y-%m-%d"),
-                            "check_out_date": p["check_out"].strftime("%Y-%m-%d"),
-                            "price": p["price"],
-                            "available": p["available"],
-                            "min_nights": p["nights"],
-                            "special_offers": None,
-                            "persons": persons,
-                            "segment": self.segment,
-                        }
-                        self.db.save_price(**record)
-                        all_records.append(record)
-                        new_count += 1
-
-                    self.logger.info(
-                        f"  Page {page_num} (from {current_date}): "
-                        f"{new_count} new prices"
+                        for p in prices
+                    ])
+                    ingest.flush()
+
+                    self.logger.debug(
+                        "  Page %d (from %s): %d new prices", page_num, current_date, new_count,
                     )
+                    progress.update(prices=len(ingest))
 
                     if not next_date:
                         self.logger.info("  No more pages available")
                         break
 
-                    current_date = next_date
-                    time.sleep(0.2)  # Gentle rate limiting
+                    # Follow navigatenextdate, but skip ahead past covered
+                    # arrivals and stop at the end of the horizon
+                    next_request = planner.next_request()
+                    if next_request is None:
+                        self.logger.info("  Horizon covered")
+                        break
+                    current_date = max(next_date, next_request[0].strftime("%Y%m%d"))
+
+                    # Speculative pages the chain skipped past are not needed
+                    for key in [k for k in inflight if k < current_date]:
+                        if not inflight.pop(key).cancel():
+                            prefetch_stats["wasted"] += 1
+                    if self._rate_controller is None:
+                        time.sleep(0.2)  # Gentle rate limiting
 
                 except Exception as e:
                     errors += 1
                     self.logger.error(f"  Page {page_num} failed: {e}")
                     break
 
+            progress.done()
+            self.logger.info(planner.format_stats())
+            if prefetch:
+                self.logger.info(
+                    f"  Prefetch: {prefetch_stats['hits']} hits, "
+                    f"{prefetch_stats['misses']} misses, "
+                    f"{prefetch_stats['wasted'] + len(inflight)} pages unused"
+                )
+
         except Exception as e:
             errors += 1
             self.logger.error(f"  Scraping failed: {e}")
+        finally:
+            for future in inflight.values():
+                future.cancel()
 
-        duration_s = time.time() - start_time
+        all_records = ingest.close()
+        return all_records, errors + ingest.errors
+
+    def _finish(self, all_records: list[dict], errors: int, duration_s: float):
+        """Write the scrape_log entry and the completion summary."""
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors} errors" if errors else None,
@@ -215,8 +314,6 @@ class MolecatenScraper(BaseScraper):
             f"({len(available)} available), {duration_s:.1f}s"
         )
 
-        return all_records
-
 
 class MolecatenKuierpadBosvenScraper(MolecatenScraper):
     """Molecaten Kuierpad — Vakantiehuisje Bosven 6p (accommodatie)."""
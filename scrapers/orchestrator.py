@@ -0,0 +1,312 @@
+"""Scrape-orchestratie gedeeld door run_scraper.py en run_daily.py.
+
+Scrapers worden per domeingroep (zie scrapers/registry.py) sequentieel
+gedraaid; verschillende groepen lopen parallel op een thread pool. Een
+ad-hoc re-scrape van veel concurrenten duurt zo zo lang als het traagste
+domein in plaats van de som van alle scrapers.
+
+Usage:
+    from scrapers.orchestrator import scrape_params, run_groups, format_summary
+    params = scrape_params(days_ahead=365, persons=4)
+    results = run_groups(domain_groups(keys), scrapers, params, jobs=4)
+    for line in format_summary(results):
+        logger.info(line)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import tracing
+from scrapers.planner import uses_browser
+from scrapers.registry import is_shared_group
+
+logger = logging.getLogger("orchestrator")
+
+
+def scrape_params(days_ahead: int = 365, persons: int = 4) -> dict:
+    """Keyword arguments for ``run_efficient`` for a horizon of ``days_ahead``."""
+    return {
+        # BookingExperts pages: ~3 days per page step
+        "max_pages": max(30, days_ahead // 3 + 10),
+        # Scrapers that work per month
+        "months_ahead": max(1, days_ahead // 30),
+        "target_end_date": (datetime.now() + timedelta(days=days_ahead)).strftime("%Y-%m-%d"),
+        "persons": persons,
+    }
+
+
+def save_run_metrics(scraper, key: str, result: dict):
+    """Write the run telemetry of ``scraper`` to scrape_metrics (never raises)."""
+    metrics = getattr(scraper, "metrics", None)
+    if metrics is None:
+        return
+    try:
+        logger.info(metrics.format_summary())
+        scraper.db.save_scrape_metrics(
+            competitor_name=scraper.competitor_name,
+            scraper_key=key,
+            segment=getattr(scraper, "segment", None) or getattr(scraper, "SEGMENT", None),
+            status=result.get("status"),
+            duration_seconds=result.get("duration"),
+            records=result.get("records"),
+            **metrics.summary(),
+        )
+    except Exception as e:
+        logger.warning(f"  Telemetrie voor {key} niet opgeslagen: {e}")
+
+
+def run_scraper_job(key: str, scrapers, params: dict, name: str = None) -> dict:
+    """Run one scraper and return its result dict (never raises).
+
+    ``scrapers`` is a (lazy) key -> scraper mapping; the scraper is built
+    inside the try so an import or init error counts as a failed scraper.
+    """
+    logger.info(f"\n--- Scraping: {name or key} ({key}) ---")
+    t0 = time.time()
+    scraper = None
+    try:
+        scraper = scrapers[key]
+        if getattr(scraper, "metrics", None) is not None:
+            scraper.metrics.reset()
+        results = scraper.run_efficient(**params)
+        available = [r for r in results if r.get("available") and r.get("price")]
+        dur = time.time() - t0
+        logger.info(
+            f"  OK: {key} - {len(results)} records "
+            f"({len(available)} beschikbaar), {dur:.1f}s"
+        )
+        if available:
+            prices = [r["price"] for r in available]
+            logger.info(f"  Prijsrange: EUR {min(prices):.0f} - EUR {max(prices):.0f}")
+        result = {
+            "status": "success",
+            "records": len(results),
+            "available": len(available),
+            "duration": dur,
+        }
+    except Exception as e:
+        dur = time.time() - t0
+        logger.error(f"  MISLUKT: {key} - {e}", exc_info=True)
+        result = {
+            "status": "failed",
+            "records": 0,
+            "available": 0,
+            "duration": dur,
+            "error": str(e),
+        }
+    tracing.add_span(key, t0, dur, cat="scraper", status=result["status"],
+                     records=result["records"])
+    if scraper is not None:
+        save_run_metrics(scraper, key, result)
+    return result
+
+
+def run_shared_job(keys: list[str], scrapers, params: dict, names: dict = None) -> dict:
+    """Run a shared-session group via its class's ``run_group`` (never raises).
+
+    Every scraper gets the shared wall-clock duration. Status means the
+    same as in ``run_scraper_job``: ``run_group`` handles a failed session
+    itself (errors in scrape_log, empty record lists), just like
+    ``run_efficient`` does for one scraper, so only an exception counts as
+    failed. If ``run_group`` raises (e.g. a scraper cannot be built) the
+    scrapers are run one by one instead; if it returns a record list per
+    scraper that does not match ``keys``, the whole group fails.
+    """
+    names = names or {}
+    logger.info(f"\n--- Scraping (gedeelde sessie): {', '.join(keys)} ---")
+    t0 = time.time()
+    try:
+        group = [scrapers[key] for key in keys]
+        for scraper in group:
+            if getattr(scraper, "metrics", None) is not None:
+                scraper.metrics.reset()
+        outputs = type(group[0]).run_group(group, **params)
+    except Exception as e:
+        logger.error(f"  Gedeelde sessie mislukt ({e}), scrapers los draaien", exc_info=True)
+        return {key: run_scraper_job(key, scrapers, params, name=names.get(key))
+                for key in keys}
+
+    dur = time.time() - t0
+    results = {}
+    if len(outputs) != len(keys):
+        error = f"run_group gaf {len(outputs)} resultaten voor {len(keys)} scrapers"
+        logger.error(f"  MISLUKT: {' + '.join(keys)} - {error}")
+        for key in keys:
+            results[key] = {"status": "failed", "records": 0, "available": 0,
+                            "duration": dur, "error": error}
+    else:
+        for key, records in zip(keys, outputs):
+            available = [r for r in records if r.get("available") and r.get("price")]
+            logger.info(
+                f"  OK: {key} - {len(records)} records "
+                f"({len(available)} beschikbaar), {dur:.1f}s"
+            )
+            results[key] = {
+                "status": "success",
+                "records": len(records),
+                "available": len(available),
+                "duration": dur,
+            }
+    tracing.add_span(" + ".join(keys), t0, dur, cat="scraper", shared=True,
+                     records=sum(r["records"] for r in results.values()))
+    for key, scraper in zip(keys, group):
+        save_run_metrics(scraper, key, results[key])
+    return results
+
+
+class Progress:
+    """Thread-safe voortgangsteller: logt elke afgeronde scraper."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.t0 = time.time()
+        self._lock = threading.Lock()
+
+    def update(self, key: str, result: dict):
+        with self._lock:
+            self.done += 1
+            if result.get("status") == "failed":
+                self.failed += 1
+            elapsed = time.time() - self.t0
+            logger.info(
+                f"  [{self.done}/{self.total}] {key}: {result.get('status')} "
+                f"({result.get('records', 0)} records) - "
+                f"{self.failed} mislukt, {elapsed:.0f}s verstreken",
+                extra={"event": "scraper_done", "scraper": key, "status": result.get("status"),
+                       "records": result.get("records", 0), "elapsed_s": round(elapsed, 1)},
+            )
+
+
+class GroupSlots:
+    """Limits concurrent domain groups, with a separate cap for browser groups.
+
+    A browser group first takes a browser slot, then a general slot, so API
+    groups are never blocked by browser groups queueing for the browser cap.
+    """
+
+    def __init__(self, total: int, browser: int = None):
+        self.total = threading.BoundedSemaphore(max(1, total))
+        self.browser = threading.BoundedSemaphore(max(1, browser)) if browser else None
+
+    @contextmanager
+    def acquire(self, browser: bool = False):
+        use_browser = browser and self.browser is not None
+        t0 = time.time()
+        if use_browser:
+            self.browser.acquire()
+        try:
+            with self.total:
+                tracing.add_span("wachten op slot", t0, time.time() - t0, cat="wait",
+                                 browser=use_browser)
+                yield
+        finally:
+            if use_browser:
+                self.browser.release()
+
+
+def run_group(group_name: str, keys: list[str], scrapers, params: dict,
+              results: dict, names: dict = None, progress: Progress = None,
+              runner=None) -> dict:
+    """Run the scrapers of one domain group sequentially.
+
+    Results are written into ``results`` as they finish (so a caller sees
+    partial results if the group crashes) and also returned for this group.
+    Shared-session groups (registry.SHARED_SESSION_GROUPS) run in one go.
+    With a ``runner`` (scrapers.isolation.IsolatedRunner) the group runs in
+    a worker process instead.
+    """
+    with tracing.span(group_name, cat="group", scrapers=len(keys),
+                      isolated=runner is not None):
+        if runner is not None:
+            return runner.run_group(group_name, keys, params, results, names, progress)
+        names = names or {}
+        group_results = {}
+        if is_shared_group(keys):
+            for key, result in run_shared_job(keys, scrapers, params, names).items():
+                results[key] = result
+                group_results[key] = result
+                if progress:
+                    progress.update(key, result)
+            return group_results
+        for key in keys:
+            result = run_scraper_job(key, scrapers, params, name=names.get(key))
+            results[key] = result
+            group_results[key] = result
+            if progress:
+                progress.update(key, result)
+        return group_results
+
+
+def run_groups(groups: dict[str, list[str]], scrapers, params: dict,
+               jobs: int = 1, names: dict = None, runner=None,
+               browser_jobs: int = None) -> dict:
+    """Run domain groups with at most ``jobs`` groups in parallel.
+
+    Groups are submitted in dict order (use scrapers.planner.plan_groups for
+    longest-first). ``browser_jobs`` caps concurrent browser groups.
+    Returns {key: result} for every scraper in ``groups``.
+    """
+    results = {}
+    total = sum(len(keys) for keys in groups.values())
+    progress = Progress(total)
+    jobs = max(1, min(jobs, len(groups) or 1))
+
+    logger.info(f"{total} scrapers in {len(groups)} domeingroepen, {jobs} parallel")
+    for gname, gkeys in groups.items():
+        logger.info(f"  {gname}: {', '.join(gkeys)}")
+
+    if jobs == 1:
+        for gname, gkeys in groups.items():
+            run_group(gname, gkeys, scrapers, params, results, names, progress, runner)
+        return results
+
+    slots = GroupSlots(jobs, browser_jobs)
+
+    def _run_slotted(gname, gkeys):
+        with slots.acquire(browser=uses_browser(gkeys)):
+            return run_group(gname, gkeys, scrapers, params, results, names, progress, runner)
+
+    # One thread per group; the slots decide how many actually scrape
+    with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="scrape") as executor:
+        futures = {
+            executor.submit(_run_slotted, gname, gkeys): gname
+            for gname, gkeys in groups.items()
+        }
+        for future in as_completed(futures):
+            gname = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"  Groep {gname} crash: {e}", exc_info=True)
+                for key in groups[gname]:
+                    results.setdefault(key, {
+                        "status": "failed", "records": 0, "available": 0,
+                        "duration": 0, "error": str(e),
+                    })
+    return results
+
+
+def format_summary(results: dict) -> list[str]:
+    """Summary table lines: one per scraper plus a totals line."""
+    lines = []
+    for key, result in sorted(results.items()):
+        status = result.get("status", "?")
+        records = result.get("records", 0)
+        dur = result.get("duration", 0)
+        error = result.get("error", "")
+        line = f"    {key:25s} {status:18s} {records:4d} records  {dur:6.1f}s"
+        if error:
+            line += f"  ({error[:60]})"
+        lines.append(line)
+
+    ok = sum(1 for r in results.values() if "success" in r.get("status", ""))
+    failed = sum(1 for r in results.values() if r.get("status") == "failed")
+    records = sum(r.get("records", 0) for r in results.values())
+    lines.append(f"    {'TOTAAL':25s} {ok} OK / {failed} mislukt  {records} records")
+    return lines
@@ -0,0 +1,316 @@
+"""Gefaseerde scrape-pipeline: fetch -> parse -> sink.
+
+Met 10 scraper-threads in één proces blokkeert CPU-zwaar parsen (json.loads
+van grote payloads, geneste walks) onder de GIL de I/O van de andere
+scrapers. ``ScrapePipeline`` scheidt de stappen:
+
+- fetch: de scraper-thread haalt alleen ruwe payloads op en zet ze met
+  ``submit()`` in een begrensde queue (backpressure als parsen achterloopt)
+- parse: een gedeelde process pool zet payloads om in records; de
+  parse-functie is een module-level functie ``parse(raw, context)`` zodat
+  hij te picklen is. Zonder process pool (uitgeschakeld, of in een
+  daemonic isolation-worker) wordt in een thread geparsed.
+- sink: één thread voert records aan een ``IngestSink`` (ontdubbelen met
+  de conflict-policy van de scraper, in batches naar
+  ``Database.save_prices_batch``)
+
+Per fase worden metrics bijgehouden (items, busy-tijd, max queue-diepte,
+wachttijd) zodat zichtbaar is welke fase de bottleneck is.
+
+Planner-gestuurde scrapers (het volgende request hangt af van het vorige
+antwoord) gebruiken ``parse()`` synchroon en ``write()`` voor de sink.
+
+Usage:
+    with ScrapePipeline(parse_page, db.save_prices_batch, context=ctx,
+                        policy=scraper.INGEST_POLICY,
+                        name=scraper.competitor_name) as pipeline:
+        for unit in units:
+            pipeline.submit(fetch(unit))
+    records = pipeline.records
+    for line in pipeline.format_metrics():
+        logger.info(line)
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from scrapers.ingest import IngestSink
+
+logger = logging.getLogger("pipeline")
+
+# Defaults; overridable via configure() (config: scraping.pipeline)
+SETTINGS = {
+    # Parse in worker processes (False = parse in a thread of this process)
+    "processes": True,
+    # Size of the shared parse pool (None = half the CPUs, at least 1)
+    "parse_workers": None,
+    # Raw payloads waiting for the parse stage before submit() blocks
+    "queue_size": 32,
+    # Records per database write
+    "batch_size": 200,
+}
+
+_pool = None
+_pool_workers = 1
+_pool_failed = False
+_pool_lock = threading.Lock()
+
+
+def configure(**settings):
+    """Override defaults (unknown keys are ignored)."""
+    for key, value in settings.items():
+        if key in SETTINGS and (value is not None or key == "parse_workers"):
+            SETTINGS[key] = value
+
+
+def _parse_pool() -> ProcessPoolExecutor | None:
+    """Shared process pool, or None when disabled or not possible here."""
+    global _pool, _pool_workers, _pool_failed
+    if not SETTINGS["processes"]:
+        return None
+    with _pool_lock:
+        if _pool is None and not _pool_failed:
+            if multiprocessing.current_process().daemon:
+                # Isolation workers are daemonic and may not have children
+                _pool_failed = True
+                logger.debug("Parse pool niet beschikbaar in daemon-proces, parsen in thread")
+                return None
+            workers = SETTINGS["parse_workers"] or max(1, (os.cpu_count() or 2) // 2)
+            try:
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+                _pool_workers = workers
+            except (OSError, ValueError) as e:
+                _pool_failed = True
+                logger.warning(f"Parse pool niet gestart ({e}), parsen in thread")
+        return _pool
+
+
+def shutdown():
+    """Stop the shared parse pool (at exit, or between tests)."""
+    global _pool, _pool_failed
+    with _pool_lock:
+        pool, _pool, _pool_failed = _pool, None, False
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+class StageMetrics:
+    """Counters for one pipeline stage (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_s = 0.0
+        self.wait_s = 0.0       # time blocked on a full downstream queue
+        self.max_queue = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 1, busy: float = 0.0, wait: float = 0.0,
+            depth: int = 0, errors: int = 0):
+        with self._lock:
+            self.items += items
+            self.busy_s += busy
+            self.wait_s += wait
+            self.max_queue = max(self.max_queue, depth)
+            self.errors += errors
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stage": self.name, "items": self.items, "busy_s": self.busy_s,
+                "wait_s": self.wait_s, "max_queue": self.max_queue, "errors": self.errors,
+            }
+
+
+class ScrapePipeline:
+    """fetch (caller) -> parse (process pool) -> sink (batched writes).
+
+    Args:
+        parse: module-level ``parse(raw, context) -> list[dict]``
+        sink: ``sink(records)`` for one batch, e.g. ``db.save_prices_batch``
+        context: picklable dict passed to every parse call
+        policy: conflict policy of the IngestSink (see scrapers.ingest)
+        name: label for logs and metrics
+    """
+
+    def __init__(self, parse, sink, context: dict = None, policy="first",
+                 name: str = "pipeline", batch_size: int = None, queue_size: int = None):
+        self.parse_fn = parse
+        self.context = context or {}
+        self.name = name
+        self.ingest = IngestSink(sink, policy=policy,
+                                 batch_size=batch_size or SETTINGS["batch_size"], name=name)
+        self.parse_errors = 0
+        self.stages = {stage: StageMetrics(stage) for stage in ("fetch", "parse", "sink")}
+
+        self._pool = _parse_pool()
+        self._raw = queue.Queue(maxsize=queue_size or SETTINGS["queue_size"])
+        self._parsed = queue.Queue()
+        # Parses in flight: enough to keep every pool worker busy
+        self._max_inflight = 2 * (_pool_workers if self._pool is not None else 1)
+        self._inflight = threading.BoundedSemaphore(self._max_inflight)
+        self._started = time.time()
+        self._closed = False
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name=f"pipeline-parse-{name}", daemon=True,
+        )
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f"pipeline-sink-{name}", daemon=True,
+        )
+        self._dispatcher.start()
+        self._writer.start()
+
+    # --- fetch stage ---
+
+    def submit(self, raw):
+        """Hand one raw payload to the parse stage (blocks while the queue is full)."""
+        t0 = time.time()
+        self._raw.put(raw)
+        self.stages["fetch"].add(wait=time.time() - t0, depth=self._raw.qsize())
+
+    def parse(self, raw) -> list[dict]:
+        """Parse one payload now (for loops that need the result to continue)."""
+        t0 = time.time()
+        try:
+            if self._pool is not None:
+                records = self._pool.submit(self.parse_fn, raw, self.context).result()
+            else:
+                records = self.parse_fn(raw, self.context)
+        except Exception:
+            self.stages["parse"].add(busy=time.time() - t0, errors=1)
+            raise
+        self.stages["parse"].add(busy=time.time() - t0)
+        return records
+
+    def write(self, records: list):
+        """Hand parsed records straight to the sink."""
+        if records:
+            self._parsed.put(records)
+
+    # --- parse stage ---
+
+    def _dispatch(self):
+        while True:
+            raw = self._raw.get()
+            if raw is None:
+                break
+            self._inflight.acquire()
+            t0 = time.time()
+            future = None
+            if self._pool is not None:
+                try:
+                    future = self._pool.submit(self.parse_fn, raw, self.context)
+                except RuntimeError as e:  # pool shut down or broken: parse here
+                    logger.warning(f"  {self.name}: parse pool onbruikbaar ({e}), parsen in thread")
+                    self._pool = None
+            if future is None:
+                future = Future()
+                try:
+                    future.set_result(self.parse_fn(raw, self.context))
+                except Exception as e:
+                    future.set_exception(e)
+            future.add_done_callback(lambda f, t0=t0: self._on_parsed(f, t0))
+        # Wait for outstanding parses before closing the sink
+        for _ in range(self._max_inflight):
+            self._inflight.acquire()
+        self._parsed.put(None)
+
+    def _on_parsed(self, future: Future, t0: float):
+        try:
+            records = future.result()
+        except Exception as e:
+            self.parse_errors += 1
+            self.stages["parse"].add(busy=time.time() - t0, errors=1)
+            logger.warning(f"  {self.name}: parsen mislukt: {e}")
+        else:
+            self.stages["parse"].add(busy=time.time() - t0, depth=self._raw.qsize())
+            if records:
+                self._parsed.put(records)
+        finally:
+            self._inflight.release()
+
+    # --- sink stage ---
+
+    def _write_loop(self):
+        while True:
+            try:
+                records = self._parsed.get(timeout=0.5)
+            except queue.Empty:
+                records = ()
+            else:
+                if records is None:
+                    break
+            self.stages["sink"].add(items=0, depth=self._parsed.qsize())
+            # Flush when full (inside add), or when the queue is idle so records land early
+            self._timed(self.ingest.add, records)
+            if not records:
+                self._timed(self.ingest.flush)
+        self._timed(self.ingest.flush)
+
+    def _timed(self, fn, *args):
+        t0 = time.time()
+        written, errors = self.ingest.written, self.ingest.errors
+        fn(*args)
+        self.stages["sink"].add(items=self.ingest.written - written, busy=time.time() - t0,
+                                errors=self.ingest.errors - errors)
+
+    @property
+    def records(self) -> list:
+        """Winning record per stay."""
+        return self.ingest.records
+
+    @property
+    def errors(self) -> int:
+        return self.parse_errors + self.ingest.errors
+
+    # --- lifecycle ---
+
+    def close(self) -> list:
+        """Drain all stages; returns the winning records."""
+        if not self._closed:
+            self._closed = True
+            self._raw.put(None)
+            self._dispatcher.join()
+            self._writer.join()
+        return self.records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def metrics(self) -> dict:
+        elapsed = time.time() - self._started
+        return {
+            "name": self.name,
+            "elapsed_s": elapsed,
+            "processes": self._pool is not None,
+            "stages": [stage.as_dict() for stage in self.stages.values()],
+        }
+
+    def format_metrics(self) -> list[str]:
+        """One line per stage: items, busy time, max queue depth, blocked time."""
+        m = self.metrics()
+        lines = [f"  Pipeline {self.name} ({'processen' if m['processes'] else 'thread'}):"]
+        for s in m["stages"]:
+            lines.append(
+                f"    {s['stage']:6s} {s['items']:5d} items  {s['busy_s']:6.1f}s bezig  "
+                f"queue max {s['max_queue']:3d}  {s['wait_s']:5.1f}s geblokkeerd"
+                + (f"  {s['errors']} fouten" if s["errors"] else "")
+            )
+        lines.append("  " + self.ingest.format_stats())
+        return lines
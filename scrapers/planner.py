@@ -0,0 +1,129 @@
+"""Kostengebaseerde planning van domeingroepen.
+
+De kosten van een groep worden geschat uit de mediane duur per scraper in
+``scrape_log`` (Database.get_scraper_durations). Groepen worden daarna
+longest-first ingepland (LPT), zodat de traagste browsergroepen als eerste
+starten en de snelle API-groepen de gaten opvullen. Groepen waarvan de host
+parallelle scrapers toestaat (registry.GROUP_MAX_PARALLEL) worden gesplitst
+als ze anders de makespan bepalen.
+
+Browsergroepen krijgen daarnaast een eigen limiet op basis van CPU en
+beschikbaar geheugen (psutil optioneel).
+
+Usage:
+    plan = plan_groups(domain_groups(keys), db.get_scraper_durations())
+    for name, group in plan.items():
+        print(name, group["keys"], group["cost"], group["browser"])
+"""
+
+import logging
+import math
+import os
+
+from scrapers.registry import GROUP_MAX_PARALLEL, SCRAPERS, is_shared_group
+
+logger = logging.getLogger("orchestrator")
+
+# Assumed duration (seconds) for a scraper without history
+DEFAULT_COST = 120.0
+# Rough memory footprint of one headless Chromium with one page
+BROWSER_MEMORY_MB = 500
+
+
+def estimate_cost(keys: list[str], durations: dict, default: float = DEFAULT_COST) -> float:
+    """Estimated duration of a group: sum of per-scraper medians.
+
+    Shared-session groups run all scrapers at once, so they cost the
+    slowest member instead.
+    """
+    costs = [durations.get(key, default) for key in keys]
+    if is_shared_group(keys):
+        return max(costs)
+    return sum(costs)
+
+
+def uses_browser(keys: list[str]) -> bool:
+    return any(SCRAPERS.get(key, {}).get("browser", False) for key in keys)
+
+
+def split_group(keys: list[str], durations: dict, parts: int,
+                default: float = DEFAULT_COST) -> list[list[str]]:
+    """Split keys into ``parts`` bins with balanced cost (LPT); keeps registry order per bin."""
+    if parts <= 1 or len(keys) <= 1:
+        return [list(keys)]
+    bins = [[] for _ in range(min(parts, len(keys)))]
+    loads = [0.0] * len(bins)
+    for key in sorted(keys, key=lambda k: -durations.get(k, default)):
+        i = loads.index(min(loads))
+        bins[i].append(key)
+        loads[i] += durations.get(key, default)
+    order = {key: n for n, key in enumerate(keys)}
+    return [sorted(b, key=order.get) for b in bins if b]
+
+
+def plan_groups(groups: dict[str, list[str]], durations: dict,
+                max_parallel: dict = None, default: float = DEFAULT_COST) -> dict:
+    """Order (and where allowed split) domain groups longest-first.
+
+    A splittable group is split into ``ceil(cost / longest other group)``
+    parts (capped by its max_parallel): no point in splitting below the
+    makespan that an unsplittable group already dictates.
+
+    Returns {name: {"keys", "cost", "browser"}} ordered by cost, descending.
+    """
+    max_parallel = GROUP_MAX_PARALLEL if max_parallel is None else max_parallel
+    costs = {name: estimate_cost(keys, durations, default) for name, keys in groups.items()}
+
+    planned = {}
+    for name, keys in groups.items():
+        limit = max_parallel.get(name, 1)
+        others = [c for n, c in costs.items() if n != name]
+        floor = max(others) if others else 0.0
+        parts = 1
+        if limit > 1 and len(keys) > 1:
+            parts = limit if floor <= 0 else min(limit, math.ceil(costs[name] / floor))
+        bins = split_group(keys, durations, parts, default)
+        for i, part in enumerate(bins, start=1):
+            part_name = name if len(bins) == 1 else f"{name}#{i}"
+            planned[part_name] = {
+                "keys": part,
+                "cost": estimate_cost(part, durations, default),
+                "browser": uses_browser(part),
+            }
+
+    return dict(sorted(planned.items(), key=lambda item: -item[1]["cost"]))
+
+
+def _available_memory_mb(meminfo: str = "/proc/meminfo") -> float | None:
+    """Memory available for new processes (incl. reclaimable page cache).
+
+    Without psutil: MemAvailable from /proc/meminfo (Linux), else the free
+    pages from sysconf, which ignore the page cache and undercount.
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open(meminfo, encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024  # kB
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def browser_slots(limit: int = None, per_browser_mb: float = BROWSER_MEMORY_MB) -> int:
+    """Max concurrent browser groups for this machine (CPU count and free RAM)."""
+    slots = os.cpu_count() or 1
+    memory = _available_memory_mb()
+    if memory is not None:
+        slots = min(slots, int(memory // per_browser_mb))
+    if limit:
+        slots = min(slots, limit)
+    return max(1, slots)
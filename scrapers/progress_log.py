@@ -0,0 +1,92 @@
+"""Gesamplede voortgang per scraper in plaats van een logregel per record.
+
+Een INFO-regel per prijs (f-string, synchroon naar console en bestand,
+gedeeld door 10 threads) kost over een volledige run tienduizenden
+lock-contended writes. ``ProgressLog`` telt records en logt hooguit één
+voortgangs-event per ``every`` records of ``seconds`` seconden; detail per
+record hoort op DEBUG met lazy %-formatting.
+
+Het event draagt gestructureerde velden (``extra``) die de JSON-lines
+logfile als losse keys wegschrijft: event, scraper, count, total, rate.
+
+Usage:
+    progress = ProgressLog(self.logger, total=len(units), unit="requests")
+    for unit in units:
+        ...
+        progress.update(stays=len(ingest))
+    progress.done()
+"""
+
+import threading
+import time
+
+# Defaults; overridable via configure() (config: scraping.progress)
+SETTINGS = {
+    # Log progress every N counted items ...
+    "every": 100,
+    # ... or every T seconds, whichever comes first
+    "seconds": 30.0,
+}
+
+
+def configure(**settings):
+    """Override defaults (unknown keys are ignored)."""
+    for key, value in settings.items():
+        if key in SETTINGS and value is not None:
+            SETTINGS[key] = value
+
+
+class ProgressLog:
+    """Rate-limited progress events for one scraper (thread-safe).
+
+    Args:
+        logger: scraper logger the events go to
+        total: expected count, if known
+        unit: what is counted (records, requests, pages, ...)
+        every, seconds: sampling; default from SETTINGS
+    """
+
+    def __init__(self, logger, total: int = None, unit: str = "records",
+                 every: int = None, seconds: float = None):
+        self.logger = logger
+        self.total = total
+        self.unit = unit
+        self.every = every or SETTINGS["every"]
+        self.seconds = seconds if seconds is not None else SETTINGS["seconds"]
+        self.count = 0
+        self.fields = {}
+        self._t0 = time.monotonic()
+        self._last_count = 0
+        self._last_time = self._t0
+        self._lock = threading.Lock()
+
+    def update(self, n: int = 1, **fields):
+        """Count ``n`` items; ``fields`` (e.g. stays=...) ride along on the next event."""
+        with self._lock:
+            self.count += n
+            self.fields.update(fields)
+            now = time.monotonic()
+            if (self.count - self._last_count < self.every
+                    and now - self._last_time < self.seconds):
+                return
+            self._last_count, self._last_time = self.count, now
+            self._emit(now, "progress")
+
+    def done(self):
+        """Final event with the totals."""
+        with self._lock:
+            self._emit(time.monotonic(), "progress_done")
+
+    def _emit(self, now: float, event: str):
+        elapsed = now - self._t0
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            "  Progress: %s%s %s%s, %.0fs (%.1f/s)",
+            self.count, f"/{self.total}" if self.total else "", self.unit,
+            "".join(f", {k} {v}" for k, v in self.fields.items()), elapsed, rate,
+            extra={
+                "event": event, "scraper": self.logger.name, "unit": self.unit,
+                "count": self.count, "total": self.total, "elapsed_s": round(elapsed, 1),
+                "rate": round(rate, 2), **self.fields,
+            },
+        )
@@ -0,0 +1,315 @@
+"""Adaptieve rate control per host (AIMD).
+
+Elke host krijgt één ``RateController``, gedeeld door alle scrapers (en
+threads) die die host aanspreken. De controller houdt een request-rate bij:
+
+- gezonde, snelle responses: rate additief omhoog (+``increase`` req/s)
+- 429, 5xx, connectiefouten of een latency-piek: rate multiplicatief
+  omlaag (x``backoff``)
+- ``Retry-After`` (seconden of HTTP-datum) blokkeert de host tot dat moment
+
+``AdaptiveHTTPAdapter`` hangt de controller aan een ``requests.Session``:
+elke request wacht eerst op zijn slot, en 429/503 worden na de opgelegde
+wachttijd automatisch opnieuw geprobeerd. Per host wordt telemetrie
+bijgehouden (requests, throttles, rate-verloop) voor het run-overzicht.
+
+Usage:
+    session = requests.Session()
+    mount_adaptive(session, "api.landal.nl", base_interval=0.5)
+    ...
+    for line in format_telemetry():
+        logger.info(line)
+"""
+
+import email.utils
+import logging
+import threading
+import time
+from datetime import timezone
+from urllib.parse import urlparse
+
+import tracing
+
+logger = logging.getLogger("rate_control")
+
+# Defaults; overridable via configure() (config: scraping.rate_control)
+SETTINGS = {
+    "enabled": True,
+    # Fastest allowed interval as a fraction of the scraper's rate_limit
+    "min_interval_factor": 0.25,
+    # Slowest interval after repeated backoff (seconds)
+    "max_interval": 30.0,
+    # Additive increase in requests/second per healthy response
+    "increase": 0.05,
+    # Multiplicative decrease on throttling/errors
+    "backoff": 0.5,
+    # A response slower than latency_factor x the running average is a spike
+    "latency_factor": 3.0,
+    # Automatic retries for 429/503 inside the adapter
+    "throttle_retries": 2,
+}
+
+_controllers = {}
+_external_telemetry = {}
+_lock = threading.Lock()
+
+
+def configure(**settings):
+    """Override defaults (unknown keys are ignored)."""
+    for key, value in settings.items():
+        if key in SETTINGS and value is not None:
+            SETTINGS[key] = value
+
+
+def parse_retry_after(value: str | None, now: float = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now if now is not None else time.time()
+    return max(0.0, when.timestamp() - now)
+
+
+class RateController:
+    """AIMD request pacing for one host (thread-safe)."""
+
+    def __init__(self, host: str, base_interval: float = 1.0,
+                 min_interval: float = None, max_interval: float = None):
+        self.host = host
+        self.base_interval = max(base_interval, 0.01)
+        self.min_interval = min_interval or self.base_interval * SETTINGS["min_interval_factor"]
+        self.max_interval = max(max_interval or SETTINGS["max_interval"], self.base_interval)
+        self.interval = self.base_interval
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._avg_latency = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0, "throttled": 0, "errors": 0, "backoffs": 0,
+            "retry_after_s": 0.0, "latency_total": 0.0,
+            "min_interval": self.interval, "max_interval": self.interval,
+        }
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self.interval
+
+    def wait(self) -> float:
+        """Block until this host may receive the next request; returns the delay."""
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            tracing.add_span(f"rate limit {self.host}", now, delay, cat="wait")
+        return max(delay, 0.0)
+
+    def _set_interval(self, interval: float):
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        self.stats["min_interval"] = min(self.stats["min_interval"], self.interval)
+        self.stats["max_interval"] = max(self.stats["max_interval"], self.interval)
+
+    def _decrease(self):
+        self.stats["backoffs"] += 1
+        self._set_interval(self.interval / SETTINGS["backoff"])
+
+    def record(self, status: int | None, latency: float, retry_after: float = None):
+        """Feed one response (status None = connection error/timeout)."""
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["latency_total"] += latency
+
+            spike = (
+                self._avg_latency is not None
+                and latency > SETTINGS["latency_factor"] * self._avg_latency
+                and latency > 1.0
+            )
+            self._avg_latency = (
+                latency if self._avg_latency is None
+                else 0.8 * self._avg_latency + 0.2 * latency
+            )
+
+            if status == 429 or status == 503:
+                self.stats["throttled"] += 1
+                self._decrease()
+                wait = retry_after if retry_after is not None else self.interval
+                self.stats["retry_after_s"] += wait
+                self._blocked_until = max(self._blocked_until, time.time() + wait)
+            elif status is None or status >= 500:
+                self.stats["errors"] += 1
+                self._decrease()
+            elif spike:
+                self._decrease()
+            elif status < 400:
+                # Additive increase of the request rate
+                self._set_interval(1.0 / (self.rate + SETTINGS["increase"]))
+
+    def telemetry(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        requests = stats.pop("requests")
+        latency_total = stats.pop("latency_total")
+        return {
+            "host": self.host,
+            "requests": requests,
+            **stats,
+            "base_interval": self.base_interval,
+            "final_interval": self.interval,
+            "avg_latency": latency_total / requests if requests else 0.0,
+        }
+
+
+def get_controller(host: str, base_interval: float = 1.0) -> RateController:
+    """Shared controller for a host (created on first use)."""
+    with _lock:
+        controller = _controllers.get(host)
+        if controller is None:
+            controller = RateController(host, base_interval)
+            _controllers[host] = controller
+        return controller
+
+
+def reset():
+    """Forget all controllers and telemetry (start of a run)."""
+    with _lock:
+        _controllers.clear()
+        _external_telemetry.clear()
+
+
+def telemetry() -> dict:
+    """Per-host telemetry of this process plus merged worker telemetry."""
+    with _lock:
+        merged = {host: dict(t) for host, t in _external_telemetry.items()}
+        local = {host: c.telemetry() for host, c in _controllers.items()}
+    for host, t in local.items():
+        merged[host] = _merge(merged.get(host), t)
+    return merged
+
+
+def merge_telemetry(remote: dict):
+    """Add telemetry reported by a worker process."""
+    with _lock:
+        for host, t in remote.items():
+            _external_telemetry[host] = _merge(_external_telemetry.get(host), t)
+
+
+def _merge(a: dict | None, b: dict) -> dict:
+    if not a:
+        return dict(b)
+    total = a["requests"] + b["requests"]
+    return {
+        **b,
+        "requests": total,
+        "throttled": a["throttled"] + b["throttled"],
+        "errors": a["errors"] + b["errors"],
+        "backoffs": a["backoffs"] + b["backoffs"],
+        "retry_after_s": a["retry_after_s"] + b["retry_after_s"],
+        "min_interval": min(a["min_interval"], b["min_interval"]),
+        "max_interval": max(a["max_interval"], b["max_interval"]),
+        "avg_latency": (
+            (a["avg_latency"] * a["requests"] + b["avg_latency"] * b["requests"]) / total
+            if total else 0.0
+        ),
+    }
+
+
+def format_telemetry() -> list[str]:
+    """Summary lines per host, busiest first."""
+    lines = []
+    for t in sorted(telemetry().values(), key=lambda t: -t["requests"]):
+        lines.append(
+            f"    {t['host']:32s} {t['requests']:5d} req  "
+            f"{1 / t['final_interval']:5.2f} req/s (basis {1 / t['base_interval']:.2f}, "
+            f"max {1 / t['min_interval']:.2f})  "
+            f"{t['throttled']} throttled, {t['errors']} fouten, "
+            f"{t['avg_latency'] * 1000:.0f} ms gem."
+        )
+    return lines
+
+
+_adapter_cls = None
+
+
+def _adapter_class():
+    """AdaptiveHTTPAdapter, defined on first use.
+
+    The CLIs import this module at startup; requests (and urllib3) are only
+    loaded once a scraper actually mounts an adapter.
+    """
+    global _adapter_cls
+    if _adapter_cls is None:
+        from requests.adapters import HTTPAdapter
+
+        class AdaptiveHTTPAdapter(HTTPAdapter):
+            """requests adapter that paces through a RateController and retries throttles."""
+
+            def __init__(self, controller: RateController, throttle_retries: int = None, **kwargs):
+                super().__init__(**kwargs)
+                self.controller = controller
+                self.throttle_retries = (
+                    SETTINGS["throttle_retries"] if throttle_retries is None else throttle_retries
+                )
+
+            def send(self, request, **kwargs):
+                attempt = 0
+                waited = 0.0
+                while True:
+                    waited += self.controller.wait()
+                    t0 = time.time()
+                    try:
+                        response = super().send(request, **kwargs)
+                    except Exception:
+                        self.controller.record(None, time.time() - t0)
+                        raise
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.controller.record(response.status_code, time.time() - t0, retry_after)
+
+                    if response.status_code in (429, 503) and attempt < self.throttle_retries:
+                        attempt += 1
+                        logger.info(
+                            f"  {self.controller.host}: {response.status_code}, "
+                            f"opnieuw na {retry_after if retry_after is not None else self.controller.interval:.1f}s "
+                            f"(poging {attempt}/{self.throttle_retries})"
+                        )
+                        response.close()
+                        continue
+                    # Pacing time for per-scraper telemetry (scrapers/telemetry.py)
+                    response.rate_wait = waited
+                    return response
+
+        _adapter_cls = AdaptiveHTTPAdapter
+    return _adapter_cls
+
+
+def __getattr__(name):
+    # ``from scrapers.rate_control import AdaptiveHTTPAdapter`` stays lazy
+    if name == "AdaptiveHTTPAdapter":
+        return _adapter_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def mount_adaptive(session, host_or_url: str, base_interval: float = 1.0) -> RateController | None:
+    """Mount an AdaptiveHTTPAdapter for one host on a requests.Session.
+
+    Returns the controller, or None when adaptive rate control is disabled.
+    """
+    if not SETTINGS["enabled"]:
+        return None
+    host = urlparse(host_or_url).netloc or host_or_url
+    controller = get_controller(host, base_interval)
+    adapter = _adapter_class()(controller)
+    session.mount(f"https://{host}", adapter)
+    session.mount(f"http://{host}", adapter)
+    return controller
@@ -7,6 +7,10 @@ needed) and extract prices from the embedded JSON data.
 Each page load for a given arrival date returns prices for ALL available
 durations, so we only need one request per unique arrival date.
 
+Pages are streamed (``iter_content``) through an incremental HTML scan that
+stops reading once the price or unavailability is known, or the
+__NUXT_DATA__ block has been captured.
+
 URL pattern:
   https://www.rcn.nl/nl/vakantieparken/nederland/drenthe/rcn-de-noordster/verhuur/{slug}
     ?arrival={date}T00:00:00&departure={date}T00:00:00
@@ -17,22 +21,151 @@ Accommodations:
   - Bungalow Luna 6p (objTypeId 2980) - /verhuur/bungalow-luna
 """
 
+import codecs
 import json
 import re
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from html.parser import HTMLParser
 
 import requests as http_requests
 
 from scrapers.base_scraper import BaseScraper
-from database import Database
+from scrapers.credential_cache import apply_cookies, get_cache, session_cookies
+from scrapers.ingest import stay_key
+from scrapers.pipeline import ScrapePipeline
+from scrapers.progress_log import ProgressLog
+from database import Database, PriceRecord
 
 logger = logging.getLogger(__name__)
 
 # Base URL for RCN De Noordster
 BASE_URL = "https://www.rcn.nl/nl/vakantieparken/nederland/drenthe/rcn-de-noordster"
 
+UNAVAILABLE_MARKERS = (
+    'niet beschikbaar', 'not available', 'uitverkocht',
+    'sold out', 'geen beschikbaarheid',
+)
+_EURO_RE = re.compile(r'€\s*([\d.,]+)')
+
+
+def _is_unavailable(text: str) -> bool:
+    lower = text.lower()
+    return any(p in lower for p in UNAVAILABLE_MARKERS)
+
+
+def _euro_amounts(text: str) -> list[float]:
+    """Plausible EUR amounts in a text (filters the €35 pitch fee)."""
+    prices = []
+    for m in _EURO_RE.findall(text):
+        raw = m.replace('.', '').replace(',', '.')
+        try:
+            p = float(raw)
+        except ValueError:
+            continue
+        if 10 < p < 50000 and p != 35:  # Filter €35 pitch fee
+            prices.append(p)
+    return prices
+
+
+class _PageScan(HTMLParser):
+    """Incremental scan of an RCN page: prices, unavailability, __NUXT_DATA__.
+
+    Fed chunk by chunk while the page downloads. Text, attribute values and
+    inline scripts are checked for unavailability markers and EUR amounts
+    (same rules as the whole-document regexes). ``done`` is set once the
+    rest of the page cannot change the outcome:
+
+    - an unavailability marker was seen, or
+    - the __NUXT_DATA__ script starts while the markup already has a price
+      (the payload is only needed as fallback), or
+    - the __NUXT_DATA__ script is complete.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.prices = []
+        self.unavailable = False
+        self.nuxt = None
+        self.done = False
+        self.bytes_read = 0
+        self.stopped_early = False
+        self._script = None      # chunks of the inline script being read
+        self._in_nuxt = False
+
+    @property
+    def price(self) -> float | None:
+        return min(self.prices) if self.prices else None
+
+    def _scan(self, text: str):
+        if _is_unavailable(text):
+            self.unavailable = True
+            self.done = True
+        if "€" in text:
+            self.prices.extend(_euro_amounts(text))
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        for _, value in attrs:
+            if value:
+                self._scan(value)
+        if tag == "script":
+            if dict(attrs).get("id") == "__NUXT_DATA__":
+                if self.prices:
+                    self.done = True
+                    return
+                self._in_nuxt = True
+            self._script = []
+
+    def handle_data(self, data):
+        if self.done:
+            return
+        if self._script is not None:
+            self._script.append(data)
+        else:
+            self._scan(data)
+
+    def handle_endtag(self, tag):
+        if self.done or tag != "script" or self._script is None:
+            return
+        content = "".join(self._script)
+        self._script = None
+        self._scan(content)
+        if self._in_nuxt:
+            self.nuxt = content
+            self._in_nuxt = False
+            self.done = True
+
+
+def parse_page(page: dict, context: dict) -> list[dict]:
+    """Price records for one scanned page (parse stage, see scrapers/pipeline.py).
+
+    ``page`` holds the _PageScan outcome of one (arrival, departure) URL;
+    ``context`` the scraper class and the record fields. The NUXT payload
+    is only parsed when the markup gave neither a price nor unavailability.
+    """
+    names = (context["competitor_name"], context["accommodation_type"])
+    fields = {"persons": context["persons"], "segment": context["segment"]}
+    if page["unavailable"] or page["price"]:
+        return [PriceRecord(
+            *names, page["check_in"], page["check_out"],
+            None if page["unavailable"] else page["price"],
+            available=not page["unavailable"],
+            min_nights=page["nights"],
+            **fields,
+        )]
+    if not page["nuxt"]:
+        return []
+    return [
+        PriceRecord(
+            *names, pr["check_in"].strftime("%Y-%m-%d"), pr["check_out"].strftime("%Y-%m-%d"),
+            pr["price"], min_nights=pr["duration"], **fields,
+        )
+        for pr in context["cls"]._parse_nuxt_data(page["nuxt"])
+    ]
+
 
 class RcnScraper(BaseScraper):
     """Base scraper for RCN De Noordster accommodations.
@@ -48,6 +181,11 @@ class RcnScraper(BaseScraper):
     SEGMENT = "accommodatie"
     DEFAULT_PERSONS = 6
     STAY_DURATIONS = [2, 3, 4, 7]
+    # Base-page cookies are shared by all RCN scrapers (credential cache)
+    CREDENTIALS_KEY = "rcn:www.rcn.nl"
+    CREDENTIALS_TTL = 12 * 3600
+    # Bytes per read while streaming a page (see _fetch_page)
+    STREAM_CHUNK = 16 * 1024
 
     def __init__(self, db: Database, headless: bool = True, **kwargs):
         super().__init__(
@@ -70,6 +208,66 @@ class RcnScraper(BaseScraper):
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "nl-NL,nl;q=0.9,en;q=0.8",
         })
+        self._use_adaptive_rate(self.http, BASE_URL)
+        self._stream_stats = {"pages": 0, "bytes": 0, "early": 0}
+        self._cached_session = False
+
+    def _warm_up(self) -> dict:
+        """Load the accommodation page once for session cookies."""
+        self._wait_rate_limit()
+        self.http.cookies.clear()
+        resp = self.http.get(self.url, timeout=30)
+        resp.raise_for_status()
+        return {"cookies": session_cookies(self.http)}
+
+    def _init_session(self, force: bool = False) -> bool:
+        """Session cookies from the credential cache or a fresh warm-up.
+
+        Shared by all RCN scrapers; ``force`` warms up again (after a
+        401/403 on cached cookies). Returns True if a warm-up was done.
+        """
+        creds, fresh = get_cache().get_or_refresh(
+            self.CREDENTIALS_KEY, self._warm_up, ttl=self.CREDENTIALS_TTL, force=force,
+        )
+        if not fresh:
+            apply_cookies(self.http, creds.get("cookies"))
+        self._cached_session = not fresh
+        self.logger.info(
+            "  Session established via base page" if fresh else "  Session cookies from cache"
+        )
+        return fresh
+
+    def _refresh_stale_session(self, error: http_requests.exceptions.HTTPError) -> bool:
+        """On a 401/403 with cached cookies: drop them and warm up again (once).
+
+        Returns True if the request is worth retrying.
+        """
+        status = error.response.status_code if error.response is not None else None
+        if status not in (401, 403) or not self._cached_session:
+            return False
+        self.logger.warning(f"  Cached session rejected ({status}), refreshing...")
+        get_cache().invalidate(self.CREDENTIALS_KEY)
+        try:
+            self._init_session(force=True)
+        except Exception as e:
+            self.logger.warning(f"  Session refresh failed: {e}")
+            return False
+        return True
+
+    def _save_and_checkpoint(self, records: list):
+        """Pipeline sink: write a batch, then checkpoint the units it covers.
+
+        A unit ("<arrival>/<n>n") only counts as done once its price is in
+        ``prices``; checkpointing at submit time would let a killed worker
+        leave checkpoints for records still buffered in the IngestSink.
+        """
+        self._save_batch(records)
+        units = []
+        for r in records:
+            nights = (date.fromisoformat(r["check_out_date"])
+                      - date.fromisoformat(r["check_in_date"])).days
+            units.append(f"{r['check_in_date']}/{nights}n")
+        self._checkpoint_units(list(dict.fromkeys(units)))
 
     def _build_url(self, check_in: datetime, check_out: datetime) -> str:
         """Build the URL for a specific accommodation with date parameters."""
@@ -80,27 +278,12 @@ class RcnScraper(BaseScraper):
             f"?arrival={arrival}&departure={departure}"
         )
 
-    def _extract_nuxt_prices(self, html: str) -> list[dict]:
-        """Extract all price records from __NUXT_DATA__ in the raw HTML.
-
-        The Nuxt data array contains objects with pricing information
-        like arrivalDate, departureDate, basePriceInclusive, and
-        offerPriceInclusive. We extract all of them in one pass.
-
-        Returns list of dicts with keys: check_in, check_out, price, duration
-        """
+    @classmethod
+    def _parse_nuxt_data(cls, payload: str) -> list[dict]:
+        """Price records from the raw __NUXT_DATA__ JSON payload."""
         records = []
-
-        # Find the __NUXT_DATA__ script tag
-        match = re.search(
-            r'<script\s+type="application/json"\s+id="__NUXT_DATA__"[^>]*>(.*?)</script>',
-            html, re.DOTALL
-        )
-        if not match:
-            return records
-
         try:
-            data = json.loads(match.group(1))
+            data = json.loads(payload)
         except (json.JSONDecodeError, ValueError):
             return records
 
@@ -140,7 +323,7 @@ class RcnScraper(BaseScraper):
                 # In Nuxt flat arrays, an object at index X references
                 # its keys and values by subsequent indices.
                 try:
-                    record = self._reconstruct_price_record(data, i)
+                    record = cls._reconstruct_price_record(data, i)
                     if record:
                         records.append(record)
                 except Exception:
@@ -149,11 +332,12 @@ class RcnScraper(BaseScraper):
         # Strategy 4: Brute-force search for price-like numeric values
         # near date-like string values
         if not records:
-            records = self._brute_force_extract(data)
+            records = cls._brute_force_extract(data)
 
         return records
 
-    def _reconstruct_price_record(self, data: list, arrival_key_idx: int) -> dict | None:
+    @classmethod
+    def _reconstruct_price_record(cls, data: list, arrival_key_idx: int) -> dict | None:
         """Try to reconstruct a price record from the Nuxt data array.
 
         Starting from an "arrivalDate" key, look for related keys
@@ -226,7 +410,7 @@ class RcnScraper(BaseScraper):
         else:
             return None
 
-        if duration not in self.STAY_DURATIONS:
+        if duration not in cls.STAY_DURATIONS:
             return None
 
         return {
@@ -236,7 +420,8 @@ class RcnScraper(BaseScraper):
             "duration": duration,
         }
 
-    def _brute_force_extract(self, data: list) -> list[dict]:
+    @classmethod
+    def _brute_force_extract(cls, data: list) -> list[dict]:
         """Fallback: search for EUR price patterns in string elements."""
         records = []
         for i, item in enumerate(data):
@@ -253,31 +438,38 @@ class RcnScraper(BaseScraper):
                         continue
         return records
 
-    def _check_unavailable(self, html: str) -> bool:
-        """Check if the page indicates the accommodation is unavailable."""
-        lower = html.lower()
-        return any(p in lower for p in [
-            'niet beschikbaar', 'not available', 'uitverkocht',
-            'sold out', 'geen beschikbaarheid',
-        ])
-
-    def _extract_price_from_html(self, html: str) -> float | None:
-        """Fallback: extract price from rendered HTML using regex."""
-        matches = re.findall(r'€\s*([\d.,]+)', html)
-        if not matches:
-            return None
+    def _fetch_page(self, url: str) -> tuple[int, "_PageScan | None"]:
+        """Stream a page through _PageScan; returns (status, scan).
 
-        prices = []
-        for m in matches:
-            raw = m.replace('.', '').replace(',', '.')
-            try:
-                p = float(raw)
-                if 10 < p < 50000 and p != 35:  # Filter €35 pitch fee
-                    prices.append(p)
-            except ValueError:
-                continue
-
-        return min(prices) if prices else None
+        Reading stops as soon as the scan is decided, so the rest of the
+        document (usually most of the __NUXT_DATA__ payload) is never
+        downloaded or decoded. ``scan`` is None for a 404; other HTTP
+        errors raise.
+        """
+        resp = self.http.get(url, timeout=30, stream=True)
+        try:
+            if resp.status_code == 404:
+                return resp.status_code, None
+            resp.raise_for_status()
+            decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+            scan = _PageScan()
+            for chunk in resp.iter_content(chunk_size=self.STREAM_CHUNK):
+                scan.bytes_read += len(chunk)
+                scan.feed(decoder.decode(chunk))
+                if scan.done:
+                    scan.stopped_early = True
+                    break
+            else:
+                scan.feed(decoder.decode(b"", final=True))
+                scan.close()
+        finally:
+            resp.close()
+
+        self._stream_stats["pages"] += 1
+        self._stream_stats["bytes"] += scan.bytes_read
+        self.metrics.add_bytes(scan.bytes_read)
+        self._stream_stats["early"] += scan.stopped_early
+        return resp.status_code, scan
 
     def scrape_price(self, page, check_in, check_out, persons=6):
         """Not used - we use run_efficient() with HTTP requests instead."""
@@ -341,7 +533,8 @@ class RcnScraper(BaseScraper):
         """Scrape all prices via direct HTTP requests (no browser needed).
 
         For each (arrival_date, duration) pair, fetches the accommodation
-        page via HTTP and extracts the price from rendered HTML.
+        page via HTTP and extracts the price from rendered HTML. Records are
+        built in the parse stage of a ScrapePipeline and written in batches.
         ~5x faster than the Playwright approach (no browser overhead,
         no 3s hydration sleep).
         """
@@ -357,133 +550,93 @@ class RcnScraper(BaseScraper):
         )
 
         start_time = time.time()
-        all_records = []
-        seen_keys = set()
         errors = 0
         consecutive_failures = 0
         max_consecutive_failures = 10
 
-        # First request: establish session cookies
+        # (arrival, nights) units already fetched today are skipped
+        done = self._load_checkpoints()
+        date_pairs = [
+            dp for dp in date_pairs
+            if f"{dp['check_in'].isoformat()}/{dp['nights']}n" not in done
+        ]
+        if not date_pairs:
+            self.logger.info("  Alle datums vandaag al gescraped (checkpoint)")
+            return []
+
+        # First request: establish session cookies (shared by all RCN scrapers)
         try:
-            self._wait_rate_limit()
-            resp = self.http.get(self.url, timeout=30)
-            resp.raise_for_status()
-            self.logger.info("  Session established via base page")
+            self._init_session()
         except Exception as e:
             self.logger.warning(f"  Base page failed (continuing): {e}")
 
-        for i, dp in enumerate(date_pairs):
+        pipeline = ScrapePipeline(
+            parse_page, self._save_and_checkpoint,
+            context={
+                "cls": type(self),
+                "competitor_name": self.competitor_name,
+                "accommodation_type": self.accommodation_type,
+                "persons": persons,
+                "segment": self.SEGMENT,
+            },
+            policy=self.INGEST_POLICY,
+            name=f"{self.competitor_name} - {self.accommodation_type}",
+        )
+
+        progress = ProgressLog(self.logger, total=len(date_pairs), unit="dates")
+        for dp in date_pairs:
             check_in = dp["check_in"]
             check_out = dp["check_out"]
             nights = dp["nights"]
+            progress.update(prices=len(pipeline.ingest))
 
-            key = (check_in.isoformat(), check_out.isoformat())
-            if key in seen_keys:
+            # Already written (e.g. from an earlier page's NUXT data)
+            key = stay_key(self.competitor_name, check_in.isoformat(),
+                           check_out.isoformat(), self.SEGMENT)
+            if key in pipeline.ingest:
                 continue
 
-            # Log progress every 25 dates
-            if i > 0 and i % 25 == 0:
-                elapsed = time.time() - start_time
-                self.logger.info(
-                    f"  Progress: {i}/{len(date_pairs)} dates, "
-                    f"{len(all_records)} prices, {elapsed:.0f}s elapsed"
-                )
-
             self._wait_rate_limit()
 
             check_in_dt = datetime.combine(check_in, datetime.min.time())
             check_out_dt = datetime.combine(check_out, datetime.min.time())
             url = self._build_url(check_in_dt, check_out_dt)
 
+            unit = f"{check_in.isoformat()}/{nights}n"
             try:
-                resp = self.http.get(url, timeout=30)
-
-                if resp.status_code == 404:
+                try:
+                    _, scan = self._fetch_page(url)
+                except http_requests.exceptions.HTTPError as e:
+                    # Stale cached cookies: refresh once per run and retry
+                    if not self._refresh_stale_session(e):
+                        raise
+                    _, scan = self._fetch_page(url)
+
+                if scan is None:  # 404
+                    self._checkpoint(unit)
                     continue
-                resp.raise_for_status()
 
-                html = resp.text
                 consecutive_failures = 0
-
-                # Check unavailability
-                unavailable = self._check_unavailable(html)
-
-                if not unavailable:
-                    # Extract price from HTML (primary method for SSR pages)
-                    price = self._extract_price_from_html(html)
-
-                    if price:
-                        seen_keys.add(key)
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "check_in_date": check_in.isoformat(),
-                            "check_out_date": check_out.isoformat(),
-                            "price": price,
-                            "available": True,
-                            "min_nights": nights,
-                            "special_offers": None,
-                            "persons": persons,
-                            "segment": self.SEGMENT,
-                        }
-                        self.db.save_price(**record)
-                        all_records.append(record)
-
-                        self.logger.info(
-                            f"  {check_in} -> {check_out} ({nights}n): "
-                            f"EUR {price:.0f} (beschikbaar)"
-                        )
-                    else:
-                        # Try NUXT data as fallback
-                        nuxt_records = self._extract_nuxt_prices(html)
-                        for pr in nuxt_records:
-                            nkey = (
-                                pr["check_in"].strftime("%Y-%m-%d"),
-                                pr["check_out"].strftime("%Y-%m-%d"),
-                            )
-                            if nkey not in seen_keys:
-                                seen_keys.add(nkey)
-                                record = {
-                                    "competitor_name": self.competitor_name,
-                                    "accommodation_type": self.accommodation_type,
-                                    "check_in_date": pr["check_in"].strftime("%Y-%m-%d"),
-                                    "check_out_date": pr["check_out"].strftime("%Y-%m-%d"),
-                                    "price": pr["price"],
-                                    "available": True,
-                                    "min_nights": pr["duration"],
-                                    "special_offers": None,
-                                    "persons": persons,
-                                    "segment": self.SEGMENT,
-                                }
-                                self.db.save_price(**record)
-                                all_records.append(record)
-
-                        if nuxt_records:
-                            self.logger.info(
-                                f"  {check_in} ({nights}n): "
-                                f"{len(nuxt_records)} prices from NUXT data"
-                            )
-                else:
-                    seen_keys.add(key)
-                    record = {
-                        "competitor_name": self.competitor_name,
-                        "accommodation_type": self.accommodation_type,
-                        "check_in_date": check_in.isoformat(),
-                        "check_out_date": check_out.isoformat(),
-                        "price": None,
-                        "available": False,
-                        "min_nights": nights,
-                        "special_offers": None,
-                        "persons": persons,
-                        "segment": self.SEGMENT,
-                    }
-                    self.db.save_price(**record)
-                    all_records.append(record)
+                # Records are built in the parse stage (NUXT JSON in a worker
+                # process) and written in batches by the sink
+                pipeline.submit({
+                    "check_in": check_in.isoformat(),
+                    "check_out": check_out.isoformat(),
+                    "nights": nights,
+                    "unavailable": scan.unavailable,
+                    "price": scan.price,
+                    "nuxt": None if scan.price or scan.unavailable else scan.nuxt,
+                })
+                # Checkpointed by the sink once the records are written
 
             except http_requests.exceptions.HTTPError as e:
                 if e.response is not None and e.response.status_code == 429:
-                    self.logger.warning("  Rate limited, waiting 10s...")
-                    time.sleep(10)
+                    # Adaptive controller already backed off for the host
+                    if self._rate_controller is None:
+                        self.logger.warning("  Rate limited, waiting 10s...")
+                        time.sleep(10)
+                    else:
+                        self.logger.warning("  Rate limited, host backed off")
                     consecutive_failures += 1
                 else:
                     errors += 1
@@ -500,18 +653,35 @@ class RcnScraper(BaseScraper):
                 )
                 break
 
+        all_records = pipeline.close()
+        progress.done()
+        self.metrics.add_time("parse", pipeline.stages["parse"].busy_s)
+        errors += pipeline.errors
+        for line in pipeline.format_metrics():
+            self.logger.info(line)
+
         duration = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors} date(s) failed" if errors else None,
             duration_seconds=duration,
             segment=self.SEGMENT,
+            resumed=bool(done),
         )
 
+        stream = self._stream_stats
+        if stream["pages"]:
+            self.logger.info(
+                f"  Streaming: {stream['pages']} pages, "
+                f"{stream['bytes'] / stream['pages'] / 1024:.0f} KB/page gelezen, "
+                f"{stream['early']} vroegtijdig gestopt"
+            )
+
         available = [r for r in all_records if r["available"] and r["price"]]
         self.logger.info(
             f"Completed {self.competitor_name} - {self.accommodation_type}: "
@@ -0,0 +1,198 @@
+"""Declaratieve scraper registry.
+
+Maps each competitor key (as used in config/settings.yaml) to the module and
+class that implements it, plus platform metadata. Scraper modules are only
+imported — and scrapers only instantiated — when a key is actually selected,
+so ``run_scraper.py --competitor landal_bartje`` or ``run_daily --skip-scrape``
+no longer load Playwright and 35 ``requests.Session`` objects up front.
+
+Fields per entry:
+    module:   import path of the scraper module
+    class:    scraper class name in that module
+    platform: booking platform / API family (informational)
+    group:    domain group; scrapers in one group hit the same domain and
+              run sequentially, different groups may run in parallel
+    browser:  True if the scraper drives a Playwright browser
+
+GROUP_MAX_PARALLEL lists the groups the scrape planner may split;
+SHARED_SESSION_GROUPS the groups whose scrapers run together in one session
+(their class implements a ``run_group`` classmethod).
+
+Usage:
+    from scrapers.registry import build_scraper, domain_groups
+    scraper = build_scraper("landal_bartje", db=db, headless=True)
+    for group, keys in domain_groups(["rcn_luna", "rcn_camping"]).items():
+        ...
+"""
+
+import importlib
+from collections.abc import Mapping
+
+# Volgorde: API-scrapers eerst (snel, geen browser), dan BookingExperts
+# scrapers gespreid om rate-limiting te voorkomen.
+SCRAPERS = {
+    # --- API-only scrapers (snel, geen browser) ---
+    "centerparcs_sandur": {"module": "scrapers.centerparcs_scraper", "class": "CenterParcsScraper",
+                           "platform": "centerparcs", "group": "api_centerparcs", "browser": False},
+    "molecaten_bosven": {"module": "scrapers.molecaten_scraper", "class": "MolecatenKuierpadBosvenScraper",
+                         "platform": "molecaten", "group": "api_molecaten", "browser": False},
+    "molecaten_camping": {"module": "scrapers.molecaten_scraper", "class": "MolecatenKuierpadCampingScraper",
+                          "platform": "molecaten", "group": "api_molecaten", "browser": False},
+    "camping_ommerland": {"module": "scrapers.holidayagent_scraper", "class": "CampingOmmerlandScraper",
+                          "platform": "holidayagent", "group": "api_ommerland", "browser": False},
+    "ommerland_camping": {"module": "scrapers.holidayagent_scraper", "class": "CampingOmmerlandCampingScraper",
+                          "platform": "holidayagent", "group": "api_ommerland", "browser": False},
+    "ommerland_psanitair": {"module": "scrapers.holidayagent_scraper", "class": "CampingOmmerlandPsanitairScraper",
+                            "platform": "holidayagent", "group": "api_ommerland", "browser": False},
+    "eiland_van_maurik": {"module": "scrapers.holidayagent_scraper", "class": "EilandVanMaurikScraper",
+                          "platform": "holidayagent", "group": "api_maurik", "browser": False},
+    "maurik_camping": {"module": "scrapers.holidayagent_scraper", "class": "EilandVanMaurikCampingScraper",
+                       "platform": "holidayagent", "group": "api_maurik", "browser": False},
+
+    # --- BookingExperts scrapers (browser, gespreid) ---
+    "de_boshoek": {"module": "scrapers.de_boshoek", "class": "DeBoshoekScraper",
+                   "platform": "bookingexperts", "group": "be_boshoek", "browser": True},
+    "zandstuve_boslodge": {"module": "scrapers.zandstuve_scraper", "class": "ZandstuveBoslodgeScraper",
+                           "platform": "bookingexperts", "group": "be_zandstuve", "browser": True},
+    "beerze_bulten": {"module": "scrapers.beerze_bulten", "class": "BeerzeBultenScraper",
+                      "platform": "bookingexperts", "group": "be_beerzebulten", "browser": True},
+    "bb_camping": {"module": "scrapers.beerze_bulten", "class": "BeerzeBultenCampingScraper",
+                   "platform": "bookingexperts", "group": "be_beerzebulten", "browser": True},
+    "zandstuve_camping": {"module": "scrapers.zandstuve_scraper", "class": "ZandstuveCampingScraper",
+                          "platform": "bookingexperts", "group": "be_zandstuve", "browser": True},
+    "de_witte_berg": {"module": "scrapers.de_witte_berg", "class": "DeWitteBergScraper",
+                      "platform": "bookingexperts", "group": "be_witteberg", "browser": True},
+    "bb_psanitair": {"module": "scrapers.beerze_bulten", "class": "BeerzeBultenPsanitairScraper",
+                     "platform": "bookingexperts", "group": "be_beerzebulten", "browser": True},
+    "zandstuve_psanitair": {"module": "scrapers.zandstuve_scraper", "class": "ZandstuvePsanitairScraper",
+                            "platform": "bookingexperts", "group": "be_zandstuve", "browser": True},
+
+    # --- Other browser scrapers ---
+    "witter_zomer": {"module": "scrapers.witter_zomer", "class": "WitterZomerScraper",
+                     "platform": "tommybooking", "group": "tomm_witterzomer", "browser": True},
+
+    # --- Capfun scrapers (HTTP API) ---
+    "stoetenslagh_camping": {"module": "scrapers.capfun_scraper", "class": "CapfunStoetenslaghCampingScraper",
+                             "platform": "capfun", "group": "capfun", "browser": False},
+    "stoetenslagh_acc": {"module": "scrapers.capfun_scraper", "class": "CapfunStoetenslaghAccScraper",
+                         "platform": "capfun", "group": "capfun", "browser": False},
+    "sprookjes_camping": {"module": "scrapers.capfun_scraper", "class": "CapfunSprookjesCampingScraper",
+                          "platform": "capfun", "group": "capfun", "browser": False},
+    "fruithof_camping": {"module": "scrapers.capfun_scraper", "class": "CapfunFruithofCampingScraper",
+                         "platform": "capfun", "group": "capfun", "browser": False},
+    "fruithof_acc": {"module": "scrapers.capfun_scraper", "class": "CapfunFruithofAccScraper",
+                     "platform": "capfun", "group": "capfun", "browser": False},
+
+    # --- Landal scrapers (HTTP API) ---
+    "landal_aelderholt": {"module": "scrapers.landal_scraper", "class": "LandalAelderholtScraper",
+                          "platform": "landal", "group": "api_landal", "browser": False},
+    "landal_aelderholt_premium": {"module": "scrapers.landal_scraper", "class": "LandalAelderholtPremiumScraper",
+                                  "platform": "landal", "group": "api_landal", "browser": False},
+    "landal_bartje": {"module": "scrapers.landal_scraper", "class": "LandalBartjeScraper",
+                      "platform": "landal", "group": "api_landal", "browser": False},
+
+    # --- De Kleine Wolf scrapers (HTTP API) ---
+    "kleinewolf_camping": {"module": "scrapers.kleinewolf_scraper", "class": "KleineWolfCampingScraper",
+                           "platform": "kleinewolf", "group": "api_kleinewolf", "browser": False},
+    "kleinewolf_acc": {"module": "scrapers.kleinewolf_scraper", "class": "KleineWolfAccScraper",
+                       "platform": "kleinewolf", "group": "api_kleinewolf", "browser": False},
+
+    # --- RCN De Noordster scrapers (HTTP, Nuxt SSR-pagina's) ---
+    "rcn_mercurius": {"module": "scrapers.rcn_scraper", "class": "RcnNoordsterMercuriusScraper",
+                      "platform": "rcn", "group": "rcn", "browser": False},
+    "rcn_luna": {"module": "scrapers.rcn_scraper", "class": "RcnNoordsterLunaScraper",
+                 "platform": "rcn", "group": "rcn", "browser": False},
+    "rcn_camping": {"module": "scrapers.rcn_scraper", "class": "RcnNoordsterCampingScraper",
+                    "platform": "rcn", "group": "rcn", "browser": False},
+
+    # --- Westerbergen (eigen park, alle segmenten) ---
+    "westerbergen": {"module": "scrapers.westerbergen", "class": "WesterbergenScraper",
+                     "platform": "westerbergen", "group": "westerbergen", "browser": True},
+    "westerbergen_camping": {"module": "scrapers.westerbergen", "class": "WesterbergenCampingScraper",
+                             "platform": "westerbergen", "group": "westerbergen", "browser": True},
+    "westerbergen_psanitair": {"module": "scrapers.westerbergen", "class": "WesterbergenPsanitairScraper",
+                               "platform": "westerbergen", "group": "westerbergen", "browser": True},
+}
+
+# Domain groups whose host tolerates concurrent scrapers: the planner may
+# split these into up to N parallel sub-groups. Not listed = 1 (sequential).
+GROUP_MAX_PARALLEL = {
+    "capfun": 2,
+    "api_ommerland": 2,
+}
+
+# Domain groups scraped in one shared session via the scraper class's
+# ``run_group(scrapers, **params)`` classmethod instead of one by one.
+# Never split by the planner; cost = slowest member instead of the sum.
+SHARED_SESSION_GROUPS = {"westerbergen", "api_landal", "api_molecaten"}
+
+
+def get_entry(key: str) -> dict:
+    """Registry entry for a key; raises KeyError with the available keys."""
+    try:
+        return SCRAPERS[key]
+    except KeyError:
+        raise KeyError(f"Onbekende scraper '{key}' (beschikbaar: {', '.join(SCRAPERS)})") from None
+
+
+def scraper_class(key: str):
+    """Import the scraper module for ``key`` and return its class."""
+    entry = get_entry(key)
+    module = importlib.import_module(entry["module"])
+    return getattr(module, entry["class"])
+
+
+def build_scraper(key: str, db, headless: bool = True, **kwargs):
+    """Instantiate the scraper for ``key`` (imports its module on first use)."""
+    scraper = scraper_class(key)(db=db, headless=headless, **kwargs)
+    scraper.scraper_key = key
+    return scraper
+
+
+def domain_groups(keys=None) -> dict[str, list[str]]:
+    """Group scraper keys by domain, in registry order.
+
+    Keys not in the registry get their own ``_ungrouped_<key>`` group.
+    """
+    selected = list(SCRAPERS) if keys is None else list(keys)
+    wanted = set(selected)
+    groups = {}
+    for key, entry in SCRAPERS.items():
+        if key in wanted:
+            groups.setdefault(entry["group"], []).append(key)
+    for key in selected:
+        if key not in SCRAPERS:
+            groups[f"_ungrouped_{key}"] = [key]
+    return groups
+
+
+def is_shared_group(keys: list[str]) -> bool:
+    """True if ``keys`` (2+) all belong to one shared-session group."""
+    groups = {SCRAPERS.get(key, {}).get("group") for key in keys}
+    return len(keys) > 1 and len(groups) == 1 and groups <= SHARED_SESSION_GROUPS
+
+
+class LazyScraperMap(Mapping):
+    """Read-only mapping key -> scraper that builds each scraper on first access."""
+
+    def __init__(self, db, headless: bool = True, keys=None):
+        self.db = db
+        self.headless = headless
+        self._keys = list(SCRAPERS) if keys is None else [k for k in keys if k in SCRAPERS]
+        self._built = {}
+
+    def __getitem__(self, key):
+        if key not in self._built:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._built[key] = build_scraper(key, db=self.db, headless=self.headless)
+        return self._built[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
@@ -0,0 +1,182 @@
+"""Performance-telemetrie per scraper-run (tabel ``scrape_metrics``).
+
+``scrape_log`` zegt alleen hoe lang een run duurde. ``RunMetrics`` splitst
+die tijd op, zodat een trage run te herleiden is tot netwerk, rate-limit
+wachttijd, parsen of SQLite:
+
+- HTTP (requests): een response-hook op de sessie telt requests, fouten
+  (status >= 400), bytes en latency (tijd tot headers); wachttijd in de
+  adaptieve rate control komt mee via ``response.rate_wait``
+- browser (Playwright): ``requestfinished``/``response`` events op pagina's
+  van ``BaseScraper._create_page``
+- ``_wait_rate_limit``: geslapen tijd
+- parsen en database-writes via ``timed("parse")`` / ``timed("db")``
+
+Met tracing aan (zie tracing.py) wordt elk request ook een span.
+
+Scrapers in een groep met gedeelde sessie (Landal) boeken het HTTP-verkeer
+op de lead-scraper. De orchestrator reset de metrics vóór elke run en
+schrijft ze daarna weg (``Database.save_scrape_metrics``).
+
+Usage:
+    metrics = RunMetrics()
+    metrics.instrument_session(session)
+    with metrics.timed("parse"):
+        records = parse(data)
+    db.save_scrape_metrics(**metrics.summary(), scraper_key=key, ...)
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import tracing
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of sorted ``values`` (None when empty)."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _span_name(method: str, url: str) -> str:
+    """Trace span name of a request: method, host and path (no query)."""
+    parts = urlsplit(url)
+    return f"{method} {parts.netloc}{parts.path}"
+
+
+class RunMetrics:
+    """Counters for one scraper run (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run (hooks stay attached to this object)."""
+        with self._lock:
+            self.started = time.time()
+            self.requests = 0
+            self.http_errors = 0
+            self.bytes = 0
+            self.latencies = []
+            self.seconds = {"sleep": 0.0, "parse": 0.0, "db": 0.0}
+
+    def record_request(self, latency: float | None, nbytes: int = 0, status: int = None,
+                       waited: float = 0.0):
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+            if latency is not None and latency >= 0:
+                self.latencies.append(latency)
+            if status is not None and status >= 400:
+                self.http_errors += 1
+            self.seconds["sleep"] += waited
+
+    def add_bytes(self, nbytes: int):
+        with self._lock:
+            self.bytes += nbytes
+
+    def add_time(self, kind: str, seconds: float):
+        with self._lock:
+            self.seconds[kind] = self.seconds.get(kind, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, kind: str):
+        """Add the duration of the block to ``kind`` (parse, db, sleep)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(kind, time.perf_counter() - t0)
+
+    # --- HTTP (requests) ---
+
+    def on_response(self, response, *args, **kwargs):
+        """requests response hook: latency, status, bytes, rate-control wait."""
+        headers_at = time.time()
+        latency = response.elapsed.total_seconds()
+        if kwargs.get("stream"):
+            # Body not read yet (RCN reads only a prefix): the caller adds bytes
+            nbytes = 0
+        else:
+            nbytes = len(response.content or b"")
+        waited = getattr(response, "rate_wait", 0.0)
+        self.record_request(latency, nbytes, response.status_code, waited=waited)
+        if tracing.active():
+            start = headers_at - latency
+            tracing.add_span(
+                _span_name(response.request.method, response.url), start,
+                time.time() - start, cat="http", status=response.status_code,
+                bytes=nbytes, rate_wait=round(waited, 3),
+            )
+        return response
+
+    def instrument_session(self, session):
+        """Count every request of a requests.Session (once per session)."""
+        hooks = session.hooks.setdefault("response", [])
+        if self.on_response not in hooks:
+            hooks.append(self.on_response)
+        return session
+
+    # --- Browser (Playwright) ---
+
+    def instrument_page(self, page):
+        """Count requests of a Playwright page: latency from timing, bytes from headers."""
+        def on_finished(request):
+            timing = getattr(request, "timing", None) or {}
+            end = timing.get("responseEnd", -1)
+            latency = end / 1000 if end is not None and end >= 0 else None
+            self.record_request(latency)
+            if latency is not None and timing.get("startTime"):
+                tracing.add_span(_span_name(request.method, request.url),
+                                 timing["startTime"] / 1000, latency, cat="browser",
+                                 resource=request.resource_type)
+
+        def on_response(response):
+            try:
+                length = int(response.headers.get("content-length") or 0)
+            except (TypeError, ValueError):
+                length = 0
+            if length:
+                self.add_bytes(length)
+            if response.status >= 400:
+                with self._lock:
+                    self.http_errors += 1
+
+        page.on("requestfinished", on_finished)
+        page.on("response", on_response)
+        return page
+
+    # --- Summary ---
+
+    def summary(self) -> dict:
+        """Columns of one scrape_metrics row."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                "requests": self.requests,
+                "http_errors": self.http_errors,
+                "bytes": self.bytes,
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p95": _percentile(latencies, 95),
+                "latency_max": latencies[-1] if latencies else None,
+                "sleep_seconds": round(self.seconds["sleep"], 3),
+                "parse_seconds": round(self.seconds["parse"], 3),
+                "db_seconds": round(self.seconds["db"], 3),
+            }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        p50 = f"{s['latency_p50'] * 1000:.0f}ms" if s["latency_p50"] is not None else "-"
+        p95 = f"{s['latency_p95'] * 1000:.0f}ms" if s["latency_p95"] is not None else "-"
+        return (
+            f"  Telemetrie: {s['requests']} requests ({s['http_errors']} fouten), "
+            f"{s['bytes'] / 1024:.0f} KB, latency p50 {p50} / p95 {p95}, "
+            f"wachten {s['sleep_seconds']:.1f}s, parsen {s['parse_seconds']:.1f}s, "
+            f"db {s['db_seconds']:.1f}s"
+        )
@@ -11,9 +11,12 @@ for each arrival date.
 Prices are fetched with withExtras=true to include all mandatory costs:
 eindschoonmaak, bedlinnen, administratiekosten, parklasten.
 This ensures fair comparison with competitor prices.
+
+All segments share one booking session: ``WesterbergenScraper.run_group``
+loads the booking page once and fetches every object type through one JS
+worker window (the orchestrator uses it for the ``westerbergen`` group).
 """
 
-import json
 import time
 import logging
 from datetime import datetime, timedelta
@@ -45,6 +48,89 @@ class WesterbergenScraper(BaseScraper):
     # Segment for database storage
     SEGMENT = "accommodatie"
 
+    # Price requests in flight at once, shared by all segments of a run
+    CONCURRENCY = 12
+
+    # Dates per object type, then one worker window over all
+    # (object type, date) price requests.
+    FETCH_JS = """
+        async (params) => {
+            const headers = {'X-Requested-With': 'XMLHttpRequest'};
+            const persons = params.persons;
+            const rentalParam = t => t.rentalIds.map(id => '&rental[]=' + id).join('');
+
+            // Step 1: available dates for every object type and month
+            const dateResults = await Promise.all(params.targets.map(t =>
+                Promise.all(params.months.map(([y, m]) =>
+                    fetch('/web/recreation/getAvailableDatesByYearMonth'
+                        + '?language=nl&year=' + y
+                        + '&month=' + String(m).padStart(2, '0')
+                        + '&objectType=' + t.objectType
+                        + rentalParam(t)
+                        + '&package=all',
+                        {headers}
+                    )
+                    .then(r => r.json())
+                    .catch(e => ({available: []}))
+                ))
+            ));
+
+            const out = params.targets.map(() => ({dates: 0, prices: []}));
+            const tasks = [];
+            dateResults.forEach((months, ti) => {
+                const allDates = new Set();
+                months.forEach(r => (r.available || []).forEach(d => allDates.add(d)));
+                const dates = [...allDates].sort();
+                out[ti].dates = dates.length;
+                dates.forEach(d => tasks.push([ti, d]));
+            });
+
+            // Step 2: prices, a fixed number of requests in flight
+            const fetchPrice = ([ti, dateStr]) => {
+                const t = params.targets[ti];
+                const [day, month, year] = dateStr.split('/').map(x => parseInt(x));
+                return fetch(
+                    '/web/recreation/getPricesByYearMonth'
+                    + '?language=nl&withExtras=true'
+                    + '&persons=' + persons
+                    + '&objectType=' + t.objectType
+                    + '&year=' + year
+                    + '&month=' + month
+                    + '&day=' + day
+                    + rentalParam(t),
+                    {headers}
+                )
+                .then(r => r.json())
+                .catch(e => ({periods: [], packages: []}))
+                .then(r => {
+                    (r.periods || []).forEach(p => {
+                        const raw = p.raw;
+                        if (raw && t.durations.includes(raw.nights)) {
+                            out[ti].prices.push(raw);
+                        }
+                    });
+                    (r.packages || []).forEach(p => {
+                        const raw = p.raw;
+                        if (raw && t.durations.includes(raw.nights)) {
+                            raw.is_package = true;
+                            out[ti].prices.push(raw);
+                        }
+                    });
+                });
+            };
+            let next = 0;
+            const worker = async () => {
+                while (next < tasks.length) {
+                    await fetchPrice(tasks[next++]);
+                }
+            };
+            await Promise.all(
+                Array.from({length: Math.min(params.concurrency, tasks.length)}, worker)
+            );
+            return out;
+        }
+    """
+
     def __init__(self, db: Database, headless: bool = True, **kwargs):
         super().__init__(
             competitor_name="Westerbergen",
@@ -60,23 +146,12 @@ class WesterbergenScraper(BaseScraper):
 
     def run_efficient(self, months_ahead: int = 12, persons: int = 4,
                       **kwargs) -> list[dict]:
-        """Scrape prices using the booking page REST API.
-
-        Loads the booking page to get a valid session, then uses
-        Promise.all to batch-fetch all prices efficiently.
-        """
-        from playwright.sync_api import sync_playwright
-
-        self.logger.info(
-            f"Starting scrape for {self.competitor_name}: "
-            f"{months_ahead} months ahead"
-        )
+        """Scrape prices using the booking page REST API."""
+        return self.run_group([self], months_ahead=months_ahead, persons=persons)[0]
 
-        start_time = time.time()
-        all_records = []
-        errors = 0
-
-        # Build list of (year, month) to query
+    @staticmethod
+    def _year_months(months_ahead: int) -> list[tuple[int, int]]:
+        """(year, month) pairs from the current month, ``months_ahead`` further."""
         now = datetime.now()
         year_months = []
         y, m = now.year, now.month
@@ -88,17 +163,42 @@ class WesterbergenScraper(BaseScraper):
             if m > 12:
                 m = 1
                 y += 1
+        return year_months
 
-        durations_js = json.dumps(self.STAY_DURATIONS)
+    @classmethod
+    def run_group(cls, scrapers: list, months_ahead: int = 12, persons: int = 4,
+                  concurrency: int = None, **kwargs) -> list[list[dict]]:
+        """Scrape several Westerbergen segments with one browser session.
+
+        Loads one booking page (all segments live on the same site), then
+        fetches available dates and prices for every object type through a
+        single JS worker window of ``concurrency`` requests in flight.
+        Each scraper saves its own records and scrape_log entry.
+
+        Returns the records per scraper, in the order of ``scrapers``.
+        """
+        from playwright.sync_api import sync_playwright
+
+        lead = scrapers[0]
+        concurrency = concurrency or cls.CONCURRENCY
+        lead.logger.info(
+            f"Starting scrape for {lead.competitor_name}: "
+            f"{len(scrapers)} segment(en), {months_ahead} months ahead"
+        )
+
+        start_time = time.time()
+        year_months = cls._year_months(months_ahead)
+        results = None
+        error = None
 
         with sync_playwright() as playwright:
-            browser = self._create_browser(playwright)
+            browser = lead._create_browser(playwright)
             try:
-                page = self._create_page(browser)
+                page = lead._create_page(browser)
 
                 # Load the booking page to establish session
-                self.logger.info("  Loading booking page...")
-                page.goto(self.BOOKING_URL, wait_until="networkidle", timeout=120000)
+                lead.logger.info("  Loading booking page...")
+                page.goto(lead.BOOKING_URL, wait_until="networkidle", timeout=120000)
                 time.sleep(3)
 
                 # Accept cookies (Cookiebot)
@@ -112,179 +212,107 @@ class WesterbergenScraper(BaseScraper):
                 except Exception:
                     pass
 
-                # Build the months array for JS
-                months_js = json.dumps(year_months)
-
-                # Batch fetch all available dates + prices in one evaluate call
-                self.logger.info(
-                    f"  Fetching prices for {len(year_months)} months..."
+                lead.logger.info(
+                    f"  Fetching prices for {len(year_months)} months, "
+                    f"{concurrency} requests in flight..."
                 )
-
-                result = page.evaluate("""
-                    async (params) => {
-                        const headers = {'X-Requested-With': 'XMLHttpRequest'};
-                        const months = params.months;
-                        const objectType = params.objectType;
-                        const rentalIds = params.rentalIds;
-                        const durations = params.durations;
-                        const persons = params.persons;
-
-                        // Build rental[] query string from list of IDs
-                        const rentalParam = rentalIds.map(id => '&rental[]=' + id).join('');
-
-                        // Step 1: Get available dates for all months
-                        const datePromises = months.map(([y, m]) =>
-                            fetch('/web/recreation/getAvailableDatesByYearMonth'
-                                + '?language=nl&year=' + y
-                                + '&month=' + String(m).padStart(2, '0')
-                                + '&objectType=' + objectType
-                                + rentalParam
-                                + '&package=all',
-                                {headers}
-                            )
-                            .then(r => r.json())
-                            .catch(e => ({available: []}))
-                        );
-                        const dateResults = await Promise.all(datePromises);
-
-                        // Collect unique dates
-                        const allDates = new Set();
-                        dateResults.forEach(r =>
-                            (r.available || []).forEach(d => allDates.add(d))
-                        );
-                        const dates = [...allDates].sort();
-
-                        // Step 2: Fetch prices in batches of 10
-                        const allPrices = [];
-                        for (let i = 0; i < dates.length; i += 10) {
-                            const batch = dates.slice(i, i + 10);
-                            const pricePromises = batch.map(dateStr => {
-                                const parts = dateStr.split('/');
-                                const day = parseInt(parts[0]);
-                                const month = parseInt(parts[1]);
-                                const year = parseInt(parts[2]);
-                                return fetch(
-                                    '/web/recreation/getPricesByYearMonth'
-                                    + '?language=nl&withExtras=true'
-                                    + '&persons=' + persons
-                                    + '&objectType=' + objectType
-                                    + '&year=' + year
-                                    + '&month=' + month
-                                    + '&day=' + day
-                                    + rentalParam,
-                                    {headers}
-                                )
-                                .then(r => r.json())
-                                .catch(e => ({periods: [], packages: []}));
-                            });
-                            const priceResults = await Promise.all(pricePromises);
-                            priceResults.forEach(r => {
-                                (r.periods || []).forEach(p => {
-                                    const raw = p.raw;
-                                    if (raw && durations.includes(raw.nights)) {
-                                        allPrices.push(raw);
-                                    }
-                                });
-                                (r.packages || []).forEach(p => {
-                                    const raw = p.raw;
-                                    if (raw && durations.includes(raw.nights)) {
-                                        raw.is_package = true;
-                                        allPrices.push(raw);
-                                    }
-                                });
-                            });
-                        }
-
-                        return {dates: dates.length, prices: allPrices};
-                    }
-                """, {
+                results = page.evaluate(cls.FETCH_JS, {
                     "months": year_months,
-                    "objectType": self.OBJECT_TYPE,
-                    "rentalIds": self.RENTAL_IDS,
-                    "durations": self.STAY_DURATIONS,
+                    "targets": [
+                        {"objectType": s.OBJECT_TYPE, "rentalIds": s.RENTAL_IDS,
+                         "durations": s.STAY_DURATIONS}
+                        for s in scrapers
+                    ],
                     "persons": persons,
+                    "concurrency": concurrency,
                 })
-
-                dates_count = result.get("dates", 0)
-                prices = result.get("prices", [])
-
-                self.logger.info(
-                    f"  Found {dates_count} arrival dates, "
-                    f"{len(prices)} price entries"
-                )
-
-                # Process results
-                seen_keys = set()
-                for p in prices:
-                    arrival_raw = p.get("arrivaldate", "")
-                    departure_raw = p.get("departuredate", "")
-                    nights = p.get("nights", 0)
-                    price = p.get("price")
-                    available = p.get("available", 0)
-
-                    if not arrival_raw or price is None:
-                        continue
-
-                    # Convert DD/MM/YYYY to YYYY-MM-DD
-                    try:
-                        arr_parts = arrival_raw.split("/")
-                        check_in = f"{arr_parts[2]}-{arr_parts[1]}-{arr_parts[0]}"
-                        dep_parts = departure_raw.split("/")
-                        check_out = f"{dep_parts[2]}-{dep_parts[1]}-{dep_parts[0]}"
-                    except (IndexError, ValueError):
-                        continue
-
-                    key = (check_in, check_out)
-                    if key in seen_keys:
-                        continue
-                    seen_keys.add(key)
-
-                    special = None
-                    if p.get("discounted"):
-                        from_price = p.get("fromprice", 0)
-                        if from_price and from_price > price:
-                            special = f"Was EUR {from_price:.0f}"
-
-                    record = {
-                        "competitor_name": self.competitor_name,
-                        "accommodation_type": self.accommodation_type,
-                        "check_in_date": check_in,
-                        "check_out_date": check_out,
-                        "price": float(price),
-                        "available": bool(available),
-                        "min_nights": nights,
-                        "special_offers": special,
-                        "persons": persons,
-                        "segment": self.SEGMENT,
-                    }
-                    self.db.save_price(**record)
-                    all_records.append(record)
-
             except Exception as e:
-                errors += 1
-                self.logger.error(f"  Scraping failed: {e}", exc_info=True)
+                error = e
+                lead.logger.error(f"  Scraping failed: {e}", exc_info=True)
             finally:
                 browser.close()
 
         duration = time.time() - start_time
+        all_records = []
+        for i, scraper in enumerate(scrapers):
+            records, errors = [], 1 if error else 0
+            if results is not None:
+                try:
+                    records = scraper._save_prices(results[i], persons)
+                except Exception as e:
+                    errors += 1
+                    scraper.logger.error(f"  Processing failed: {e}", exc_info=True)
+            scraper._finish(records, errors, duration)
+            all_records.append(records)
+        return all_records
+
+    def _save_prices(self, result: dict, persons: int) -> list[dict]:
+        """Turn the raw API price entries into records and save them."""
+        dates_count = result.get("dates", 0)
+        prices = result.get("prices", [])
+
+        self.logger.info(
+            f"  {self.SEGMENT}: {dates_count} arrival dates, "
+            f"{len(prices)} price entries"
+        )
+
+        ingest = self._ingest_sink()
+        for p in prices:
+            arrival_raw = p.get("arrivaldate", "")
+            departure_raw = p.get("departuredate", "")
+            nights = p.get("nights", 0)
+            price = p.get("price")
+            available = p.get("available", 0)
+
+            if not arrival_raw or price is None:
+                continue
+
+            # Convert DD/MM/YYYY to YYYY-MM-DD
+            try:
+                arr_parts = arrival_raw.split("/")
+                check_in = f"{arr_parts[2]}-{arr_parts[1]}-{arr_parts[0]}"
+                dep_parts = departure_raw.split("/")
+                check_out = f"{dep_parts[2]}-{dep_parts[1]}-{dep_parts[0]}"
+            except (IndexError, ValueError):
+                continue
+
+            special = None
+            if p.get("discounted"):
+                from_price = p.get("fromprice", 0)
+                if from_price and from_price > price:
+                    special = f"Was EUR {from_price:.0f}"
+
+            record = self._make_record(
+                check_in, check_out,
+                float(price),
+                available=bool(available),
+                min_nights=nights,
+                special_offers=special,
+                persons=persons,
+                segment=self.SEGMENT,
+            )
+            ingest.add([record])
+        return ingest.close()
+
+    def _finish(self, records: list[dict], errors: int, duration: float):
+        """Write the scrape_log entry and the completion summary."""
         status = "success" if errors == 0 else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
-            records_scraped=len(all_records),
+            records_scraped=len(records),
             error_message=f"{errors} errors" if errors else None,
             duration_seconds=duration,
         )
 
-        available = [r for r in all_records if r["available"] and r["price"]]
+        available = [r for r in records if r["available"] and r["price"]]
         self.logger.info(
-            f"Completed {self.competitor_name}: {len(all_records)} records "
+            f"Completed {self.competitor_name} ({self.SEGMENT}): {len(records)} records "
             f"({len(available)} available), {duration:.1f}s"
         )
 
-        return all_records
-
 
 class WesterbergenCampingScraper(WesterbergenScraper):
     """Westerbergen — Comfort kampeerplaats."""
@@ -4,10 +4,12 @@ The site uses a Vue-based booking widget (widgets.boekingpro.nl) that shows
 a price matrix on the accommodation detail page with date columns and
 duration rows.
 
-Prices are read directly from the rendered widget DOM rather than the
-raw matrix API, because the Vue widget applies client-side promotional
-discounts that are not included in the API response. This ensures we
-capture the actual consumer-facing prices.
+The widget's JSON responses are captured with ``page.on("response")``.
+The Vue widget may apply client-side promotional discounts that the raw
+matrix API lacks, so the first page is cross-checked against the rendered
+widget DOM: only if the payload prices match are later pages read (and,
+where the matrix request can be replayed, paged) at API level. Otherwise
+prices are read from the DOM, which always shows the consumer-facing price.
 
 The matrix cells contain booking links with structured parameters including
 check-in/check-out dates and the final price. We parse these links for
@@ -17,7 +19,6 @@ The widget is paginated; clicking the 'next' arrow advances to the
 next set of date columns (typically 4 columns per page).
 """
 
-import json
 import re
 import time
 import logging
@@ -27,10 +28,132 @@ from urllib.parse import unquote
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.progress_log import ProgressLog
 from database import Database
 
 logger = logging.getLogger(__name__)
 
+# Widget/API hosts whose JSON responses are captured
+_WIDGET_HOSTS = ("boekingpro.nl", "tomm")
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_CHECK_IN_KEYS = ("start", "arrival", "arrivalDate", "checkIn", "from")
+_CHECK_OUT_KEYS = ("end", "departure", "departureDate", "checkOut", "till", "to")
+_PRICE_KEYS = ("price", "totalPrice", "total", "amount")
+_PROMO_KEYS = ("discountPrice", "discountedPrice", "promoPrice", "priceDiscount")
+_OLD_PRICE_KEYS = ("priceOld", "oldPrice", "originalPrice", "fromPrice")
+
+
+def _first(obj: dict, keys: tuple):
+    for key in keys:
+        if obj.get(key) not in (None, ""):
+            return obj[key]
+    return None
+
+
+def _number(value) -> float | None:
+    if isinstance(value, dict):
+        value = _first(value, ("amount", "value", "raw"))
+    try:
+        return float(str(value).replace(",", ".")) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _prices_from_payload(payload) -> list[dict]:
+    """Price records from a widget JSON payload (schema-tolerant walk).
+
+    Any object with a check-in date, a check-out date (directly or in a
+    nested ``period``) and a price counts as a matrix cell. A promo price
+    field, if present, wins over the regular price.
+    """
+    records = []
+
+    def _walk(obj):
+        if isinstance(obj, list):
+            for item in obj:
+                _walk(item)
+            return
+        if not isinstance(obj, dict):
+            return
+        period = obj.get("period") if isinstance(obj.get("period"), dict) else obj
+        check_in = _first(period, _CHECK_IN_KEYS)
+        check_out = _first(period, _CHECK_OUT_KEYS)
+        price = _number(_first(obj, _PRICE_KEYS))
+        if (isinstance(check_in, str) and isinstance(check_out, str)
+                and _DATE_RE.match(check_in) and _DATE_RE.match(check_out)
+                and price is not None):
+            check_in, check_out = check_in[:10], check_out[:10]
+            nights = (
+                datetime.strptime(check_out, "%Y-%m-%d")
+                - datetime.strptime(check_in, "%Y-%m-%d")
+            ).days
+            promo = _number(_first(obj, _PROMO_KEYS))
+            original = _number(_first(obj, _OLD_PRICE_KEYS))
+            if promo is not None and promo < price:
+                original, price = price, promo
+            records.append({
+                "check_in_date": check_in,
+                "check_out_date": check_out,
+                "price": price,
+                "available": True,
+                "min_nights": nights,
+                "special_offers": (
+                    f"Was EUR {original:.0f}" if original and original > price else None
+                ),
+            })
+            return
+        for value in obj.values():
+            _walk(value)
+
+    _walk(payload)
+    return records
+
+
+def _with_start_date(url: str, start: str) -> str:
+    """Replace the first ISO date in the query string with ``start``."""
+    base, _, query = url.partition("?")
+    return f"{base}?{_DATE_RE.sub(start, query, count=1)}"
+
+
+class _ResponseCapture:
+    """Collects the widget's JSON responses via ``page.on("response")``."""
+
+    def __init__(self):
+        self.payloads = []   # [(url, json)]
+
+    def __call__(self, response):
+        if not any(host in response.url for host in _WIDGET_HOSTS):
+            return
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        try:
+            self.payloads.append((response.url, response.json()))
+        except Exception:
+            pass
+
+    def records(self, since: int = 0) -> list[dict]:
+        return [r for _, payload in self.payloads[since:] for r in _prices_from_payload(payload)]
+
+    def matrix_url(self) -> str | None:
+        """Last captured request that yielded prices and has a date to shift."""
+        for url, payload in reversed(self.payloads):
+            if _DATE_RE.search(url.partition("?")[2]) and _prices_from_payload(payload):
+                return url
+        return None
+
+    def wait(self, page: Page, seen: int, timeout_ms: int = 10000) -> bool:
+        """Wait until a response arrived after the first ``seen`` ones."""
+        waited = 0
+        while len(self.payloads) <= seen and waited < timeout_ms:
+            page.wait_for_timeout(100)
+            waited += 100
+        # Let the rest of a burst of responses come in
+        if len(self.payloads) > seen:
+            page.wait_for_timeout(200)
+            return True
+        return False
+
 
 class WitterZomerScraper(BaseScraper):
     """Scraper for Witter Zomer via the BoekingPro/TOMM matrix widget."""
@@ -185,12 +308,45 @@ class WitterZomerScraper(BaseScraper):
 
         return result_records, has_next
 
+    @staticmethod
+    def _payload_matches_dom(payload_records: list[dict], dom_records: list[dict]) -> bool:
+        """True if the payload prices equal the rendered (promo) prices.
+
+        Needs at least one overlapping stay and no price difference above
+        EUR 0.50; otherwise the widget applies client-side discounts the
+        payload lacks and the DOM stays the source.
+        """
+        payload = {(r["check_in_date"], r["check_out_date"]): r for r in payload_records}
+        overlap = [
+            (payload[key], r) for r in dom_records
+            if (key := (r["check_in_date"], r["check_out_date"])) in payload
+        ]
+        return bool(overlap) and all(
+            abs(p["price"] - d["price"]) <= 0.5 for p, d in overlap
+        )
+
+    def _replay(self, page: Page, url: str, start: str) -> list[dict]:
+        """Fetch the matrix payload for a later start date in the page context."""
+        self._wait_rate_limit()
+        try:
+            resp = page.request.get(_with_start_date(url, start))
+            if not resp.ok:
+                return []
+            return _prices_from_payload(resp.json())
+        except Exception as e:
+            self.logger.debug("  Matrix replay failed: %s", e)
+            return []
+
     def run_efficient(self, months_ahead: int = 12, persons: int = 4,
                       max_pages: int = 100, **kwargs) -> list[dict]:
         """Scrape prices by loading the widget and paginating through dates.
 
-        Reads prices from the rendered DOM to capture promotional discounts
-        that the raw matrix API does not include.
+        The widget's JSON responses are captured (``page.on("response")``).
+        On the first page they are checked against the rendered DOM: if the
+        payload carries the consumer-facing (promo) prices, later pages are
+        read from the payloads only and paged at API level where the matrix
+        request can be replayed with a later start date. Otherwise every
+        page is read from the DOM as before.
         """
         from playwright.sync_api import sync_playwright
 
@@ -201,60 +357,67 @@ class WitterZomerScraper(BaseScraper):
 
         target_end = datetime.now() + timedelta(days=months_ahead * 30)
         target_end_str = target_end.strftime("%Y-%m-%d")
+        segment = getattr(self, 'segment', 'accommodatie')
 
         start_time = time.time()
-        all_records = []
-        seen_keys = set()
+        ingest = self._ingest_sink()
+        progress = ProgressLog(self.logger, unit="pages")
+        last_date = None
         errors = 0
         empty_pages = 0  # Track consecutive pages with no new data
 
+        def _store(records) -> tuple[int, str | None]:
+            nonlocal last_date
+            page_records = [
+                self._make_record(persons=persons, segment=segment, **r)
+                for r in records if r["min_nights"] in self.STAY_DURATIONS
+            ]
+            # Pages overlap; the sink keeps one record per stay. Written per
+            # page so an aborted run keeps what it had.
+            new_count = ingest.add(page_records)
+            ingest.flush()
+            max_date_seen = max((r.check_in_date for r in page_records), default=None)
+            if max_date_seen and (last_date is None or max_date_seen > last_date):
+                last_date = max_date_seen
+            return new_count, max_date_seen
+
+        capture = _ResponseCapture()
         with sync_playwright() as playwright:
             browser = self._create_browser(playwright)
             try:
                 page = self._create_page(browser)
+                page.on("response", capture)
 
                 # Load the accommodation detail page with correct person count
                 detail_url = self._build_detail_url(persons)
                 self.logger.info("  Loading accommodation detail page...")
                 page.goto(detail_url, wait_until="networkidle", timeout=120000)
-                time.sleep(5)  # Wait for Vue widget to fully render
+                # Wait for the Vue widget to render (was a fixed 5s sleep)
+                try:
+                    page.wait_for_selector(
+                        ".w3media-booking-matrix-widget .matrix-row", timeout=15000
+                    )
+                except PlaywrightTimeout:
+                    self.logger.warning("  Widget matrix not rendered after 15s")
+
+                # Payload vs DOM on the first page decides the mode
+                dom_records, has_next = self._parse_widget_matrix(page)
+                api_mode = self._payload_matches_dom(capture.records(), dom_records)
+                self.logger.info(
+                    "  Mode: " + ("API payloads" if api_mode else "DOM (payload lacks promo prices)")
+                )
+                page_records = dom_records
+                seen_payloads = len(capture.payloads)
+                replay_url = capture.matrix_url() if api_mode else None
 
                 for page_num in range(1, max_pages + 1):
-                    try:
-                        records, has_next = self._parse_widget_matrix(page)
-                    except Exception as e:
-                        errors += 1
-                        self.logger.error(f"  Page {page_num} parse failed: {e}")
-                        break
+                    new_count, max_date_seen = _store(page_records)
 
-                    new_count = 0
-                    max_date_seen = None
-                    for r in records:
-                        if r["min_nights"] not in self.STAY_DURATIONS:
-                            continue
-                        key = (r["check_in_date"], r["check_out_date"])
-                        if key in seen_keys:
-                            continue
-                        seen_keys.add(key)
-
-                        record = {
-                            "competitor_name": self.competitor_name,
-                            "accommodation_type": self.accommodation_type,
-                            "persons": persons,
-                            "segment": getattr(self, 'segment', 'accommodatie'),
-                            **r,
-                        }
-                        self.db.save_price(**record)
-                        all_records.append(record)
-                        new_count += 1
-
-                        if max_date_seen is None or r["check_in_date"] > max_date_seen:
-                            max_date_seen = r["check_in_date"]
-
-                    self.logger.info(
-                        f"  Page {page_num} (up to {max_date_seen or '?'}): "
-                        f"{new_count} new prices"
+                    self.logger.debug(
+                        "  Page %d (up to %s): %d new prices",
+                        page_num, max_date_seen or "?", new_count,
                     )
+                    progress.update(prices=len(ingest))
 
                     # Stop if multiple consecutive pages have no data
                     if new_count == 0:
@@ -272,6 +435,18 @@ class WitterZomerScraper(BaseScraper):
                         )
                         break
 
+                    # API-level pagination: replay the matrix request from
+                    # the day after the last date seen
+                    if replay_url and last_date:
+                        next_start = (
+                            datetime.strptime(last_date, "%Y-%m-%d") + timedelta(days=1)
+                        ).strftime("%Y-%m-%d")
+                        page_records = self._replay(page, replay_url, next_start)
+                        if page_records:
+                            continue
+                        self.logger.info("  API replay gave no data, paging via widget")
+                        replay_url = None
+
                     # Navigate to next page
                     if not has_next:
                         self.logger.info("  No next button, stopping.")
@@ -284,29 +459,49 @@ class WitterZomerScraper(BaseScraper):
                         )
                         if next_btn and next_btn.is_visible():
                             next_btn.click()
-                            time.sleep(1)  # Wait for new data to render
                         else:
                             break
                     except Exception as e:
                         self.logger.warning(f"  Navigation failed: {e}")
                         break
 
+                    try:
+                        if api_mode and capture.wait(page, seen_payloads):
+                            page_records = capture.records(since=seen_payloads)
+                            has_next = page.query_selector(
+                                '.w3media-booking-matrix-widget a.btn-next'
+                            ) is not None
+                        else:
+                            page.wait_for_timeout(1000)  # Wait for new data to render
+                            with self.metrics.timed("parse"):
+                                page_records, has_next = self._parse_widget_matrix(page)
+                        seen_payloads = len(capture.payloads)
+                    except Exception as e:
+                        errors += 1
+                        self.logger.error(f"  Page {page_num + 1} parse failed: {e}")
+                        break
+
             except Exception as e:
                 errors += 1
                 self.logger.error(f"  Scraping failed: {e}", exc_info=True)
             finally:
                 browser.close()
 
+        all_records = ingest.close()
+        progress.done()
+        errors += ingest.errors
+        self.logger.info(ingest.format_stats())
         duration = time.time() - start_time
         status = "success" if errors == 0 else "partial" if all_records else "failed"
 
         self.db.log_scrape(
             competitor_name=self.competitor_name,
+            scraper_key=self.scraper_key,
             status=status,
             records_scraped=len(all_records),
             error_message=f"{errors} errors" if errors else None,
             duration_seconds=duration,
-            segment=getattr(self, 'segment', 'accommodatie'),
+            segment=segment,
         )
 
         available = [r for r in all_records if r["available"] and r["price"]]
@@ -27,21 +27,6 @@ class ZandstuveBoslodgeScraper(BeerzeBultenScraper):
         )
         self.segment = "accommodatie"
 
-    def run_efficient(self, **kwargs):
-        self._inject_segment()
-        return super().run_efficient(**kwargs)
-
-    def _inject_segment(self):
-        """Patch save_price to include segment."""
-        original_save = self.db.save_price
-        segment = self.segment
-
-        def save_with_segment(**kw):
-            kw.setdefault("segment", segment)
-            return original_save(**kw)
-
-        self.db.save_price = save_with_segment
-
 
 class ZandstuveCampingScraper(BeerzeBultenScraper):
     """De Zandstuve — Comfort camping site (kampeerplaats segment)."""
@@ -61,19 +46,8 @@ class ZandstuveCampingScraper(BeerzeBultenScraper):
 
     def run_efficient(self, **kwargs):
         kwargs.setdefault("persons", 2)
-        self._inject_segment()
         return super().run_efficient(**kwargs)
 
-    def _inject_segment(self):
-        original_save = self.db.save_price
-        segment = self.segment
-
-        def save_with_segment(**kw):
-            kw.setdefault("segment", segment)
-            return original_save(**kw)
-
-        self.db.save_price = save_with_segment
-
 
 class ZandstuvePsanitairScraper(BeerzeBultenScraper):
     """De Zandstuve — Pitch with private bathroom (privé sanitair segment)."""
@@ -93,15 +67,5 @@ class ZandstuvePsanitairScraper(BeerzeBultenScraper):
 
     def run_efficient(self, **kwargs):
         kwargs.setdefault("persons", 2)
-        self._inject_segment()
         return super().run_efficient(**kwargs)
 
-    def _inject_segment(self):
-        original_save = self.db.save_price
-        segment = self.segment
-
-        def save_with_segment(**kw):
-            kw.setdefault("segment", segment)
-            return original_save(**kw)
-
-        self.db.save_price = save_with_segment
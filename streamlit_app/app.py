@@ -21,7 +21,11 @@ if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
 from components.styles import get_custom_css, COLORS, CHART_COLORS, STAY_LABELS
-from components.data_loader import get_db_path, load_analytics, get_available_dates, get_scrape_status, get_available_segments
+from components.data_loader import get_db_path, load_analytics, get_available_dates, get_scrape_status, get_available_segments, get_scrape_metrics
+from components.derived import (
+    get_analytics_meta, get_price_frame, get_price_index_frame, get_position_rows,
+    get_monthly_prices, get_index_heatmap, get_coverage_rows, get_price_changes, clear_derived,
+)
 
 # ── Page Config ─────────────────────────────────────────────────
 st.set_page_config(
@@ -114,17 +118,13 @@ with st.sidebar:
         index=0,
     )
 
-    analytics = load_analytics(db_path, selected_date, segment=selected_segment)
-    meta = analytics.get("metadata", {})
-    competitors = meta.get("competitors", sorted(set(
-        comp for row in analytics.get("comparison_data", [])
-        for comp in row.get("competitors", {}).keys()
-    )))
+    meta = get_analytics_meta(db_path, selected_date, selected_segment)
+    competitors = meta["competitors"]
 
     st.markdown("---")
     selected_competitors = st.multiselect("CONCURRENTEN", competitors, default=competitors)
 
-    all_stay_types = sorted(set(r["stay_type"] for r in analytics.get("comparison_data", [])))
+    all_stay_types = meta["stay_types"]
     selected_stay_types = st.multiselect(
         "VERBLIJFSTYPE", all_stay_types, default=all_stay_types,
         format_func=lambda x: STAY_LABELS.get(x, x),
@@ -136,50 +136,16 @@ with st.sidebar:
 
 
 # ── Data voorbereiden ───────────────────────────────────────────
-# Bouw één plat DataFrame van alle comparison_data
-rows = []
-for row in analytics.get("comparison_data", []):
-    if row["stay_type"] not in selected_stay_types:
-        continue
-    base = {
-        "check_in": row["check_in_date"],
-        "check_out": row["check_out_date"],
-        "nachten": row["nights"],
-        "type": STAY_LABELS.get(row["stay_type"], row["stay_type"]),
-        "stay_type": row["stay_type"],
-        "maand": row["month"],
-        "dag": row["day_of_week"],
-        "dagen_vooruit": row["days_ahead"],
-        "Westerbergen": row["wb_price"],
-    }
-    has_comp = False
-    for comp in selected_competitors:
-        info = row.get("competitors", {}).get(comp, {})
-        price = info.get("price")
-        base[comp] = price
-        if price is not None:
-            has_comp = True
-    if has_comp:
-        rows.append(base)
-
-df = pd.DataFrame(rows) if rows else pd.DataFrame()
-
-# Prijsindex data
-pi_rows = []
-for p in analytics.get("price_index", []):
-    if p["stay_type"] not in selected_stay_types:
-        continue
-    if p["competitor"] not in selected_competitors:
-        continue
-    pi_rows.append(p)
-df_pi = pd.DataFrame(pi_rows) if pi_rows else pd.DataFrame()
-
-# Positie data
-pos_rows = []
-for p in analytics.get("competitive_position", []):
-    if p["stay_type"] not in selected_stay_types:
-        continue
-    pos_rows.append(p)
+# Alle afgeleide frames komen uit components.derived en worden per
+# filtercombinatie één keer berekend; reruns zonder filterwijziging
+# (tabwissel, sortering, head-to-head keuze) raken alleen de cache.
+_key = (db_path, selected_date, selected_segment)
+_comp_key = tuple(selected_competitors)
+_stay_key = tuple(selected_stay_types)
+
+df = get_price_frame(*_key, _comp_key, _stay_key)
+df_pi = get_price_index_frame(*_key, _comp_key, _stay_key)
+pos_rows = get_position_rows(*_key, _stay_key)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -259,19 +225,19 @@ with tab_markt:
                 st.plotly_chart(styled_fig(fig, "Ranking verdeling", 300), use_container_width=True)
 
         # ── Seizoenslijn ────────────────────────────────────────────
-        by_month = analytics.get("seasonal_patterns", {}).get("by_month", {})
-        if by_month:
-            months = sorted(by_month.keys())
+        monthly = get_monthly_prices(*_key, _comp_key)
+        months = monthly["months"]
+        if months:
             fig = go.Figure()
             for i, comp in enumerate(selected_competitors):
-                prices = [by_month[m].get(comp, {}).get("avg_price") for m in months]
+                prices = monthly["series"][comp]
                 fig.add_trace(go.Scatter(
                     x=months, y=prices, name=comp, mode="lines+markers",
                     line=dict(color=CHART_COLORS[(i + 1) % len(CHART_COLORS)], width=1.5, dash="dot"),
                     marker=dict(size=5),
                     hovertemplate=f"{comp}: €%{{y:,.0f}}<extra></extra>",
                 ))
-            wb_prices = [by_month[m].get("Westerbergen", {}).get("avg_price") for m in months]
+            wb_prices = monthly["series"]["Westerbergen"]
             fig.add_trace(go.Scatter(
                 x=months, y=wb_prices, name="Westerbergen", mode="lines+markers",
                 line=dict(color=COLORS["diep_bosgroen"], width=3.5),
@@ -281,15 +247,8 @@ with tab_markt:
             st.plotly_chart(styled_fig(fig, "Gemiddelde prijs per maand", 380), use_container_width=True)
 
         # ── Heatmap: index per week × concurrent ────────────────────
-        if not df_pi.empty:
-            df_hm = df_pi.copy()
-            df_hm["week"] = pd.to_datetime(df_hm["check_in_date"]).dt.isocalendar().week.astype(int)
-            df_hm["week_label"] = "W" + df_hm["week"].astype(str)
-            pivot = df_hm.pivot_table(values="price_index", index="competitor", columns="week_label", aggfunc="mean")
-            pivot = pivot.reindex([c for c in selected_competitors if c in pivot.index])
-            cols = sorted(pivot.columns, key=lambda x: int(x[1:]))
-            pivot = pivot[cols]
-
+        pivot = get_index_heatmap(*_key, _comp_key, _stay_key)
+        if not pivot.empty:
             fig = go.Figure(go.Heatmap(
                 z=pivot.values, x=pivot.columns, y=pivot.index,
                 colorscale=[[0, COLORS["diep_bosgroen"]], [0.5, COLORS["zandgroen"]], [1, COLORS["oranje_bruin"]]],
@@ -509,23 +468,84 @@ with tab_systeem:
             })
         st.dataframe(pd.DataFrame(status_rows), use_container_width=True, hide_index=True)
 
+    # Performance-trends (scrape_metrics)
+    perf = pd.DataFrame(get_scrape_metrics(db_path, days=30))
+    if not perf.empty:
+        st.markdown("---")
+        st.markdown("### Performance")
+        perf["timestamp"] = pd.to_datetime(perf["timestamp"])
+        perf = perf.sort_values("timestamp")
+        for col in ("duration_seconds", "requests", "http_errors", "bytes",
+                    "sleep_seconds", "parse_seconds", "db_seconds"):
+            perf[col] = perf[col].fillna(0)
+
+        # Laatste run per scraper t.o.v. de mediaan van de runs ervoor
+        perf_rows = []
+        for key, runs in perf.groupby("scraper_key"):
+            last = runs.iloc[-1]
+            base = runs.iloc[:-1]["duration_seconds"].median() if len(runs) > 1 else None
+            slower = bool(base) and last["duration_seconds"] > 1.5 * base
+            p95 = last["latency_p95"]
+            perf_rows.append({
+                "": "🐢" if slower else "✅", "Scraper": key,
+                "Laatste run": last["timestamp"].strftime("%d-%m %H:%M"),
+                "Duur": f"{last['duration_seconds']:.0f}s",
+                "Mediaan": f"{base:.0f}s" if base else "-",
+                "Requests": int(last["requests"]),
+                "Fouten": int(last["http_errors"]),
+                "MB": f"{last['bytes'] / 1024 / 1024:.1f}",
+                "p95": f"{p95 * 1000:.0f}ms" if pd.notna(p95) else "-",
+                "Wachten": f"{last['sleep_seconds']:.0f}s",
+                "Parsen": f"{last['parse_seconds']:.0f}s",
+                "DB": f"{last['db_seconds']:.0f}s",
+            })
+        st.dataframe(pd.DataFrame(perf_rows), use_container_width=True, hide_index=True)
+
+        keys = sorted(perf["scraper_key"].dropna().unique())
+        c1, c2 = st.columns(2)
+        fig = go.Figure()
+        for i, key in enumerate(keys):
+            runs = perf[perf["scraper_key"] == key]
+            fig.add_trace(go.Scatter(
+                x=runs["timestamp"], y=runs["duration_seconds"], name=key,
+                mode="lines+markers", line=dict(color=CHART_COLORS[i % len(CHART_COLORS)]),
+            ))
+        c1.plotly_chart(styled_fig(fig, "Duur per run (s)", 350), use_container_width=True)
+
+        fig = go.Figure()
+        for i, key in enumerate(keys):
+            runs = perf[perf["scraper_key"] == key]
+            fig.add_trace(go.Scatter(
+                x=runs["timestamp"], y=runs["latency_p95"] * 1000, name=key,
+                mode="lines+markers", line=dict(color=CHART_COLORS[i % len(CHART_COLORS)]),
+            ))
+        c2.plotly_chart(styled_fig(fig, "Latency p95 (ms)", 350), use_container_width=True)
+
+        # Tijdsverdeling van één scraper: wachten, parsen, db en de rest (netwerk)
+        sel_key = st.selectbox("Tijdsverdeling voor", keys, key="perf_scraper")
+        runs = perf[perf["scraper_key"] == sel_key]
+        parts = {
+            "Wachten (rate limit)": runs["sleep_seconds"],
+            "Parsen": runs["parse_seconds"],
+            "Database": runs["db_seconds"],
+        }
+        parts["Netwerk/overig"] = (
+            runs["duration_seconds"] - sum(parts.values())
+        ).clip(lower=0)
+        fig = go.Figure()
+        for i, (label, values) in enumerate(parts.items()):
+            fig.add_trace(go.Scatter(
+                x=runs["timestamp"], y=values, name=label, stackgroup="tijd",
+                mode="lines", line=dict(color=CHART_COLORS[i % len(CHART_COLORS)]),
+            ))
+        st.plotly_chart(styled_fig(fig, f"Tijdsverdeling {sel_key} (s)", 350),
+                        use_container_width=True)
+
     st.markdown("---")
 
     # Datadekking
     st.markdown("### Datadekking per concurrent")
-    total = len(analytics.get("comparison_data", []))
-    cov = {}
-    for row in analytics.get("comparison_data", []):
-        for comp, info in row.get("competitors", {}).items():
-            if info.get("price") is not None:
-                cov[comp] = cov.get(comp, 0) + 1
-
-    cov_rows = []
-    for comp in sorted(cov.keys()):
-        cnt = cov[comp]
-        pct = cnt / total * 100 if total else 0
-        cov_rows.append({"Concurrent": comp, "Prijzen": cnt, "Dekking": f"{pct:.0f}%",
-                          "": "█" * int(pct / 5) + "░" * (20 - int(pct / 5))})
+    cov_rows = get_coverage_rows(*_key)
     st.dataframe(pd.DataFrame(cov_rows), use_container_width=True, hide_index=True)
 
     st.markdown("---")
@@ -538,7 +558,7 @@ with tab_systeem:
     c3.metric("Vergelijkingen", meta.get("comparison_count", 0))
 
     # Prijswijzigingen
-    changes = analytics.get("price_changes", {})
+    changes = get_price_changes(*_key)
     st.markdown("---")
     st.markdown("### Prijswijzigingen")
     if changes.get("status") == "onvoldoende_data":
@@ -561,4 +581,5 @@ with tab_systeem:
     st.markdown("---")
     if st.button("🔄 Herbereken analytics"):
         load_analytics.clear()
+        clear_derived()
         st.rerun()
@@ -273,21 +273,32 @@ def chart_scatter_comparison(price_index: list[dict], competitor: str) -> go.Fig
 
 
 # ── Chart: Heatmap Prijsindex ───────────────────────────────────
-def chart_index_heatmap(price_index: list[dict], competitors: list[str]) -> go.Figure:
-    """Heatmap: prijsindex per week × concurrent."""
-    df = pd.DataFrame(price_index)
+def index_heatmap_pivot(df: pd.DataFrame, competitors: list[str]) -> pd.DataFrame:
+    """Pivot prijsindex per concurrent × ISO-week (kolommen W1..W53 gesorteerd)."""
     if df.empty:
-        return go.Figure()
+        return pd.DataFrame()
 
-    df["week"] = pd.to_datetime(df["check_in_date"]).dt.isocalendar().week
-    df["week_label"] = "W" + df["week"].astype(str)
-
-    pivot = df.pivot_table(values="price_index", index="competitor", columns="week_label", aggfunc="mean")
+    weeks = pd.to_datetime(df["check_in_date"]).dt.isocalendar().week.astype(int)
+    pivot = df.assign(week_label="W" + weeks.astype(str)).pivot_table(
+        values="price_index", index="competitor", columns="week_label", aggfunc="mean",
+    )
     pivot = pivot.reindex([c for c in competitors if c in pivot.index])
 
     # Sorteer kolommen op weeknummer
     cols = sorted(pivot.columns, key=lambda x: int(x[1:]))
-    pivot = pivot[cols]
+    return pivot[cols]
+
+
+def chart_index_heatmap(price_index: list[dict], competitors: list[str],
+                        pivot: pd.DataFrame = None) -> go.Figure:
+    """Heatmap: prijsindex per week × concurrent.
+
+    Geef een (gecachete) ``pivot`` mee om de isocalendar/pivot-stap over te slaan.
+    """
+    if pivot is None:
+        pivot = index_heatmap_pivot(pd.DataFrame(price_index), competitors)
+    if pivot.empty:
+        return go.Figure()
 
     fig = go.Figure(go.Heatmap(
         z=pivot.values,
@@ -59,3 +59,10 @@ def get_scrape_history(db_path: str) -> list[dict]:
     """Scrape-statistieken van de laatste 30 dagen."""
     db = Database(db_path)
     return db.get_scrape_stats(days=30)
+
+
+@st.cache_data(ttl=300)
+def get_scrape_metrics(db_path: str, days: int = 30) -> list[dict]:
+    """Performance-telemetrie per scraper-run (requests, latency, wacht-/parse-/db-tijd)."""
+    db = Database(db_path)
+    return db.get_scrape_metrics(days=days)
@@ -0,0 +1,148 @@
+"""Afgeleide DataFrames met Streamlit caching.
+
+Het dashboard draait bij elke widget-interactie het hele script opnieuw.
+Alle afleidingen uit de analytics (platte prijstabel, prijsindex, posities,
+maandreeksen, heatmap-pivot) staan daarom hier als pure functies met
+``st.cache_data``. De cache-sleutel is (db_path, scrape_date, segment,
+concurrenten, verblijfstypes); filters worden als tuple doorgegeven zodat
+de sleutel hashbaar en volgorde-stabiel is. De analytics zelf worden alleen
+bij een cache-miss opgehaald (via het eveneens gecachete load_analytics).
+"""
+
+import pandas as pd
+import streamlit as st
+
+from .charts import index_heatmap_pivot
+from .data_loader import load_analytics
+from .styles import STAY_LABELS
+
+
+@st.cache_data(ttl=300)
+def get_analytics_meta(db_path: str, scrape_date: str, segment: str) -> dict:
+    """Metadata plus filteropties (concurrenten, verblijfstypes)."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    comparison = analytics.get("comparison_data", [])
+    meta = dict(analytics.get("metadata", {}))
+    if "competitors" not in meta:
+        meta["competitors"] = sorted(set(
+            comp for row in comparison
+            for comp in row.get("competitors", {}).keys()
+        ))
+    meta["stay_types"] = sorted(set(r["stay_type"] for r in comparison))
+    return meta
+
+
+@st.cache_data(ttl=300)
+def get_price_frame(db_path: str, scrape_date: str, segment: str,
+                    competitors: tuple, stay_types: tuple) -> pd.DataFrame:
+    """Plat DataFrame: één rij per vergelijking, één kolom per concurrent."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    rows = []
+    for row in analytics.get("comparison_data", []):
+        if row["stay_type"] not in stay_types:
+            continue
+        base = {
+            "check_in": row["check_in_date"],
+            "check_out": row["check_out_date"],
+            "nachten": row["nights"],
+            "type": STAY_LABELS.get(row["stay_type"], row["stay_type"]),
+            "stay_type": row["stay_type"],
+            "maand": row["month"],
+            "dag": row["day_of_week"],
+            "dagen_vooruit": row["days_ahead"],
+            "Westerbergen": row["wb_price"],
+        }
+        has_comp = False
+        for comp in competitors:
+            info = row.get("competitors", {}).get(comp, {})
+            price = info.get("price")
+            base[comp] = price
+            if price is not None:
+                has_comp = True
+        if has_comp:
+            rows.append(base)
+
+    return pd.DataFrame(rows) if rows else pd.DataFrame()
+
+
+@st.cache_data(ttl=300)
+def get_price_index_frame(db_path: str, scrape_date: str, segment: str,
+                          competitors: tuple, stay_types: tuple) -> pd.DataFrame:
+    """Prijsindex-rijen gefilterd op concurrent en verblijfstype."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    pi_rows = [
+        p for p in analytics.get("price_index", [])
+        if p["stay_type"] in stay_types and p["competitor"] in competitors
+    ]
+    return pd.DataFrame(pi_rows) if pi_rows else pd.DataFrame()
+
+
+@st.cache_data(ttl=300)
+def get_position_rows(db_path: str, scrape_date: str, segment: str,
+                      stay_types: tuple) -> list[dict]:
+    """Concurrentiepositie-rijen gefilterd op verblijfstype."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    return [
+        p for p in analytics.get("competitive_position", [])
+        if p["stay_type"] in stay_types
+    ]
+
+
+@st.cache_data(ttl=300)
+def get_monthly_prices(db_path: str, scrape_date: str, segment: str,
+                       competitors: tuple) -> dict:
+    """Gemiddelde prijs per maand: {"months": [...], "series": {naam: [...]}}.
+
+    Westerbergen zit altijd in ``series``; de concurrenten in de gevraagde volgorde.
+    """
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    by_month = analytics.get("seasonal_patterns", {}).get("by_month", {})
+    months = sorted(by_month.keys())
+    series = {}
+    for name in list(competitors) + ["Westerbergen"]:
+        series[name] = [by_month[m].get(name, {}).get("avg_price") for m in months]
+    return {"months": months, "series": series}
+
+
+@st.cache_data(ttl=300)
+def get_index_heatmap(db_path: str, scrape_date: str, segment: str,
+                      competitors: tuple, stay_types: tuple) -> pd.DataFrame:
+    """Heatmap-pivot (concurrent × week) op basis van de gecachete prijsindex."""
+    df_pi = get_price_index_frame(db_path, scrape_date, segment, competitors, stay_types)
+    return index_heatmap_pivot(df_pi, list(competitors))
+
+
+@st.cache_data(ttl=300)
+def get_coverage_rows(db_path: str, scrape_date: str, segment: str) -> list[dict]:
+    """Datadekking per concurrent (aantal vergelijkingen met prijs)."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    comparison = analytics.get("comparison_data", [])
+    total = len(comparison)
+    cov = {}
+    for row in comparison:
+        for comp, info in row.get("competitors", {}).items():
+            if info.get("price") is not None:
+                cov[comp] = cov.get(comp, 0) + 1
+
+    cov_rows = []
+    for comp in sorted(cov.keys()):
+        cnt = cov[comp]
+        pct = cnt / total * 100 if total else 0
+        cov_rows.append({"Concurrent": comp, "Prijzen": cnt, "Dekking": f"{pct:.0f}%",
+                         "": "█" * int(pct / 5) + "░" * (20 - int(pct / 5))})
+    return cov_rows
+
+
+@st.cache_data(ttl=300)
+def get_price_changes(db_path: str, scrape_date: str, segment: str) -> dict:
+    """Prijswijzigingen-blok uit de analytics."""
+    analytics = load_analytics(db_path, scrape_date, segment=segment)
+    return analytics.get("price_changes", {})
+
+
+def clear_derived() -> None:
+    """Leeg alle afgeleide caches (bij herberekenen van de analytics)."""
+    for fn in (get_analytics_meta, get_price_frame, get_price_index_frame,
+               get_position_rows, get_monthly_prices, get_index_heatmap,
+               get_coverage_rows, get_price_changes):
+        fn.clear()
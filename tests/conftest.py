@@ -2,6 +2,8 @@
 
 import os
 import tempfile
+from datetime import datetime, timedelta
+
 import pytest
 import yaml
 
@@ -57,6 +59,29 @@ def tmp_db(tmp_path):
     return db
 
 
+@pytest.fixture
+def tmp_db_history(tmp_db, monkeypatch):
+    """tmp_db plus een vorige scrape-dag (gisteren), voor Historisch/prijswijzigingen."""
+    import database
+
+    class _Yesterday(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) - timedelta(days=1)
+
+    previous = [
+        ("Westerbergen", "Bosbungalow Sequoia C6", "2026-03-06", "2026-03-09", 279.0),
+        ("Beerze Bulten", "Luxe Bungalow", "2026-03-06", "2026-03-09", 392.0),
+        ("Beerze Bulten", "Luxe Bungalow", "2026-03-13", "2026-03-16", 399.0),
+    ]
+    with monkeypatch.context() as m:
+        m.setattr(database, "datetime", _Yesterday)
+        for competitor, accommodation, check_in, check_out, price in previous:
+            tmp_db.save_price(competitor, accommodation, check_in, check_out, price,
+                              min_nights=3, persons=4)
+    return tmp_db
+
+
 @pytest.fixture
 def sample_config(tmp_path):
     """Maak een tijdelijke YAML config."""
@@ -0,0 +1,109 @@
+"""Smoke tests voor hervatbare scrapes (checkpoints)."""
+
+import time
+from datetime import datetime, timedelta
+
+
+def test_checkpoint_roundtrip(tmp_db):
+    """Checkpoints worden per scraper en scrape-datum opgeslagen en opgeruimd."""
+    tmp_db.save_checkpoint("rcn_luna", "2026-06-05/2n")
+    tmp_db.save_checkpoint("rcn_luna", "cursor", {"url": "https://x", "page": 4})
+    tmp_db.save_checkpoint("rcn_luna", "oud", scrape_date="2020-01-01")
+
+    done = tmp_db.get_checkpoints("rcn_luna")
+    assert done == {"2026-06-05/2n": None, "cursor": {"url": "https://x", "page": 4}}
+    assert tmp_db.clear_checkpoints(before_date=datetime.now().strftime("%Y-%m-%d")) == 1
+    assert tmp_db.get_checkpoints("rcn_camping") == {}
+
+
+def test_capfun_resume_skips_completed_units(tmp_db):
+    """Een retry vraagt alleen de units op die de vorige run niet afrondde."""
+    from scrapers.capfun_scraper import CapfunStoetenslaghAccScraper
+
+    calls = []
+
+    def fake_search(begin_date, duration):
+        calls.append((begin_date, duration))
+        if fail["on"] and len(calls) == 3:
+            raise RuntimeError("tijdelijke storing")
+        end = datetime.strptime(begin_date, "%Y-%m-%d") + timedelta(days=duration)
+        return {"results": [{"results": [{"products": [{
+            "product": {"name": "Chalet", "type": 2, "capacity": 6},
+            "stays": [{"begin": begin_date, "end": end.strftime("%Y-%m-%d"),
+                       "duration": duration, "price": 100 + duration}],
+        }]}]}]}
+
+    def build():
+        scraper = CapfunStoetenslaghAccScraper(db=tmp_db, headless=True)
+        scraper.scraper_key = "stoetenslagh_acc"
+        scraper._get_session = lambda: None
+        scraper._wait_rate_limit = lambda: None
+        scraper._search = fake_search
+        return scraper
+
+    fail = {"on": True}
+    first = build().run_efficient(months_ahead=1)
+    n_units = len(calls)
+    assert len(first) == n_units - 1
+
+    calls.clear()
+    fail["on"] = False
+    second = build().run_efficient(months_ahead=1)
+    assert len(calls) == 1
+    assert len(second) == n_units
+
+
+def test_rcn_abort_resume_keeps_checkpoints_behind_prices(tmp_db, monkeypatch):
+    """Na een afgebroken run staat elke gecheckpointe unit ook in prices; hervatten vult de rest."""
+    from types import SimpleNamespace
+
+    from scrapers import credential_cache, pipeline
+    from scrapers.rcn_scraper import RcnNoordsterMercuriusScraper
+
+    monkeypatch.setattr(credential_cache, "_cache",
+                        credential_cache.CredentialCache(enabled=False))
+    monkeypatch.setitem(pipeline.SETTINGS, "processes", False)
+    monkeypatch.setitem(pipeline.SETTINGS, "batch_size", 2)  # vroeg wegschrijven
+    calls = []
+
+    def build(abort_at=None):
+        scraper = RcnNoordsterMercuriusScraper(db=tmp_db, headless=True)
+        scraper.scraper_key = "rcn_mercurius"
+        scraper._warm_up = lambda: {}
+        scraper._wait_rate_limit = lambda: None
+
+        def fake_fetch(url):
+            calls.append(url)
+            if abort_at and len(calls) == abort_at:
+                time.sleep(0.5)  # de writer heeft dan al batches weggeschreven
+                raise KeyboardInterrupt  # Ctrl-C / gekilde worker midden in de run
+            return 200, SimpleNamespace(unavailable=False, price=500.0, nuxt=None,
+                                        bytes_read=0, stopped_early=True)
+
+        scraper._fetch_page = fake_fetch
+        return scraper
+
+    def written():
+        return {(r["check_in_date"], r["check_out_date"])
+                for r in tmp_db.get_prices(competitor_name="RCN De Noordster")}
+
+    try:
+        build(abort_at=6).run_efficient(months_ahead=1)
+    except KeyboardInterrupt:
+        pass
+    prices = written()
+    for unit in tmp_db.get_checkpoints("rcn_mercurius"):
+        check_in, nights = unit.split("/")
+        check_out = (datetime.strptime(check_in, "%Y-%m-%d")
+                     + timedelta(days=int(nights.rstrip("n")))).strftime("%Y-%m-%d")
+        assert (check_in, check_out) in prices, unit
+
+    assert tmp_db.get_checkpoints("rcn_mercurius")  # er valt echt iets te hervatten
+    calls.clear()
+    records = build().run_efficient(months_ahead=1)
+    pairs = build()._generate_date_pairs(1)
+    assert written() == {(dp["check_in"].isoformat(), dp["check_out"].isoformat())
+                         for dp in pairs}
+    assert len(calls) == len(records) <= len(pairs)
+    # De hervatte run dekt maar een deel van de dag: niet in de planner-medianen
+    assert "rcn_mercurius" not in tmp_db.get_scraper_durations()
@@ -0,0 +1,82 @@
+"""Smoke tests voor de coverage-planner."""
+
+from datetime import date, timedelta
+
+from scrapers.coverage import CoveragePlanner
+
+
+def _run(planner, respond):
+    while (request := planner.next_request()) is not None:
+        planner.record(request, respond(*request))
+    return planner.stats()
+
+
+def test_planner_covers_horizon_with_fewer_requests():
+    """Vensters van +-3 dagen: volledige dekking met ~1 request per week."""
+    start, end = date(2026, 1, 1), date(2026, 12, 31)
+
+    def window_api(arrival, nights):
+        return [(arrival + timedelta(days=o), n) for o in range(-3, 4) for n in (2, 3, 4, 7)]
+
+    stats = _run(CoveragePlanner(start, end, [2, 3, 4, 7], window=(-3, 3)), window_api)
+    assert stats["coverage_pct"] == 100.0 and stats["open"] == 0
+    assert stats["requests"] <= 53
+
+
+def test_planner_per_duration_skips_unbookable_days():
+    """Alleen vrijdag/maandag boekbaar: zelfde dekking als het vaste weekraster, minder requests."""
+    start, end = date(2026, 1, 1), date(2026, 12, 31)
+
+    def capfun_like(arrival, nights):
+        return [(arrival + timedelta(days=o), nights) for o in range(-2, 10)
+                if (arrival + timedelta(days=o)).weekday() in (0, 4)]
+
+    grid = set()
+    for week in range(53):
+        for n in (2, 3, 4, 7):
+            grid |= {c for c in capfun_like(start + timedelta(weeks=week), n) if start <= c[0] <= end}
+
+    planner = CoveragePlanner(start, end, [2, 3, 4, 7], window=(0, 6),
+                              per_duration=True, max_requests=53 * 4)
+    stats = _run(planner, capfun_like)
+    assert stats["covered"] >= len(grid)
+    assert stats["requests"] < 53 * 4
+
+
+def test_planner_failed_request_moves_on():
+    """Een mislukt request blokkeert de planner niet."""
+    planner = CoveragePlanner(date(2026, 3, 1), date(2026, 3, 3), [2])
+    seen = []
+    while (request := planner.next_request()) is not None:
+        seen.append(request)
+        planner.record(request, failed=True)
+    assert len(seen) == 3 and planner.stats()["covered"] == 0
+
+
+def test_budget_never_drops_below_grid_coverage():
+    """Smal venster (0..6) of alleen de exacte aankomst: het budget van het raster
+    levert minstens de dekking van dat raster op, tot het einde van de horizon."""
+    start, end = date(2026, 10, 16), date(2027, 10, 13)  # start op een vrijdag
+    step, durations = 7, [2, 3, 4, 7]
+    budget = ((end - start).days // step + 1) * len(durations)
+
+    def week_window(arrival, nights):
+        return [(arrival + timedelta(days=o), nights) for o in range(0, step)
+                if start <= arrival + timedelta(days=o) <= end
+                and (arrival + timedelta(days=o)).weekday() in (0, 4)]
+
+    def exact_only(arrival, nights):
+        return [(arrival, nights)] if arrival.weekday() in (0, 4) else []
+
+    for respond in (week_window, exact_only):
+        grid = set()
+        for k in range((end - start).days // step + 1):
+            for n in durations:
+                grid |= set(respond(start + timedelta(days=k * step), n))
+
+        planner = CoveragePlanner(start, end, durations, window=(0, step - 1),
+                                  per_duration=True, max_requests=budget, grid_step=step)
+        stats = _run(planner, respond)
+        assert stats["covered"] >= len(grid), respond.__name__
+        assert max(d for d, _ in planner.covered) >= max(d for d, _ in grid)
+        assert stats["requests"] <= budget + 1
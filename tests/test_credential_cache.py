@@ -0,0 +1,130 @@
+"""Smoke tests voor de gedeelde credential cache."""
+
+import multiprocessing
+
+import requests
+
+from scrapers.credential_cache import CredentialCache, apply_cookies, session_cookies
+
+
+def test_cache_refresh_ttl_and_invalidate(tmp_path):
+    """Warm-up gebeurt één keer; verlopen of ongeldige entries worden ververst."""
+    cache = CredentialCache(path=str(tmp_path / "credentials.json"))
+    calls = []
+
+    def warm_up():
+        calls.append(1)
+        return {"token": f"tok{len(calls)}"}
+
+    assert cache.get_or_refresh("centerparcs:token", warm_up) == ({"token": "tok1"}, True)
+    # Tweede scraper (ook een nieuw proces) leest dezelfde entry
+    other = CredentialCache(path=cache.path)
+    assert other.get_or_refresh("centerparcs:token", warm_up) == ({"token": "tok1"}, False)
+
+    other.invalidate("centerparcs:token")
+    assert cache.get_or_refresh("centerparcs:token", warm_up)[0] == {"token": "tok2"}
+
+    cache.put("rcn:www.rcn.nl", {"cookies": []}, ttl=-1)
+    assert cache.get("rcn:www.rcn.nl") is None
+    assert len(calls) == 2
+
+
+def _put_many(path, worker):
+    cache = CredentialCache(path=path)
+    for i in range(25):
+        cache.put(f"park{worker}:{i}", {"token": f"{worker}-{i}"})
+
+
+def test_concurrent_processes_keep_all_entries(tmp_path):
+    """Gelijktijdige writers in aparte processen (isolation-workers) verliezen geen entries."""
+    path = str(tmp_path / "credentials.json")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_put_many, args=(path, w)) for w in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(timeout=60)
+        assert proc.exitcode == 0
+
+    cache = CredentialCache(path=path)
+    assert all(cache.get(f"park{w}:{i}") == {"token": f"{w}-{i}"}
+               for w in range(4) for i in range(25))
+
+
+def test_cookies_roundtrip():
+    """Cookies van een requests.Session overleven een JSON-roundtrip."""
+    session = requests.Session()
+    session.cookies.set("sid", "abc", domain="www.landal.nl", path="/")
+    cookies = session_cookies(session)
+
+    fresh = requests.Session()
+    apply_cookies(fresh, cookies)
+    assert fresh.cookies.get("sid", domain="www.landal.nl") == "abc"
+
+
+def test_centerparcs_http_falls_back_on_403(tmp_db, tmp_path, monkeypatch):
+    """Center Parcs mint de token één keer; alleen bij blijvende 403 volgt de browser."""
+    from scrapers import credential_cache
+    from scrapers.centerparcs_scraper import CenterParcsScraper
+
+    monkeypatch.setattr(credential_cache, "_cache",
+                        CredentialCache(path=str(tmp_path / "credentials.json")))
+    scraper = CenterParcsScraper(db=tmp_db, headless=True)
+    mints = []
+    scraper._mint_credentials = lambda: mints.append(1) or {"token": "t", "cookies": []}
+
+    status = {"code": None}
+
+    def fake_fetch(creds, persons, housing_codes=None):
+        return {
+            (scraper.housing_code, d): {"error": status["code"]} if status["code"] else {}
+            for d in scraper.STAY_DURATIONS
+        }
+
+    scraper._fetch_http = fake_fetch
+    assert scraper._run_http(persons=6) is not None
+    assert scraper._run_http(persons=6) is not None
+    assert len(mints) == 1  # tweede run uit de cache
+
+    status["code"] = 403
+    assert scraper._run_http(persons=6) is None  # cache + verse token geweigerd
+    assert len(mints) == 2
+
+
+def test_rcn_refreshes_stale_cookies_on_403(tmp_db, tmp_path, monkeypatch):
+    """Gecachete RCN-cookies die een 403 geven, worden één keer ververst; daarna gaat de run door."""
+    from types import SimpleNamespace
+
+    from scrapers import credential_cache, pipeline
+    from scrapers.rcn_scraper import RcnNoordsterMercuriusScraper
+
+    cache = CredentialCache(path=str(tmp_path / "credentials.json"))
+    cache.put("rcn:www.rcn.nl", {"cookies": [{"name": "sid", "value": "oud",
+                                              "domain": "www.rcn.nl", "path": "/"}]})
+    monkeypatch.setattr(credential_cache, "_cache", cache)
+    monkeypatch.setitem(pipeline.SETTINGS, "processes", False)
+
+    scraper = RcnNoordsterMercuriusScraper(db=tmp_db, headless=True)
+    scraper._wait_rate_limit = lambda: None
+    warm_ups = []
+
+    def warm_up():  # zoals de basispagina: zet de cookie op de sessie
+        warm_ups.append(1)
+        scraper.http.cookies.set("sid", "nieuw", domain="www.rcn.nl", path="/")
+        return {"cookies": session_cookies(scraper.http)}
+
+    scraper._warm_up = warm_up
+
+    def fake_fetch(url):
+        if scraper.http.cookies.get("sid", domain="www.rcn.nl") != "nieuw":
+            response = requests.Response()
+            response.status_code = 403
+            raise requests.exceptions.HTTPError("403 Forbidden", response=response)
+        return 200, SimpleNamespace(unavailable=False, price=500.0, nuxt=None,
+                                    bytes_read=0, stopped_early=True)
+
+    scraper._fetch_page = fake_fetch
+    records = scraper.run_efficient(months_ahead=1)
+    assert len(warm_ups) == 1
+    assert len(records) == len(scraper._generate_date_pairs(1))
+    assert cache.get("rcn:www.rcn.nl")["cookies"][0]["value"] == "nieuw"
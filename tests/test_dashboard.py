@@ -0,0 +1,65 @@
+"""Smoke tests voor Excel dashboard generatie."""
+
+import openpyxl
+
+from analytics import run_analytics
+from dashboard import generate_dashboard
+
+
+def _sheet_values(path, sheet):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    return [tuple(r) for r in wb[sheet].iter_rows(values_only=True)]
+
+
+def test_dashboard_generates(tmp_db, tmp_path):
+    """Dashboard wordt aangemaakt met alle 4 werkbladen."""
+    result = run_analytics(db_path=tmp_db.db_path, print_to_console=False)
+    path = generate_dashboard(result, {"output_dir": str(tmp_path)})
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    assert wb.sheetnames == ["Overzicht", "Prijsvergelijking", "Concurrenten", "Historisch"]
+
+
+def test_batch_write_same_values(tmp_db_history, tmp_path):
+    """Batch-write modus (write_row + constant_memory) schrijft dezelfde waarden."""
+    result = run_analytics(db_path=tmp_db_history.db_path, print_to_console=False)
+
+    normal = generate_dashboard(result, {"batch_write": False},
+                                output_path=str(tmp_path / "normal.xlsx"))
+    batch = generate_dashboard(result, {"batch_write": True},
+                               output_path=str(tmp_path / "batch.xlsx"))
+
+    assert len(result["price_changes"]["changes"]) == 2
+    for sheet in ["Overzicht", "Prijsvergelijking", "Concurrenten", "Historisch"]:
+        assert _sheet_values(normal, sheet) == _sheet_values(batch, sheet), sheet
+
+
+def test_payload_roundtrip_same_workbook(tmp_db, tmp_path):
+    """Columnar payload levert hetzelfde werkboek op als de volledige analytics."""
+    from dashboard.payload import pack, unpack
+
+    result = run_analytics(db_path=tmp_db.db_path, print_to_console=False)
+    direct = generate_dashboard(result, {}, output_path=str(tmp_path / "direct.xlsx"))
+    packed = generate_dashboard(unpack(pack(result)), {}, output_path=str(tmp_path / "packed.xlsx"))
+
+    for sheet in ["Overzicht", "Prijsvergelijking", "Concurrenten", "Historisch"]:
+        assert _sheet_values(direct, sheet) == _sheet_values(packed, sheet), sheet
+
+
+def test_generate_dashboards_parallel(tmp_db, tmp_path):
+    """Segmenten worden parallel gegenereerd; fouten worden per segment gemeld."""
+    from dashboard import generate_dashboards
+
+    result = run_analytics(db_path=tmp_db.db_path, print_to_console=False)
+    broken = {"metadata": {"scrape_date": result["metadata"]["scrape_date"]}}
+
+    outcomes = generate_dashboards(
+        {"accommodatie": result, "kampeerplaats": result, "prive_sanitair": broken},
+        {"output_dir": str(tmp_path)}, max_workers=2,
+    )
+
+    assert list(outcomes) == ["accommodatie", "kampeerplaats", "prive_sanitair"]
+    assert outcomes["accommodatie"]["path"].endswith(".xlsx")
+    assert outcomes["kampeerplaats"]["error"] is None
+    assert outcomes["prive_sanitair"]["path"] is None
+    assert outcomes["prive_sanitair"]["error"]
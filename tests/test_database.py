@@ -1,6 +1,6 @@
 """Smoke tests voor database module."""
 
-from database import Database
+from database import Database, PriceRecord
 
 
 def test_save_and_retrieve(tmp_db):
@@ -68,3 +68,26 @@ def test_empty_database(tmp_path):
     assert db.get_latest_scrape_date() is None
     assert db.get_prices() == []
     assert db.get_scrape_summary() == {}
+
+
+def test_price_record_batch(tmp_db):
+    """PriceRecord is slotted en dict-compatibel; een batch mag records en dicts mengen."""
+    import pickle
+
+    from scrapers.zandstuve_scraper import ZandstuveCampingScraper
+
+    scraper = ZandstuveCampingScraper(db=tmp_db)
+    record = scraper._make_record("2026-07-03", "2026-07-05", 88.0, min_nights=2, persons=2)
+    assert not hasattr(record, "__dict__")
+    assert record["segment"] == "kampeerplaats" and record.get("onbekend") is None
+    assert record.competitor_name is scraper._make_record("x", "y", 1.0).competitor_name
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert dict(**record)["price"] == 88.0
+
+    tmp_db.save_prices_batch([record, {
+        "competitor_name": "De Zandstuve", "accommodation_type": "Comfort camping site",
+        "check_in_date": "2026-07-10", "check_out_date": "2026-07-12", "price": 92.0,
+    }])
+    rows = tmp_db.get_prices(competitor_name="De Zandstuve")
+    assert sorted((r["check_in_date"], r["segment"]) for r in rows) == [
+        ("2026-07-03", "kampeerplaats"), ("2026-07-10", "accommodatie")]
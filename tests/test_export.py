@@ -0,0 +1,47 @@
+"""Smoke tests voor de streaming export."""
+
+import csv
+import json
+
+import pytest
+
+from analytics.export import export
+
+
+def test_export_prices_csv_filtered(tmp_db, tmp_path):
+    """Ruwe prijzen worden gefilterd op concurrent en kolomselectie."""
+    out = tmp_path / "prices.csv"
+    count = export(tmp_db.db_path, "prices", "csv", str(out),
+                   competitors=["De Boshoek"],
+                   columns=["competitor_name", "check_in_date", "price"])
+
+    with open(out, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert count == len(rows) == 3
+    assert set(rows[0]) == {"competitor_name", "check_in_date", "price"}
+    assert {r["competitor_name"] for r in rows} == {"De Boshoek"}
+
+
+def test_export_comparison_ndjson(tmp_db, tmp_path):
+    """Vergelijkingsrijen worden per concurrent als NDJSON geschreven."""
+    out = tmp_path / "comparison.ndjson"
+    count = export(tmp_db.db_path, "comparison", "ndjson", str(out))
+
+    with open(out, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert count == len(rows) > 0
+    assert all(r["wb_price"] is not None for r in rows)
+    assert {r["competitor"] for r in rows} <= {"Beerze Bulten", "De Boshoek"}
+
+
+def test_export_recommendations_and_index(tmp_db, tmp_path):
+    """Prijsindex en adviezen exporteren zonder fouten."""
+    assert export(tmp_db.db_path, "price_index", "csv", str(tmp_path / "pi.csv")) > 0
+    export(tmp_db.db_path, "recommendations", "csv", str(tmp_path / "recs.csv"))
+    assert (tmp_path / "recs.csv").exists()
+
+
+def test_export_unknown_column(tmp_db, tmp_path):
+    """Onbekende kolommen geven een duidelijke fout."""
+    with pytest.raises(ValueError):
+        export(tmp_db.db_path, "prices", "csv", str(tmp_path / "x.csv"), columns=["bestaat_niet"])
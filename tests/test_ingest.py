@@ -0,0 +1,58 @@
+"""Smoke tests voor de gedeelde ingest-sink (ontdubbelen + conflict-policy)."""
+
+import pytest
+
+from database import PriceRecord
+from scrapers.ingest import IngestSink, record_key, stay_key
+
+
+def _rec(check_in, price, available=True, special_offers=None, segment="accommodatie"):
+    return PriceRecord("Capfun Het Stoetenslagh", "Chalet 6p", check_in, "2026-06-08",
+                       price, available=available, special_offers=special_offers,
+                       segment=segment)
+
+
+def test_policies_resolve_conflicts():
+    """Per policy wint het juiste record, ongeacht de volgorde van binnenkomst."""
+    cheap, dear = _rec("2026-06-05", 400.0), _rec("2026-06-05", 450.0)
+    sold_out = _rec("2026-06-05", None, available=False)
+    promo = _rec("2026-06-05", 450.0, special_offers="Was EUR 500")
+
+    for policy, records, winner in [
+        ("first", [dear, cheap], dear),
+        ("cheapest", [dear, sold_out, cheap], cheap),
+        ("prefer_available", [sold_out, dear], dear),
+        ("prefer_promo", [cheap, promo], promo),
+    ]:
+        ingest = IngestSink(lambda batch: None, policy=policy)
+        ingest.add(records)
+        assert ingest.records == [winner], policy
+
+    # Segment hoort bij de sleutel: camping en accommodatie botsen niet
+    camping = _rec("2026-06-05", 90.0, segment="kampeerplaats")
+    assert record_key(camping) != record_key(cheap)
+    assert stay_key("Capfun Het Stoetenslagh", "2026-06-05", "2026-06-08",
+                    "accommodatie") == record_key(cheap)
+    with pytest.raises(ValueError):
+        IngestSink(lambda batch: None, policy="duurste")
+
+
+def test_batches_and_rewrite(tmp_db):
+    """Winnaars gaan in batches naar de database; een latere winnaar overschrijft."""
+    batches = []
+
+    def sink(batch):
+        batches.append(len(batch))
+        tmp_db.save_prices_batch(batch)
+
+    ingest = IngestSink(sink, policy="cheapest", batch_size=2)
+    assert ingest.add([_rec("2026-06-05", 450.0), _rec("2026-06-12", 480.0)]) == 2
+    assert batches == [2]
+    assert ingest.add([_rec("2026-06-05", 420.0), _rec("2026-06-12", 490.0)]) == 0
+    assert ingest.close() and batches == [2, 1]
+
+    rows = tmp_db.get_prices(competitor_name="Capfun Het Stoetenslagh")
+    assert {(r["check_in_date"], r["price"]) for r in rows} == {
+        ("2026-06-05", 420.0), ("2026-06-12", 480.0)}
+    s = ingest.stats()
+    assert (s["received"], s["stays"], s["duplicates"], s["replaced"]) == (4, 2, 1, 1)
@@ -0,0 +1,136 @@
+"""Smoke tests voor scrapers in geïsoleerde worker-processen."""
+
+import time
+
+from scrapers.isolation import IsolatedRunner
+from scrapers.orchestrator import scrape_params
+
+
+class FastScraper:
+    """Fake scraper die één prijs via de (proxy-)database opslaat."""
+
+    def __init__(self, db, headless=True):
+        self.db = db
+
+    def run_efficient(self, **kwargs):
+        name = type(self).__name__
+        self.db.save_price(competitor_name=name, accommodation_type="Bungalow",
+                           check_in_date="2026-06-05", check_out_date="2026-06-08",
+                           price=300.0)
+        self.db.log_scrape(competitor_name=name, status="success", records_scraped=1)
+        return [{"available": True, "price": 300.0}]
+
+
+class OtherFastScraper(FastScraper):
+    pass
+
+
+class HangingScraper(FastScraper):
+    """Fake scraper die blijft hangen (zoals een vastgelopen browser)."""
+
+    def run_efficient(self, **kwargs):
+        time.sleep(60)
+        return []
+
+
+class ChattyScraper(FastScraper):
+    """Fake scraper die vastloopt maar elke 0,1s blijft loggen en schrijven."""
+
+    def run_efficient(self, **kwargs):
+        import logging
+        log = logging.getLogger("scraper.chatty")
+        for i in range(600):
+            log.info("nog bezig %d", i)
+            self.db.save_checkpoint("chatty", f"unit-{i}")
+            time.sleep(0.1)
+        return []
+
+
+class BurstScraper(FastScraper):
+    """Fake scraper die vlak voor de deadline veel checkpoints stuurt en dan hangt."""
+
+    def run_efficient(self, **kwargs):
+        time.sleep(1.5)
+        for i in range(500):
+            self.db.save_checkpoint("burst", f"unit-{i}")
+        time.sleep(60)
+        return []
+
+
+class HangingGroupScraper(FastScraper):
+    """Fake gedeelde sessie (zoals Westerbergen) die blijft hangen."""
+
+    @classmethod
+    def run_group(cls, scrapers, marker=None, **params):
+        with open(marker, "a", encoding="utf-8") as f:
+            f.write(f"{len(scrapers)}\n")
+        time.sleep(60)
+        return [[] for _ in scrapers]
+
+    def run_efficient(self, **kwargs):
+        return self.run_group([self], **kwargs)[0]
+
+
+ENTRIES = {
+    "fast": {"module": __name__, "class": "FastScraper"},
+    "hang": {"module": __name__, "class": "HangingScraper"},
+    "chatty": {"module": __name__, "class": "ChattyScraper"},
+    "other": {"module": __name__, "class": "OtherFastScraper"},
+    "burst": {"module": __name__, "class": "BurstScraper"},
+}
+
+
+def test_isolated_group_deadline_and_restart(tmp_db):
+    """Een hangende scraper wordt gekilld; de rest van de groep draait in een nieuwe worker."""
+    runner = IsolatedRunner(tmp_db, deadline=2, entries=ENTRIES)
+    results = {}
+    t0 = time.time()
+    runner.run_group("test", ["fast", "hang", "other"], scrape_params(30), results)
+
+    assert time.time() - t0 < 30
+    assert results["fast"]["status"] == "success"
+    assert results["hang"]["status"] == "failed"
+    assert "deadline" in results["hang"]["error"]
+    assert results["other"]["status"] == "success"
+
+    # De parent heeft de DB-writes van de workers uitgevoerd
+    names = {p["competitor_name"] for p in tmp_db.get_prices()}
+    assert {"FastScraper", "OtherFastScraper"} <= names
+
+
+def test_deadline_holds_for_busy_worker(tmp_db):
+    """Ook een worker die onafgebroken berichten stuurt, wordt op de deadline gekilld."""
+    runner = IsolatedRunner(tmp_db, deadline=2, entries=ENTRIES)
+    results = {}
+    t0 = time.time()
+    runner.run_group("test", ["chatty", "other"], scrape_params(30), results)
+
+    assert time.time() - t0 < 15
+    assert results["chatty"]["status"] == "failed"
+    assert "deadline" in results["chatty"]["error"]
+    assert results["other"]["status"] == "success"
+
+
+def test_deadline_keeps_queued_writes(tmp_db):
+    """Bij een deadline-kill worden de al verstuurde DB-writes nog verwerkt."""
+    runner = IsolatedRunner(tmp_db, deadline=2, entries=ENTRIES)
+    results = {}
+    runner.run_group("test", ["burst"], scrape_params(30), results)
+
+    assert "deadline" in results["burst"]["error"]
+    assert len(tmp_db.get_checkpoints("burst")) == 500
+
+
+def test_shared_group_fails_as_one_job(tmp_db, tmp_path):
+    """Een gedeelde sessie die de deadline haalt, faalt als geheel zonder nieuwe worker."""
+    keys = ["westerbergen", "westerbergen_camping", "westerbergen_psanitair"]
+    entries = {key: {"module": __name__, "class": "HangingGroupScraper"} for key in keys}
+    marker = tmp_path / "sessies.txt"
+    runner = IsolatedRunner(tmp_db, deadline=2, entries=entries)
+    results = {}
+    runner.run_group("westerbergen", keys, {**scrape_params(30), "marker": str(marker)}, results)
+
+    assert marker.read_text(encoding="utf-8").split() == ["3"]
+    for key in keys:
+        assert results[key]["status"] == "failed"
+        assert "groep westerbergen" in results[key]["error"]
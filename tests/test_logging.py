@@ -0,0 +1,50 @@
+"""Smoke tests voor async JSON-lines logging en gesamplede voortgang."""
+
+import json
+import logging
+
+import run_scraper
+from scrapers.progress_log import ProgressLog
+
+
+def test_queue_logging_writes_json_lines(tmp_path):
+    """Records gaan via de queue-listener als JSON-regels met extra velden en traceback naar het bestand."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        log_file = run_scraper.setup_logging(log_dir=str(tmp_path), level="DEBUG")
+        assert log_file.endswith(".jsonl")
+        log = logging.getLogger("scraper.test")
+        log.debug("  %s -> %s: EUR %.0f", "2026-05-01", "2026-05-04", 450)
+        log.info("klaar", extra={"event": "progress", "count": 3})
+        try:
+            raise ValueError("geen prijs")
+        except ValueError:
+            log.exception("prijs ophalen mislukt voor %s", "2026-05-01")
+        run_scraper.stop_logging()
+
+        lines = [json.loads(line) for line in open(log_file, encoding="utf-8")]
+        assert lines[0]["msg"] == "  2026-05-01 -> 2026-05-04: EUR 450"
+        assert lines[0]["level"] == "DEBUG" and lines[0]["logger"] == "scraper.test"
+        assert lines[1]["event"] == "progress" and lines[1]["count"] == 3
+        assert lines[2]["msg"] == "prijs ophalen mislukt voor 2026-05-01"
+        assert lines[2]["exc"].startswith("Traceback") and "ValueError: geen prijs" in lines[2]["exc"]
+    finally:
+        run_scraper.stop_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+
+def test_progress_is_sampled(caplog):
+    """Voortgang wordt hooguit eens per N items gelogd, plus een eindregel."""
+    log = logging.getLogger("scraper.sampled")
+    progress = ProgressLog(log, total=250, unit="dates", every=100, seconds=3600)
+    with caplog.at_level(logging.INFO, logger="scraper.sampled"):
+        for i in range(250):
+            progress.update(prices=i)
+        progress.done()
+
+    events = [r for r in caplog.records if r.name == "scraper.sampled"]
+    assert [r.event for r in events] == ["progress", "progress", "progress_done"]
+    assert [r.count for r in events] == [100, 200, 250]
+    assert "200/250 dates, prices 199" in events[1].getMessage()
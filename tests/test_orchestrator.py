@@ -0,0 +1,153 @@
+"""Smoke tests voor de scrape-orchestratie."""
+
+import sys
+import threading
+import time
+
+from scrapers.orchestrator import format_summary, run_groups, scrape_params
+
+
+class _SlowScraper:
+    """Fake scraper die even slaapt en de actieve threads bijhoudt."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def run_efficient(self, **kwargs):
+        with self.lock:
+            _SlowScraper.active += 1
+            _SlowScraper.peak = max(_SlowScraper.peak, _SlowScraper.active)
+        try:
+            time.sleep(0.05)
+            if self.fail:
+                raise RuntimeError("kapot")
+            return [{"available": True, "price": 100.0}, {"available": False, "price": None}]
+        finally:
+            with self.lock:
+                _SlowScraper.active -= 1
+
+
+def test_run_groups_parallel_and_summary():
+    """Groepen lopen parallel, binnen een groep sequentieel; fouten worden gerapporteerd."""
+    scrapers = {"a1": _SlowScraper(), "a2": _SlowScraper(),
+                "b1": _SlowScraper(fail=True), "c1": _SlowScraper()}
+    groups = {"a": ["a1", "a2"], "b": ["b1"], "c": ["c1"]}
+    _SlowScraper.peak = 0
+
+    results = run_groups(groups, scrapers, scrape_params(days_ahead=30), jobs=3)
+
+    assert set(results) == set(scrapers)
+    assert results["a1"]["records"] == 2 and results["a1"]["available"] == 1
+    assert results["b1"]["status"] == "failed"
+    assert 1 < _SlowScraper.peak <= 3
+
+    lines = format_summary(results)
+    assert any("b1" in line and "kapot" in line for line in lines)
+    assert "3 OK / 1 mislukt" in lines[-1]
+
+
+def test_run_groups_unknown_scraper_fails_softly():
+    """Een scraper die niet gebouwd kan worden telt als mislukt."""
+    results = run_groups({"x": ["bestaat_niet"]}, {}, scrape_params(), jobs=2)
+    assert results["bestaat_niet"]["status"] == "failed"
+
+
+def test_plan_groups_longest_first_and_split():
+    """Groepen worden op geschatte duur gesorteerd; splitsbare groepen worden verdeeld."""
+    from scrapers.planner import plan_groups
+
+    groups = {
+        "api_ommerland": ["camping_ommerland", "ommerland_camping", "ommerland_psanitair"],
+        "rcn": ["rcn_mercurius"],
+        "capfun": ["stoetenslagh_camping", "stoetenslagh_acc", "fruithof_acc"],
+    }
+    durations = {
+        "camping_ommerland": 2, "ommerland_camping": 2, "ommerland_psanitair": 2,
+        "rcn_mercurius": 300,
+        "stoetenslagh_camping": 200, "stoetenslagh_acc": 200, "fruithof_acc": 100,
+    }
+    plan = plan_groups(groups, durations)
+
+    assert [g["cost"] for g in plan.values()] == sorted((g["cost"] for g in plan.values()), reverse=True)
+    assert {n for n in plan if n.startswith("capfun")} == {"capfun#1", "capfun#2"}
+    assert max(g["cost"] for g in plan.values()) == 300
+    assert plan["rcn"]["browser"] is False  # RCN is puur HTTP
+    assert plan["api_ommerland"]["keys"] == groups["api_ommerland"]
+    assert list(plan)[-1] == "api_ommerland"
+
+
+def test_available_memory_counts_page_cache(tmp_path, monkeypatch):
+    """Zonder psutil telt MemAvailable (incl. page cache), niet alleen vrije pagina's."""
+    from scrapers.planner import _available_memory_mb
+
+    monkeypatch.setitem(sys.modules, "psutil", None)  # import psutil -> ImportError
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal:       16384000 kB\n"
+                       "MemFree:          512000 kB\n"
+                       "MemAvailable:    8192000 kB\n")
+    assert _available_memory_mb(str(meminfo)) == 8000.0
+    assert _available_memory_mb(str(tmp_path / "bestaat_niet")) != 8000.0  # sysconf-fallback
+
+
+def test_scraper_durations_from_log(tmp_db):
+    """Mediane duur per scraper_key komt uit scrape_log; hervatte runs tellen niet mee."""
+    for dur in (10, 30, 20):
+        tmp_db.log_scrape(competitor_name="RCN De Noordster", status="success",
+                          duration_seconds=dur, scraper_key="rcn_luna")
+    tmp_db.log_scrape(competitor_name="RCN De Noordster", status="failed",
+                      duration_seconds=999, scraper_key="rcn_luna")
+    tmp_db.log_scrape(competitor_name="RCN De Noordster", status="success",
+                      duration_seconds=1, scraper_key="rcn_luna", resumed=True)
+    assert tmp_db.get_scraper_durations() == {"rcn_luna": 20}
+
+
+def test_shared_session_group_runs_once():
+    """Westerbergen-segmenten draaien samen via run_group en kosten de traagste duur."""
+    from scrapers.planner import estimate_cost
+
+    calls = []
+
+    class _SharedScraper:
+        def __init__(self, n):
+            self.n = n
+
+        @classmethod
+        def run_group(cls, scrapers, **params):
+            calls.append([s.n for s in scrapers])
+            return [[{"available": True, "price": 100.0}] * s.n for s in scrapers]
+
+    keys = ["westerbergen", "westerbergen_camping", "westerbergen_psanitair"]
+    scrapers = {key: _SharedScraper(n) for n, key in enumerate(keys, start=1)}
+    results = run_groups({"westerbergen": keys}, scrapers, scrape_params(), jobs=1)
+
+    assert calls == [[1, 2, 3]]
+    assert [results[key]["records"] for key in keys] == [1, 2, 3]
+    assert estimate_cost(keys, {"westerbergen": 300, "westerbergen_camping": 200}) == 300
+
+
+def test_shared_session_status_like_single_scraper():
+    """Lege resultaten tellen als succes (zoals run_efficient); een ontbrekende lijst niet."""
+    from scrapers.orchestrator import run_shared_job
+
+    class _EmptySession:
+        @classmethod
+        def run_group(cls, scrapers, **params):
+            return [[] for _ in scrapers]
+
+    class _ShortSession:
+        @classmethod
+        def run_group(cls, scrapers, **params):
+            return [[{"available": True, "price": 100.0}]]
+
+    keys = ["westerbergen", "westerbergen_camping"]
+    empty = run_shared_job(keys, {key: _EmptySession() for key in keys}, scrape_params())
+    assert [empty[key]["status"] for key in keys] == ["success", "success"]
+    assert [empty[key]["records"] for key in keys] == [0, 0]
+
+    short = run_shared_job(keys, {key: _ShortSession() for key in keys}, scrape_params())
+    assert [short[key]["status"] for key in keys] == ["failed", "failed"]
+    assert "2 scrapers" in short["westerbergen_camping"]["error"]
@@ -23,5 +23,44 @@ def test_skip_scrape(sample_config, tmp_db):
     # Disable dashboard to avoid file creation issues
     config["automation"]["generate_dashboard"] = False
 
-    exit_code = run_pipeline(config=config, skip_scrape=True)
+    # Zonder dashboard-nodes start er geen dashboard-procespool
+    with patch("run_daily.ProcessPoolExecutor") as pool:
+        exit_code = run_pipeline(config=config, skip_scrape=True)
     assert exit_code == EXIT_SUCCESS
+    assert not pool.called
+
+
+class _FakeScraper:
+    """Minimale scraper: faalt de eerste `fail_times` runs."""
+
+    def __init__(self, name, fail_times=0):
+        self.competitor_name = name
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def run_efficient(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError("tijdelijke fout")
+        return [{"available": True, "price": 100.0}]
+
+
+def test_scrape_graph_with_retry(sample_config, tmp_db):
+    """Scrapers draaien via de taakgraaf; een mislukte scraper krijgt een retry-node."""
+    config_path, config = sample_config
+    config["general"]["database_path"] = tmp_db.db_path
+    config["automation"]["generate_dashboard"] = False
+    config["automation"]["git_auto_push"] = False
+    config["competitors"]["beerze_bulten"]["segment"] = "accommodatie"
+
+    scrapers = {
+        "westerbergen": _FakeScraper("Westerbergen"),
+        "beerze_bulten": _FakeScraper("Beerze Bulten", fail_times=1),
+    }
+    with patch("run_daily.get_scraper_map", return_value=scrapers), \
+            patch("email_report.send_report"):
+        exit_code = run_pipeline(config=config)
+
+    assert exit_code == EXIT_SUCCESS
+    assert scrapers["beerze_bulten"].calls == 2
+    assert scrapers["westerbergen"].calls == 1
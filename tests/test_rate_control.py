@@ -0,0 +1,78 @@
+"""Smoke tests voor adaptieve rate control (AIMD per host)."""
+
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from scrapers import rate_control
+from scrapers.rate_control import RateController, mount_adaptive, parse_retry_after
+
+
+def test_controller_aimd():
+    """Gezonde responses versnellen additief, 429 en latency-pieken remmen af."""
+    rc = RateController("example.test", base_interval=1.0)
+    for _ in range(10):
+        rc.record(200, 0.1)
+    assert rc.interval < 1.0
+    fast = rc.interval
+
+    rc.record(429, 0.1, retry_after=0)
+    assert rc.interval == min(rc.max_interval, fast * 2)
+    slowed = rc.interval
+    rc.record(200, 5.0)  # latency-piek t.o.v. ~0.1s gemiddeld
+    assert rc.interval > slowed
+
+    t = rc.telemetry()
+    assert t["requests"] == 12 and t["throttled"] == 1 and t["backoffs"] == 2
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("onzin") is None
+
+
+def test_adapter_retries_throttle():
+    """De session-adapter wacht een 429 met Retry-After af en probeert opnieuw."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if len(hits) == 1:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_port}"
+    rate_control.reset()
+    try:
+        session = requests.Session()
+        controller = mount_adaptive(session, f"http://{host}", base_interval=0.05)
+        resp = session.get(f"http://{host}/prijzen", timeout=5)
+        assert resp.status_code == 200 and len(hits) == 2
+        assert controller.telemetry()["throttled"] == 1
+        assert host in rate_control.telemetry()
+        assert any(host in line for line in rate_control.format_telemetry())
+    finally:
+        server.shutdown()
+        rate_control.reset()
+
+
+def test_import_does_not_load_requests():
+    """De CLI's importeren rate_control bij het opstarten; requests laadt pas bij gebruik."""
+    code = ("import sys, run_daily, run_scraper; "
+            "print('requests' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         check=True).stdout.strip()
+    assert out == "False"
+    assert issubclass(rate_control.AdaptiveHTTPAdapter, requests.adapters.HTTPAdapter)
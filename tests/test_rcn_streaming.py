@@ -0,0 +1,77 @@
+"""Smoke tests voor het streamend inlezen van RCN-pagina's."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from scrapers.rcn_scraper import RcnNoordsterMercuriusScraper, _PageScan
+
+NUXT = json.dumps(["x" * 200_000])
+PAGES = {
+    "/prijs": (
+        '<html><body><div class="price" aria-label="prijs">&euro; 1.234,50</div>'
+        '<span>Toeristenbelasting € 35</span>'
+        f'<script type="application/json" id="__NUXT_DATA__">{NUXT}</script></body></html>'
+    ),
+    "/vol": (
+        '<html><body><p>Deze periode is helaas niet beschikbaar</p>'
+        f'<script type="application/json" id="__NUXT_DATA__">{NUXT}</script></body></html>'
+    ),
+    "/nuxt": (
+        '<html><body><div>Kies je verblijf</div>'
+        '<script type="application/json" id="__NUXT_DATA__">[1, "arrivalDate"]</script>'
+        '<footer>€ 99</footer></body></html>'
+    ),
+}
+
+
+def test_page_scan_stops_early():
+    """Prijs of 'niet beschikbaar' in de markup: de NUXT-payload wordt niet gelezen."""
+    html = PAGES["/prijs"]
+    scan = _PageScan()
+    for i in range(0, len(html), 100):
+        scan.feed(html[i:i + 100])
+        if scan.done:
+            break
+    assert scan.done and scan.price == 1234.5 and scan.nuxt is None
+
+    scan = _PageScan()
+    scan.feed(PAGES["/nuxt"])
+    assert scan.done and scan.price is None
+    assert scan.nuxt == '[1, "arrivalDate"]'
+
+
+def test_fetch_page_streams(tmp_db):
+    """_fetch_page leest in chunks en sluit de verbinding zodra de uitkomst vaststaat."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = PAGES.get(self.path, "").encode("utf-8")
+            self.send_response(200 if self.path in PAGES else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        scraper = RcnNoordsterMercuriusScraper(db=tmp_db)
+        status, scan = scraper._fetch_page(f"{base}/prijs")
+        assert status == 200 and scan.price == 1234.5 and scan.stopped_early
+        assert scan.bytes_read < len(PAGES["/prijs"])
+
+        _, scan = scraper._fetch_page(f"{base}/vol")
+        assert scan.unavailable and scan.stopped_early
+
+        assert scraper._fetch_page(f"{base}/onbekend") == (404, None)
+        assert scraper._stream_stats["pages"] == 2
+    finally:
+        server.shutdown()
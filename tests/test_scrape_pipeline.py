@@ -0,0 +1,63 @@
+"""Smoke tests voor de gefaseerde fetch -> parse -> sink pipeline."""
+
+from scrapers import pipeline
+from scrapers.kleinewolf_scraper import parse_availability
+from scrapers.pipeline import ScrapePipeline
+from scrapers.rcn_scraper import RcnNoordsterMercuriusScraper, parse_page
+
+CONTEXT = {
+    "cls": RcnNoordsterMercuriusScraper,
+    "competitor_name": "RCN De Noordster",
+    "accommodation_type": "Bungalow Mercurius 6p",
+    "persons": 6,
+    "segment": "accommodatie",
+}
+
+
+def _page(check_in, price=None, unavailable=False):
+    return {"check_in": check_in, "check_out": "2026-05-04", "nights": 3,
+            "unavailable": unavailable, "price": price, "nuxt": None}
+
+
+def test_pipeline_batches_and_dedups(tmp_db, monkeypatch):
+    """Records worden ontdubbeld en in batches weggeschreven; metrics per fase."""
+    monkeypatch.setitem(pipeline.SETTINGS, "processes", False)
+    batches = []
+
+    def sink(records):
+        batches.append(len(records))
+        tmp_db.save_prices_batch(records)
+
+    with ScrapePipeline(parse_page, sink, context=CONTEXT, batch_size=2) as p:
+        p.submit(_page("2026-05-01", price=450.0))
+        p.submit(_page("2026-05-01", price=460.0))  # dubbel
+        p.submit(_page("2026-05-02", unavailable=True))
+        p.submit(_page("2026-05-03"))                # geen prijs, geen NUXT
+
+    assert [r["check_in_date"] for r in p.records] == ["2026-05-01", "2026-05-02"]
+    assert sum(batches) == 2
+    stages = {s["stage"]: s for s in p.metrics()["stages"]}
+    assert stages["fetch"]["items"] == 4 and stages["parse"]["items"] == 4
+    assert stages["sink"]["items"] == 2
+    rows = tmp_db.get_prices(competitor_name="RCN De Noordster")
+    assert {(r["check_in_date"], r["available"]) for r in rows} == {
+        ("2026-05-01", 1), ("2026-05-02", 0)}
+
+
+def test_pipeline_parses_in_process_pool(tmp_db):
+    """Parsen via de process pool (spawn) levert dezelfde records als inline."""
+    data = {"levels": [{"ident": "56397", "arrivals": [{"date": "01-05-2026", "departures": [
+        {"date": "04-05-2026", "nights": 3, "price": 300, "additional": 20, "discount": 0},
+    ]}]}]}
+    context = {"level_id": "56397", "add_additional_price": True,
+               "competitor_name": "De Kleine Wolf", "accommodation_type": "Klaverlodge",
+               "persons": 4, "segment": "accommodatie"}
+    try:
+        with ScrapePipeline(parse_availability, tmp_db.save_prices_batch, context=context) as p:
+            records = p.parse(data)
+            p.write(records)
+        assert p.metrics()["processes"]
+        assert records == parse_availability(data, context)
+        assert records[0]["price"] == 320 and len(p.records) == 1
+    finally:
+        pipeline.shutdown()
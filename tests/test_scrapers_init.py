@@ -50,6 +50,28 @@ def test_witter_zomer_init(tmp_db):
     assert s.competitor_name == "Witter Zomer"
 
 
+def test_witter_zomer_payload_prices():
+    """Promo-prijzen uit de widget-payload winnen; payload telt alleen als hij met de DOM klopt."""
+    from scrapers.witter_zomer import (
+        WitterZomerScraper, _prices_from_payload, _with_start_date,
+    )
+
+    payload = {"matrix": [{"period": {"start": "2026-07-03", "end": "2026-07-05"},
+                           "price": 450, "discountPrice": 399.5},
+                          {"period": {"start": "2026-07-06", "end": "2026-07-10"},
+                           "price": "612,00"}]}
+    records = _prices_from_payload(payload)
+    assert [(r["min_nights"], r["price"]) for r in records] == [(2, 399.5), (4, 612.0)]
+    assert records[0]["special_offers"] == "Was EUR 450"
+
+    dom = [dict(records[0])]
+    assert WitterZomerScraper._payload_matches_dom(records, dom)
+    dom[0]["price"] = 380.0  # widget-korting die de payload mist
+    assert not WitterZomerScraper._payload_matches_dom(records, dom)
+    assert _with_start_date("https://x/matrix?from=2026-07-01&n=4", "2026-08-01") \
+        == "https://x/matrix?from=2026-08-01&n=4"
+
+
 def test_westerbergen_init(tmp_db):
     """Westerbergen scraper initialiseert correct."""
     from scrapers.westerbergen import WesterbergenScraper
@@ -58,11 +80,93 @@ def test_westerbergen_init(tmp_db):
 
 
 def test_scraper_map_complete(tmp_db):
-    """Alle 7 scrapers in de scraper map."""
-    from run_scraper import get_scraper_map
+    """Alle scrapers uit de config staan in de (lazy) scraper map."""
+    from run_scraper import get_scraper_map, load_config
     scrapers = get_scraper_map(tmp_db, headless=True)
-    expected = {
-        "beerze_bulten", "camping_ommerland", "eiland_van_maurik",
-        "witter_zomer", "de_witte_berg", "de_boshoek", "westerbergen",
+    config = load_config("config/settings.yaml")
+    assert set(scrapers.keys()) == set(config["competitors"])
+
+    # Pas bij opvragen wordt de scraper gebouwd
+    assert scrapers._built == {}
+    assert scrapers["landal_bartje"].competitor_name == "Landal Het Land van Bartje"
+    assert list(scrapers._built) == ["landal_bartje"]
+
+
+def test_registry_domain_groups():
+    """Elke registry-key valt in precies één domeingroep."""
+    from scrapers.registry import SCRAPERS, domain_groups
+    groups = domain_groups()
+    keys = [k for gkeys in groups.values() for k in gkeys]
+    assert sorted(keys) == sorted(SCRAPERS)
+    assert groups["rcn"] == ["rcn_mercurius", "rcn_luna", "rcn_camping"]
+    assert domain_groups(["rcn_luna", "onbekend"]) == {
+        "rcn": ["rcn_luna"], "_ungrouped_onbekend": ["onbekend"],
     }
-    assert set(scrapers.keys()) == expected
+
+
+def test_landal_group_pipeline(tmp_db, monkeypatch):
+    """Landal-groep: één zoekrequest per park/verblijf levert prijzen voor alle codes."""
+    from scrapers.landal_scraper import (
+        LandalAelderholtPremiumScraper, LandalAelderholtScraper, LandalBartjeScraper,
+        LandalScraper,
+    )
+
+    monkeypatch.setattr(LandalScraper, "_init_session", lambda self, force=False: False)
+    monkeypatch.setattr(
+        LandalScraper, "_fetch_arrival_dates",
+        lambda self, stay_type: [{"date": "01-05-2026", "durations": [2, 3, 7]}],
+    )
+    searches = []
+
+    def fake_search(self, arr, dep, stay_type, persons=6, acc_code=""):
+        searches.append((self.park_code, arr, dep, acc_code))
+        codes = ["6CE", "6ELK"] if self.park_code == "AHT" else ["6D5"]
+        return [
+            {"AccommodationInfo": {"Code": code},
+             "PriceInfo": {"bestRentalPriceInEuros": 300},
+             "stayDuration": {"arrivalDate": "2026-05-01T00:00:00Z",
+                              "departureDate": dep[6:] + "-" + dep[3:5] + "-" + dep[:2]
+                              + "T00:00:00Z", "numberOfNights": 2}}
+            for code in codes
+        ]
+
+    monkeypatch.setattr(LandalScraper, "_search_prices", fake_search)
+    scrapers = [cls(db=tmp_db) for cls in (
+        LandalAelderholtScraper, LandalAelderholtPremiumScraper, LandalBartjeScraper)]
+    results = LandalScraper.run_group(scrapers, workers=3)
+
+    # 3 verblijven (2n, 3n, 7n) per park, Aelderholt zonder acc-filter
+    assert len(searches) == 6
+    assert {acc for park, _, _, acc in searches if park == "AHT"} == {None}
+    assert [len(r) for r in results] == [3, 3, 3]
+    assert {r["accommodation_type"] for r in results[1]} == {scrapers[1].accommodation_type}
+
+
+def test_molecaten_prefetch_group(tmp_db, monkeypatch):
+    """Molecaten: beide producten via één sessie, elke pagina precies één keer opgehaald."""
+    from datetime import datetime, timedelta
+
+    from scrapers.molecaten_scraper import (
+        MolecatenKuierpadBosvenScraper, MolecatenKuierpadCampingScraper, MolecatenScraper,
+    )
+
+    fetched = []
+
+    def fake_page(self, arrival_date, persons=6):
+        fetched.append((self.ac_code, arrival_date))
+        day = datetime.strptime(arrival_date, "%Y%m%d")
+        prices = [
+            {"check_in": day + timedelta(days=i), "check_out": day + timedelta(days=i + 2),
+             "nights": 2, "price": 200.0, "available": True, "quantity": 1}
+            for i in range(7)
+        ]
+        return {"prices": prices, "next_date": (day + timedelta(days=7)).strftime("%Y%m%d")}
+
+    monkeypatch.setattr(MolecatenScraper, "_fetch_availability_page", fake_page)
+    scrapers = [MolecatenKuierpadBosvenScraper(db=tmp_db), MolecatenKuierpadCampingScraper(db=tmp_db)]
+    results = MolecatenScraper.run_group(scrapers, months_ahead=1)
+
+    assert scrapers[1].session is scrapers[0].session
+    assert [len(r) for r in results] == [35, 35]  # 5 pagina's x 7 aankomstdata
+    assert len(fetched) == len(set(fetched))
+    assert {ac for ac, _ in fetched} == {"4063", "4064"}
@@ -0,0 +1,63 @@
+"""Smoke tests voor de taakgraaf-executor."""
+
+import threading
+import time
+
+import pytest
+
+from scheduler.task_graph import SKIPPED, TaskGraph
+
+
+def test_dependencies_respected():
+    """Een node start pas als zijn afhankelijkheden klaar zijn."""
+    order = []
+    lock = threading.Lock()
+
+    def step(name, delay=0.0):
+        def fn():
+            time.sleep(delay)
+            with lock:
+                order.append(name)
+            return name
+        return fn
+
+    graph = TaskGraph(max_workers=4)
+    graph.add("slow", step("slow", 0.2))
+    graph.add("fast", step("fast"))
+    graph.add("after_fast", step("after_fast"), deps=["fast"])
+    graph.add("after_both", step("after_both"), deps=["slow", "after_fast"])
+    nodes = graph.run()
+
+    # after_fast hoeft niet op de trage node te wachten
+    assert order.index("after_fast") < order.index("slow")
+    assert order[-1] == "after_both"
+    assert all(n["status"] == "ok" for n in nodes.values())
+    assert nodes["slow"]["duration"] >= 0.2
+
+
+def test_failure_and_skip():
+    """Fouten worden per node vastgelegd; require_success slaat afhankelijken over."""
+    def boom():
+        raise RuntimeError("kapot")
+
+    graph = TaskGraph()
+    graph.add("boom", boom)
+    graph.add("needs_ok", lambda: "x", deps=["boom"], require_success=True)
+    graph.add("runs_anyway", lambda: "y", deps=["boom"])
+    graph.add("noop", lambda: SKIPPED)
+    nodes = graph.run()
+
+    assert nodes["boom"]["status"] == "failed"
+    assert "kapot" in nodes["boom"]["error"]
+    assert nodes["needs_ok"]["status"] == "skipped"
+    assert graph.result("runs_anyway") == "y"
+    assert nodes["noop"]["status"] == "skipped"
+
+
+def test_cycle_detected():
+    """Een cyclus wordt vóór de uitvoering gemeld."""
+    graph = TaskGraph()
+    graph.add("a", lambda: 1, deps=["b"])
+    graph.add("b", lambda: 2, deps=["a"])
+    with pytest.raises(ValueError):
+        graph.run()
@@ -0,0 +1,75 @@
+"""Smoke tests voor scrape-telemetrie (RunMetrics + tabel scrape_metrics)."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from scrapers.telemetry import RunMetrics
+
+
+def test_run_metrics_summary():
+    """Requests, fouten, bytes, latency-percentielen en tijdsverdeling per run."""
+    metrics = RunMetrics()
+    for i in range(1, 21):
+        metrics.record_request(i / 100, nbytes=1000, status=200, waited=0.5)
+    metrics.record_request(2.0, nbytes=10, status=503)
+    with metrics.timed("parse"):
+        pass
+    metrics.add_time("db", 0.25)
+
+    s = metrics.summary()
+    assert (s["requests"], s["http_errors"], s["bytes"]) == (21, 1, 20010)
+    assert s["latency_p50"] == 0.11 and s["latency_p95"] == 0.2 and s["latency_max"] == 2.0
+    assert s["sleep_seconds"] == 10.0 and s["db_seconds"] == 0.25
+    assert "21 requests (1 fouten)" in metrics.format_summary()
+
+    metrics.reset()
+    assert metrics.summary()["requests"] == 0 and metrics.summary()["latency_p95"] is None
+
+
+def test_session_hook_counts_requests():
+    """De response-hook op een requests.Session telt status en bytes mee."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(404 if self.path == "/weg" else 200)
+            self.send_header("Content-Length", "5")
+            self.end_headers()
+            self.wfile.write(b"prijs")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        metrics = RunMetrics()
+        session = metrics.instrument_session(requests.Session())
+        metrics.instrument_session(session)  # tweede keer: geen dubbele hook
+        base = f"http://127.0.0.1:{server.server_port}"
+        session.get(f"{base}/prijzen", timeout=5)
+        session.get(f"{base}/weg", timeout=5)
+    finally:
+        server.shutdown()
+
+    s = metrics.summary()
+    assert (s["requests"], s["http_errors"], s["bytes"]) == (2, 1, 10)
+    assert s["latency_max"] is not None
+
+
+def test_scrape_metrics_roundtrip(tmp_db):
+    """Telemetrie wordt per run opgeslagen en per scraper opgevraagd."""
+    metrics = RunMetrics()
+    metrics.record_request(0.3, nbytes=2048, status=200)
+    tmp_db.save_scrape_metrics(competitor_name="Landal Het Land van Bartje",
+                               scraper_key="landal_bartje", status="success",
+                               duration_seconds=42.0, records=120, **metrics.summary())
+    tmp_db.save_scrape_metrics(competitor_name="RCN De Noordster", scraper_key="rcn",
+                               status="failed", duration_seconds=3.0)
+
+    rows = tmp_db.get_scrape_metrics(days=1)
+    assert [r["scraper_key"] for r in rows] == ["landal_bartje", "rcn"]
+    landal = tmp_db.get_scrape_metrics(days=1, scraper_key="landal_bartje")
+    assert len(landal) == 1
+    assert (landal[0]["requests"], landal[0]["bytes"], landal[0]["latency_p95"]) == (1, 2048, 0.3)
@@ -0,0 +1,80 @@
+"""Smoke tests voor span-tracing met Chrome-trace export."""
+
+import json
+from unittest.mock import patch
+
+import tracing
+from run_daily import run_pipeline, EXIT_SUCCESS
+
+
+def _spans(path):
+    with open(path, encoding="utf-8") as f:
+        events = json.load(f)["traceEvents"]
+    return {e["name"]: e for e in events if e["ph"] == "X"}
+
+
+def test_spans_nest_and_merge(tmp_path):
+    """Spans nesten in tijd, worker-events worden samengevoegd, zonder tracer no-op."""
+
+    @tracing.traced("kpi")
+    def compute_index():
+        return 42
+
+    with tracing.span("los") as args:  # geen tracer actief: no-op
+        args["genegeerd"] = True
+    assert not tracing.active()
+
+    tracing.start()
+    with tracing.span("analytics", cat="analytics", segment="accommodatie") as args:
+        assert compute_index() == 42
+        args["comparisons"] = 3
+    with tracing.capture() as worker_events:
+        with tracing.span("Overzicht", cat="sheet"):
+            pass
+    tracing.merge(worker_events)
+    tracing.add_span("GET example.test/prijzen", 1.0, 0.25, cat="http", status=200)
+    path = tracing.stop(str(tmp_path))
+    assert tracing.stop(str(tmp_path)) is None
+
+    spans = _spans(path)
+    assert set(spans) == {"analytics", "compute_index", "Overzicht", "GET example.test/prijzen"}
+    outer, inner = spans["analytics"], spans["compute_index"]
+    assert outer["args"] == {"segment": "accommodatie", "comparisons": 3}
+    assert inner["cat"] == "kpi" and inner["ts"] >= outer["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert spans["GET example.test/prijzen"]["dur"] == 250000
+
+
+class _FakeScraper:
+    def __init__(self, name):
+        self.competitor_name = name
+
+    def run_efficient(self, **kwargs):
+        return [{"available": True, "price": 100.0}]
+
+
+def test_pipeline_writes_trace(sample_config, tmp_db, tmp_path):
+    """run_daily met trace: taakgraaf, scrapers, KPI's en werkbladen in één trace."""
+    config_path, config = sample_config
+    config["general"]["database_path"] = tmp_db.db_path
+    config["general"]["trace_dir"] = str(tmp_path / "traces")
+    config["automation"]["git_auto_push"] = False
+    config["competitors"]["beerze_bulten"]["segment"] = "accommodatie"
+
+    scrapers = {"westerbergen": _FakeScraper("Westerbergen"),
+                "beerze_bulten": _FakeScraper("Beerze Bulten")}
+    with patch("run_daily.get_scraper_map", return_value=scrapers), \
+            patch("email_report.send_report"):
+        assert run_pipeline(config=config, trace=True) == EXIT_SUCCESS
+    assert not tracing.active()
+
+    traces = list((tmp_path / "traces").glob("trace_*.json"))
+    assert len(traces) == 1
+    spans = _spans(traces[0])
+    assert spans["run_daily"]["args"]["exit_code"] == EXIT_SUCCESS
+    for name in ("taakgraaf", "analytics:accommodatie", "westerbergen", "beerze_bulten",
+                 "wachten op slot", "compute_price_index", "run_analytics"):
+        assert name in spans, name
+    # Werkbladen komen uit het dashboard-workerproces
+    assert spans["Overzicht"]["cat"] == "sheet"
+    assert spans["Overzicht"]["pid"] != spans["run_daily"]["pid"]
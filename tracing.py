@@ -0,0 +1,200 @@
+"""Span-tracing van de dagelijkse run, export als Chrome-trace (Perfetto).
+
+run_daily logde alleen de duur per scraper en een totaal. Met tracing aan
+(``run_daily.py --trace`` of ``general.trace`` in settings.yaml) wordt elke
+stap een span, van grof naar fijn:
+
+- pipeline -> fase -> taakgraaf-node (scrape-groep, retry, analytics en
+  dashboard per segment)
+- domeingroep -> wachten op een scrape-slot -> scraper -> HTTP-request of
+  browser-request (via scrapers.telemetry)
+- analytics -> KPI-functie
+- dashboard -> werkblad
+
+Per run komt er één JSON-bestand in het Chrome trace event format
+(``logs/traces/trace_<datum>_<tijd>.json``). Open het in
+https://ui.perfetto.dev of chrome://tracing om het kritieke pad en de
+idle-gaten te zien. Worker-processen (proces-isolatie, dashboard-pool)
+verzamelen hun spans met ``capture()`` en sturen ze terug naar de parent,
+die ze met ``merge()`` toevoegt. Tijdstempels zijn wall-clock, zodat spans
+uit verschillende processen op één tijdlijn liggen.
+
+Zonder actieve tracer doet ``span()`` niets.
+
+Usage:
+    tracing.start()
+    with tracing.span("analytics", cat="analytics", segment="accommodatie") as args:
+        result = run_analytics(...)
+        args["comparisons"] = result["metadata"]["comparison_count"]
+    path = tracing.stop("logs/traces")
+"""
+
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+_tracer = None
+
+
+class Tracer:
+    """Collects Chrome trace events of one process (thread-safe)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.events = [{
+            "name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+            "args": {"name": multiprocessing.current_process().name},
+        }]
+        self._named = set()  # (pid, tid) that already have a thread_name event
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, cat: str = "",
+            args: dict = None):
+        """Add a complete span; ``start`` in epoch seconds, ``duration`` in seconds."""
+        pid, tid = os.getpid(), threading.get_native_id()
+        event = {
+            "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+            "ts": round(start * 1e6), "dur": max(0, round(duration * 1e6)),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if (pid, tid) not in self._named:
+                self._named.add((pid, tid))
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                })
+            self.events.append(event)
+
+    def merge(self, events: list):
+        with self._lock:
+            self.events.extend(events)
+
+    def write(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"started": datetime.fromtimestamp(self.started).isoformat()},
+            }, f, separators=(",", ":"))
+        return path
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start", "t0")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> dict:
+        self.start = time.time()
+        self.t0 = time.perf_counter()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, time.perf_counter() - self.t0,
+                        self.cat, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> dict:
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def active() -> bool:
+    return _tracer is not None
+
+
+def start() -> Tracer:
+    """Start tracing in this process (replaces a running tracer)."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop(trace_dir: str = "logs/traces") -> str | None:
+    """Stop tracing and write the trace file; returns its path (None if inactive)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    stamp = datetime.fromtimestamp(tracer.started).strftime("%Y-%m-%d_%H%M%S")
+    return tracer.write(os.path.join(trace_dir, f"trace_{stamp}.json"))
+
+
+def span(name: str, cat: str = "", **args):
+    """Context manager timing a block; yields the args dict to add results to."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def add_span(name: str, start: float, duration: float, cat: str = "", **args):
+    """Record a span measured elsewhere (e.g. a request's own timing)."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, start, duration, cat, args)
+
+
+def traced(cat: str = ""):
+    """Decorator: trace every call of the function under its own name."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with span(fn.__name__, cat=cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def capture(enabled: bool = True):
+    """Trace a block in a worker process; the yielded list holds its events afterwards.
+
+    A forked worker inherits the parent's tracer, so the block always gets
+    a fresh one; the previous tracer is restored on exit.
+    """
+    global _tracer
+    events = []
+    if not enabled:
+        yield events
+        return
+    previous, _tracer = _tracer, Tracer()
+    try:
+        yield events
+    finally:
+        events.extend(_tracer.events)
+        _tracer = previous
+
+
+def merge(events: list):
+    """Add events captured in a worker process to the running trace."""
+    tracer = _tracer
+    if tracer is not None and events:
+        tracer.merge(events)